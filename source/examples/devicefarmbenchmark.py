@@ -0,0 +1,238 @@
+"""
+    Benchmarks the startup scan, description refresh and eventing of the :class:`UpnpCoordinator` as the number
+    of devices grows, using a :class:`UpnpDeviceFarm` of simulated media renderers on loopback.
+
+    * Scan is the time `startup_scan` takes to find the devices of the farm, activate them and start the
+      network engine.  The fetch and activate stages are taken from the `activation_statistics` of the
+      coordinator.
+    * Refresh is the time to load the description of every activated device again and to refresh the device
+      and its service proxies with `refresh_description`.
+    * Subscribe is the time to subscribe to the evented services of every device with `subscribe_to_events`.
+    * Event throughput is the rate that a NOTIFY storm is processed by the callback server and the workers
+      of the coordinator.
+
+    The farm answers M-SEARCH requests on a loopback port instead of the SSDP multicast group, so the coordinator
+    is derived to search the farm from the `_device_scan_pre_msearch_query` hook that runs before the multicast
+    search.  The landscape is a minimal stand in that provides a landscape device for every device of the farm.
+
+    Each device count is run in a new process because the coordinator is a singleton.  The device counts can be
+    passed as arguments, for example `devicefarmbenchmark.py 100 500 1000`.
+"""
+
+import multiprocessing
+import socket
+import sys
+import time
+
+from mojo.interop.protocols.upnp.upnpcoordinator import UpnpCoordinator
+from mojo.interop.protocols.upnp.upnpdevicefarm import UpnpDeviceFarm, LOOPBACK_ADDRESS
+from mojo.interop.protocols.upnp.upnpfactory import UpnpFactory
+from mojo.interop.protocols.upnp.upnpprotocol import MSearchRouteKeys, MSearchScanContext, MSearchTargets
+from mojo.interop.protocols.upnp.upnpprotocol import msearch_create_message, msearch_process_response
+from mojo.interop.protocols.upnp.xml.upnpdevice1 import UPNP_DEVICE1_NAMESPACE
+
+DEFAULT_DEVICE_COUNTS = (50, 100, 250, 500)
+ACTIVATION_WORKERS = 8
+CALLBACK_WORKERS = 5
+STORM_EVENTS_PER_SUBSCRIPTION = 10
+DISCOVERY_TIMEOUT = 30
+
+LOOPBACK_INTERFACE = "lo"
+
+# The devices of the farm report the manufacturer of the standard service proxies that their services are
+# modeled on, so the coordinator creates the service proxies when it activates the devices.
+FARM_MANUFACTURER = "UPnP"
+
+NAMESPACES = {"": UPNP_DEVICE1_NAMESPACE}
+
+
+class FarmLandscapeDevice:
+    """
+        The landscape device the coordinator attaches the UPnP extension of a farm device to.
+    """
+
+    def __init__(self, hint: str):
+        self.identity = hint
+        self.upnp = None
+        return
+
+    def attach_extension(self, ext_type: str, extension):
+        setattr(self, ext_type, extension)
+        return
+
+    def initialize_features(self):
+        return
+
+    def update_full_identifier(self, full_identifier: str):
+        self.identity = full_identifier
+        return
+
+    def update_match_table(self, match_table: dict):
+        return
+
+
+class FarmLandscape:
+    """
+        A minimal stand in for the landscape the coordinator is created for, it has a landscape device for every
+        device of the farm.
+    """
+
+    def __init__(self, hints):
+        self._devices = {hint: FarmLandscapeDevice(hint) for hint in hints}
+        return
+
+    def _enhance_landscape_device(self, basedevice: FarmLandscapeDevice, extension) -> FarmLandscapeDevice:
+        return basedevice
+
+    def _internal_activate_device(self, hint: str):
+        return
+
+    def _internal_get_upnp_device_config_lookup_table(self) -> dict:
+        return {}
+
+    def _internal_lookup_device_by_hint(self, hint: str) -> FarmLandscapeDevice:
+        return self._devices.get(hint)
+
+
+class FarmCoordinator(UpnpCoordinator):
+    """
+        A coordinator that sends its M-SEARCH to the SSDP port of a device farm before it falls back to the
+        multicast search.
+    """
+
+    def __init__(self, lscape: FarmLandscape, farm_ssdp_address, **kwargs):
+        super(FarmCoordinator, self).__init__(lscape, **kwargs)
+        self._farm_ssdp_address = farm_ssdp_address
+        return
+
+    def _device_scan_pre_msearch_query(self, lscape, query_devices: list, timeout: float, interval: float):
+
+        scan_context = MSearchScanContext(query_devices)
+
+        route_info = {
+            MSearchRouteKeys.IFNAME: LOOPBACK_INTERFACE,
+            MSearchRouteKeys.IP: LOOPBACK_ADDRESS
+        }
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as msock:
+            msock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+            msock.settimeout(timeout)
+            msock.sendto(msearch_create_message(st=MSearchTargets.ROOTDEVICE), self._farm_ssdp_address)
+
+            try:
+                while scan_context.continue_scan:
+                    resp, addr = msock.recvfrom(2048)
+                    msearch_process_response(scan_context, LOOPBACK_INTERFACE, route_info, MSearchTargets.ROOTDEVICE, resp, addr)
+            except socket.timeout:
+                pass
+
+        return scan_context.matching_devices
+
+
+def subscribe_all(devices) -> int:
+    """
+        Subscribes to the evented services of the devices.
+    """
+    subscriptions = 0
+    for device in devices:
+        for svc_info in device.description.serviceList:
+            service = device.lookup_service(svc_info.serviceManufacturer, svc_info.serviceType, allow_none=True)
+            if service is not None and len(service.SERVICE_EVENT_VARIABLES) > 0:
+                sid, _ = device.subscribe_to_events(service)
+                if sid is not None:
+                    subscriptions += 1
+
+    return subscriptions
+
+
+def wait_for_completed(coordinator: UpnpCoordinator, count: int, timeout: float) -> int:
+    """
+        Waits for the workers of the coordinator to complete a number of work packets.
+    """
+    end_time = time.perf_counter() + timeout
+
+    completed = coordinator.work_queue_statistics["completed"]
+    while completed < count and time.perf_counter() < end_time:
+        time.sleep(0.005)
+        completed = coordinator.work_queue_statistics["completed"]
+
+    return completed
+
+
+def benchmark_device_count(device_count: int):
+
+    farm = UpnpDeviceFarm(device_count, manufacturer=FARM_MANUFACTURER)
+    farm.start()
+
+    hints = [device.udn for device in farm.devices]
+
+    lscape = FarmLandscape(hints)
+    coordinator = FarmCoordinator(lscape, farm.ssdp_address, workers=CALLBACK_WORKERS)
+
+    try:
+        start = time.perf_counter()
+        _, matching, _ = coordinator.startup_scan({hint: {} for hint in hints}, required_devices=hints, watchlist=hints,
+                                                  pre_msearch_timeout=DISCOVERY_TIMEOUT, activation_workers=ACTIVATION_WORKERS)
+        scan_elapsed = time.perf_counter() - start
+
+        activation_stats = coordinator.activation_statistics
+
+        devices = coordinator.lookup_device_list_by_usn([device.usn for device in farm.devices])
+
+        factory = UpnpFactory()
+        start = time.perf_counter()
+        for device in devices:
+            docTree = device.query_device_description()
+            device.refresh_description(device.IPAddress, factory, docTree.getroot(), namespaces=NAMESPACES)
+        refresh_elapsed = time.perf_counter() - start
+
+        completed_before = coordinator.work_queue_statistics["completed"]
+
+        start = time.perf_counter()
+        subscriptions = subscribe_all(devices)
+        subscribe_elapsed = time.perf_counter() - start
+
+        # Wait for the initial events of the subscriptions to be processed before the storm
+        received_before = wait_for_completed(coordinator, completed_before + subscriptions, timeout=30)
+
+        start = time.perf_counter()
+        storm_stats = farm.emit_notify_storm(STORM_EVENTS_PER_SUBSCRIPTION)
+        received_after = wait_for_completed(coordinator, received_before + storm_stats["sent"], timeout=60)
+        storm_elapsed = time.perf_counter() - start
+
+        storm_received = received_after - received_before
+        queue_stats = coordinator.work_queue_statistics
+
+    finally:
+        coordinator.shutdown_monitoring()
+        farm.stop()
+
+    print("{:7d} {:5d} {:9.1f}ms {:9.1f}ms {:9.1f}ms {:9.2f}ms {:6d} {:9.2f}ms {:11.0f}/s {:9.1f}us".format(
+        device_count, len(matching), scan_elapsed * 1e3, activation_stats["fetch_elapsed"] * 1e3,
+        activation_stats["activate_elapsed"] * 1e3, refresh_elapsed * 1e3 / max(len(devices), 1), subscriptions,
+        subscribe_elapsed * 1e3 / max(subscriptions, 1), storm_received / storm_elapsed if storm_elapsed > 0 else 0.0,
+        queue_stats["wait_avg"] * 1e6))
+
+    return
+
+
+def benchmark_main():
+
+    device_counts = DEFAULT_DEVICE_COUNTS
+    if len(sys.argv) > 1:
+        device_counts = [int(arg) for arg in sys.argv[1:]]
+
+    mpctx = multiprocessing.get_context("spawn")
+
+    print("{:>7} {:>5} {:>11} {:>11} {:>11} {:>11} {:>6} {:>11} {:>13} {:>11}".format(
+        "Devices", "Found", "Scan", "Fetch", "Activate", "Refresh/Dev", "Subs", "Subscribe", "Event Rate", "Queue Wait"))
+    for device_count in device_counts:
+        proc = mpctx.Process(target=benchmark_device_count, args=(device_count,))
+        proc.start()
+        proc.join()
+
+    return
+
+
+if __name__ == "__main__":
+    benchmark_main()
@@ -0,0 +1,130 @@
+"""
+    Benchmarks the compiled SOAP request templates of the :class:`SoapProcessor` against building the
+    request envelope with ElementTree for every action of the generated standard service proxies.
+"""
+
+import enum
+import inspect
+import pkgutil
+import time
+
+from xml.etree.ElementTree import Element, SubElement
+from xml.etree.ElementTree import tostring as xml_tostring
+from xml.etree.ElementTree import register_namespace
+
+from mojo.xmods.ximport import import_by_name
+
+from mojo.interop.protocols.upnp.soap import SoapProcessor, PYTHON_TO_SOAP_TYPE_MAP
+from mojo.interop.protocols.upnp.soap import NS_SOAP_ENV, URI_SOAP_ENCODING, XML_DOCUMENT_DECLARATION
+
+import mojo.interop.protocols.upnp.extensions.standard.services.UPnP as upnp_services
+
+ITERATIONS = 200
+
+
+def elementtree_create_request(action_name: str, arguments: dict, encoding=URI_SOAP_ENCODING, typed=None):
+    """
+        The ElementTree based construction of the request envelope that the templates replace.
+    """
+    register_namespace('', None)
+
+    envelope = Element("s:Envelope")
+    envelope.attrib.update({'xmlns:s': NS_SOAP_ENV})
+    envelope.attrib.update({'s:encodingStyle': encoding})
+
+    body = SubElement(envelope, "s:Body")
+
+    if typed:
+        methElement = SubElement(body, "u:" + action_name)
+        methElement.attrib.update({'xmlns:u': typed})
+    else:
+        methElement = SubElement(body, action_name)
+
+    if arguments:
+        for arg_name, arg_val in arguments.items():
+            if isinstance(arg_val, enum.Enum):
+                arg_val = arg_val.value
+
+            soap_type = PYTHON_TO_SOAP_TYPE_MAP[type(arg_val)]
+            if soap_type == 'xsd:int' or soap_type == 'xsd:float':
+                arg_val = str(arg_val)
+            elif soap_type == 'xsd:boolean':
+                arg_val = "1" if arg_val else "0"
+
+            argElement = SubElement(methElement, arg_name)
+            argElement.text = arg_val
+    else:
+        methElement.text = ""
+
+    envelope_content = xml_tostring(envelope, short_empty_elements=False)
+    content = (XML_DOCUMENT_DECLARATION + envelope_content.decode("utf-8")).encode("utf-8")
+
+    return content
+
+
+def collect_action_calls():
+    """
+        Collects the (serviceType, action name, arguments) for every action of the generated service proxies.
+    """
+    action_calls = []
+
+    for modinfo in pkgutil.iter_modules(upnp_services.__path__):
+        module = import_by_name("%s.%s" % (upnp_services.__name__, modinfo.name))
+
+        for _, proxy_type in inspect.getmembers(module, inspect.isclass):
+            if proxy_type.__module__ != module.__name__ or not hasattr(proxy_type, "SERVICE_TYPE"):
+                continue
+
+            service_type = "urn:schemas-upnp-org:service:%s" % proxy_type.SERVICE_TYPE
+
+            for meth_name, meth in inspect.getmembers(proxy_type, inspect.isfunction):
+                if not meth_name.startswith("action_"):
+                    continue
+
+                arguments = {}
+                for param in inspect.signature(meth).parameters.values():
+                    if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD and param.name != "self":
+                        arguments[param.name] = "%s & <value>" % param.name
+
+                action_calls.append((service_type, meth_name[len("action_"):], arguments))
+
+    return action_calls
+
+
+def benchmark_main():
+
+    action_calls = collect_action_calls()
+
+    processor = SoapProcessor()
+
+    # Make sure both paths produce the same request content
+    for service_type, action_name, arguments in action_calls:
+        expected = elementtree_create_request(action_name, arguments, typed=service_type)
+        found = processor.create_request(action_name, arguments, typed=service_type)
+        if expected != found:
+            raise RuntimeError("Request content mismatch for %s#%s" % (service_type, action_name))
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for service_type, action_name, arguments in action_calls:
+            elementtree_create_request(action_name, arguments, typed=service_type)
+    et_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for service_type, action_name, arguments in action_calls:
+            processor.create_request(action_name, arguments, typed=service_type)
+    tmpl_elapsed = time.perf_counter() - start
+
+    call_count = ITERATIONS * len(action_calls)
+
+    print("Actions: {}  Calls: {}".format(len(action_calls), call_count))
+    print("ElementTree: {:.3f}s  {:.2f}us/call".format(et_elapsed, et_elapsed * 1e6 / call_count))
+    print("   Template: {:.3f}s  {:.2f}us/call".format(tmpl_elapsed, tmpl_elapsed * 1e6 / call_count))
+    print("    Speedup: {:.1f}x".format(et_elapsed / tmpl_elapsed))
+
+    return
+
+
+if __name__ == "__main__":
+    benchmark_main()
@@ -0,0 +1,204 @@
+"""
+    Benchmarks the bytes level SSDP codec against the str based parsing of SSDP NOTIFY and M-SEARCH response
+    datagrams that it replaces.  The traffic is modeled on a capture from a home network with a mix of media
+    players, routers and printers, each announcing its root device, embedded devices and services.
+"""
+
+import random
+import time
+
+from mojo.interop.protocols.upnp.ssdpcodec import ssdp_parse
+from mojo.interop.protocols.upnp.upnpprotocol import msearch_parse_response, notify_parse_request
+
+DEVICE_COUNT = 40
+WATCHED_DEVICE_COUNT = 4
+ITERATIONS = 200
+
+DEVICE_PROFILES = [
+    ("Linux UPnP/1.0 Sonos/70.3-35220 (ZPS23)", [
+        "urn:schemas-upnp-org:device:ZonePlayer:1",
+        "urn:schemas-upnp-org:device:MediaServer:1",
+        "urn:schemas-upnp-org:device:MediaRenderer:1",
+        "urn:schemas-upnp-org:service:AlarmClock:1",
+        "urn:schemas-upnp-org:service:MusicServices:1",
+        "urn:schemas-upnp-org:service:DeviceProperties:1",
+        "urn:schemas-upnp-org:service:SystemProperties:1",
+        "urn:schemas-upnp-org:service:ZoneGroupTopology:1",
+        "urn:schemas-upnp-org:service:GroupManagement:1",
+        "urn:schemas-upnp-org:service:ContentDirectory:1",
+        "urn:schemas-upnp-org:service:ConnectionManager:1",
+        "urn:schemas-upnp-org:service:RenderingControl:1",
+        "urn:schemas-upnp-org:service:AVTransport:1"
+    ]),
+    ("Linux/3.14 UPnP/1.0 IpBridge/1.26.0", [
+        "urn:schemas-upnp-org:device:InternetGatewayDevice:1",
+        "urn:schemas-upnp-org:device:WANDevice:1",
+        "urn:schemas-upnp-org:device:WANConnectionDevice:1",
+        "urn:schemas-upnp-org:service:Layer3Forwarding:1",
+        "urn:schemas-upnp-org:service:WANCommonInterfaceConfig:1",
+        "urn:schemas-upnp-org:service:WANIPConnection:1"
+    ]),
+    ("Network Printer Server UPnP/1.0 OS 1.29.00.44 06-17-2009", [
+        "urn:schemas-upnp-org:device:Printer:1",
+        "urn:schemas-upnp-org:service:PrintBasic:1"
+    ])
+]
+
+
+def legacy_http_parse(content: bytes) -> dict:
+    """
+        The str based parsing that the codec replaces, it decodes the whole datagram, splits it
+        into lines and upper cases every header name.
+    """
+    content = content.decode('utf-8')
+
+    headers = None
+
+    lines = content.splitlines(False)
+    if len(lines) > 0:
+        lines.pop(0)
+        headers = {}
+        for nxtline in lines:
+            cidx = nxtline.find(":")
+            if cidx > -1:
+                key = nxtline[:cidx].upper()
+                val = nxtline[cidx+1:].strip()
+                headers[key] = val
+
+    return headers
+
+
+def create_traffic():
+    """
+        Creates the NOTIFY and M-SEARCH response datagrams for the modeled devices.
+    """
+    rand = random.Random(7)
+
+    notify_traffic = []
+    response_traffic = []
+    device_udns = []
+
+    for didx in range(DEVICE_COUNT):
+        server, targets = DEVICE_PROFILES[didx % len(DEVICE_PROFILES)]
+        udn = "uuid:RINCON_%012X01400" % rand.getrandbits(48)
+        device_udns.append(udn[len("uuid:"):])
+        ipaddr = "192.168.1.%d" % (didx + 10)
+        location = "http://%s:1400/xml/device_description.xml" % ipaddr
+
+        for target in ["upnp:rootdevice", udn] + targets:
+            usn = udn if target == udn else "%s::%s" % (udn, target)
+            notify = "\r\n".join([
+                "NOTIFY * HTTP/1.1",
+                "HOST: 239.255.255.250:1900",
+                "CACHE-CONTROL: max-age = 1800",
+                "LOCATION: %s" % location,
+                "NT: %s" % target,
+                "NTS: ssdp:alive",
+                "SERVER: %s" % server,
+                "USN: %s" % usn,
+                "X-RINCON-HOUSEHOLD: Sonos_abcdefghijklmnop",
+                "X-RINCON-BOOTSEQ: 86",
+                "BOOTID.UPNP.ORG: 86",
+                "CONFIGID.UPNP.ORG: 1",
+                "", ""
+            ]).encode("utf-8")
+            notify_traffic.append(notify)
+
+        response = "\r\n".join([
+            "HTTP/1.1 200 OK",
+            "CACHE-CONTROL: max-age = 1800",
+            "EXT:",
+            "LOCATION: %s" % location,
+            "SERVER: %s" % server,
+            "ST: upnp:rootdevice",
+            "USN: %s::upnp:rootdevice" % udn,
+            "BOOTID.UPNP.ORG: 86",
+            "CONFIGID.UPNP.ORG: 1",
+            "", ""
+        ]).encode("utf-8")
+        response_traffic.append(response)
+
+    rand.shuffle(notify_traffic)
+
+    return notify_traffic, response_traffic, device_udns
+
+
+def codec_notify_filter(msg, watched: set) -> bool:
+    """
+        The pre-filter the coordinator applies to NOTIFY messages before they are queued.
+    """
+    interesting = False
+    usn = msg.get("USN")
+    if usn is not None:
+        usn_dev, sep, usn_cls = usn.partition("::")
+        if sep and usn_cls == "upnp:rootdevice":
+            interesting = usn_dev[len("uuid:"):] in watched
+    return interesting
+
+
+def time_call(func, traffic) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for datagram in traffic:
+            func(datagram)
+    elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def benchmark_main():
+
+    notify_traffic, response_traffic, device_udns = create_traffic()
+
+    watched = set(device_udns[:WATCHED_DEVICE_COUNT])
+
+    # Make sure both paths produce the same headers
+    for datagram in notify_traffic:
+        expected = legacy_http_parse(datagram)
+        found, _ = notify_parse_request(datagram)
+        if expected != found:
+            raise RuntimeError("Header mismatch for NOTIFY %r" % datagram)
+
+    for datagram in response_traffic:
+        expected = legacy_http_parse(datagram)
+        found = msearch_parse_response(datagram)
+        if expected != found:
+            raise RuntimeError("Header mismatch for response %r" % datagram)
+
+    def legacy_filter(datagram):
+        headers = legacy_http_parse(datagram)
+        usn = headers["USN"]
+        if usn.find("::") > -1:
+            usn_dev, usn_cls = usn.split("::")
+            return usn_cls == "upnp:rootdevice" and usn_dev[len("uuid:"):] in watched
+        return False
+
+    def codec_filter(datagram):
+        return codec_notify_filter(ssdp_parse(datagram), watched)
+
+    passed = sum(1 for datagram in notify_traffic if codec_filter(datagram))
+
+    legacy_filtered = time_call(legacy_filter, notify_traffic)
+    codec_filtered = time_call(codec_filter, notify_traffic)
+    legacy_notify = time_call(legacy_http_parse, notify_traffic)
+    codec_notify = time_call(notify_parse_request, notify_traffic)
+    legacy_response = time_call(legacy_http_parse, response_traffic)
+    codec_response = time_call(msearch_parse_response, response_traffic)
+
+    notify_count = ITERATIONS * len(notify_traffic)
+    response_count = ITERATIONS * len(response_traffic)
+
+    print("NOTIFY datagrams: {}  Passed filter: {}".format(len(notify_traffic), passed))
+    print("")
+    print("                     Legacy      Codec    Speedup")
+    print("NOTIFY filter:    {:7.2f}us  {:7.2f}us  {:7.1f}x".format(
+        legacy_filtered * 1e6 / notify_count, codec_filtered * 1e6 / notify_count, legacy_filtered / codec_filtered))
+    print("NOTIFY to dict:   {:7.2f}us  {:7.2f}us  {:7.1f}x".format(
+        legacy_notify * 1e6 / notify_count, codec_notify * 1e6 / notify_count, legacy_notify / codec_notify))
+    print("Response to dict: {:7.2f}us  {:7.2f}us  {:7.1f}x".format(
+        legacy_response * 1e6 / response_count, codec_response * 1e6 / response_count, legacy_response / codec_response))
+
+    return
+
+
+if __name__ == "__main__":
+    benchmark_main()
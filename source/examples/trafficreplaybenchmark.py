@@ -0,0 +1,264 @@
+"""
+    Benchmarks the processing of UPnP traffic by replaying a traffic capture over loopback to a running
+    :class:`UpnpCoordinator`.  The devices that announce themselves in the capture are registered with the
+    coordinator, so the SSDP monitor, the notify filter, the work queue, the workers and the GENA callback
+    server of the coordinator process the replayed traffic.  The SOAP exchanges of the capture are answered
+    by a :class:`UpnpTrafficReplayServer` and called through the pooled HTTP sessions.
+
+    A capture recorded with `UpnpCoordinator.start_traffic_recording` can be passed as the first argument,
+    otherwise a capture is synthesized for a household of media players.  The playback speed can be passed
+    as the second argument, zero plays the capture back as fast as possible.  Passing `async` as the third
+    argument runs the coordinator with the asyncio network engine.
+
+    The SSDP datagrams are sent to the loopback address on the SSDP port, so the port must not be in use by
+    another UPnP stack on the host.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from mojo.interop.protocols.upnp.ssdpcodec import ssdp_parse
+from mojo.interop.protocols.upnp.upnpcoordinator import UpnpCoordinator
+from mojo.interop.protocols.upnp.upnphttpsession import upnp_http_request
+from mojo.interop.protocols.upnp.upnptrafficrecorder import UpnpTrafficKind, UpnpTrafficRecorder, read_traffic_capture
+from mojo.interop.protocols.upnp.upnptrafficreplay import UpnpTrafficReplayer, UpnpTrafficReplayServer
+
+DEVICE_COUNT = 60
+WATCHED_DEVICE_COUNT = 12
+ANNOUNCE_ROUNDS = 20
+EVENTS_PER_DEVICE = 40
+SOAP_CALLS_PER_DEVICE = 20
+WORKER_COUNT = 5
+LOOPBACK_INTERFACE = "lo"
+LOOKUP_ITERATIONS = 20000
+
+SERVICE_TYPES = [
+    "urn:schemas-upnp-org:service:AVTransport:1",
+    "urn:schemas-upnp-org:service:RenderingControl:1",
+    "urn:schemas-upnp-org:service:ZoneGroupTopology:1",
+    "urn:schemas-upnp-org:service:ContentDirectory:1"
+]
+
+LAST_CHANGE_EVENT = (
+    '<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"><e:property><LastChange>'
+    '&lt;Event xmlns=&quot;urn:schemas-upnp-org:metadata-1-0/RCS/&quot;&gt;&lt;InstanceID val=&quot;0&quot;&gt;'
+    '&lt;Volume channel=&quot;Master&quot; val=&quot;%d&quot;/&gt;&lt;Mute channel=&quot;Master&quot; val=&quot;0&quot;/&gt;'
+    '&lt;/InstanceID&gt;&lt;/Event&gt;</LastChange></e:property></e:propertyset>'
+)
+
+GET_VOLUME_RESPONSE = (
+    '<?xml version="1.0" encoding="utf-8"?><s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+    's:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/"><s:Body>'
+    '<u:GetVolumeResponse xmlns:u="urn:schemas-upnp-org:service:RenderingControl:1"><CurrentVolume>%d</CurrentVolume>'
+    '</u:GetVolumeResponse></s:Body></s:Envelope>'
+)
+
+
+class ReplayLandscape:
+    """
+        A minimal stand in for the landscape the coordinator is created for.  The replayed devices are registered
+        with the coordinator directly, so the landscape is never asked to create or activate a device.
+    """
+    def _internal_get_upnp_device_config_lookup_table(self) -> dict:
+        return {}
+
+
+class ReplayDevice:
+    """
+        A device that is registered with the coordinator so its replayed announcements and events pass the notify
+        filter and are dispatched to it by the coordinator workers.
+    """
+
+    processed_lock = threading.Lock()
+    processed = 0
+
+    def __init__(self, udn: str, ipaddr: str, mac: str):
+        self.USN = "uuid:%s::upnp:rootdevice" % udn
+        self.USN_DEV = udn
+        self.MACAddress = mac
+        self.IPAddress = ipaddr
+        return
+
+    def mark_alive(self):
+        self._mark_processed()
+        return
+
+    def process_subscription_callback(self, sender_ip, sid, headers, body):
+        self._mark_processed()
+        return
+
+    def process_subscription_properties(self, sender_ip, sid, headers, property_nodes):
+        self._mark_processed()
+        return
+
+    def _mark_processed(self):
+        ReplayDevice.processed_lock.acquire()
+        try:
+            ReplayDevice.processed += 1
+        finally:
+            ReplayDevice.processed_lock.release()
+        return
+
+
+def synthesize_capture(filename: str):
+    """
+        Records a synthetic capture of the announcements, events and action calls of a household of devices.
+    """
+    rand = random.Random(11)
+
+    devices = []
+    for didx in range(DEVICE_COUNT):
+        udn = "RINCON_%012X01400" % rand.getrandbits(48)
+        devices.append((udn, "192.168.1.%d" % (didx + 10)))
+
+    with UpnpTrafficRecorder(filename) as recorder:
+        for _ in range(ANNOUNCE_ROUNDS):
+            for udn, ipaddr in devices:
+                for target in ["upnp:rootdevice"] + SERVICE_TYPES:
+                    notify = "\r\n".join([
+                        "NOTIFY * HTTP/1.1",
+                        "HOST: 239.255.255.250:1900",
+                        "CACHE-CONTROL: max-age = 1800",
+                        "LOCATION: http://%s:1400/xml/device_description.xml" % ipaddr,
+                        "NT: %s" % target,
+                        "NTS: ssdp:alive",
+                        "SERVER: Linux UPnP/1.0 Sonos/70.3-35220 (ZPS23)",
+                        "USN: uuid:%s::%s" % (udn, target),
+                        "", ""
+                    ]).encode("utf-8")
+                    recorder.record_ssdp((ipaddr, 1900), notify)
+
+        for eidx in range(EVENTS_PER_DEVICE):
+            for udn, ipaddr in devices[:WATCHED_DEVICE_COUNT]:
+                headers = {
+                    "CONTENT-TYPE": 'text/xml; charset="utf-8"',
+                    "NT": "upnp:event",
+                    "NTS": "upnp:propchange",
+                    "SID": "uuid:%s_sub0000000%d" % (udn, eidx % 4),
+                    "SEQ": str(eidx)
+                }
+                body = (LAST_CHANGE_EVENT % (eidx % 100)).encode("utf-8")
+                recorder.record_gena((ipaddr, 1400), headers, body, path="/notify")
+
+        for cidx in range(SOAP_CALLS_PER_DEVICE):
+            for udn, ipaddr in devices[:WATCHED_DEVICE_COUNT]:
+                url = "http://%s:1400/MediaRenderer/RenderingControl/Control" % ipaddr
+                headers = {
+                    "SOAPAction": '"urn:schemas-upnp-org:service:RenderingControl:1#GetVolume"',
+                    "Content-Type": "text/xml"
+                }
+                response = (GET_VOLUME_RESPONSE % (cidx % 100)).encode("utf-8")
+                recorder.record_soap(url, headers, b"", 200, {"Content-Type": 'text/xml; charset="utf-8"'}, response)
+
+    return
+
+
+def benchmark_main():
+
+    speed = 0.0
+    async_engine = False
+
+    capture_filename = None
+    if len(sys.argv) > 1:
+        capture_filename = sys.argv[1]
+    if len(sys.argv) > 2:
+        speed = float(sys.argv[2])
+    if len(sys.argv) > 3:
+        async_engine = sys.argv[3] == "async"
+
+    tempdir = None
+    if capture_filename is None:
+        tempdir = tempfile.TemporaryDirectory()
+        capture_filename = os.path.join(tempdir.name, "traffic.jsonl")
+        synthesize_capture(capture_filename)
+
+    records = list(read_traffic_capture(capture_filename))
+
+    coordinator = UpnpCoordinator(ReplayLandscape(), workers=WORKER_COUNT)
+    device_registry = coordinator._device_registry # pylint: disable=protected-access
+
+    # Register the devices that announced themselves in the capture, the first of them are watched
+    lookup_keys = []
+    for record in records:
+        if record.kind == UpnpTrafficKind.SSDP:
+            msg = ssdp_parse(record.content)
+            usn = msg.get("USN", "") if msg is not None else ""
+            usn_dev, _, usn_cls = usn.partition("::")
+            usn_dev = usn_dev[len("uuid:"):]
+            if usn_cls == "upnp:rootdevice" and usn_dev not in lookup_keys:
+                lookup_keys.append(usn_dev)
+                if len(lookup_keys) <= WATCHED_DEVICE_COUNT:
+                    ipaddr = record.address[0]
+                    device = ReplayDevice(usn_dev, ipaddr, "00:0e:58:%02x:%02x:%02x" % (len(lookup_keys), 0, 1))
+                    device_registry.register("http://%s:1400/xml/device_description.xml" % ipaddr, device)
+
+    # Register the subscription ids of the events with the devices that sent them
+    for record in records:
+        if record.kind == UpnpTrafficKind.GENA and "SID" in record.headers:
+            device = coordinator.lookup_device_by_ip(record.address[0])
+            if device is not None:
+                coordinator.register_subscription_for_device(record.headers["SID"], device)
+
+    start = time.perf_counter()
+    for lidx in range(LOOKUP_ITERATIONS):
+        device_registry.find_by_substring(lookup_keys[lidx % len(lookup_keys)])
+    lookup_elapsed = time.perf_counter() - start
+
+    coordinator.start_monitoring([LOOPBACK_INTERFACE], async_engine=async_engine)
+
+    replayer = UpnpTrafficReplayer(records, speed=speed)
+    replay_stats = replayer.replay_to_coordinator(coordinator, LOOPBACK_INTERFACE)
+
+    # Give the workers time to drain the queue before the statistics are taken
+    expected = replay_stats["ssdp_sent"] + replay_stats["gena_sent"]
+    drain_end = time.perf_counter() + 5
+    while ReplayDevice.processed + coordinator.ssdp_notify_filtered < expected and time.perf_counter() < drain_end:
+        time.sleep(0.01)
+
+    processed = ReplayDevice.processed
+    filtered = coordinator.ssdp_notify_filtered
+    queue_stats = coordinator.work_queue_statistics
+    coordinator.shutdown_monitoring()
+
+    server = UpnpTrafficReplayServer(records)
+    server.start()
+
+    soap_records = [rec for rec in records if rec.kind == UpnpTrafficKind.SOAP]
+    start = time.perf_counter()
+    for record in soap_records:
+        path = record.path[record.path.find("/", len("http://")):]
+        resp = upnp_http_request("POST", server.base_url + path, headers=record.headers, data=record.content)
+        resp.content # pylint: disable=pointless-statement
+    soap_elapsed = time.perf_counter() - start
+
+    server_stats = server.statistics()
+    server.stop()
+
+    if tempdir is not None:
+        tempdir.cleanup()
+
+    print("Capture records: {}  Devices: {}  Watched: {}  Engine: {}".format(
+        len(records), len(lookup_keys), len(device_registry), "async" if async_engine else "threads"))
+    print("")
+    print("Replay:  {:9.0f} events/sec  ssdp={} gena={} failed={} lag_max={:.3f}s".format(
+        replay_stats["events_per_second"], replay_stats["ssdp_sent"], replay_stats["gena_sent"],
+        replay_stats["gena_failed"], replay_stats["lag_max"]))
+    print("Ingest:  processed={} filtered={} dropped={}".format(processed, filtered, queue_stats["dropped"]))
+    print("Queue:   wait_avg={:.1f}us wait_max={:.1f}us high_water={}".format(
+        queue_stats["wait_avg"] * 1e6, queue_stats["wait_max"] * 1e6, queue_stats["high_water"]))
+    print("GENA:    response_avg={:.1f}us response_max={:.1f}us".format(
+        replay_stats["gena_response_avg"] * 1e6, replay_stats["gena_response_max"] * 1e6))
+    print("Lookup:  {:.2f}us per device lookup".format(lookup_elapsed * 1e6 / LOOKUP_ITERATIONS))
+    if len(soap_records) > 0:
+        print("SOAP:    {:.1f}us per action call  answered={} unmatched={}".format(
+            soap_elapsed * 1e6 / len(soap_records), server_stats["answered"], server_stats["unmatched"]))
+
+    return
+
+
+if __name__ == "__main__":
+    benchmark_main()
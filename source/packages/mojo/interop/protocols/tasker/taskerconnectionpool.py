@@ -0,0 +1,355 @@
+"""
+.. module:: taskerconnectionpool
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the :class:`TaskerConnectionPool` class which keeps a small pool of persistent
+               RPyC connections to a :class:`TaskerService` endpoint.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+
+from typing import Any, Dict, Generator, List, Tuple
+
+import logging
+import threading
+import time
+import weakref
+
+from contextlib import contextmanager
+
+import rpyc
+
+DEFAULT_MAX_CONNECTIONS = 4
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+DEFAULT_KEEPALIVE_INTERVAL = 60
+DEFAULT_PING_TIMEOUT = 5
+
+KEEPALIVE_SWEEP_INTERVAL = 10
+
+logger = logging.getLogger()
+
+
+class TaskerConnectionPool:
+    """
+        The :class:`TaskerConnectionPool` keeps persistent RPyC connections to a tasker service endpoint so the
+        calls made by a :class:`TaskerNode` do not pay for a TCP connect and an RPyC handshake every time.
+
+        * A connection is used by one thread at a time, threads check out an idle connection or open a new
+          one up to the maximum number of connections and wait for a connection to be checked in after that.
+        * A connection that has been idle longer than the health check interval is pinged before it is handed
+          out and is replaced if it does not answer.
+        * A connection that is closed or that timed out during a call is dropped when it is checked in, the next
+          checkout opens a new connection.
+        * Idle connections are pinged by a shared keepalive thread so they are not dropped by the service or
+          by the network while a tasking is running.
+    """
+
+    def __init__(self, ipaddr: str, port: int, protocol_config: Dict[str, Any], max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL, keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL):
+        """
+            Creates a connection pool for a tasker service endpoint, connections are opened as they are needed.
+
+            :param ipaddr: The IP address of the tasker service.
+            :param port: The port of the tasker service.
+            :param protocol_config: The RPyC protocol configuration for the connections.
+            :param max_connections: The maximum number of connections to have open to the service.
+            :param health_check_interval: The idle time after which a connection is pinged before it is used.
+            :param keepalive_interval: The idle time after which the keepalive thread pings a connection.
+        """
+        self._ipaddr = ipaddr
+        self._port = port
+        self._protocol_config = protocol_config
+        self._max_connections = max_connections
+        self._health_check_interval = health_check_interval
+        self._keepalive_interval = keepalive_interval
+
+        self._pool_lock = threading.Lock()
+        self._pool_available = threading.Condition(self._pool_lock)
+
+        # ========================= Pool Lock Variables =========================
+        # These variables are protected by the pool lock and are prefixed with
+        # _pl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._pl_idle: List[Tuple[rpyc.Connection, float]] = []
+        self._pl_open_count = 0
+        self._pl_closed = False
+
+        self._pl_connects = 0
+        self._pl_reconnects = 0
+        self._pl_dropped = 0
+        self._pl_waits = 0
+
+        return
+
+    @property
+    def ipaddr(self) -> str:
+        return self._ipaddr
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    def close(self):
+        """
+            Closes the idle connections of the pool, connections that are checked out are closed when they
+            are checked in.
+        """
+        idle = []
+
+        self._pool_lock.acquire()
+        try:
+            self._pl_closed = True
+
+            idle = [conn for conn, _ in self._pl_idle]
+            self._pl_idle.clear()
+            self._pl_open_count -= len(idle)
+
+            self._pool_available.notify_all()
+        finally:
+            self._pool_lock.release()
+
+        for conn in idle:
+            self._close_connection(conn)
+
+        return
+
+    @contextmanager
+    def connection(self) -> Generator[rpyc.Connection, None, None]:
+        """
+            Checks out a connection for the duration of a with block.
+
+            .. code:: python
+
+                with pool.connection() as client:
+                    status = client.root.get_tasking_status(session_id=session_id, tasking_id=tasking_id)
+        """
+        conn = self._checkout()
+
+        healthy = True
+        try:
+            yield conn
+        except TimeoutError:
+            # A reply to a request that timed out can still arrive, don't reuse the connection
+            healthy = False
+            raise
+        finally:
+            self._checkin(conn, healthy)
+
+        return
+
+    def create_connection(self) -> rpyc.Connection:
+        """
+            Opens a dedicated connection to the service that is not managed by the pool.  A dedicated connection
+            is used when the connection has to outlive a call, for example when the service calls back into the
+            caller over the connection.
+        """
+        conn = rpyc.connect(self._ipaddr, self._port, keepalive=True, config=self._protocol_config)
+        return conn
+
+    def keepalive(self):
+        """
+            Pings the idle connections that have not been used within the keepalive interval and drops the
+            ones that do not answer.  This is called by the keepalive thread.
+        """
+        expired = []
+
+        now = time.monotonic()
+
+        self._pool_lock.acquire()
+        try:
+            remaining = []
+            for conn, last_used in self._pl_idle:
+                if now - last_used >= self._keepalive_interval:
+                    expired.append(conn)
+                else:
+                    remaining.append((conn, last_used))
+            self._pl_idle = remaining
+        finally:
+            self._pool_lock.release()
+
+        # Ping outside of the lock and give the connections back through the normal checkin path
+        for conn in expired:
+            healthy = self._ping(conn)
+            self._checkin(conn, healthy)
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the connection counts of the pool.
+        """
+        stats = None
+
+        self._pool_lock.acquire()
+        try:
+            stats = {
+                "open": self._pl_open_count,
+                "idle": len(self._pl_idle),
+                "connects": self._pl_connects,
+                "reconnects": self._pl_reconnects,
+                "dropped": self._pl_dropped,
+                "waits": self._pl_waits
+            }
+        finally:
+            self._pool_lock.release()
+
+        return stats
+
+    def _checkin(self, conn: rpyc.Connection, healthy: bool):
+        """
+            Returns a connection to the pool or drops it if it is no longer usable.
+        """
+        drop = True
+
+        self._pool_lock.acquire()
+        try:
+            if healthy and not conn.closed and not self._pl_closed:
+                self._pl_idle.append((conn, time.monotonic()))
+                drop = False
+            else:
+                self._pl_open_count -= 1
+                if not self._pl_closed:
+                    self._pl_dropped += 1
+
+            self._pool_available.notify()
+        finally:
+            self._pool_lock.release()
+
+        if drop:
+            self._close_connection(conn)
+
+        return
+
+    def _checkout(self) -> rpyc.Connection:
+        """
+            Gets an idle connection from the pool or opens a new one.
+        """
+        conn = None
+        last_used = None
+
+        self._pool_lock.acquire()
+        try:
+            while True:
+                if self._pl_closed:
+                    errmsg = "The connection pool for {}:{} has been closed.".format(self._ipaddr, self._port)
+                    raise ConnectionError(errmsg)
+
+                if len(self._pl_idle) > 0:
+                    # Use the most recently used connection so the others can age out
+                    conn, last_used = self._pl_idle.pop()
+                    break
+
+                if self._pl_open_count < self._max_connections:
+                    # Reserve the slot for the connection that will be opened outside of the lock
+                    self._pl_open_count += 1
+                    break
+
+                self._pl_waits += 1
+                self._pool_available.wait()
+        finally:
+            self._pool_lock.release()
+
+        if conn is not None:
+            if conn.closed or (time.monotonic() - last_used >= self._health_check_interval and not self._ping(conn)):
+                self._close_connection(conn)
+                conn = None
+
+                self._pool_lock.acquire()
+                try:
+                    self._pl_reconnects += 1
+                finally:
+                    self._pool_lock.release()
+
+        if conn is None:
+            try:
+                conn = self.create_connection()
+            except:
+                self._pool_lock.acquire()
+                try:
+                    self._pl_open_count -= 1
+                    self._pool_available.notify()
+                finally:
+                    self._pool_lock.release()
+                raise
+
+            self._pool_lock.acquire()
+            try:
+                self._pl_connects += 1
+            finally:
+                self._pool_lock.release()
+
+            register_for_keepalive(self)
+
+        return conn
+
+    def _close_connection(self, conn: rpyc.Connection):
+        try:
+            conn.close()
+        except Exception: # pylint: disable=broad-except
+            pass
+        return
+
+    def _ping(self, conn: rpyc.Connection) -> bool:
+        """
+            Checks that the service is answering on a connection.
+        """
+        healthy = False
+        try:
+            conn.ping(timeout=DEFAULT_PING_TIMEOUT)
+            healthy = True
+        except Exception: # pylint: disable=broad-except
+            logger.debug("Tasker connection to {}:{} failed its health check.".format(self._ipaddr, self._port))
+        return healthy
+
+
+# The keepalive thread is shared by the connection pools of all the tasker nodes, the pools are
+# held by weak reference so a pool does not outlive the node that owns it.
+keepalive_lock = threading.Lock()
+keepalive_pools = weakref.WeakSet()
+keepalive_thread = None
+
+
+def register_for_keepalive(pool: TaskerConnectionPool):
+    """
+        Adds a connection pool to the pools that are swept by the keepalive thread and starts the thread if
+        it is not running.
+    """
+    global keepalive_thread
+
+    keepalive_lock.acquire()
+    try:
+        keepalive_pools.add(pool)
+
+        if keepalive_thread is None:
+            keepalive_thread = threading.Thread(target=_keepalive_thread_entry, name="tasker-keepalive", daemon=True)
+            keepalive_thread.start()
+    finally:
+        keepalive_lock.release()
+
+    return
+
+
+def _keepalive_thread_entry():
+
+    while True:
+        time.sleep(KEEPALIVE_SWEEP_INTERVAL)
+
+        keepalive_lock.acquire()
+        try:
+            pools = list(keepalive_pools)
+        finally:
+            keepalive_lock.release()
+
+        for pool in pools:
+            try:
+                pool.keepalive()
+            except Exception: # pylint: disable=broad-except
+                logger.exception("Error while sweeping tasker connections.")
+
+    return
@@ -13,13 +13,14 @@ __credits__ = []
 
 
 
-from typing import List, Optional, Type, Union
+from typing import Generator, List, Optional, Tuple, Type, Union
 
 
 import logging
 import os
-import time
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
 
 from datetime import datetime, timedelta
 
@@ -30,9 +31,9 @@ from mojo.results.model.progressdelivery import SummaryProgressDelivery
 
 
 from mojo.interop.protocols.tasker.taskeraspects import TaskerAspects, DEFAULT_TASKER_ASPECTS
-from mojo.interop.protocols.tasker.tasking import Tasking, TaskingIdentity
+from mojo.interop.protocols.tasker.tasking import Tasking, TaskingIdentity, TaskingSpec
 from mojo.interop.protocols.tasker.taskernode import TaskerNode, TaskerClientNode
-from mojo.interop.protocols.tasker.taskingresultpromise import TaskingResultPromise
+from mojo.interop.protocols.tasker.taskingresultpromise import TaskingResultPromise, as_completed, wait_any
 from mojo.interop.protocols.tasker.taskerservice import TaskerService
 from mojo.interop.protocols.tasker.taskerservermanager import TaskerServerManager, spawn_tasking_server_process
 from mojo.interop.protocols.tasker.taskingevent import TaskingEvent
@@ -73,21 +74,11 @@ class TaskerController:
         return self._tasker_nodes
 
 
-    def execute_tasking_on_all_nodes(self, *, tasking: Union[TaskingIdentity, Type[Tasking]], parent_id: str = None,
+    def execute_tasking_on_all_nodes(self, *, tasking: Union[TaskingIdentity, Type[Tasking]], ncount: int = 1, parent_id: str = None,
                                      summary_progress: Optional[SummaryProgressDelivery] = None, aspects: Optional[TaskerAspects] = None, **kwargs) -> List[TaskingResultPromise]:
 
-        if aspects is None:
-            aspects = self._aspects
-
-        promise_list = []
-
-        if not isinstance(tasking, TaskingIdentity):
-            tasking = tasking.get_identity()
-        module_name, tasking_name = tasking.as_tuple()
-
-        for node in self._tasker_nodes:
-            promise = node.execute_tasking(module_name=module_name, tasking_name=tasking_name, parent_id=parent_id, summary_progress=summary_progress, aspects=aspects, **kwargs)
-            promise_list.append(promise)
+        promise_list = self.execute_tasking_on_node_list(self._tasker_nodes, tasking=tasking, ncount=ncount, parent_id=parent_id,
+                                                         summary_progress=summary_progress, aspects=aspects, **kwargs)
 
         return promise_list
 
@@ -109,21 +100,61 @@ class TaskerController:
         return promise
 
 
-    def execute_tasking_on_node_list(self, node_list: List[TaskerNode], *, tasking: Union[TaskingIdentity, Type[Tasking]], parent_id: str = None,
-                                     summary_progress: Optional[SummaryProgressDelivery] = None, aspects: Optional[TaskerAspects] = None, **kwargs) -> List[TaskingResultPromise]:
+    def execute_tasking_on_node_list(self, node_list: List[TaskerNode], *, tasking: Union[TaskingIdentity, Type[Tasking]], ncount: int = 1,
+                                     parent_id: str = None, summary_progress: Optional[SummaryProgressDelivery] = None,
+                                     aspects: Optional[TaskerAspects] = None, **kwargs) -> List[TaskingResultPromise]:
+        """
+            Starts `ncount` instances of a tasking on each of the nodes in the node list.  The taskings for a node are
+            submitted as one batch and the batches are submitted to the nodes concurrently.
+        """
+
+        if not isinstance(tasking, TaskingIdentity):
+            tasking = tasking.get_identity()
+        module_name, tasking_name = tasking.as_tuple()
+
+        node_specs = []
+        for node in node_list:
+            specs = [
+                TaskingSpec(module_name=module_name, tasking_name=tasking_name, parent_id=parent_id, kwparams=kwargs)
+                for _ in range(ncount)
+            ]
+            node_specs.append((node, specs))
+
+        promise_list = self.execute_taskings_on_nodes(node_specs, summary_progress=summary_progress, aspects=aspects)
+
+        return promise_list
+
+
+    def execute_taskings_on_nodes(self, node_specs: List[Tuple[TaskerNode, List[TaskingSpec]]], *,
+                                  summary_progress: Optional[SummaryProgressDelivery] = None,
+                                  aspects: Optional[TaskerAspects] = None) -> List[TaskingResultPromise]:
+        """
+            Submits a batch of taskings to each node, the batches are submitted to the nodes concurrently so starting
+            the taskings costs about one round trip to the slowest node.
+
+            :param node_specs: A list of the nodes along with the specs of the taskings to start on each node.
+            :param summary_progress: The summary progress delivery for the taskings.
+            :param aspects: The aspects of the taskings.
+
+            :returns: The promises of the taskings, grouped by node in the order of the node specs.
+        """
 
         if aspects is None:
             aspects = self._aspects
 
         promise_list = []
 
-        if not isinstance(tasking, TaskingIdentity):
-            tasking = tasking.get_identity()
-        module_name, tasking_name = tasking.as_tuple()
+        if len(node_specs) > 0:
+            with ThreadPoolExecutor(max_workers=len(node_specs), thread_name_prefix="tasker-submit") as submit_executor:
+                futures = [
+                    submit_executor.submit(node.execute_taskings, specs=specs, summary_progress=summary_progress, aspects=aspects)
+                    for node, specs in node_specs
+                ]
 
-        for node in node_list:
-            promise = node.execute_tasking(module_name=module_name, tasking_name=tasking_name, parent_id=parent_id, summary_progress=summary_progress, aspects=aspects, **kwargs)
-            promise_list.append(promise)
+            # The executor waits for all of the submissions so a failure on one node does not abandon
+            # the submissions to the others, the first failure is raised by its result.
+            for fut in futures:
+                promise_list.extend(fut.result())
 
         return promise_list
 
@@ -151,6 +182,41 @@ class TaskerController:
         raise NotOverloadedError("The 'stop_tasker_network' method must be overloaded.")
 
 
+    def as_completed(self, promises: List[TaskingResultPromise], aspects: Optional[TaskerAspects] = None) -> Generator[TaskingResultPromise, None, None]:
+        """
+            Yields the promises of a group of taskings as the taskings complete, taskings whose service pushes
+            notifications are yielded as soon as their completion arrives.
+
+            :raises: :class:`TimeoutError` if the taskings do not all complete within the completion timeout.
+        """
+
+        if aspects is None:
+            aspects = self._aspects
+
+        yield from as_completed(promises, timeout=aspects.completion_timeout, interval=aspects.completion_interval)
+
+        return
+
+
+    def wait_any(self, promises: List[TaskingResultPromise],
+                 aspects: Optional[TaskerAspects] = None) -> Tuple[List[TaskingResultPromise], List[TaskingResultPromise]]:
+        """
+            Waits for any tasking of a group of taskings to complete.
+
+            :returns: A tuple with the list of the promises whose taskings have completed and the list of the
+                      promises whose taskings are still pending.
+
+            :raises: :class:`TimeoutError` if none of the taskings complete within the completion timeout.
+        """
+
+        if aspects is None:
+            aspects = self._aspects
+
+        done, pending = wait_any(promises, timeout=aspects.completion_timeout, interval=aspects.completion_interval)
+
+        return done, pending
+
+
     def wait_for_all_to_event(self, event_name: str, promises: List[TaskingResultPromise],
                             aspects: Optional[TaskerAspects] = None) -> List[TaskingEvent]:
         """
@@ -171,50 +237,61 @@ class TaskerController:
         start_time = now_time
         end_time = start_time + timedelta(seconds=timeout)
 
-        wait_on = [ np for np in promises ]
-        not_ready = []
+        waiter = threading.Event()
+        for np in promises:
+            np.add_waiter(waiter)
+
+        try:
+            wait_on = [ np for np in promises ]
+            not_ready = []
         
-        while True:
-            events_found = []
-
-            # Loop through our promises and check the status of the results
-            while len(wait_on) > 0:
-                np = wait_on.pop()
-                events = np.get_events()
-
-                has_fired = False
-                ev: TaskingEvent
-                for ev in events:
-                    if ev.event_name == event_name:
-                        events_found.append(ev)
-                        has_fired = True
-                        break
+            while True:
+                events_found = []
+
+                # Loop through our promises and check the status of the results
+                while len(wait_on) > 0:
+                    np = wait_on.pop()
+                    events = np.get_events()
+
+                    has_fired = False
+                    ev: TaskingEvent
+                    for ev in events:
+                        if ev.event_name == event_name:
+                            events_found.append(ev)
+                            has_fired = True
+                            break
                 
-                if not has_fired:
-                    not_ready.append(np)
-
-            if len(not_ready) == 0:
-                # We are done, every tasking has fired the specified event
-                break
-            else:
-                # Reset our wait lists so we can circle back
-                # after a short word from our sponsers, even
-                # though some of promises may have completed
-                # we still want to visit them because it will
-                # update the last session activity on the tasker
-                # server
-                wait_on = [p for p in promises]
-                not_ready = []
-
-            now_time = datetime.now()
-            if now_time > end_time:
-                err_msg_lines = [
-                    f"Timeout: Waiting for taskings to fire event='{event_name}'."
-                ]
-                errmsg = os.linesep.join(err_msg_lines)
-                raise TimeoutError(errmsg)
+                    if not has_fired:
+                        not_ready.append(np)
+
+                if len(not_ready) == 0:
+                    # We are done, every tasking has fired the specified event
+                    break
+                else:
+                    # Reset our wait lists so we can circle back
+                    # after a short word from our sponsers, even
+                    # though some of promises may have completed
+                    # we still want to visit them because it will
+                    # update the last session activity on the tasker
+                    # server
+                    wait_on = [p for p in promises]
+                    not_ready = []
+
+                now_time = datetime.now()
+                if now_time > end_time:
+                    err_msg_lines = [
+                        f"Timeout: Waiting for taskings to fire event='{event_name}'."
+                    ]
+                    errmsg = os.linesep.join(err_msg_lines)
+                    raise TimeoutError(errmsg)
 
-            time.sleep(interval)
+                # Wake early when a tasking pushes an event or completes
+                waiter.wait(interval)
+                waiter.clear()
+
+        finally:
+            for np in promises:
+                np.remove_waiter(waiter)
 
         return events_found
 
@@ -239,61 +316,72 @@ class TaskerController:
         start_time = now_time
         end_time = start_time + timedelta(seconds=timeout)
 
-        wait_on = [ np for np in promises ]
-        ready = []
-        
-        while True:
-            events_found = []
-
-            # Loop through our promises and check the status of the results
-            while len(wait_on) > 0:
-                np = wait_on.pop()
+        waiter = threading.Event()
+        for np in promises:
+            np.add_waiter(waiter)
 
-                events = np.get_events()
-                completed = np.is_task_complete()
-                if completed and len(events) == 0:
+        try:
+            wait_on = [ np for np in promises ]
+            ready = []
+        
+            while True:
+                events_found = []
+
+                # Loop through our promises and check the status of the results
+                while len(wait_on) > 0:
+                    np = wait_on.pop()
+
+                    events = np.get_events()
+                    completed = np.is_task_complete(verify_interval=interval)
+                    if completed and len(events) == 0:
+                        err_msg_lines = [
+                            f"Task is complete but we are still waiting on event name={event_name}. A task likely had an error."
+                            "TASK RESULT:"
+                        ]
+
+                        result = np.get_result()
+                        result_fmt_lines = result.format_result()
+                        result_fmt_lines = indent_lines_list(result_fmt_lines, 1)
+                    
+                        err_msg_lines.extend(result_fmt_lines)
+
+                        err_msg = os.linesep.join(err_msg_lines)
+                        raise RuntimeError(err_msg)
+
+                    ev: TaskingEvent
+                    for ev in events:
+                        if ev.event_name == event_name:
+                            events_found.append(ev)
+                            ready.append(np)
+                            break
+
+                if len(ready) > 0:
+                    # We are done, we are only waiting for any node to report
+                    break
+                else:
+                    # Reset our wait lists so we can circle back
+                    # after a short word from our sponsers, even
+                    # though some of promises may have completed
+                    # we still want to visit them because it will
+                    # update the last session activity on the tasker
+                    # server
+                    wait_on = [p for p in promises]
+
+                now_time = datetime.now()
+                if now_time > end_time:
                     err_msg_lines = [
-                        f"Task is complete but we are still waiting on event name={event_name}. A task likely had an error."
-                        "TASK RESULT:"
+                        f"Timeout: Waiting for taskings to fire event='{event_name}'."
                     ]
+                    errmsg = os.linesep.join(err_msg_lines)
+                    raise TimeoutError(errmsg)
 
-                    result = np.get_result()
-                    result_fmt_lines = result.format_result()
-                    result_fmt_lines = indent_lines_list(result_fmt_lines, 1)
-                    
-                    err_msg_lines.extend(result_fmt_lines)
-
-                    err_msg = os.linesep.join(err_msg_lines)
-                    raise RuntimeError(err_msg)
-
-                ev: TaskingEvent
-                for ev in events:
-                    if ev.event_name == event_name:
-                        events_found.append(ev)
-                        ready.append(np)
-                        break
-
-            if len(ready) > 0:
-                # We are done, we are only waiting for any node to report
-                break
-            else:
-                # Reset our wait lists so we can circle back
-                # after a short word from our sponsers, even
-                # though some of promises may have completed
-                # we still want to visit them because it will
-                # update the last session activity on the tasker
-                # server
-                wait_on = [p for p in promises]
-
-            now_time = datetime.now()
-            if now_time > end_time:
-                err_msg_lines = [
-                    f"Timeout: Waiting for taskings to fire event='{event_name}'."
-                ]
-                errmsg = os.linesep.join(err_msg_lines)
-                raise TimeoutError(errmsg)
+                # Wake early when a tasking pushes an event or completes
+                waiter.wait(interval)
+                waiter.clear()
 
-            time.sleep(interval)
+        finally:
+            for np in promises:
+                np.remove_waiter(waiter)
 
         return events_found
 
@@ -314,45 +402,17 @@ class TaskerController:
         timeout = aspects.completion_timeout
         interval = aspects.completion_interval
 
-        now_time = datetime.now()
-        start_time = now_time
-        end_time = start_time + timedelta(seconds=timeout)
-        
-        wait_on = [ np for np in promises ]
-        not_ready = []
-
-        while True:
-
-            # Loop through our promises and check the status of the results
-            while len(wait_on) > 0:
-                np = wait_on.pop()
-                completed = np.is_task_complete()
-                if not completed:
-                    not_ready.append(np)
-
-            if len(not_ready) == 0:
-                # We are done, every tasking is completed
-                break
-            else:
-                # Reset our wait lists so we can circle back
-                # after a short word from our sponsers, even
-                # though some of promises may have completed
-                # we still want to visit them because it will
-                # update the last session activity on the tasker
-                # server
-                wait_on = [p for p in promises]
-                not_ready = []
-
-            now_time = datetime.now()
-            if now_time > end_time:
-                err_msg_lines = [
-                    "Timeout: Waiting for taskings to complete."
-                ]
-                errmsg = os.linesep.join(err_msg_lines)
-                raise TimeoutError(errmsg)
-
-            time.sleep(interval)
-
+        # Taskings that push their completion are collected as soon as they complete, the others
+        # are checked with their service every interval.
+        try:
+            for _ in as_completed(promises, timeout=timeout, interval=interval):
+                pass
+        except TimeoutError:
+            err_msg_lines = [
+                "Timeout: Waiting for taskings to complete."
+            ]
+            errmsg = os.linesep.join(err_msg_lines)
+            raise TimeoutError(errmsg) from None
 
         # If we made it here, we didn't timeout, that means we should
         # have a result from each tasking in our promise objects
@@ -373,7 +433,8 @@ class ProcessTaskerController(TaskerController):
         self._svr_proxies: List[TaskerService] = []
         return
 
-    def start_tasker_network(self, node_count=5, output_directory: Optional[str] = None, log_level: Optional[int] = logging.DEBUG):
+    def start_tasker_network(self, node_count=5, output_directory: Optional[str] = None, log_level: Optional[int] = logging.DEBUG,
+                             preload_modules: Optional[List[str]] = None):
         """
         """
 
@@ -398,7 +459,8 @@ class ProcessTaskerController(TaskerController):
             
             wref = str(nindex)
 
-            node.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=self._aspects)
+            node.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=self._aspects,
+                              preload_modules=preload_modules)
 
             self._tasker_nodes.append(node)
 
@@ -408,6 +470,7 @@ class ProcessTaskerController(TaskerController):
 
         for node in self._tasker_nodes:
             node.session_close()
+            node.close()
 
         return
 
@@ -419,7 +482,7 @@ class ClientTaskerController(TaskerController):
         return
 
     def start_tasker_network(self, clients: List[ClientBase], output_directory: Optional[str] = None,
-                             log_level: Optional[int] = logging.DEBUG):
+                             log_level: Optional[int] = logging.DEBUG, preload_modules: Optional[List[str]] = None):
         """
         """
 
@@ -436,7 +499,8 @@ class ClientTaskerController(TaskerController):
             worker = cl.ipaddr
             wref = str(cidx)
 
-            node.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=self._aspects)
+            node.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=self._aspects,
+                              preload_modules=preload_modules)
             
             self._tasker_nodes.append(node)
 
@@ -446,6 +510,7 @@ class ClientTaskerController(TaskerController):
 
         for node in self._tasker_nodes:
             node.session_close()
+            node.close()
 
         return
 
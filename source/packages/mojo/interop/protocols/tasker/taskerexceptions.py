@@ -3,4 +3,11 @@ class TaskingGroupAssertionError(AssertionError):
     """
         Represents an AssertionError that is raised in response to the validation of a
         collection of taskings
-    """
\ No newline at end of file
+    """
+
+
+class TaskingLimitError(RuntimeError):
+    """
+        Represents an error that is raised when a tasking cannot be started because the session
+        it was submitted to has reached one of its resource limits.
+    """
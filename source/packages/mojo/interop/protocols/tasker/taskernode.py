@@ -25,12 +25,19 @@ from mojo.results.model.taskingresult import TaskingResult
 from mojo.results.model.progressinfo import ProgressInfo
 from mojo.results.model.progressdelivery import SummaryProgressDelivery
 
-from mojo.interop.protocols.tasker.taskingresultpromise import TaskingResultPromise
+from mojo.interop.protocols.tasker.taskingresultpromise import (
+    SharedTaskingConnection,
+    TaskingResultPromise,
+    TaskingNotificationReceiver,
+    TaskingNotificationRouter
+)
+from mojo.interop.protocols.tasker.taskerconnectionpool import TaskerConnectionPool, DEFAULT_MAX_CONNECTIONS
 from mojo.interop.protocols.tasker.taskeraspects import (
     TaskerAspects,
     DEFAULT_TASKER_ASPECTS
 )
 from mojo.interop.protocols.tasker.taskingevent import TaskingEvent
+from mojo.interop.protocols.tasker.tasking import TaskingSpec
 
 if TYPE_CHECKING:
     from mojo.landscaping.client.clientbase import ClientBase
@@ -51,13 +58,27 @@ class TaskerNode:
     """
 
     def __init__(self, ipaddr: str, port: int, summary_progress: Optional[SummaryProgressDelivery] = None,
-                 protocol_config: Optional[Dict[str, Any]] = TASKER_PROTOCOL_CONFIG, aspect: TaskerAspects=DEFAULT_TASKER_ASPECTS):
+                 protocol_config: Optional[Dict[str, Any]] = TASKER_PROTOCOL_CONFIG, aspect: TaskerAspects=DEFAULT_TASKER_ASPECTS,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS):
         self._ipaddr = ipaddr
         self._port = port
         self._summary_progress = summary_progress
         self._aspects = aspect
         self._session_id = None
-        self._protocol_config = protocol_config
+
+        # Determined the first time a tasking is executed on the node
+        self._push_supported = None
+        self._batch_supported = None
+
+        # Copy the protocol config so the timeout from the aspects of this node does not
+        # change the config shared by the other nodes.
+        self._protocol_config = dict(protocol_config)
+        if self._aspects is not None:
+            self._protocol_config["sync_request_timeout"] = self._aspects.sync_request_timeout
+
+        # The calls to the node share a small pool of persistent connections instead of
+        # connecting to the service for every call.
+        self._connection_pool = TaskerConnectionPool(ipaddr, port, self._protocol_config, max_connections=max_connections)
         return
 
     @property
@@ -72,15 +93,15 @@ class TaskerNode:
     def session_id(self):
         return self._session_id
 
+    @property
+    def connection_pool(self) -> TaskerConnectionPool:
+        return self._connection_pool
+
     def archive_folder(self, *, folder_to_archive: str, dest_folder: str, archive_name: str, compression_level: int = 7) -> str:
         
-        client = self._create_connection()
-
-        try:
+        with self._connection_pool.connection() as client:
             rmt_archive_fullpath = client.root.archive_folder(folder_to_archive=folder_to_archive, dest_folder=dest_folder,
                                          archive_name=archive_name, compression_level=compression_level)
-        finally:
-            client.close()
         
         return rmt_archive_fullpath
 
@@ -95,18 +116,13 @@ class TaskerNode:
 
             :returns: Returns the response from the remote method.
         """
-        client = self._create_connection()
-
-        try:
+        with self._connection_pool.connection() as client:
             pkl_args = pickle.dumps(args)
             pkl_kwargs = pickle.dumps(kwargs)
 
             pkl_rtnval = client.root.call_tasking_method(session_id=self._session_id, tasking_id=tasking_id, method_name=method_name, pkl_args=pkl_args, pkl_kwargs=pkl_kwargs)
             rtnval = pickle.loads(pkl_rtnval)
 
-        finally:
-            client.close()
-
         return rtnval
 
     def cancel_tasking(self, *, tasking_id: str):
@@ -115,100 +131,78 @@ class TaskerNode:
 
             :param tasking_id: The id of the tasking to cancel.
         """
-        client = self._create_connection()
-
-        try:
+        with self._connection_pool.connection() as client:
             client.root.cancel_tasking(session_id=self._session_id, tasking_id=tasking_id)
-        finally:
-            client.close()
 
         return
 
-    def file_exists(self, *, filename: str) -> bool:
+    def close(self):
+        """
+            Closes the persistent connections to the tasker service.
+        """
+        self._connection_pool.close()
+        return
 
-        client = self._create_connection()
+    def file_exists(self, *, filename: str) -> bool:
 
-        try:
+        exists = False
+        with self._connection_pool.connection() as client:
             exists = client.root.file_exists(filename=filename)
-        finally:
-            client.close()
         
         return exists
     
     def folder_exists(self, *, folder: str) -> bool:
 
-        client = self._create_connection()
-
-        try:
+        exists = False
+        with self._connection_pool.connection() as client:
             exists = client.root.folder_exists(folder=folder)
-        finally:
-            client.close()
         
         return exists
 
     def get_tasking_events(self, *, tasking_id: str) -> List[dict]:
 
-        client = self._create_connection()
-
         tevents = []
-        try:
+        with self._connection_pool.connection() as client:
             tevents_str = client.root.get_tasking_events(session_id=self._session_id, tasking_id=tasking_id)
             tevents = pickle.loads(tevents_str)
 
             if tevents is not None and len(tevents) > 0:
                 tevents = [TaskingEvent.from_dict(tedata) for tedata in tevents]
-        finally:
-            client.close()
         
         return tevents
 
     def get_tasking_progress(self, *, tasking_id: str) -> ProgressInfo:
 
-        client = self._create_connection()
-
         tprog = None
-        try:
+        with self._connection_pool.connection() as client:
             tprog_str = client.root.get_tasking_progress(session_id=self._session_id, tasking_id=tasking_id)
             if tprog_str is not None:
                 tprog = pickle.loads(tprog_str)
-        finally:
-            client.close()
         
         return tprog
 
     def get_tasking_status(self, *, tasking_id: str) -> str:
 
-        client = self._create_connection()
-
         tstatus = None
-        try:
+        with self._connection_pool.connection() as client:
             tstatus = client.root.get_tasking_status(session_id=self._session_id, tasking_id=tasking_id)
-        finally:
-            client.close()
         
         return tstatus
     
     def get_tasking_result(self, *, tasking_id: str) -> TaskingResult:
 
-        client = self._create_connection()
-
         tresult = None
-        try:
+        with self._connection_pool.connection() as client:
             tresult_str = client.root.get_tasking_result(session_id=self._session_id, tasking_id=tasking_id)
             tresult = pickle.loads(tresult_str)
-        finally:
-            client.close()
         
         return tresult
 
     def has_completed_and_result_ready(self, *, tasking_id: str) -> bool:
 
-        client = self._create_connection()
-
-        try:
+        complete_and_ready = False
+        with self._connection_pool.connection() as client:
             complete_and_ready = client.root.has_completed_and_result_ready(session_id=self._session_id, tasking_id=tasking_id)
-        finally:
-            client.close()
         
         return complete_and_ready
 
@@ -228,75 +222,177 @@ class TaskerNode:
         if summary_progress is None:
             summary_progress = self._summary_progress
 
-        taskref_info = client.root.execute_tasking(session_id=self._session_id, worker=self._ipaddr,
-                                                   module_name=module_name, tasking_name=tasking_name,
-                                                   aspects=aspects, **kwargs)
+        # The service pushes the progress, events and completion of the tasking back over this
+        # connection, the responder thread serves the notifications.
+        receiver = TaskingNotificationReceiver()
+
+        if self._push_supported is None:
+            # Services from before notifications were added do not have the method
+            try:
+                self._push_supported = client.root.supports_notifications()
+            except AttributeError:
+                self._push_supported = False
+
+        if self._push_supported:
+            taskref_info = client.root.execute_tasking(session_id=self._session_id, worker=self._ipaddr,
+                                                       module_name=module_name, tasking_name=tasking_name,
+                                                       aspects=aspects, notify_callback=receiver.notify, **kwargs)
+            receiver.attach(client)
+        else:
+            # The service does not push notifications, the promise will poll the service.
+            taskref_info = client.root.execute_tasking(session_id=self._session_id, worker=self._ipaddr,
+                                                       module_name=module_name, tasking_name=tasking_name,
+                                                       aspects=aspects, **kwargs)
 
         promise = TaskingResultPromise(client, responder, taskref_info["module_name"], taskref_info["tasking_id"], taskref_info["task_name"],
-                                        taskref_info["log_dir"], self._session_id, self)
+                                        taskref_info["log_dir"], self._session_id, self, receiver=receiver)
 
         return promise
 
-    def session_close(self):
+    def execute_taskings(self, *, specs: List[TaskingSpec], summary_progress: Optional[SummaryProgressDelivery] = None,
+                         aspects: Optional[TaskerAspects]=None) -> List[TaskingResultPromise]:
+        """
+            Starts a batch of taskings on the node with a single call to the tasker service.  The taskings of the
+            batch share one connection that the service pushes their notifications over.
 
-        client = self._create_connection()
+            :param specs: The specs of the taskings to start.
+            :param summary_progress: The summary progress delivery for the taskings.
+            :param aspects: The aspects of the taskings.
+
+            :returns: The promises of the taskings in the order of the specs.
+        """
+
+        if aspects is None:
+            aspects = self._aspects
+
+        if summary_progress is None:
+            summary_progress = self._summary_progress
+
+        if self._batch_supported is None:
+            # Services from before batches were added do not have the method, this is checked
+            # before the batch is submitted so an error raised by the service is never mistaken
+            # for a missing method and the taskings are never started twice.
+            with self._connection_pool.connection() as client:
+                try:
+                    self._batch_supported = client.root.supports_batches()
+                except AttributeError:
+                    self._batch_supported = False
+
+        promises = []
+
+        if not self._batch_supported:
+            # Start the taskings one at a time
+            for spec in specs:
+                promise = self.execute_tasking(module_name=spec.module_name, tasking_name=spec.tasking_name, parent_id=spec.parent_id,
+                                               summary_progress=summary_progress, aspects=aspects, **spec.kwparams)
+                promises.append(promise)
+        else:
+            # The connection is not closed here, the service pushes the notifications of the taskings
+            # over it so it is closed by the shared connection once the last promise of the batch is gone.
+            client = self._create_connection()
+
+            responder = rpyc.BgServingThread(client)
+
+            shared_connection = SharedTaskingConnection(client, responder)
+
+            pkl_aspects = pickle.dumps(aspects.as_dict())
+            pkl_specs = pickle.dumps([spec.as_dict() for spec in specs])
+
+            if self._push_supported is None:
+                # Services from before notifications were added do not have the method
+                try:
+                    self._push_supported = client.root.supports_notifications()
+                except AttributeError:
+                    self._push_supported = False
+
+            router = None
+            if self._push_supported:
+                router = TaskingNotificationRouter()
+
+            if router is not None:
+                taskrefs_str = client.root.execute_taskings(session_id=self._session_id, specs=pkl_specs, aspects=pkl_aspects,
+                                                            notify_callback=router.notify)
+            else:
+                taskrefs_str = client.root.execute_taskings(session_id=self._session_id, specs=pkl_specs, aspects=pkl_aspects)
+
+            taskref_info_list = pickle.loads(taskrefs_str)
+
+            for taskref_info in taskref_info_list:
+                tasking_id = taskref_info["tasking_id"]
+
+                receiver = TaskingNotificationReceiver()
+                if router is not None:
+                    router.add_receiver(tasking_id, receiver)
+                    receiver.attach(client)
+
+                promise = TaskingResultPromise(client, None, taskref_info["module_name"], tasking_id, taskref_info["task_name"],
+                                               taskref_info["log_dir"], self._session_id, self, receiver=receiver,
+                                               shared_connection=shared_connection)
+                promises.append(promise)
+
+        return promises
 
-        try:
+    def session_close(self):
+
+        with self._connection_pool.connection() as client:
             client.root.session_close(session_id=self._session_id)
             self._session_id = None
-        finally:
-            client.close()
 
         return
 
     def session_open(self, *, worker: str, wref: str, output_directory: Optional[str] = None, log_level: Optional[int] = logging.DEBUG,
-                     aspects: Optional[TaskerAspects] = None) -> str:
-        
+                     aspects: Optional[TaskerAspects] = None, host_pool_size: Optional[int] = None,
+                     preload_modules: Optional[List[str]] = None, max_taskings: Optional[int] = None,
+                     memory_budget: Optional[int] = None, cpu_affinity: Optional[List[int]] = None) -> str:
+        """
+            Opens a tasking session on the tasker service.
+
+            :param host_pool_size: The number of warm tasking host processes the service keeps for the session, `None`
+                                   uses the default of the service.
+            :param preload_modules: The names of modules, typically the tasking modules, that are imported into the
+                                    tasking host processes of the session before taskings are run in them.
+            :param max_taskings: The maximum number of taskings the session can run at the same time, `None` uses
+                                 the default of the service.
+            :param memory_budget: The number of bytes of memory the tasking processes of the session can use before
+                                  the service refuses new taskings, `None` uses the default of the service.
+            :param cpu_affinity: The indexes of the CPUs the tasking processes of the session are restricted to.
+        """
+
         if aspects is None:
             aspects = self._aspects
 
-        client = self._create_connection()
-
         if wref is None:
             wref = self.ipaddr
 
-        try:
-            session_id = client.root.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=aspects)
+        with self._connection_pool.connection() as client:
+            session_id = client.root.session_open(worker=worker, wref=wref, output_directory=output_directory, log_level=log_level, aspects=aspects,
+                                                  host_pool_size=host_pool_size, preload_modules=preload_modules,
+                                                  max_taskings=max_taskings, memory_budget=memory_budget,
+                                                  cpu_affinity=cpu_affinity)
             self._session_id = session_id
-        finally:
-            client.close()
 
         return self._session_id
 
     def reinitialize_logging(self, *, logging_directory: Optional[str] = None,
                                       logging_level: Optional[int] = None):
         
-        client = self._create_connection()
-        
-        try:
+        with self._connection_pool.connection() as client:
             client.root.reinitialize_logging(logging_directory=logging_directory, logging_level=logging_level)
-        finally:
-            client.close()
 
         return
 
     def resolve_path(self, *, path) -> str:
 
-        client = self._create_connection()
-
-        try:
+        with self._connection_pool.connection() as client:
             full_path = client.root.resolve_path(path=path)
-        finally:
-            client.close()
         
         return full_path
 
     def _create_connection(self):
-        
-        if self._aspects is not None:
-            self._protocol_config["sync_request_timeout"] = self._aspects.sync_request_timeout
 
-        client = rpyc.connect(self._ipaddr, self._port, keepalive=True, config=self._protocol_config)
+        # Taskings get a dedicated connection because the promise keeps the connection
+        # and its serving thread for the life of the tasking.
+        client = self._connection_pool.create_connection()
 
         return client
 
@@ -14,7 +14,7 @@ __credits__ = []
 
 
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import logging
 import os
@@ -37,11 +37,24 @@ from mojo.xmods.fspath import expand_path
 
 from mojo.interop.protocols.tasker.taskeraspects import TaskerAspects, DEFAULT_TASKER_ASPECTS
 from mojo.interop.protocols.tasker.taskersession import TaskerSession
+from mojo.interop.protocols.tasker.taskinghostpool import (
+    DEFAULT_HOST_POOL_SIZE,
+    DEFAULT_HOST_RECYCLE_TASKINGS,
+    DEFAULT_HOST_RECYCLE_MEMORY_GROWTH
+)
+
+DEFAULT_MAX_SESSIONS = 8
 
 class TaskerService(rpyc.Service):
     """
         The :class:`TaskerService` is an rpyc service that handles the spawning of tasks
         on a node.
+
+        Several sessions can be open on a service at the same time so more than one controller can share a
+        tasker host.  The service lock is only held to open and close sessions and to change the service
+        logging.  The table of active sessions is replaced rather than changed when a session is opened or
+        closed, so the calls that work with a session look it up without taking the lock and only contend
+        with the calls made to the same session.
     """
 
     service_lock = threading.Lock()
@@ -53,7 +66,16 @@ class TaskerService(rpyc.Service):
     logging_level = logging.DEBUG
 
     active_sessions = OrderedDict()
-    max_sessions = 1
+    max_sessions = DEFAULT_MAX_SESSIONS
+
+    host_pool_size = DEFAULT_HOST_POOL_SIZE
+    host_recycle_taskings = DEFAULT_HOST_RECYCLE_TASKINGS
+    host_recycle_memory_growth = DEFAULT_HOST_RECYCLE_MEMORY_GROWTH
+
+    # The default resource limits for a session, `None` is unlimited
+    session_max_taskings = None
+    session_memory_budget = None
+    session_cpu_affinity = None
 
 
     def __init__(self) -> None:
@@ -75,29 +97,23 @@ class TaskerService(rpyc.Service):
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
-
-            this_type.logger.info("Method 'exposed_archive_folder' was called.")
-
-            if not archive_name.endswith(".zip"):
-                archive_name = f"{archive_name}.zip"
+        this_type.logger.info("Method 'exposed_archive_folder' was called.")
 
-            folder_to_archive = expand_path(folder_to_archive)
+        if not archive_name.endswith(".zip"):
+            archive_name = f"{archive_name}.zip"
 
-            if not os.path.exists(folder_to_archive):
-                raise FileNotFoundError(f"The folder to archive folder={folder_to_archive} does not exist")
+        folder_to_archive = expand_path(folder_to_archive)
 
-            dest_folder = expand_path(dest_folder)
-            if not os.path.exists(dest_folder):
-                os.makedirs(dest_folder)
+        if not os.path.exists(folder_to_archive):
+            raise FileNotFoundError(f"The folder to archive folder={folder_to_archive} does not exist")
 
-            archive_full = os.path.join(dest_folder, archive_name)
+        dest_folder = expand_path(dest_folder)
+        if not os.path.exists(dest_folder):
+            os.makedirs(dest_folder, exist_ok=True)
 
-            create_archive_of_folder(folder_to_archive, archive_full, compression_level=compression_level)
+        archive_full = os.path.join(dest_folder, archive_name)
 
-        finally:
-            this_type.service_lock.release()
+        create_archive_of_folder(folder_to_archive, archive_full, compression_level=compression_level)
 
         return archive_full
 
@@ -106,45 +122,21 @@ class TaskerService(rpyc.Service):
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
-
-            this_type.logger.info("Method 'exposed_cancel_tasking' was called.")
-
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                session.cancel_tasking(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+        this_type.logger.info("Method 'exposed_cancel_tasking' was called.")
 
-        finally:
-            this_type.service_lock.release()
+        session = self._get_session(session_id)
+        session.cancel_tasking(tasking_id)
 
         return
 
     def exposed_call_tasking_method(self, *, session_id: str, tasking_id: str, method_name: str, pkl_args: bytes, pkl_kwargs: bytes) -> bytes:
 
-        tasking = None
-
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
-
-            this_type.logger.info("Method 'exposed_call_tasking_method' was called.")
-
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                tasking = session.get_tasking(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+        this_type.logger.info("Method 'exposed_call_tasking_method' was called.")
 
-        finally:
-            this_type.service_lock.release()
+        session = self._get_session(session_id)
+        tasking = session.get_tasking(tasking_id)
 
         this_type.logger.info("Tasking found.")
 
@@ -168,78 +160,87 @@ class TaskerService(rpyc.Service):
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
+        this_type.logger.info("Method 'exposed_dispose_tasking' was called.")
 
-            this_type.logger.info("Method 'exposed_dispose_tasking' was called.")
-
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                session.dispose_tasking(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
-
-        finally:
-            this_type.service_lock.release()
+        session = self._get_session(session_id)
+        session.dispose_tasking(tasking_id)
 
         return
-    
+
 
     def exposed_execute_tasking(self, *, session_id: str, module_name: str, tasking_name: str, parent_id: Optional[str] = None,
-                                aspects: Optional[TaskerAspects]=None, **kwargs) -> dict:
+                                aspects: Optional[TaskerAspects]=None, notify_callback=None, **kwargs) -> dict:
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_execute_tasking' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                aspects = TaskerAspects.from_dict(pickle.loads(aspects))
+            session = self._get_session(session_id)
+
+            aspects = TaskerAspects.from_dict(pickle.loads(aspects))
 
-                taskref = session.execute_tasking(module_name=module_name, tasking_name=tasking_name, parent_id=parent_id,
-                                        aspects=aspects, **kwargs)
-            finally:
-                this_type.service_lock.acquire()
+            taskref = session.execute_tasking(module_name=module_name, tasking_name=tasking_name, parent_id=parent_id,
+                                    aspects=aspects, notify_callback=notify_callback, **kwargs)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return taskref.as_dict()
 
 
-    def exposed_file_exists(self, *, filename) -> bool:
+    def exposed_execute_taskings(self, *, session_id: str, specs: bytes, aspects: Optional[bytes] = None,
+                                 notify_callback=None) -> bytes:
+        """
+            Starts a batch of taskings in one call.  The specs and the aspects are pickled, and so is the list of
+            tasking references that is returned, so the batch does not cost a round trip per tasking.
+        """
 
         this_type = type(self)
 
-        exists = False
+        taskrefs = None
 
-        this_type.service_lock.acquire()
         try:
 
-            this_type.logger.info("Method 'exposed_file_exists' was called.")
+            this_type.logger.info("Method 'exposed_execute_taskings' was called.")
 
-            filename = expand_path(filename)
+            session = self._get_session(session_id)
 
-            if os.path.exists(filename) and os.path.isfile(filename):
-                exists = True
+            specs = pickle.loads(specs)
 
-        finally:
-            this_type.service_lock.release()
+            if aspects is not None:
+                aspects = TaskerAspects.from_dict(pickle.loads(aspects))
+
+            taskrefs = session.execute_taskings(specs, aspects=aspects, notify_callback=notify_callback)
+
+        except:
+            errmsg = traceback.format_exc()
+            this_type.logger.error(errmsg)
+            raise
+
+        taskrefs_str = pickle.dumps([tref.as_dict() for tref in taskrefs])
+
+        return taskrefs_str
+
+
+    def exposed_file_exists(self, *, filename) -> bool:
+
+        this_type = type(self)
+
+        exists = False
+
+        this_type.logger.info("Method 'exposed_file_exists' was called.")
+
+        filename = expand_path(filename)
+
+        if os.path.exists(filename) and os.path.isfile(filename):
+            exists = True
 
         return exists
-    
+
 
     def exposed_folder_exists(self, *, folder) -> bool:
 
@@ -247,17 +248,12 @@ class TaskerService(rpyc.Service):
 
         exists = False
 
-        this_type.service_lock.acquire()
-        try:
+        this_type.logger.info("Method 'exposed_folder_exists' was called.")
 
-            this_type.logger.info("Method 'exposed_folder_exists' was called.")
+        folder = expand_path(folder)
 
-            folder = expand_path(folder)
-
-            if os.path.exists(folder) and os.path.isdir(folder):
-                exists = True
-        finally:
-            this_type.service_lock.release()
+        if os.path.exists(folder) and os.path.isdir(folder):
+            exists = True
 
         return exists
 
@@ -268,27 +264,18 @@ class TaskerService(rpyc.Service):
 
         events_str = None
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_get_tasking_events' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                events_str = session.get_tasking_events(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+            session = self._get_session(session_id)
+            events_str = session.get_tasking_events(tasking_id)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return events_str
 
 
@@ -298,27 +285,18 @@ class TaskerService(rpyc.Service):
 
         progress_str = None
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_get_tasking_progress' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                progress_str = session.get_tasking_progress(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+            session = self._get_session(session_id)
+            progress_str = session.get_tasking_progress(tasking_id)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return progress_str
 
 
@@ -328,85 +306,58 @@ class TaskerService(rpyc.Service):
 
         result_str = None
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_get_tasking_result' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                result_str = session.get_tasking_result(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+            session = self._get_session(session_id)
+            result_str = session.get_tasking_result(tasking_id)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return result_str
-    
+
     def exposed_get_tasking_status(self, *, session_id: str, tasking_id: str) -> str:
 
         this_type = type(self)
 
         tstatus = None
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_get_tasking_status' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                result_str = session.get_tasking_status(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+            session = self._get_session(session_id)
+            tstatus = session.get_tasking_status(tasking_id)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return tstatus
-    
+
     def exposed_has_completed_and_result_ready(self, *, session_id: str, tasking_id: str) -> bool:
 
         complete_and_ready = False
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
         try:
 
             this_type.logger.info("Method 'exposed_has_completed_and_result_ready' was called.")
 
-            session = self._locked_get_session(session_id)
-            
-            this_type.service_lock.release()
-            try:
-                complete_and_ready = session.has_completed_and_result_ready(tasking_id)
-            finally:
-                this_type.service_lock.acquire()
+            session = self._get_session(session_id)
+            complete_and_ready = session.has_completed_and_result_ready(tasking_id)
 
         except:
             errmsg = traceback.format_exc()
             this_type.logger.error(errmsg)
             raise
 
-        finally:
-            this_type.service_lock.release()
-
         return complete_and_ready
 
 
@@ -414,28 +365,39 @@ class TaskerService(rpyc.Service):
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
+        this_type.logger.info("Method 'exposed_make_folder' was called.")
 
-            this_type.logger.info("Method 'exposed_make_folder' was called.")
+        folder = expand_path(folder)
 
-            folder = expand_path(folder)
+        os.makedirs(folder)
 
-            os.makedirs(folder)
+        return
 
-        finally:
-            this_type.service_lock.release()
 
-        return
+    def exposed_supports_batches(self) -> bool:
+        """
+            Indicates the service can start a batch of taskings with a single call to `execute_taskings`.
+        """
+        return True
+
+
+    def exposed_supports_notifications(self) -> bool:
+        """
+            Indicates the service pushes the progress, events and completion of a tasking to the `notify_callback`
+            passed to `execute_tasking`.
+        """
+        return True
 
 
     def exposed_session_close(self, *, session_id: str) -> str:
 
         this_type = type(self)
 
+        session = None
+
         this_type.service_lock.acquire()
         try:
-            
+
             this_type.logger.info("Method 'exposed_close_session' was called.")
 
             if session_id not in this_type.active_sessions:
@@ -444,53 +406,87 @@ class TaskerService(rpyc.Service):
 
             session = this_type.active_sessions[session_id]
 
-            del this_type.active_sessions[session_id]
-
-            session.shutdown()
+            # Replace the table so lookups that are in progress see a consistent table
+            sessions = OrderedDict(this_type.active_sessions)
+            del sessions[session_id]
+            this_type.active_sessions = sessions
 
         finally:
             this_type.service_lock.release()
 
+        # Shutting down the taskings of the session does not hold up the other sessions
+        session.shutdown()
+
         return session_id
 
     def exposed_session_close_all(self) -> str:
 
         this_type = type(self)
 
+        session_id = None
+        closed_sessions = None
+
         this_type.service_lock.acquire()
         try:
-            
-            this_type.logger.info("Method 'exposed_close_session_all' was called.")
 
-            closed_sessions = []
-            for session_id, session in session in this_type.active_sessions.items():
-                session.shutdown()
-                closed_sessions.append(session_id)
+            this_type.logger.info("Method 'exposed_close_session_all' was called.")
 
-            for session_id in closed_sessions:
-                del this_type.active_sessions[session_id]
+            closed_sessions = this_type.active_sessions
+            this_type.active_sessions = OrderedDict()
 
         finally:
             this_type.service_lock.release()
 
+        for session_id, session in closed_sessions.items():
+            session.shutdown()
+
         return session_id
 
 
     def exposed_session_open(self, *, worker: str, wref: str, output_directory: Optional[str] = None,
                              log_level: Optional[int] = logging.DEBUG, notify_url: Optional[str] = None,
                              notify_headers: Optional[Dict[str, str]] = None,
-                             aspects: Optional[TaskerAspects] = DEFAULT_TASKER_ASPECTS) -> str:
+                             aspects: Optional[TaskerAspects] = DEFAULT_TASKER_ASPECTS,
+                             host_pool_size: Optional[int] = None, preload_modules: Optional[List[str]] = None,
+                             max_taskings: Optional[int] = None, memory_budget: Optional[int] = None,
+                             cpu_affinity: Optional[List[int]] = None) -> str:
+        """
+            Opens a tasking session.
+
+            :param max_taskings: The maximum number of taskings the session can run at the same time.
+            :param memory_budget: The number of bytes of memory the tasking processes of the session can use before
+                                  new taskings are refused.
+            :param cpu_affinity: The indexes of the CPUs the tasking processes of the session are restricted to.
+        """
 
         this_type = type(self)
 
         session = None
         session_id = None
 
+        if output_directory is None:
+            output_directory = this_type.logging_directory
+
+        if host_pool_size is None:
+            host_pool_size = this_type.host_pool_size
+
+        if max_taskings is None:
+            max_taskings = this_type.session_max_taskings
+
+        if memory_budget is None:
+            memory_budget = this_type.session_memory_budget
+
+        # Copy the lists out of the netrefs of the caller
+        if preload_modules is not None:
+            preload_modules = [str(mname) for mname in preload_modules]
+
+        if cpu_affinity is not None:
+            cpu_affinity = [int(cpu) for cpu in cpu_affinity]
+        else:
+            cpu_affinity = this_type.session_cpu_affinity
+
         this_type.service_lock.acquire()
         try:
-            
-            if output_directory is None:
-                output_directory = this_type.logging_directory
 
             this_type.logger.info("Method 'exposed_open_session' was called.")
 
@@ -499,11 +495,18 @@ class TaskerService(rpyc.Service):
                 raise RuntimeError(errmsg)
 
             session = TaskerSession(this_type, worker, wref, output_directory=output_directory, log_level=log_level,
-                                    notify_url=notify_url, notify_headers=notify_headers, aspects=aspects)
+                                    notify_url=notify_url, notify_headers=notify_headers, aspects=aspects,
+                                    host_pool_size=host_pool_size, preload_modules=preload_modules,
+                                    host_recycle_taskings=this_type.host_recycle_taskings,
+                                    host_recycle_memory_growth=this_type.host_recycle_memory_growth,
+                                    max_taskings=max_taskings, memory_budget=memory_budget, cpu_affinity=cpu_affinity)
             session_id = session.session_id
             session.start_event_server()
+            session.start_host_pool()
 
-            this_type.active_sessions[session_id] = session
+            sessions = OrderedDict(this_type.active_sessions)
+            sessions[session_id] = session
+            this_type.active_sessions = sessions
 
         finally:
             this_type.service_lock.release()
@@ -515,7 +518,7 @@ class TaskerService(rpyc.Service):
             Called in order to change the location of the service logging.  This is typically not warranted as individual taskings
             derive logging inputs from an established TaskerSession.
         """
-        
+
         this_type = type(self)
 
         this_type.service_lock.acquire()
@@ -538,7 +541,7 @@ class TaskerService(rpyc.Service):
 
         finally:
             this_type.service_lock.release()
-        
+
         return
 
 
@@ -546,13 +549,9 @@ class TaskerService(rpyc.Service):
 
         this_type = type(self)
 
-        this_type.service_lock.acquire()
-        try:
-            this_type.logger.info("Method 'exposed_resolve_path' was called.")
+        this_type.logger.info("Method 'exposed_resolve_path' was called.")
 
-            path = expand_path(path)
-        finally:
-            this_type.service_lock.release()
+        path = expand_path(path)
 
         return path
 
@@ -575,7 +574,7 @@ class TaskerService(rpyc.Service):
             pass
 
         return
-    
+
     @classmethod
     def log_info(cls, message: str):
 
@@ -585,7 +584,7 @@ class TaskerService(rpyc.Service):
             pass
 
         return
-    
+
     @classmethod
     def log_warn(cls, message: str):
 
@@ -596,20 +595,26 @@ class TaskerService(rpyc.Service):
 
         return
 
-    def _locked_get_session(self, session_id: str) -> TaskerSession:
+    def _get_session(self, session_id: str) -> TaskerSession:
+        """
+            Looks up an active session without taking the service lock, the table of active sessions is
+            replaced and not changed when sessions are opened or closed.
+        """
 
         this_type = type(self)
 
         if session_id is None:
             raise ValueError(f"The session_id='{session_id}' provided was None.")
-    
-        if len(self.active_sessions) == 0:
+
+        active_sessions = this_type.active_sessions
+
+        if len(active_sessions) == 0:
             raise SemanticError("You must first open a tasking session before calling APIs that work with taskings.")
 
-        if session_id not in self.active_sessions:
+        if session_id not in active_sessions:
             raise SemanticError(f"The session_id={session_id} provided was not valid")
 
-        rtnval = self.active_sessions[session_id]
+        rtnval = active_sessions[session_id]
 
         this_type.logger.info(f"Session found for session_id={session_id}")
 
@@ -622,7 +627,7 @@ class TaskerService(rpyc.Service):
 
         if this_type.logger is None:
             this_type.logger = logging.getLogger()
-        
+
         handlers_list = [h for h in this_type.logger.handlers]
 
         for handler in handlers_list:
@@ -643,4 +648,4 @@ class TaskerService(rpyc.Service):
 
         this_type.logger.addHandler(rotating_handler)
 
-        return
\ No newline at end of file
+        return
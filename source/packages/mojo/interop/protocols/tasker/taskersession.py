@@ -14,15 +14,14 @@ __credits__ = []
 
 
 
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 
 import json
-import multiprocessing
-import multiprocessing.context
 import os
 import pickle
 import threading
+import time
 import traceback
 import weakref
 
@@ -34,6 +33,8 @@ from uuid import uuid4
 
 from http import HTTPStatus
 
+import rpyc
+
 from mojo.errors.exceptions import SemanticError
 
 from mojo.errors.xtraceback import (
@@ -50,11 +51,22 @@ from mojo.xmods.ximport import import_by_name
 
 from mojo.interop.protocols.tasker.taskingresultpromise import TaskingRef
 from mojo.interop.protocols.tasker.taskeraspects import TaskerAspects, DEFAULT_TASKER_ASPECTS
-from mojo.interop.protocols.tasker.tasking import Tasking, TaskingManager
+from mojo.interop.protocols.tasker.taskerexceptions import TaskingLimitError
+from mojo.interop.protocols.tasker.tasking import Tasking
+from mojo.interop.protocols.tasker.taskinghostpool import (
+    TaskingHostPool,
+    TaskingHostProcess,
+    DEFAULT_HOST_POOL_SIZE,
+    DEFAULT_HOST_RECYCLE_TASKINGS,
+    DEFAULT_HOST_RECYCLE_MEMORY_GROWTH
+)
+from mojo.interop.protocols.tasker.taskingresultpromise import TaskingNotification
 
 if TYPE_CHECKING:
     from mojo.interop.protocols.tasker.taskerservice import TaskerService
 
+MEMORY_SAMPLE_INTERVAL = 1
+
 
 class EventNotificationHandler(BaseHTTPRequestHandler):
 
@@ -97,7 +109,11 @@ class TaskerSession:
 
     def __init__(self, service_class: "TaskerService", worker: str, wref: str, output_directory: str, log_level: int,
                  notify_url: str = None, notify_headers: Dict[str, str] = None,
-                 aspects: TaskerAspects = DEFAULT_TASKER_ASPECTS):
+                 aspects: TaskerAspects = DEFAULT_TASKER_ASPECTS, host_pool_size: int = DEFAULT_HOST_POOL_SIZE,
+                 preload_modules: Optional[List[str]] = None, host_recycle_taskings: Optional[int] = DEFAULT_HOST_RECYCLE_TASKINGS,
+                 host_recycle_memory_growth: Optional[int] = DEFAULT_HOST_RECYCLE_MEMORY_GROWTH,
+                 max_taskings: Optional[int] = None, memory_budget: Optional[int] = None,
+                 cpu_affinity: Optional[List[int]] = None):
 
         self._service_class = service_class
 
@@ -112,19 +128,47 @@ class TaskerSession:
 
         self._aspects = aspects
 
+        # The resource limits of the session, a tasking that would take the session over
+        # one of its limits is refused with a TaskingLimitError.
+        self._max_taskings = max_taskings
+        self._memory_budget = memory_budget
+        self._cpu_affinity = cpu_affinity
+
         self._session_id = str(uuid4())
 
         self._start = datetime.now()
         self._last_activity = datetime.now()
 
+        # The tables are only changed while holding the session lock and every change is a single
+        # item assignment, so the status and progress queries read them without taking the lock
+        # and do not wait behind the taskings that are being started or dispatched.
         self._taskings_table = OrderedDict()
         self._results_table = OrderedDict()
         self._status_table = OrderedDict()
         self._progress_table = OrderedDict()
         self._events_table = {}
 
+        # The callbacks that status, progress, events and completion are pushed to for
+        # the taskings whose callers asked to be notified instead of polling.
+        self._notify_table: Dict[str, Callable] = {}
+
         self._session_lock = threading.Lock()
 
+        # ======================= Session Lock Variables ========================
+        # These variables are protected by the session lock and are prefixed with
+        # _sl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._sl_active_count = 0
+        self._sl_memory_usage = 0
+        self._sl_memory_sampled = None
+
+        # The taskings of the session are run in warm tasking host processes that are reused
+        # so a tasking does not pay for spawning a process and importing its modules.
+        self._host_pool = TaskingHostPool(pool_size=host_pool_size, preload_modules=preload_modules,
+                                          recycle_taskings=host_recycle_taskings,
+                                          recycle_memory_growth=host_recycle_memory_growth,
+                                          cpu_affinity=cpu_affinity)
+
         self._events_server = None
         self._events_endpoint = None
 
@@ -134,6 +178,14 @@ class TaskerSession:
     def aspects(self): 
         return self._aspects
     
+    @property
+    def host_pool(self) -> TaskingHostPool:
+        return self._host_pool
+
+    @property
+    def active_count(self) -> int:
+        return self._sl_active_count
+
     @property
     def last_activity(self) -> datetime: 
         return self._last_activity
@@ -234,105 +286,89 @@ class TaskerSession:
         return tasking
 
     def execute_tasking(self, module_name: str, tasking_name: str,
-                               parent_id: Optional[str] = None, aspects: Optional[TaskerAspects]=None, **kwargs) -> TaskingRef:
-        
-        if aspects is None:
-            aspects = self._aspects
-
-        taskref: TaskingRef = None
+                               parent_id: Optional[str] = None, aspects: Optional[TaskerAspects]=None,
+                               notify_callback: Optional[Callable] = None, **kwargs) -> TaskingRef:
+        """
+            Starts a tasking in a tasking process.
 
-        # Make sure the requested "Tasking" actually exists before we attempt to instantiate one in a remote
-        # process.
-        module = import_by_name(module_name)
+            :param notify_callback: An optional callback, from the caller over its RPyC connection, that the progress,
+                                    events and completion of the tasking are pushed to as :class:`TaskingNotification`
+                                    kinds with a pickled payload.
+        """
 
-        if hasattr(module, tasking_name):
-
-            tasking_type = getattr(module, tasking_name)
-
-            tasking_id = str(uuid4())
-
-            log_dir = None
-            
-            if not os.path.exists(self._output_directory):
-                os.makedirs(self._output_directory)
-
-            prefix = tasking_type.PREFIX
-            
-            log_dir = os.path.join(self._output_directory, "taskings", f"{prefix}-{tasking_id}")
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
+        taskref = self._start_tasking(module_name, tasking_name, parent_id, aspects, notify_callback, kwargs)
 
-            log_file: str = os.path.join(log_dir, f"tasking-{tasking_id}.log")
+        return taskref
 
-            taskref = TaskingRef(module_name, tasking_id, tasking_name, log_dir)
+    def execute_taskings(self, specs: List[dict], aspects: Optional[TaskerAspects] = None,
+                         notify_callback: Optional[Callable] = None) -> List[TaskingRef]:
+        """
+            Starts a batch of taskings in tasking processes.
 
-            # Create an instance of a TaskingManager to manage the remote process, we will manage the scope
-            # if this instance by delegating it to a thread that will execute the task and monitor its lifespan
-            mpctx = multiprocessing.get_context("spawn")
-            tasking_manager = TaskingManager(ctx=mpctx)
-            tasking_manager.start()
+            :param specs: The specs of the taskings as dictionaries with a 'module_name', 'tasking_name', 'parent_id'
+                          and 'kwparams'.
+            :param aspects: The aspects of the taskings.
+            :param notify_callback: An optional callback that the notifications of all the taskings of the batch are
+                                    pushed to, the notifications carry the tasking id.
 
-            start_msg_lines = [
-                "=============================== Instantiating Task ===============================",
-                f"worker: {self._worker}",
-                f"worker-ref: {self._wref}",
-                f"module_name: {module_name}",
-                f"tasking_name: {tasking_name}",
-                f"tasking_id: {tasking_id}",
-                f"parent_id: {parent_id}",
-                f"output_directory: {self._output_directory}",
-                f"log_dir: {log_dir}",
-                f"log_file: {log_file}",
-                f"notify_url: {self._notify_url}",
-                f"notify_headers: {repr(self._notify_headers)}",
-                f"log_level: {self._log_level}",
-                "==================================================================================",
-            ]
-            start_msg = os.linesep.join(start_msg_lines)
+            :returns: The references to the taskings in the order of the specs.
 
-            with open(log_file, "+a") as tlogf:
-                tlogf.write(start_msg)
+            :raises TaskingLimitError: If the session does not have room for the whole batch, none of the taskings
+                                       are started.
+        """
 
-            tasking = tasking_manager.instantiate_tasking(self._worker, self._wref, module_name, tasking_name, tasking_id, parent_id, self._output_directory,
-                log_dir, log_file, self._log_level, self._events_endpoint, self._notify_url, self._notify_headers, aspects=aspects)
+        # Check all the taskings exist before any of them are started so a bad spec does not
+        # leave part of the batch running.
+        for spec in specs:
+            module_name = spec["module_name"]
+            tasking_name = spec["tasking_name"]
 
-            self._session_lock.acquire()
-            try:
-                self.statuses[tasking_id] = str(ProgressCode.NotStarted.value)
-                self.taskings[tasking_id] = tasking
-            finally:
-                self._session_lock.release()
+            module = import_by_name(module_name)
+            if not hasattr(module, tasking_name):
+                errmsg = f"The specified tasking 'module' was not found. module={module_name} tasking={tasking_name}"
+                raise ValueError(errmsg)
 
-            sgate = threading.Event()
-            sgate.clear()
+        # Take the tasking slots for the whole batch up front so the session limits either admit
+        # every tasking of the batch or none of them.
+        errmsg = self._reserve_taskings(len(specs))
+        if errmsg is not None:
+            errmsg = f"Unable to start a batch of {len(specs)} taskings, {errmsg}"
+            raise TaskingLimitError(errmsg)
 
-            dargs = (sgate, tasking_manager, tasking, tasking_name, tasking_id, prefix,
-                     parent_id, log_file, kwargs, aspects)
+        taskrefs = []
 
-            # We have to dispatch the task with a thread, because we need to leave a local thread running
-            # to monitor the progress of the task.
-            taskthread = threading.Thread(target=self._dispatch_task, args=dargs, daemon=True)
-            taskthread.start()
-    
-            sgate.wait()
+        started = 0
+        try:
+            for spec in specs:
+                kwparams = spec.get("kwparams")
+                if kwparams is None:
+                    kwparams = {}
+
+                # The slot of the tasking is owned by the tasking from here on, it is given back
+                # when the tasking is done or if it fails to start.
+                started += 1
+                taskref = self._start_tasking(spec["module_name"], spec["tasking_name"], spec.get("parent_id"),
+                                              aspects, notify_callback, kwparams, reserved=True)
+                taskrefs.append(taskref)
+        except:
+            for _ in range(len(specs) - started):
+                self._release_tasking()
+
+            # The caller will not get the references to the taskings that were started, so they are
+            # stopped instead of being left to run.
+            for taskref in taskrefs:
+                try:
+                    self.dispose_tasking(taskref.tasking_id)
+                except Exception: # pylint: disable=broad-except
+                    self._service_class.log_error(f"Error stopping tasking_id={taskref.tasking_id} of a failed batch.")
+            raise
 
-        else:
-            errmsg = f"The specified tasking 'module' was not found. module={module_name} tasking={tasking_name}"
-            raise ValueError(errmsg)
-    
-        return taskref
-    
+        return taskrefs
 
     def get_tasking_events(self, tasking_id: str) -> str:
 
-        events = []
-
-        self._session_lock.acquire()
-        try:
-            if tasking_id in self._events_table:
-                events = self._events_table[tasking_id]
-        finally:
-            self._session_lock.release()
+        # Lock free read, the events list is only appended to so a copy of it is consistent
+        events = list(self._events_table.get(tasking_id, []))
 
         events_str = pickle.dumps(events)
 
@@ -341,14 +377,8 @@ class TaskerSession:
 
     def get_tasking_progress(self, tasking_id: str) -> str:
 
-        progress = None
-
-        self._session_lock.acquire()
-        try:
-            if tasking_id in self._progress_table:
-                progress = self._progress_table[tasking_id]
-        finally:
-            self._session_lock.release()
+        # Lock free read, see the note on the tables in the constructor
+        progress = self._progress_table.get(tasking_id)
 
         progress_str = None
         if progress is not None:
@@ -381,12 +411,13 @@ class TaskerSession:
 
     def get_tasking_status(self, tasking_id: str) -> str:
 
-        self._session_lock.acquire()
-        try:
-            if tasking_id in self._status_table:
-                tstatus = str(self._status_table[tasking_id])
-        finally:
-            self._session_lock.release()
+        # Lock free read, see the note on the tables in the constructor
+        tstatus = self._status_table.get(tasking_id)
+        if tstatus is None:
+            errmsg = f"The specified tasking tasking_id={tasking_id} is not known to this TaskerService instance."
+            raise ValueError(errmsg)
+
+        tstatus = str(tstatus)
 
         return tstatus
 
@@ -394,17 +425,15 @@ class TaskerSession:
 
         complete_and_ready = False
 
-        self._session_lock.acquire()
-        try:
-            if tasking_id in self._status_table:
-                tstatus = str(self._status_table[tasking_id])
+        # Lock free read, both the status and the result are checked so a query that lands
+        # between the two updates reports the tasking as not ready yet.
+        tstatus = self._status_table.get(tasking_id)
+        if tstatus is not None:
+            tstatus = str(tstatus)
 
-                if tstatus == ProgressCode.Completed or tstatus == ProgressCode.Errored or tstatus == ProgressCode.Failed:
-                    if tasking_id in self._results_table:
-                        complete_and_ready = True
-
-        finally:
-            self._session_lock.release()
+            if tstatus == ProgressCode.Completed or tstatus == ProgressCode.Errored or tstatus == ProgressCode.Failed:
+                if tasking_id in self._results_table:
+                    complete_and_ready = True
 
         return complete_and_ready
 
@@ -424,6 +453,8 @@ class TaskerSession:
         finally:
             self._session_lock.release()
 
+        self._notify(tasking_id, TaskingNotification.EVENT, event)
+
         return
 
     def shutdown(self):
@@ -452,10 +483,18 @@ class TaskerSession:
                 if tstatus in [ProgressCode.NotStarted, ProgressCode.Paused, ProgressCode.Running]:
                     tasking.shutdown()
         finally:
+            self._host_pool.shutdown()
             events_server.shutdown()
 
         return
 
+    def start_host_pool(self):
+        """
+            Starts the warm tasking host processes of the session in the background.
+        """
+        self._host_pool.start()
+        return
+
     def start_event_server(self) -> Tuple[str, int]:
 
         sgate = threading.Event()
@@ -467,7 +506,211 @@ class TaskerSession:
 
         return
 
-    def _dispatch_task(self, sgate: threading.Event, tasking_manager: TaskingManager, tasking: Tasking,
+    def _admit_tasking(self, tasking_id: str, log_file: str):
+        """
+            Takes a tasking slot of the session if starting the tasking keeps the session within its limits.
+
+            :raises TaskingLimitError: If the session is at its maximum number of taskings or over its memory budget.
+        """
+
+        errmsg = self._reserve_taskings(1)
+
+        if errmsg is not None:
+            errmsg = f"Unable to start tasking_id={tasking_id}, {errmsg}"
+            with open(log_file, "+a") as tlogf:
+                tlogf.write(os.linesep + errmsg)
+            raise TaskingLimitError(errmsg)
+
+        return
+
+    def _release_tasking(self):
+        """
+            Gives back the tasking slot of a tasking that is done or that failed to start.
+        """
+
+        self._session_lock.acquire()
+        try:
+            self._sl_active_count -= 1
+        finally:
+            self._session_lock.release()
+
+        return
+
+    def _reserve_taskings(self, count: int) -> Optional[str]:
+        """
+            Takes the specified number of tasking slots of the session if starting that many taskings keeps the
+            session within its limits.  The slots are either all taken or none of them are.
+
+            :param count: The number of tasking slots to take.
+
+            :returns: None if the slots were taken or a message describing the limit that was reached.
+        """
+
+        errmsg = None
+
+        memory_usage = None
+        if self._memory_budget is not None:
+            memory_usage = self._sample_memory_usage()
+
+        self._session_lock.acquire()
+        try:
+            if self._max_taskings is not None and self._sl_active_count + count > self._max_taskings:
+                errmsg = (f"the session is running {self._sl_active_count} of its maximum of "
+                          f"{self._max_taskings} taskings.")
+            elif memory_usage is not None and memory_usage >= self._memory_budget:
+                errmsg = (f"the tasking processes of the session are using {memory_usage} bytes of its "
+                          f"{self._memory_budget} byte memory budget.")
+            else:
+                self._sl_active_count += count
+        finally:
+            self._session_lock.release()
+
+        return errmsg
+
+    def _sample_memory_usage(self) -> int:
+        """
+            Returns the memory used by the tasking host processes of the session, the usage is sampled at most
+            once per sample interval so admitting a burst of taskings does not query every host for each one.
+        """
+
+        memory_usage = None
+
+        now = time.monotonic()
+
+        self._session_lock.acquire()
+        try:
+            if self._sl_memory_sampled is not None and now - self._sl_memory_sampled < MEMORY_SAMPLE_INTERVAL:
+                memory_usage = self._sl_memory_usage
+        finally:
+            self._session_lock.release()
+
+        if memory_usage is None:
+            memory_usage = self._host_pool.memory_usage()
+
+            self._session_lock.acquire()
+            try:
+                self._sl_memory_usage = memory_usage
+                self._sl_memory_sampled = now
+            finally:
+                self._session_lock.release()
+
+        return memory_usage
+
+    def _start_tasking(self, module_name: str, tasking_name: str, parent_id: Optional[str], aspects: Optional[TaskerAspects],
+                       notify_callback: Optional[Callable], kwparams: dict, reserved: bool = False) -> TaskingRef:
+        """
+            Starts a tasking in a tasking host process.
+
+            :param reserved: True if the caller already reserved a tasking slot for the tasking.  The slot is owned
+                             by the tasking and is given back if the tasking fails to start.
+        """
+
+        if aspects is None:
+            aspects = self._aspects
+
+        taskref: TaskingRef = None
+
+        try:
+            # Make sure the requested "Tasking" actually exists before we attempt to instantiate one in a remote
+            # process.
+            module = import_by_name(module_name)
+
+            if not hasattr(module, tasking_name):
+                errmsg = f"The specified tasking 'module' was not found. module={module_name} tasking={tasking_name}"
+                raise ValueError(errmsg)
+
+            tasking_type = getattr(module, tasking_name)
+
+            tasking_id = str(uuid4())
+
+            log_dir = None
+
+            if not os.path.exists(self._output_directory):
+                os.makedirs(self._output_directory)
+
+            prefix = tasking_type.PREFIX
+
+            log_dir = os.path.join(self._output_directory, "taskings", f"{prefix}-{tasking_id}")
+            if not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+
+            log_file: str = os.path.join(log_dir, f"tasking-{tasking_id}.log")
+
+            taskref = TaskingRef(module_name, tasking_id, tasking_name, log_dir)
+
+            start_msg_lines = [
+                "=============================== Instantiating Task ===============================",
+                f"worker: {self._worker}",
+                f"worker-ref: {self._wref}",
+                f"module_name: {module_name}",
+                f"tasking_name: {tasking_name}",
+                f"tasking_id: {tasking_id}",
+                f"parent_id: {parent_id}",
+                f"output_directory: {self._output_directory}",
+                f"log_dir: {log_dir}",
+                f"log_file: {log_file}",
+                f"notify_url: {self._notify_url}",
+                f"notify_headers: {repr(self._notify_headers)}",
+                f"log_level: {self._log_level}",
+                "==================================================================================",
+            ]
+            start_msg = os.linesep.join(start_msg_lines)
+
+            with open(log_file, "+a") as tlogf:
+                tlogf.write(start_msg)
+        except:
+            if reserved:
+                self._release_tasking()
+            raise
+
+        # Take one of the tasking slots of the session, this raises a TaskingLimitError if the
+        # session is at one of its limits.  The slot is given back when the tasking is done.
+        if not reserved:
+            self._admit_tasking(tasking_id, log_file)
+
+        # Get a warm tasking host process to run the tasking in, we will manage the scope of the host
+        # by delegating it to a thread that will execute the task and monitor its lifespan
+        try:
+            tasking_host = self._host_pool.checkout()
+        except:
+            self._release_tasking()
+            raise
+
+        try:
+            tasking = tasking_host.manager.instantiate_tasking(self._worker, self._wref, module_name, tasking_name, tasking_id, parent_id,
+                self._output_directory, log_dir, log_file, self._log_level, self._events_endpoint, self._notify_url, self._notify_headers,
+                aspects=aspects)
+        except:
+            self._host_pool.checkin(tasking_host, reusable=False)
+            self._release_tasking()
+            raise
+
+        self._session_lock.acquire()
+        try:
+            self.statuses[tasking_id] = str(ProgressCode.NotStarted.value)
+            self.taskings[tasking_id] = tasking
+            if notify_callback is not None:
+                # Notifications are one way so a slow caller does not hold up the tasking
+                self._notify_table[tasking_id] = rpyc.async_(notify_callback)
+        finally:
+            self._session_lock.release()
+
+        sgate = threading.Event()
+        sgate.clear()
+
+        dargs = (sgate, tasking_host, tasking, tasking_name, tasking_id, prefix,
+                 parent_id, log_file, kwparams, aspects)
+
+        # We have to dispatch the task with a thread, because we need to leave a local thread running
+        # to monitor the progress of the task.
+        taskthread = threading.Thread(target=self._dispatch_task, args=dargs, daemon=True)
+        taskthread.start()
+
+        sgate.wait()
+
+        return taskref
+
+    def _dispatch_task(self, sgate: threading.Event, tasking_host: TaskingHostProcess, tasking: Tasking,
                       tasking_name: str, tasking_id: str, prefix: str, parent_id: str,
                       log_file: str, kwparams: dict, aspects: TaskerAspects):
 
@@ -484,13 +727,17 @@ class TaskerSession:
         self._service_class.log_info(f"Dispatching task_type={tasking_name} id={tasking_id}")
 
         progress = None
+        progress_queue = None
+
+        # The host is only reused if the tasking ran to completion and its task thread has finished
+        completed = False
 
         try:
             inactivity_timeout = None
             if aspects is not None:
                 inactivity_timeout = aspects.inactivity_timeout
 
-            progress_queue = tasking_manager.Queue()
+            progress_queue = tasking_host.manager.Queue()
 
             tasking.execute(progress_queue, kwparams)
 
@@ -498,12 +745,14 @@ class TaskerSession:
 
                 progress: ProgressInfo = progress_queue.get(block=True, timeout=inactivity_timeout)
 
+                result: TaskingResult = None
+
                 self._session_lock.acquire()
                 try:
                     self._progress_table[tasking_id] = progress
 
                     if isinstance(progress, TaskingResult):
-                        result: TaskingResult = progress
+                        result = progress
 
                         if len(result.errors) > 0:
                             self._status_table[tasking_id] = str(ProgressCode.Errored.value)
@@ -513,14 +762,22 @@ class TaskerSession:
                             self._status_table[tasking_id] = str(ProgressCode.Completed.value)
 
                         self._results_table[tasking_id] = result
-                        break
-
-                    prog_status = str(progress.status.value)
-                    self._status_table[tasking_id] = prog_status
+                    else:
+                        prog_status = str(progress.status.value)
+                        self._status_table[tasking_id] = prog_status
 
                 finally:
                     self._session_lock.release()
 
+                # Push outside of the session lock, the tables are updated first so a caller
+                # that is notified sees the same state if it asks for it.
+                if result is not None:
+                    completed = True
+                    self._notify(tasking_id, TaskingNotification.COMPLETED, result)
+                    break
+
+                self._notify(tasking_id, TaskingNotification.PROGRESS, progress)
+
         except BaseException as err:
             tbdetail = create_traceback_detail(err)
 
@@ -532,14 +789,61 @@ class TaskerSession:
                 tlogf.write(errmsg)
             
             tresult = TaskingResult(tasking_id, tasking_name, parent_id, ResultCode.ERRORED, prefix=prefix)
-            self._status_table[tasking_id] = str(ProgressCode.Errored.value)
             tresult.add_error(tbdetail)
-            self._results_table[tasking_id] = tresult
+
+            self._session_lock.acquire()
+            try:
+                self._status_table[tasking_id] = str(ProgressCode.Errored.value)
+                self._results_table[tasking_id] = tresult
+            finally:
+                self._session_lock.release()
+
+            self._notify(tasking_id, TaskingNotification.COMPLETED, tresult)
 
             raise
 
         finally:
-            tasking_manager.shutdown()
+            # Release the queue in the host process before the host is handed to another tasking
+            progress_queue = None
+            self._host_pool.checkin(tasking_host, reusable=completed)
+            self._release_tasking()
+
+            self._session_lock.acquire()
+            try:
+                if tasking_id in self._notify_table:
+                    del self._notify_table[tasking_id]
+            finally:
+                self._session_lock.release()
+
+        return
+
+    def _notify(self, tasking_id: str, kind: str, payload: Any):
+        """
+            Pushes a notification to the caller of a tasking if the caller asked to be notified.  If the caller
+            has gone away the callback is dropped, the caller can still poll for the state of the tasking.
+        """
+
+        notify_callback = None
+
+        self._session_lock.acquire()
+        try:
+            notify_callback = self._notify_table.get(tasking_id)
+        finally:
+            self._session_lock.release()
+
+        if notify_callback is not None:
+            try:
+                notify_callback(kind, tasking_id, pickle.dumps(payload))
+            except Exception:
+                errmsg = traceback.format_exc()
+                self._service_class.log_warn(f"Unable to notify the caller of tasking_id={tasking_id}.{os.linesep}{errmsg}")
+
+                self._session_lock.acquire()
+                try:
+                    if tasking_id in self._notify_table:
+                        del self._notify_table[tasking_id]
+                finally:
+                    self._session_lock.release()
 
         return
 
@@ -14,7 +14,7 @@ __credits__ = []
 
 
 
-from typing import Dict, Optional, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import multiprocessing
 import multiprocessing.managers
@@ -23,13 +23,14 @@ import json
 import logging
 import os
 import requests
+import sys
 import threading
 import traceback
 
 from http import HTTPStatus
 from pprint import pformat
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from logging import FileHandler
 
@@ -70,6 +71,14 @@ def instantiate_tasking(worker: str, wref: str, module_name: str, tasking_name:
         log_handler.setLevel(log_level)
         
         logger = logging.getLogger("TASKING")
+
+        # A tasking host process is reused for many taskings, drop the log file of the
+        # previous tasking so its output does not end up in the log of this one.
+        for prev_handler in list(logger.handlers):
+            if isinstance(prev_handler, FileHandler):
+                logger.removeHandler(prev_handler)
+                prev_handler.close()
+
         logger.addHandler(log_handler)
 
         tasking_type: Type[Tasking] = getattr(module, tasking_name)
@@ -83,6 +92,74 @@ def instantiate_tasking(worker: str, wref: str, module_name: str, tasking_name:
     return tasking
 
 
+class TaskingHost:
+    """
+        The :class:`TaskingHost` is created in the process of a :class:`TaskingManager` so the tasker service
+        can warm the process up before taskings are run in it and can keep track of how much memory the
+        taskings that were run in the process have left behind.
+    """
+
+    def get_pid(self) -> int:
+        return os.getpid()
+
+    def get_memory_usage(self) -> Optional[int]:
+        """
+            Returns the resident memory of the tasking host process in bytes or `None` if it cannot
+            be determined on this platform.
+        """
+        usage = None
+
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm", 'r') as smf:
+                resident_pages = int(smf.read().split()[1])
+            usage = resident_pages * os.sysconf("SC_PAGE_SIZE")
+        else:
+            try:
+                import resource
+                max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                # The peak resident size is reported in bytes on Darwin and in kilobytes everywhere else
+                usage = max_rss if sys.platform == "darwin" else max_rss * 1024
+            except ImportError:
+                pass
+
+        return usage
+
+    def set_cpu_affinity(self, cpus: List[int]) -> bool:
+        """
+            Restricts the tasking host process and the threads it starts to the specified CPUs.
+
+            :param cpus: The indexes of the CPUs the process is allowed to run on.
+
+            :returns: True if the affinity was set, False if the platform does not support setting it.
+        """
+        applied = False
+
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+            applied = True
+
+        return applied
+
+    def preload_modules(self, module_names: List[str]) -> List[str]:
+        """
+            Imports the specified modules into the tasking host process so the taskings run in the process
+            do not pay for the imports.
+
+            :param module_names: The names of the modules to import.
+
+            :returns: A list of error messages for the modules that could not be imported.
+        """
+        errors = []
+
+        for mname in module_names:
+            try:
+                import_by_name(mname)
+            except Exception:
+                errors.append(f"Unable to preload module={mname}.{os.linesep}{traceback.format_exc()}")
+
+        return errors
+
+
 class TaskingManager(multiprocessing.managers.SyncManager):
     """
         This is a process manager used for creating a :class:`TaskingManager`
@@ -90,6 +167,7 @@ class TaskingManager(multiprocessing.managers.SyncManager):
     """
 
 TaskingManager.register("instantiate_tasking", instantiate_tasking)
+TaskingManager.register("TaskingHost", TaskingHost)
 
 
 @dataclass
@@ -108,6 +186,26 @@ class TaskingIdentity:
         return self.module_name, self.tasking_name
 
 
+@dataclass
+class TaskingSpec:
+    """
+        Describes one tasking of a batch of taskings that is submitted to a tasker service in a single call.
+    """
+    module_name: str
+    tasking_name: str
+    parent_id: Optional[str] = None
+    kwparams: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        data = {
+            "module_name": self.module_name,
+            "tasking_name": self.tasking_name,
+            "parent_id": self.parent_id,
+            "kwparams": self.kwparams
+        }
+        return data
+
+
 class Tasking:
     """
     """
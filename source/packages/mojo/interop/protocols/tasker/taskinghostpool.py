@@ -0,0 +1,417 @@
+"""
+.. module:: taskinghostpool
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the :class:`TaskingHostPool` class which keeps warm tasking host
+               processes that are reused by the taskings of a :class:`TaskerSession`.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+
+from typing import List, Optional
+
+import logging
+import multiprocessing
+import threading
+
+from mojo.interop.protocols.tasker.tasking import TaskingHost, TaskingManager
+
+DEFAULT_HOST_POOL_SIZE = 2
+
+DEFAULT_HOST_RECYCLE_TASKINGS = 100
+DEFAULT_HOST_RECYCLE_MEMORY_GROWTH = 512 * 1024 * 1024
+
+logger = logging.getLogger()
+
+
+class TaskingHostProcess:
+    """
+        A tasking host process is a started :class:`TaskingManager` process along with the bookkeeping
+        the :class:`TaskingHostPool` uses to decide when the process should be recycled.
+    """
+
+    def __init__(self):
+
+        mpctx = multiprocessing.get_context("spawn")
+        self._manager = TaskingManager(ctx=mpctx)
+
+        self._host: TaskingHost = None
+        self._pid = None
+
+        self._taskings_run = 0
+        self._baseline_memory = None
+
+        return
+
+    @property
+    def manager(self) -> TaskingManager:
+        return self._manager
+
+    @property
+    def pid(self) -> int:
+        return self._pid
+
+    @property
+    def taskings_run(self) -> int:
+        return self._taskings_run
+
+    def mark_tasking_run(self):
+        self._taskings_run += 1
+        return
+
+    def memory_usage(self) -> Optional[int]:
+        """
+            Returns the resident memory of the host process in bytes or `None` if it cannot be determined.
+        """
+        usage = self._host.get_memory_usage()
+        return usage
+
+    def memory_growth(self) -> Optional[int]:
+        """
+            Returns the number of bytes the resident memory of the host process has grown since it was
+            started or `None` if the memory of the process cannot be determined.
+        """
+        growth = None
+
+        usage = self._host.get_memory_usage()
+        if usage is not None and self._baseline_memory is not None:
+            growth = usage - self._baseline_memory
+
+        return growth
+
+    def shutdown(self):
+        """
+            Shuts down the host process.
+        """
+        try:
+            self._manager.shutdown()
+        except Exception: # pylint: disable=broad-except
+            logger.debug(f"Error shutting down tasking host pid={self._pid}.")
+        return
+
+    def start(self, preload_modules: List[str], cpu_affinity: Optional[List[int]] = None):
+        """
+            Starts the host process and imports the preload modules into it.
+
+            :param preload_modules: The names of the modules to import into the host process.
+            :param cpu_affinity: The indexes of the CPUs the host process is restricted to.
+        """
+        self._manager.start()
+
+        try:
+            self._host = self._manager.TaskingHost()
+            self._pid = self._host.get_pid()
+
+            if cpu_affinity is not None:
+                if not self._host.set_cpu_affinity(cpu_affinity):
+                    logger.warning(f"Unable to restrict tasking host pid={self._pid} to cpus={cpu_affinity} on this platform.")
+
+            if len(preload_modules) > 0:
+                errors = self._host.preload_modules(preload_modules)
+                for errmsg in errors:
+                    logger.warning(errmsg)
+
+            # The memory baseline is taken after the preload so the preloaded modules are not
+            # counted as growth.
+            self._baseline_memory = self._host.get_memory_usage()
+        except:
+            # Don't leave the manager process running when the host could not be set up
+            self.shutdown()
+            raise
+
+        return
+
+
+class TaskingHostPool:
+    """
+        The :class:`TaskingHostPool` keeps a size limited set of warm tasking host processes so a
+        :class:`TaskerSession` does not have to spawn a new process for every tasking.
+
+        * Host processes are pre-forked when the pool is started and are loaded with the preload modules.
+        * A host process runs one tasking at a time, a tasking that is started while all the warm hosts
+          are busy gets a host process of its own that is shut down when the tasking is done.
+        * A host process is recycled after it has run the recycle number of taskings, when its memory has
+          grown by more than the recycle memory growth or when a tasking did not complete cleanly, a
+          replacement is started in the background.
+
+        .. note:: Taskings that are run in the same host process share the module state of the process.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_HOST_POOL_SIZE, preload_modules: Optional[List[str]] = None,
+                 recycle_taskings: Optional[int] = DEFAULT_HOST_RECYCLE_TASKINGS,
+                 recycle_memory_growth: Optional[int] = DEFAULT_HOST_RECYCLE_MEMORY_GROWTH,
+                 cpu_affinity: Optional[List[int]] = None):
+        """
+            Creates a pool of tasking host processes, the hosts are started by calling :meth:`start`.
+
+            :param pool_size: The number of warm host processes to keep.  A size of zero disables reuse and
+                              a new host process is started for every tasking.
+            :param preload_modules: The names of the modules to import into each host process when it is started.
+            :param recycle_taskings: The number of taskings a host process runs before it is recycled.
+            :param recycle_memory_growth: The number of bytes the memory of a host process can grow by before
+                                          it is recycled.
+            :param cpu_affinity: The indexes of the CPUs the host processes are restricted to.
+        """
+        self._pool_size = pool_size
+        self._preload_modules = list(preload_modules) if preload_modules is not None else []
+        self._recycle_taskings = recycle_taskings
+        self._recycle_memory_growth = recycle_memory_growth
+        self._cpu_affinity = list(cpu_affinity) if cpu_affinity is not None else None
+
+        self._pool_lock = threading.Lock()
+
+        # ========================= Pool Lock Variables =========================
+        # These variables are protected by the pool lock and are prefixed with
+        # _pl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._pl_idle: List[TaskingHostProcess] = []
+        self._pl_busy: List[TaskingHostProcess] = []
+        self._pl_starting = 0
+        self._pl_closed = False
+
+        self._pl_started = 0
+        self._pl_reused = 0
+        self._pl_recycled = 0
+        self._pl_overflow = 0
+
+        return
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def preload_modules(self) -> List[str]:
+        return self._preload_modules
+
+    def checkin(self, host: TaskingHostProcess, reusable: bool = True):
+        """
+            Gives a host process back to the pool after a tasking has run in it.
+
+            :param host: The host process the tasking was run in.
+            :param reusable: False if the tasking did not complete cleanly and the host process should not
+                             be reused.
+        """
+        host.mark_tasking_run()
+
+        recycle_reason = None
+
+        if not reusable:
+            recycle_reason = "tasking did not complete"
+        elif self._recycle_taskings is not None and host.taskings_run >= self._recycle_taskings:
+            recycle_reason = f"ran {host.taskings_run} taskings"
+        elif self._recycle_memory_growth is not None:
+            try:
+                growth = host.memory_growth()
+                if growth is not None and growth >= self._recycle_memory_growth:
+                    recycle_reason = f"memory grew by {growth} bytes"
+            except Exception: # pylint: disable=broad-except
+                recycle_reason = "host did not answer"
+
+        keep = False
+        replenish = False
+
+        self._pool_lock.acquire()
+        try:
+            if host in self._pl_busy:
+                self._pl_busy.remove(host)
+
+            if recycle_reason is None and not self._pl_closed and len(self._pl_idle) < self._pool_size:
+                self._pl_idle.append(host)
+                keep = True
+            elif recycle_reason is not None and not self._pl_closed:
+                self._pl_recycled += 1
+                replenish = self._locked_reserve_start()
+        finally:
+            self._pool_lock.release()
+
+        if not keep:
+            if recycle_reason is not None:
+                logger.info(f"Recycling tasking host pid={host.pid}, {recycle_reason}.")
+            host.shutdown()
+
+        if replenish:
+            self._start_in_background(1)
+
+        return
+
+    def checkout(self) -> TaskingHostProcess:
+        """
+            Gets a warm host process from the pool or starts a new one if there are no idle host processes.
+        """
+        host = None
+
+        self._pool_lock.acquire()
+        try:
+            if self._pl_closed:
+                errmsg = "The tasking host pool has been shut down."
+                raise RuntimeError(errmsg)
+
+            if len(self._pl_idle) > 0:
+                # Use the most recently used host so its pages are still warm
+                host = self._pl_idle.pop()
+                self._pl_busy.append(host)
+                self._pl_reused += 1
+            else:
+                self._pl_overflow += 1
+        finally:
+            self._pool_lock.release()
+
+        if host is None:
+            host = self._start_host()
+
+            self._pool_lock.acquire()
+            try:
+                self._pl_busy.append(host)
+            finally:
+                self._pool_lock.release()
+
+        return host
+
+    def memory_usage(self) -> int:
+        """
+            Returns the total resident memory in bytes of the idle and busy host processes of the pool, the
+            host processes whose memory cannot be determined are not counted.
+        """
+        hosts = None
+
+        self._pool_lock.acquire()
+        try:
+            hosts = self._pl_idle + self._pl_busy
+        finally:
+            self._pool_lock.release()
+
+        total = 0
+        for host in hosts:
+            try:
+                usage = host.memory_usage()
+                if usage is not None:
+                    total += usage
+            except Exception: # pylint: disable=broad-except
+                # The host is being recycled or has exited
+                pass
+
+        return total
+
+    def shutdown(self):
+        """
+            Shuts down the idle host processes of the pool, host processes that are running a tasking
+            are shut down when they are checked in.
+        """
+        idle = []
+
+        self._pool_lock.acquire()
+        try:
+            self._pl_closed = True
+
+            idle = self._pl_idle
+            self._pl_idle = []
+        finally:
+            self._pool_lock.release()
+
+        for host in idle:
+            host.shutdown()
+
+        return
+
+    def start(self):
+        """
+            Pre-forks the warm host processes of the pool in the background.
+        """
+        count = 0
+
+        self._pool_lock.acquire()
+        try:
+            while self._locked_reserve_start():
+                count += 1
+        finally:
+            self._pool_lock.release()
+
+        if count > 0:
+            self._start_in_background(count)
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the host process counts of the pool.
+        """
+        stats = None
+
+        self._pool_lock.acquire()
+        try:
+            stats = {
+                "idle": len(self._pl_idle),
+                "busy": len(self._pl_busy),
+                "starting": self._pl_starting,
+                "started": self._pl_started,
+                "reused": self._pl_reused,
+                "recycled": self._pl_recycled,
+                "overflow": self._pl_overflow
+            }
+        finally:
+            self._pool_lock.release()
+
+        return stats
+
+    def _locked_reserve_start(self) -> bool:
+        """
+            Reserves the start of a warm host process if the pool is not full.  The pool lock must be held.
+        """
+        reserved = False
+
+        if not self._pl_closed and len(self._pl_idle) + self._pl_starting < self._pool_size:
+            self._pl_starting += 1
+            reserved = True
+
+        return reserved
+
+    def _start_host(self) -> TaskingHostProcess:
+
+        host = TaskingHostProcess()
+        host.start(self._preload_modules, cpu_affinity=self._cpu_affinity)
+
+        self._pool_lock.acquire()
+        try:
+            self._pl_started += 1
+        finally:
+            self._pool_lock.release()
+
+        return host
+
+    def _start_in_background(self, count: int):
+
+        for _ in range(count):
+            sthread = threading.Thread(target=self._start_thread_entry, name="tasking-host-starter", daemon=True)
+            sthread.start()
+
+        return
+
+    def _start_thread_entry(self):
+
+        host = None
+        try:
+            host = self._start_host()
+        except Exception: # pylint: disable=broad-except
+            logger.exception("Error starting a tasking host process.")
+
+        keep = False
+
+        self._pool_lock.acquire()
+        try:
+            self._pl_starting -= 1
+            if host is not None and not self._pl_closed and len(self._pl_idle) < self._pool_size:
+                self._pl_idle.append(host)
+                keep = True
+        finally:
+            self._pool_lock.release()
+
+        if host is not None and not keep:
+            host.shutdown()
+
+        return
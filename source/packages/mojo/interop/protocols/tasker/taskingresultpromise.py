@@ -12,10 +12,12 @@ __credits__ = []
 
 
 
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, TYPE_CHECKING
 
 import logging
 import os
+import pickle
+import threading
 import time
 
 from datetime import datetime, timedelta
@@ -50,12 +52,236 @@ class TaskingRef:
         return rtnval
 
 
+class TaskingNotification:
+    """
+        The kinds of notifications the tasker service pushes to the caller of a tasking.
+    """
+    PROGRESS = "progress"
+    EVENT = "event"
+    COMPLETED = "completed"
+
+
+class TaskingNotificationReceiver:
+    """
+        The :class:`TaskingNotificationReceiver` receives the progress, events and completion of a tasking that
+        the tasker service pushes over the connection the tasking was started on, so the promise of the tasking
+        can answer status questions without a call to the service.  Threads that are waiting on a group of
+        taskings register a waiter event that is set when a tasking posts an event or completes.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._completed = threading.Event()
+
+        self._receiver_lock = threading.Lock()
+
+        # ======================= Receiver Lock Variables =======================
+        # These variables are protected by the receiver lock and are prefixed with
+        # _rl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._rl_progress = None
+        self._rl_result = None
+        self._rl_events: List[TaskingEvent] = []
+        self._rl_waiters: List[threading.Event] = []
+        return
+
+    @property
+    def completed(self) -> bool:
+        return self._completed.is_set()
+
+    @property
+    def events(self) -> List[TaskingEvent]:
+        events = None
+
+        self._receiver_lock.acquire()
+        try:
+            events = [ev for ev in self._rl_events]
+        finally:
+            self._receiver_lock.release()
+
+        return events
+
+    @property
+    def progress(self) -> ProgressInfo:
+        return self._rl_progress
+
+    @property
+    def push_active(self) -> bool:
+        """
+            Indicates the service is pushing notifications, once the connection of the tasking is lost the
+            state of the tasking has to be requested from the service again.
+        """
+        active = self._client is not None and not self._client.closed
+        return active
+
+    @property
+    def result(self) -> TaskingResult:
+        return self._rl_result
+
+    def add_waiter(self, waiter: threading.Event):
+
+        self._receiver_lock.acquire()
+        try:
+            self._rl_waiters.append(waiter)
+        finally:
+            self._receiver_lock.release()
+
+        # Wake the waiter if it registered after the tasking completed
+        if self._completed.is_set():
+            waiter.set()
+
+        return
+
+    def attach(self, client):
+        """
+            Called once the service has accepted the callback for the tasking, the notifications are trusted
+            for as long as the connection they are pushed over stays open.
+        """
+        self._client = client
+        return
+
+    def notify(self, kind: str, tasking_id: str, payload: bytes):
+        """
+            The callback the tasker service pushes the notifications of the tasking to.
+        """
+        data = pickle.loads(payload)
+
+        waiters = []
+
+        self._receiver_lock.acquire()
+        try:
+            if kind == TaskingNotification.PROGRESS:
+                self._rl_progress = data
+            elif kind == TaskingNotification.EVENT:
+                self._rl_events.append(TaskingEvent.from_dict(data))
+                waiters = [w for w in self._rl_waiters]
+            elif kind == TaskingNotification.COMPLETED:
+                # The service reports the result as the last progress of a tasking
+                self._rl_progress = data
+                self._rl_result = data
+                waiters = [w for w in self._rl_waiters]
+        finally:
+            self._receiver_lock.release()
+
+        if kind == TaskingNotification.COMPLETED:
+            self._completed.set()
+
+        for waiter in waiters:
+            waiter.set()
+
+        return
+
+    def remove_waiter(self, waiter: threading.Event):
+
+        self._receiver_lock.acquire()
+        try:
+            if waiter in self._rl_waiters:
+                self._rl_waiters.remove(waiter)
+        finally:
+            self._receiver_lock.release()
+
+        return
+
+    def wait(self, timeout: float) -> bool:
+        """
+            Waits for the tasking to complete or for the timeout to expire.
+        """
+        completed = self._completed.wait(timeout)
+        return completed
+
+
+class TaskingNotificationRouter:
+    """
+        The :class:`TaskingNotificationRouter` is the single callback a batch of taskings is started with, it routes
+        the notifications the tasker service pushes for the taskings of the batch to their receivers.  The service
+        can push notifications before the call that starts the batch returns, so the notifications for a tasking
+        are held until the receiver of the tasking is added.
+    """
+
+    def __init__(self):
+        self._router_lock = threading.Lock()
+
+        # ======================== Router Lock Variables ========================
+        # These variables are protected by the router lock and are prefixed with
+        # _rl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._rl_receivers: Dict[str, TaskingNotificationReceiver] = {}
+        self._rl_pending: Dict[str, List[Tuple[str, bytes]]] = {}
+        return
+
+    def add_receiver(self, tasking_id: str, receiver: TaskingNotificationReceiver):
+        """
+            Adds the receiver for a tasking and hands it the notifications that arrived before it was added.
+        """
+
+        self._router_lock.acquire()
+        try:
+            self._rl_receivers[tasking_id] = receiver
+
+            # Deliver while holding the lock so a notification that arrives now is not
+            # delivered ahead of the ones that were held.
+            pending = self._rl_pending.pop(tasking_id, [])
+            for kind, payload in pending:
+                receiver.notify(kind, tasking_id, payload)
+        finally:
+            self._router_lock.release()
+
+        return
+
+    def notify(self, kind: str, tasking_id: str, payload: bytes):
+        """
+            The callback the tasker service pushes the notifications of the taskings of the batch to.
+        """
+
+        self._router_lock.acquire()
+        try:
+            if tasking_id in self._rl_receivers:
+                self._rl_receivers[tasking_id].notify(kind, tasking_id, payload)
+            elif tasking_id in self._rl_pending:
+                self._rl_pending[tasking_id].append((kind, payload))
+            else:
+                self._rl_pending[tasking_id] = [(kind, payload)]
+        finally:
+            self._router_lock.release()
+
+        return
+
+
+class SharedTaskingConnection:
+    """
+        Holds the connection and serving thread that a batch of taskings was started on.  The promises of the
+        batch share a reference to it so the connection is closed when the last promise is destroyed.
+    """
+
+    def __init__(self, client, responder):
+        self._client = client
+        self._responder = responder
+        return
+
+    @property
+    def client(self):
+        return self._client
+
+    def __del__(self):
+
+        try:
+            self._responder.stop()
+            self._client.close()
+        except:
+            pass
+
+        return
+
+
 class TaskingResultPromise:
 
     def __init__(self, client, responder, module_name: str, tasking_id: str, task_name: str, log_dir: str,
-                 session_id: str, node: "TaskerNode", progress_monitor: Optional[TaskingProgressMonitor] = None):
+                 session_id: str, node: "TaskerNode", progress_monitor: Optional[TaskingProgressMonitor] = None,
+                 receiver: Optional[TaskingNotificationReceiver] = None,
+                 shared_connection: Optional[SharedTaskingConnection] = None):
         self._client = client
         self._responder = responder
+        self._shared_connection = shared_connection
         self._module_name = module_name
         self._tasking_id = tasking_id
         self._task_name = task_name
@@ -64,6 +290,10 @@ class TaskingResultPromise:
         self._node = node
 
         self._progress_monitor = progress_monitor
+        self._receiver = receiver
+
+        # The last time the completion of a tasking whose completion is pushed was checked with the service
+        self._last_verified = time.monotonic()
         return
 
     def __del__(self):
@@ -73,7 +303,8 @@ class TaskingResultPromise:
 
         # Keep the task run client open until this object
         # is destroyed in case there are NetRef objects that are
-        # being used by the remote end.
+        # being used by the remote end.  The promises of a batch
+        # close their shared connection when the last one goes.
         if self._responder is not None:
             try:
                 self._responder.stop()
@@ -95,6 +326,10 @@ class TaskingResultPromise:
     def session_id(self) -> str:
         return self._session_id
 
+    @property
+    def receiver(self) -> Optional[TaskingNotificationReceiver]:
+        return self._receiver
+
     @property
     def tasking_id(self) -> str:
         return self._tasking_id
@@ -125,11 +360,23 @@ class TaskingResultPromise:
 
         return rtnval
 
+    def add_waiter(self, waiter: threading.Event):
+        """
+            Registers an event that is set when the associated tasking posts an event or completes.  The event is
+            only set for taskings whose service pushes notifications.
+        """
+        if self._receiver is not None:
+            self._receiver.add_waiter(waiter)
+        return
+
     def get_events(self) -> List[TaskingEvent]:
         """
             Get the events that have been posted by the associated tasking.
         """
-        rtnval = self._node.get_tasking_events(tasking_id=self._tasking_id)
+        if self._has_pushed_state():
+            rtnval = self._receiver.events
+        else:
+            rtnval = self._node.get_tasking_events(tasking_id=self._tasking_id)
         
         return rtnval
 
@@ -137,7 +384,10 @@ class TaskingResultPromise:
         """
             Get the result of the associated tasking.
         """
-        rtnval = self._node.get_tasking_result(tasking_id=self._tasking_id)
+        if self._receiver is not None and self._receiver.completed:
+            rtnval = self._receiver.result
+        else:
+            rtnval = self._node.get_tasking_result(tasking_id=self._tasking_id)
         return rtnval
 
     def get_progress(self) -> ProgressInfo:
@@ -145,10 +395,21 @@ class TaskingResultPromise:
             Used by TaskingGroupScope and other group wait methods to probe for progress.
         """
 
-        progress = self._node.get_tasking_progress(tasking_id=self._tasking_id)
+        if self._has_pushed_state():
+            progress = self._receiver.progress
+        else:
+            progress = self._node.get_tasking_progress(tasking_id=self._tasking_id)
 
         return progress
 
+    def remove_waiter(self, waiter: threading.Event):
+        """
+            Removes an event registered with :meth:`add_waiter`.
+        """
+        if self._receiver is not None:
+            self._receiver.remove_waiter(waiter)
+        return
+
     def wait(self, timeout: float=DEFAULT_WAIT_TIMEOUT, interval: float=DEFAULT_WAIT_INTERVAL):
         """
             The 'wait' method on the promise object is used to wait on a single tasking to complete
@@ -178,7 +439,7 @@ class TaskingResultPromise:
         while (True):
 
             try:
-                finished = self.is_task_complete()
+                finished = self.is_task_complete(verify_interval=interval)
                 if finished:
                     break
             except EOFError as ferr:
@@ -191,7 +452,12 @@ class TaskingResultPromise:
             if end_time is not None and now > end_time:
                 break
 
-            time.sleep(interval)
+            if self._receiver is not None:
+                # Wakes as soon as completion is pushed, the interval still bounds the wait so
+                # the completion is checked with the service in case a notification was lost.
+                self._receiver.wait(interval)
+            else:
+                time.sleep(interval)
 
         if not finished:
             if end_time is not None:
@@ -209,15 +475,127 @@ class TaskingResultPromise:
 
         return
     
-    def is_task_complete(self) -> bool:
+    def is_task_complete(self, verify_interval: float = DEFAULT_WAIT_INTERVAL) -> bool:
         """
             Returns a boolean value indicating if the associated tasking is complete.
 
             ..node:  This is intentionally implemented as a method and not a property in order to ensure that
                      we do not make cross process or across network calls from an object property.
+
+            :param verify_interval: The interval to check the completion of a tasking with the service when its
+                                    completion is pushed, so a lost notification does not go unnoticed.
         """
 
-        rtnval = self._node.has_completed_and_result_ready(tasking_id=self._tasking_id)
+        now = time.monotonic()
+
+        if self._receiver is not None and self._receiver.completed:
+            rtnval = True
+        elif self._receiver is not None and self._receiver.push_active and now - self._last_verified < verify_interval:
+            # Completion will be pushed, there is no need to ask the service yet
+            rtnval = False
+        else:
+            rtnval = self._node.has_completed_and_result_ready(tasking_id=self._tasking_id)
+            self._last_verified = now
 
         return rtnval
+
+    def _has_pushed_state(self) -> bool:
+        """
+            Indicates the progress and events of the tasking are known from the notifications pushed by the service.
+        """
+        pushed = self._receiver is not None and (self._receiver.completed or self._receiver.push_active)
+        return pushed
+
+
+def as_completed(promises: Iterable[TaskingResultPromise], timeout: Optional[float] = None,
+                 interval: float = DEFAULT_WAIT_INTERVAL) -> Generator[TaskingResultPromise, None, None]:
+    """
+        Yields the promises of a group of taskings as the taskings complete.  Taskings whose service pushes
+        notifications are yielded as soon as their completion arrives, all the taskings are also checked with
+        their service every interval so a lost notification only delays a tasking by one interval.
+
+        :param promises: The promises of the taskings to wait on.
+        :param timeout: The time to wait for all the taskings to complete or None to wait forever.
+        :param interval: The interval to check the completion of the taskings with their service.
+
+        :raises: :class:`TimeoutError` if the taskings do not all complete within the timeout.
+    """
+    promises = list(promises)
+    pending = list(promises)
+
+    waiter = threading.Event()
+    for prom in promises:
+        prom.add_waiter(waiter)
+
+    end_time = None
+    if timeout is not None:
+        end_time = time.monotonic() + timeout
+
+    try:
+        while len(pending) > 0:
+            # Clear before checking so a completion that arrives during the check wakes the wait
+            waiter.clear()
+
+            done = [prom for prom in pending if prom.is_task_complete(verify_interval=interval)]
+            for prom in done:
+                pending.remove(prom)
+                yield prom
+
+            if len(pending) == 0:
+                break
+
+            wait_time = interval
+            if end_time is not None:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    errmsg = f"Timeout: Waiting for {len(pending)} of {len(promises)} taskings to complete."
+                    raise TimeoutError(errmsg)
+                wait_time = min(interval, remaining)
+
+            waiter.wait(wait_time)
+
+    finally:
+        for prom in promises:
+            prom.remove_waiter(waiter)
+
+    return
+
+
+def wait_any(promises: Iterable[TaskingResultPromise], timeout: Optional[float] = None,
+             interval: float = DEFAULT_WAIT_INTERVAL) -> Tuple[List[TaskingResultPromise], List[TaskingResultPromise]]:
+    """
+        Waits for any tasking of a group of taskings to complete.
+
+        :param promises: The promises of the taskings to wait on.
+        :param timeout: The time to wait for a tasking to complete or None to wait forever.
+        :param interval: The interval to check the completion of the taskings with their service.
+
+        :returns: A tuple with the list of the promises whose taskings have completed and the list of the
+                  promises whose taskings are still pending.
+
+        :raises: :class:`TimeoutError` if none of the taskings complete within the timeout.
+    """
+    promises = list(promises)
+
+    done = []
+    pending = []
+
+    completed = as_completed(promises, timeout=timeout, interval=interval)
+    try:
+        done.append(next(completed))
+    except StopIteration:
+        pass
+    finally:
+        completed.close()
+
+    # Pick up any other taskings that completed at the same time
+    for prom in promises:
+        if prom in done:
+            continue
+        if prom.is_task_complete():
+            done.append(prom)
+        else:
+            pending.append(prom)
+
+    return done, pending
     
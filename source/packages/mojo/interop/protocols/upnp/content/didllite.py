@@ -3,12 +3,11 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
-from typing import List, NamedTuple, Optional
+from typing import Dict, Generator, Iterable, List, NamedTuple, Optional, Union
 
 from enum import Enum
 
-from xml.etree.ElementTree import fromstring as from_xml_string
-from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import Element, XMLPullParser
 
 from mojo.networking.exceptions import ProtocolError
 
@@ -22,8 +21,17 @@ DIDL_NAMESPACES = {
     "upnp": "urn:schemas-upnp-org:metadata-1-0/upnp/"
 }
 
+# The size of the chunks that DIDL-Lite content is fed to the pull parser in, the objects
+# parsed from a chunk are handed out before the next chunk is fed to the parser.
+DIDL_PARSE_CHUNK_SIZE = 16384
+
+DIDL_RESTRICTED_TRUE_VALUES = ("1", "true", "True", "TRUE")
+
+
 class DidlDesc:
 
+    __slots__ = ("_desc", "_attrs")
+
     def __init__(self, *, desc: str, **attrs):
         self._desc = desc
         self._attrs = attrs
@@ -38,7 +46,7 @@ class DidlDesc:
         ]
 
         return xlines
-    
+
     def to_xml(self):
 
         attrs_str = ""
@@ -60,7 +68,20 @@ class DidlResource(NamedTuple):
 
     @classmethod
     def from_xml(cls, res_element: Element):
-        return
+
+        res_attrs = res_element.attrib
+
+        uri = res_element.text.strip() if res_element.text is not None else ""
+
+        size = res_attrs.get("size")
+        if size is not None:
+            try:
+                size = int(size)
+            except ValueError:
+                size = None
+
+        res = cls(res_attrs.get("protocolInfo", ""), uri, duration=res_attrs.get("duration"), size=size)
+        return res
 
     def to_xml_lines(self, indent=""):
 
@@ -77,11 +98,11 @@ class DidlResource(NamedTuple):
         return xlines
 
     def to_xml(self):
-        
+
         sizeattr = ""
         if self.size is not None:
             sizeattr = " size='{}'"
-        
+
         xstr = "<res protocolInfo='{}'{}>{}</res>".format(
             self.protocol_info, sizeattr, self.uri)
 
@@ -95,26 +116,45 @@ class DidlWriteStatus(str, Enum):
     WRITABLE = "WRITABLE"
 
 class DidlObject:
+    """
+        The base of the DIDL-Lite objects.  The objects use slots because a walk of a media library can
+        create tens of thousands of them.
+    """
+
+    __slots__ = ("_oid", "_parent_id", "_restricted", "_title", "_res", "_didl_class")
 
     element_tag = None
     upnp_class = None
 
-    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, res: DidlResource):
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, res: Optional[DidlResource] = None,
+                 didl_class: Optional[str] = None):
         self._oid = oid
         self._parent_id = parent_id
         self._restricted = restricted
         self._title = title
         self._res = res
+        self._didl_class = didl_class
         return
 
+    @property
+    def didl_class(self) -> str:
+        """
+            The upnp:class of the object, which is only different from the upnp_class of the python
+            class for the generic items and containers.
+        """
+        didl_class = self._didl_class
+        if didl_class is None:
+            didl_class = self.upnp_class
+        return didl_class
+
     @property
     def oid(self) -> str:
         return self._oid
-    
+
     @property
     def parent_id(self) -> str:
         return self._parent_id
-    
+
     @property
     def restricted(self) -> bool:
         return self._restricted
@@ -127,11 +167,29 @@ class DidlObject:
     def title(self) -> str:
         return self._title
 
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        """
+            Creates an object from the values the streaming decoder collected for a DIDL-Lite object element.
+
+            :param oid: The id attribute of the object.
+            :param parent_id: The parentID attribute of the object.
+            :param restricted: The restricted attribute of the object.
+            :param attrs: All of the attributes of the object element.
+            :param fields: The text of the child elements of the object keyed by prefixed tag, for example 'dc:title'.
+            :param res: The first resource of the object.
+            :param didl_class: The upnp:class of the object.
+        """
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  res=res)
+        return obj
+
     def create_opening_element(self):
         estr = "<{} id='{}' parentID='{}' restricted='{}' >".format(
             self.element_tag, self._oid, self._parent_id, self._restricted)
         return estr
-    
+
     def create_closing_element(self):
         estr = "</{}>".format(self.element_tag)
         return estr
@@ -145,8 +203,8 @@ class DidlObject:
         if self._title is not None:
             xlines.append('<dc:title>{}</dc:title>'.format(self._title))
 
-        if self.upnp_class is not None:
-            xlines.append('<upnp:class>{}</upnp:class>'.format(self.upnp_class))
+        if self.didl_class is not None:
+            xlines.append('<upnp:class>{}</upnp:class>'.format(self.didl_class))
 
         if self._res is not None:
             res_lines = self._res.to_xml_lines()
@@ -165,8 +223,8 @@ class DidlObject:
         if self._title is not None:
             xml_parts.append('<dc:title>{}</dc:title>'.format(self._title))
 
-        if self.upnp_class is not None:
-            xml_parts.append('<upnp:class>{}</upnp:class>'.format(self.upnp_class))
+        if self.didl_class is not None:
+            xml_parts.append('<upnp:class>{}</upnp:class>'.format(self.didl_class))
 
         if self._res is not None:
             xml_parts.append(self._res.to_xml())
@@ -177,76 +235,124 @@ class DidlObject:
 
         return xmlstr
 
-class DidlContainerPhotoAlbum(DidlObject):
+    def __repr__(self) -> str:
+        rstr = "<{} oid={!r} title={!r}>".format(type(self).__name__, self._oid, self._title)
+        return rstr
+
+class DidlContainer(DidlObject):
+    """
+        A generic container, it is used for the container classes that do not have a specific python class.
+    """
+
+    __slots__ = ("_child_count",)
 
     element_tag = "container"
-    upnp_class = "object.container.album.photoAlbum"
+    upnp_class = "object.container"
 
-    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, child_count: int,
-                 storage_used: int, write_status: str = DidlWriteStatus.UNKNOWN):
-        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title)
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, child_count: int = -1,
+                 res: Optional[DidlResource] = None, didl_class: Optional[str] = None):
+        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title, res=res, didl_class=didl_class)
         self._child_count = child_count
+        return
+
+    @property
+    def child_count(self) -> int:
+        return self._child_count
+
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  child_count=_int_value(attrs.get("childCount")), res=res, didl_class=didl_class)
+        return obj
+
+class DidlContainerPhotoAlbum(DidlContainer):
+
+    __slots__ = ("_storage_used", "_write_status")
+
+    upnp_class = "object.container.album.photoAlbum"
+
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, child_count: int = -1,
+                 storage_used: int = -1, write_status: str = DidlWriteStatus.UNKNOWN):
+        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title, child_count=child_count)
         self._storage_used = storage_used
         self._write_status = write_status
         return
-    
-    @classmethod
-    def from_xml(cls, obj_element: Element, namespaces: Optional[dict]=None):
-        
-        oid = obj_element.attrib["id"]
-        parent_id = obj_element.attrib["parentID"]
-        restricted = obj_element.attrib["restricted"]
-
-        # Read the Required elements
-        e_title = obj_element.find("dc:title", namespaces=namespaces)
-        if e_title is None:
-            errmsg = "DIDL message for DidlItemMusicTrack is missing a required element 'title'."
-            raise ProtocolError(errmsg)
-        title = e_title.text
 
-        obj = DidlContainerStorageFolder(oid=oid, parent_id=parent_id, restricted=restricted)
+    @property
+    def storage_used(self) -> int:
+        return self._storage_used
+
+    @property
+    def write_status(self) -> str:
+        return self._write_status
+
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  child_count=_int_value(attrs.get("childCount")), storage_used=_int_value(fields.get("upnp:storageUsed")),
+                  write_status=_write_status_value(fields.get("upnp:writeStatus")))
         return obj
 
 
-class DidlContainerStorageFolder(DidlObject):
+class DidlContainerStorageFolder(DidlContainer):
+
+    __slots__ = ("_storage_used", "_write_status")
 
-    element_tag = "container"
     upnp_class = "object.container.storageFolder"
 
-    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, child_count: int,
-                 storage_used: int, write_status: str = DidlWriteStatus.UNKNOWN):
-        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title)
-        self._child_count = child_count
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, child_count: int = -1,
+                 storage_used: int = -1, write_status: str = DidlWriteStatus.UNKNOWN):
+        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title, child_count=child_count)
         self._storage_used = storage_used
         self._write_status = write_status
         return
-    
-    @classmethod
-    def from_xml(cls, obj_element: Element, namespaces: Optional[dict]=None):
-        
-        oid = obj_element.attrib["id"]
-        parent_id = obj_element.attrib["parentID"]
-        restricted = obj_element.attrib["restricted"]
-
-        # Read the Required elements
-        e_title = obj_element.find("dc:title", namespaces=namespaces)
-        if e_title is None:
-            errmsg = "DIDL message for DidlItemMusicTrack is missing a required element 'title'."
-            raise ProtocolError(errmsg)
-        title = e_title.text
 
-        child_count = -1
-        storage_used = -1
-        write_status = DidlWriteStatus.UNKNOWN
+    @property
+    def storage_used(self) -> int:
+        return self._storage_used
+
+    @property
+    def write_status(self) -> str:
+        return self._write_status
 
-        obj = DidlContainerStorageFolder(oid=oid, parent_id=parent_id, restricted=restricted, title=title,
-            child_count=child_count, storage_used=storage_used, write_status=write_status)
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  child_count=_int_value(attrs.get("childCount")), storage_used=_int_value(fields.get("upnp:storageUsed")),
+                  write_status=_write_status_value(fields.get("upnp:writeStatus")))
         return obj
 
 
-class DidlItemAlbumArt(DidlObject):
+class DidlItem(DidlObject):
+    """
+        A generic item, it is used for the item classes that do not have a specific python class.
+    """
+
+    __slots__ = ()
 
     element_tag = "item"
+    upnp_class = "object.item"
+
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, res: Optional[DidlResource] = None,
+                 didl_class: Optional[str] = None):
+        super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title, res=res, didl_class=didl_class)
+        return
+
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  res=res, didl_class=didl_class)
+        return obj
+
+
+class DidlItemAlbumArt(DidlItem):
+
+    __slots__ = ()
+
     upnp_class = "object.item.imageItem.photo.vendorAlbumArt"
 
     def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, res: DidlResource):
@@ -254,69 +360,56 @@ class DidlItemAlbumArt(DidlObject):
         return
 
     @classmethod
-    def from_xml(cls, obj_element: Element, namespaces: Optional[dict]=None):
-        
-        # Read the Required attributes
-        oid = obj_element.attrib["id"]
-        parent_id = obj_element.attrib["parentID"]
-        restricted = obj_element.attrib["restricted"]
-
-        obj = None
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  res=res)
         return obj
 
-class DidlItemMusicTrack(DidlObject):
+class DidlItemMusicTrack(DidlItem):
+
+    __slots__ = ("_creator", "_album", "_album_art", "_genre")
 
-    element_tag = "item"
     upnp_class = "object.item.audioItem.musicTrack"
 
-    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, res: DidlResource, creator: str,
-                 album_art: Optional[str] = None, genre: Optional[str] = None):
+    def __init__(self, *, oid: str, parent_id: str, restricted: bool, title: str, res: Optional[DidlResource], creator: Optional[str],
+                 album: Optional[str] = None, album_art: Optional[str] = None, genre: Optional[str] = None):
         super().__init__(oid=oid, parent_id=parent_id, restricted=restricted, title=title, res=res)
         self._creator = creator
+        self._album = album
         self._album_art = album_art
         self._genre = genre
         return
-    
-    @classmethod
-    def from_xml(self, obj_element: Element, namespaces: Optional[dict]=None):
 
-        # Read the Required attributes
-        oid = obj_element.attrib["id"]
-        parent_id = obj_element.attrib["parentID"]
-        restricted = obj_element.attrib["restricted"]
-
-        # Read the Required elements
-        e_title = obj_element.find("dc:title", namespaces=namespaces)
-        if e_title is None:
-            errmsg = "DIDL message for DidlItemMusicTrack is missing a required element 'title'."
-            raise ProtocolError(errmsg)
-        title = e_title.text
-
-        e_res = obj_element.find("", namespaces=namespaces)
-        if e_res is None:
-            errmsg = "DIDL message for DidlItemMusicTrack is missing a required element 'title'."
-            raise ProtocolError(errmsg)
-        res = DidlResource.from_xml(e_res)
+    @property
+    def album(self) -> Optional[str]:
+        return self._album
 
-        # Read the Optional elements
-        creator = None
-        e_creator = obj_element.find("dc:creator", namespaces=namespaces)
-        if e_creator is not None:
-            creator = e_creator.text
+    @property
+    def album_art(self) -> Optional[str]:
+        return self._album_art
 
-        album_art = None
-        e_album_art = obj_element.find("upnp:albumArtURI", namespaces=namespaces)
-        if e_album_art is not None:
-            album_art = e_album_art.text
+    @property
+    def creator(self) -> Optional[str]:
+        return self._creator
 
-        obj = DidlItemMusicTrack(oid=oid, parent_id=parent_id, restricted=restricted, title=title, creator=creator, album_art=album_art)
+    @property
+    def genre(self) -> Optional[str]:
+        return self._genre
 
+    @classmethod
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  res=res, creator=fields.get("dc:creator"), album=fields.get("upnp:album"),
+                  album_art=fields.get("upnp:albumArtURI"), genre=fields.get("upnp:genre"))
         return obj
 
 
-class DidlItemPhoto(DidlObject):
+class DidlItemPhoto(DidlItem):
+
+    __slots__ = ("_date",)
 
-    element_tag = "item"
     upnp_class = "object.item.imageItem.photo"
 
     def __init__(self, *, oid: str, parent_id: str, restricted: bool, title:str, res: DidlResource, date: str):
@@ -327,19 +420,35 @@ class DidlItemPhoto(DidlObject):
     @property
     def date(self):
         return self._date
-    
+
     @classmethod
-    def from_xml(self, obj_element: Element, namespaces: Optional[dict]=None):
-        
-        # Read the Required attributes
-        oid = obj_element.attrib["id"]
-        parent_id = obj_element.attrib["parentID"]
-        restricted = obj_element.attrib["restricted"]
-
-        obj = None
+    def from_fields(cls, oid: str, parent_id: str, restricted: bool, attrs: Dict[str, str], fields: Dict[str, str],
+                    res: Optional[DidlResource], didl_class: str):
+        obj = cls(oid=oid, parent_id=parent_id, restricted=restricted, title=_required_field(cls, fields, "dc:title"),
+                  res=res, date=fields.get("dc:date"))
         return obj
 
 
+# The table used to dispatch the creation of an object by the upnp:class of the object
+DIDL_CLASS_TABLE = {
+    didl_cls.upnp_class: didl_cls for didl_cls in [
+        DidlContainer,
+        DidlContainerPhotoAlbum,
+        DidlContainerStorageFolder,
+        DidlItem,
+        DidlItemAlbumArt,
+        DidlItemMusicTrack,
+        DidlItemPhoto
+    ]
+}
+
+# The classes used for objects with a upnp:class that is not in the class table
+DIDL_GENERIC_CLASS_TABLE = {
+    DidlContainer.element_tag: DidlContainer,
+    DidlItem.element_tag: DidlItem
+}
+
+
 class DidlLitePacket:
 
     xml_namespaces = {
@@ -348,7 +457,9 @@ class DidlLitePacket:
         '': 'urn:schemas-upnp-org:metadata-1-0/DIDL-Lite/'
     }
 
-    def __init__(self, objects: List[DidlObject] = []):
+    def __init__(self, objects: Optional[List[DidlObject]] = None):
+        if objects is None:
+            objects = []
         self._objects = objects
         return
 
@@ -394,38 +505,165 @@ class DidlLitePacket:
 
         return xstr
 
-def parse_didl_lite_packet(content, namespaces=DIDL_NAMESPACES):
-
-    root_element: Element = from_xml_string(content)
 
-    obj_items = []
+def _int_value(val: Optional[str]) -> int:
+    ival = -1
+    if val is not None:
+        try:
+            ival = int(val)
+        except ValueError:
+            ival = -1
+    return ival
+
+
+def _required_field(didl_cls: type, fields: Dict[str, str], field_name: str) -> str:
+    val = fields.get(field_name)
+    if val is None:
+        errmsg = "DIDL message for {} is missing a required element '{}'.".format(didl_cls.__name__, field_name)
+        raise ProtocolError(errmsg)
+    return val
+
+
+def _write_status_value(val: Optional[str]) -> DidlWriteStatus:
+    status = DidlWriteStatus.UNKNOWN
+    if val is not None:
+        try:
+            status = DidlWriteStatus(val)
+        except ValueError:
+            status = DidlWriteStatus.UNKNOWN
+    return status
+
+
+def didl_field_names(namespaces: Dict[str, str] = DIDL_NAMESPACES) -> Dict[str, str]:
+    """
+        Creates the table that maps the '{namespace}tag' names of elements to the prefixed names the
+        decoder uses for fields, for example 'dc:title'.
+    """
+    ns_prefixes = {}
+    for prefix, uri in namespaces.items():
+        ns_prefixes[uri] = prefix + ":" if prefix else ""
+    return ns_prefixes
+
+
+def create_didl_object(obj_element: Element, fields: Dict[str, str], res: Optional[DidlResource]) -> DidlObject:
+    """
+        Creates the DIDL object for an object element by dispatching on the upnp:class of the object.
+
+        :param obj_element: The item or container element.
+        :param fields: The text of the child elements of the object keyed by prefixed tag.
+        :param res: The first resource of the object.
+
+        :returns: The DIDL object.
+    """
+    element_tag = obj_element.tag.rpartition("}")[2]
+
+    didl_class = fields.get("upnp:class")
+    if didl_class is None:
+        errmsg = "DIDL '{}' element is missing a required element 'upnp:class'.".format(element_tag)
+        raise ProtocolError(errmsg)
+
+    didl_cls = DIDL_CLASS_TABLE.get(didl_class)
+    if didl_cls is None or didl_cls.element_tag != element_tag:
+        didl_cls = DIDL_GENERIC_CLASS_TABLE.get(element_tag)
+        if didl_cls is None:
+            errmsg = "Unknown DIDL object element '{}' with class '{}'.".format(element_tag, didl_class)
+            raise ProtocolError(errmsg)
 
-    root_children = [ ce for ce in root_element ]
+    attrs = obj_element.attrib
+
+    oid = attrs.get("id")
+    parent_id = attrs.get("parentID")
+    restricted = attrs.get("restricted") in DIDL_RESTRICTED_TRUE_VALUES
+
+    obj = didl_cls.from_fields(oid, parent_id, restricted, attrs, fields, res, didl_class)
+    return obj
+
+
+def iter_didl_lite_objects(content: Union[str, bytes, Iterable[Union[str, bytes]]],
+                           namespaces: Dict[str, str] = DIDL_NAMESPACES,
+                           chunk_size: int = DIDL_PARSE_CHUNK_SIZE) -> Generator[DidlObject, None, None]:
+    """
+        Decodes the objects in DIDL-Lite content as they are parsed.  The content is fed to a pull parser in
+        chunks and each object element is released as soon as its object has been created, so the tree of the
+        full document is never built.  The first value of each child element of an object is kept, repeated
+        child elements like 'upnp:searchClass' only keep their first value.
+
+        :param content: The DIDL-Lite document or an iterable of the chunks of the document.
+        :param namespaces: The namespace prefixes used for the field names.
+        :param chunk_size: The size of the chunks a document is fed to the parser in.
+
+        :returns: A generator of the DIDL objects in the content.
+    """
+    if isinstance(content, (str, bytes)):
+        chunks = (content[cidx:cidx + chunk_size] for cidx in range(0, len(content), chunk_size))
+    else:
+        chunks = content
+
+    ns_prefixes = didl_field_names(namespaces)
+    field_names = {}
+
+    parser = XMLPullParser(events=("start", "end"))
+
+    depth = 0
+    root_element = None
+    fields = None
+    res = None
+
+    for chunk in chunks:
+        parser.feed(chunk)
+
+        for event, element in parser.read_events():
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root_element = element
+                elif depth == 2:
+                    fields = {}
+                    res = None
+                continue
+
+            if depth == 3:
+                tag = element.tag
+                field_name = field_names.get(tag)
+                if field_name is None:
+                    if tag[0] == "{":
+                        ns_uri, _, local_name = tag[1:].partition("}")
+                        field_name = ns_prefixes.get(ns_uri, "") + local_name
+                    else:
+                        field_name = tag
+                    field_names[tag] = field_name
+
+                if field_name == "res":
+                    if res is None:
+                        res = DidlResource.from_xml(element)
+                elif field_name not in fields:
+                    fields[field_name] = element.text.strip() if element.text is not None else ""
+
+            elif depth == 2:
+                obj = create_didl_object(element, fields, res)
+
+                # Release the object element so the document tree does not grow
+                root_element.remove(element)
+                fields = None
+                res = None
+
+                yield obj
+
+            depth -= 1
+
+    parser.close()
 
-    for obj_element in root_children:
-        
-        class_element = obj_element.find("upnp:class", namespaces=namespaces)
-        didl_class = class_element.text
+    return
 
-        obj = None
 
-        if didl_class == "object.container.storageFolder":
-            obj = DidlContainerStorageFolder.from_xml(obj_element, namespaces=namespaces)
-        elif didl_class == "object.container.album.photoAlbum":
-            obj = DidlContainerPhotoAlbum.from_xml(obj_element, namespaces=namespaces)
-        elif didl_class == "object.item.imageItem.photo.vendorAlbumArt":
-            obj = DidlItemAlbumArt.from_xml(obj_element, namespaces=namespaces)
-        elif didl_class == "object.item.audioItem.musicTrack":
-            obj = DidlItemMusicTrack.from_xml(obj_element, namespaces=namespaces)
-        elif didl_class == "object.item.imageItem.photo":
-            obj = DidlItemPhoto.from_xml(obj_element, namespaces=namespaces)
-        else:
-            errmsg = "Unknown DIDL object class '{}':".format(didl_class)
-            raise ProtocolError(errmsg)
+def parse_didl_lite_packet(content, namespaces=DIDL_NAMESPACES) -> DidlLitePacket:
+    """
+        Parses a DIDL-Lite document into a :class:`DidlLitePacket`.  Use :func:`iter_didl_lite_objects` to
+        process the objects of large documents without holding all of them.
+    """
+    packet = DidlLitePacket(list(iter_didl_lite_objects(content, namespaces=namespaces)))
+    return packet
 
-        obj_items.append(obj)
-
-    return
 
 EXAMPLE_DIDL_PACKET = """
 <DIDL-Lite xmlns:dc="http://purl.org/dc/elements/1.1/"
@@ -487,4 +725,5 @@ EXAMPLE_DIDL_PACKET = """
 """
 
 if __name__ == "__main__":
-    parse_didl_lite_packet(EXAMPLE_DIDL_PACKET)
\ No newline at end of file
+    for didl_obj in iter_didl_lite_objects(EXAMPLE_DIDL_PACKET.strip()):
+        print(didl_obj)
@@ -20,9 +20,8 @@ import weakref
 from xml.etree.ElementTree import fromstring as xml_fromstring
 from xml.etree.ElementTree import Element
 
-import requests
-
 from mojo.interop.protocols.upnp.upnperrors import UpnpServiceNotAvailableError
+from mojo.interop.protocols.upnp.upnpdescriptioncache import upnp_description_fetch
 
 from mojo.xmods.extension.dynamic import generate_extension_key
 
@@ -127,9 +126,9 @@ class UpnpDevice:
             if nxtsvc.serviceType == service_type:
                 fullurl = self.URLBase.rstrip("/") + "/" + nxtsvc.SCPDURL.lstrip("/")
 
-                resp = requests.get(fullurl)
-                if resp.status_code == 200:
-                    svc_content = resp.text
+                status_code, content = upnp_description_fetch(fullurl)
+                if status_code == 200:
+                    svc_content = content.decode("utf-8")
                     break
 
         return svc_content
@@ -265,15 +264,14 @@ class UpnpDevice:
         """
         svcdesc = None
 
-        resp = requests.get(sdurl)
-        if resp.status_code == 200:
+        status_code, content = upnp_description_fetch(sdurl)
+        if status_code == 200:
             svcdesc = {}
 
             namespaces = {"": UPNP_SERVICE1_NAMESPACE}
 
             try:
-                xml_content = resp.text
-                descDoc = xml_fromstring(xml_content)
+                descDoc = xml_fromstring(content)
 
                 specVersionNode = descDoc.find("specVersion", namespaces=namespaces)
                 verInfo = self._locked_process_node_spec_version(specVersionNode, namespaces=namespaces)
@@ -30,8 +30,6 @@ from xml.etree.ElementTree import fromstring as xml_fromstring
 from xml.etree.ElementTree import Element, ElementTree
 from xml.etree.ElementTree import register_namespace
 
-import requests
-
 from requests.compat import urljoin
 
 from mojo.networking.exceptions import ProtocolError, HttpRequestError, NotOverloadedError
@@ -45,6 +43,8 @@ from mojo.interop.protocols.upnp.upnperrors import UpnpError
 from mojo.interop.protocols.upnp.aliases import StrSvcId, StrSvcType, StrSubId
 from mojo.interop.protocols.upnp.upnpconstants import TIMEDELTA_RENEWAL_WINDOW, UPNP_HEADERS
 from mojo.interop.protocols.upnp.upnpprotocol import MSearchRouteKeys
+from mojo.interop.protocols.upnp.upnphttpsession import upnp_http_request
+from mojo.interop.protocols.upnp.upnpdescriptioncache import upnp_description_fetch
 from mojo.interop.protocols.upnp.devices.upnpdevice import UpnpDevice
 from mojo.interop.protocols.upnp.devices.upnpembeddeddevice import UpnpEmbeddedDevice
 from mojo.interop.protocols.upnp.xml.upnpdevice1 import UPNP_DEVICE1_NAMESPACE, UpnpDevice1Device, UpnpDevice1SpecVersion
@@ -70,20 +70,23 @@ UPNP_DIR = os.path.dirname(upnp_module.__file__)
 
 REGEX_SUBSCRIPTION_TIMEOUT = re.compile("^Second-([0-9]+|infinite)", flags=re.IGNORECASE)
 
-def device_description_load(location: str) -> Union[ElementTree, None]:
+def device_description_load(location: str, udn: Optional[str] = None, configid: Optional[str] = None,
+                            bootid: Optional[str] = None) -> Union[ElementTree, None]:
     """
-        Gets the description document from the specified URL and loads the contents into an XML ElementTree.
+        Gets the description document from the specified URL and loads the contents into an XML ElementTree.  The
+        document is served from the description cache when the cached copy is still valid.
 
         :param location: The url of where to get the device description.
+        :param udn: The UDN of the device, used with the configid or bootid to validate the cached documents.
+        :param configid: The CONFIGID.UPNP.ORG value the device advertised.
+        :param bootid: The BOOTID.UPNP.ORG value the device advertised.
 
         :returns: The XML ElementTree for the XML content from the device description or None.
     """
     docTree = None
 
-    resp = requests.get(location)
-    if resp.status_code == 200:
-        xmlcontent = resp.content
-
+    status_code, xmlcontent = upnp_description_fetch(location, udn=udn, configid=configid, bootid=bootid)
+    if status_code == 200:
         docTree = ElementTree(xml_fromstring(xmlcontent))
 
     return  docTree
@@ -194,6 +197,7 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
 
         self._subscriptions: Dict[StrSvcType, Tuple[StrSvcId, datetime]] = {}
         self._sid_to_service_lookup: Dict[str, UpnpServiceProxy] = {}
+        self._subscription_timeouts: Dict[StrSvcType, int] = {}
         self._variables = {}
 
         self._last_alive = datetime.min
@@ -564,6 +568,32 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
 
         return
 
+    def process_subscription_properties(self, sender_ip, sid: str, headers: dict, propertyNodeList: List[Element]):
+        """
+            Completes the processing of a subscription callback whose body has already been parsed into
+            its list of `property` elements, routing the properties to the UpnpServiceProxy instance.
+
+            :param sender_ip: The IP address of the entity sending the update
+            :param sid: The Subscription ID (sid) associated with the subscription callback
+            :param headers: The HTTP headers contained in the callback response.
+            :param propertyNodeList: The `property` elements from the body of the subscription callback.
+        """
+        # pylint: disable=unused-argument
+
+        service = None
+
+        self._device_lock.acquire()
+        try:
+            if sid in self._sid_to_service_lookup:
+                service = self._sid_to_service_lookup[sid]
+        finally:
+            self._device_lock.release()
+
+        if service is not None:
+            service._update_event_variables(sender_ip, self._usn_dev, propertyNodeList) # pylint: disable=protected-access
+
+        return
+
     def query_device_description(self):
         """
             Queries the UPnP device for its description.
@@ -572,7 +602,8 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
         return desc
 
 
-    def record_description(self, ip_addr: str, urlBase: str, manufacturer: str, modelName: str, docTree: ElementTree, devNode: Element, namespaces: str, upnp_recording: bool = False):
+    def record_description(self, ip_addr: str, urlBase: str, manufacturer: str, modelName: str, docTree: ElementTree, devNode: Element, namespaces: str,
+                           upnp_recording: bool = False, description_current: bool = False):
         """
             Called to record a description of a UPNP root device.
 
@@ -583,16 +614,21 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
             :param devNode: The 'device' element node from the device description.
             :param namespaces: A dictionary of namespaced to use when processing the XML document.
             :param upnp_recording: Force the recording of the device description and will overwrite existing device descriptions.
+            :param description_current: Indicates the description came from the description cache unchanged, when the device
+                                        has already been recorded the recording is not forced and only missing files are written.
         """
         manufacturerNormalized = normalize_name_for_path(manufacturer)
         modelName = normalize_name_for_path(modelName)
 
         root_dev_dir = os.path.join(DIR_UPNP_SCAN_INTEGRATION_ROOTDEVICES, manufacturerNormalized)
         if not os.path.exists(root_dev_dir):
-            os.makedirs(root_dev_dir)
+            os.makedirs(root_dev_dir, exist_ok=True)
 
         root_dev_def_file = os.path.join(root_dev_dir, modelName + ".xml")
 
+        if upnp_recording and description_current and os.path.exists(root_dev_def_file):
+            upnp_recording = False
+
         if upnp_recording:
             console_msg_lines = [
                 "================================================================",
@@ -687,6 +723,34 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
 
         return
 
+    def renew_subscription(self, service_type: str) -> bool:
+        """
+            Renews the event subscription of this device for the specified service type.  This is called by
+            the renewal scheduler of the coordinator ahead of the subscription expiring.
+
+            :param service_type: The service type of the subscription to renew.
+
+            :returns: True if the subscription was renewed, False if the device no longer has a subscription
+                      for the service type.
+        """
+        service = None
+
+        self._device_lock.acquire()
+        try:
+            if self._available and service_type in self._subscriptions:
+                sub_sid, _ = self._subscriptions[service_type]
+                if sub_sid is not None and sub_sid in self._sid_to_service_lookup:
+                    service = self._sid_to_service_lookup[sub_sid]
+        finally:
+            self._device_lock.release()
+
+        renewed = False
+        if service is not None:
+            sub_sid, _ = self.subscribe_to_events(service, renew=True)
+            renewed = sub_sid is not None
+
+        return renewed
+
     def set_auto_subscribe(self, val, factory: Optional["UpnpFactory"] = None):
         self._auto_subscribe = val
         return
@@ -721,8 +785,13 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
             UpnpEventVar object that can be used to read the current value for
             the given event.
 
+            When the service already has a subscription and `renew` is True, the subscription is renewed
+            by sending a SUBSCRIBE with the SID of the subscription.  A new subscription is only created
+            if the device no longer knows the SID and answers the renewal with a 412.
+
             :param service: A :class:`mojo.protocols.upnp.services.upnpserviceproxy.UpnpServiceProxy`
                             for which to subscribe to events.
+            :param renew: Renew the existing subscription of the service.
             :param timeout: The timeout to pass as a header when creating the subscription.
         """
         sub_sid = None
@@ -745,6 +814,9 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
                         # The service was unsubscribed so this is the same as a new
                         # subscription.
                         new_subscription = True
+
+                if timeout is None and service_type in self._subscription_timeouts:
+                    timeout = self._subscription_timeouts[service_type]
             finally:
                 self._device_lock.release()
 
@@ -766,24 +838,49 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
 
                 coord = self._coord_ref()
 
-                ifname = self._primary_route[MSearchRouteKeys.IFNAME]
+                prev_sid = None
+                if not new_subscription and sub_sid is not None:
+                    prev_sid = sub_sid
+
+                resp = None
+                if prev_sid is not None:
+                    # A renewal only carries the SID and the TIMEOUT, the CALLBACK and NT headers
+                    # are only allowed on the SUBSCRIBE that creates the subscription.
+                    headers = { "HOST": self._host, "User-Agent": UPNP_HEADERS.USER_AGENT, "SID": prev_sid }
+                    if timeout is not None:
+                        headers["TIMEOUT"] = "Second-%d" % int(timeout)
 
-                callback_url = coord.lookup_callback_url_for_interface(ifname)
-                if callback_url is None:
-                    errmsg = "No callback url found for ifname={}".format(ifname)
-                    raise RuntimeError(errmsg) from None
+                    resp = upnp_http_request(
+                        "SUBSCRIBE", subscribe_url, headers=headers, auth=subscribe_auth
+                    )
 
-                headers = { "HOST": self._host, "User-Agent": UPNP_HEADERS.USER_AGENT, "CALLBACK": callback_url, "NT": "upnp:event"}
-                if timeout is not None:
-                    headers["TIMEOUT"] = "Seconds-%s" % timeout
+                    if resp.status_code == 412:
+                        # The device does not know the SID anymore, the subscription expired
+                        # or the device rebooted, so we fall back to a new subscription.
+                        self._logger.debug("Renewal of subscription sid={} was rejected, resubscribing.".format(prev_sid))
+                        self._discard_subscription_id(prev_sid)
+                        prev_sid = None
+                        resp = None
 
-                custom_headers = self.get_custom_subscribe_headers()
-                if custom_headers is not None:
-                    headers.update(custom_headers)
+                if resp is None:
+                    ifname = self._primary_route[MSearchRouteKeys.IFNAME]
 
-                resp = requests.request(
-                    "SUBSCRIBE", subscribe_url, headers=headers, auth=subscribe_auth
-                )
+                    callback_url = coord.lookup_callback_url_for_interface(ifname)
+                    if callback_url is None:
+                        errmsg = "No callback url found for ifname={}".format(ifname)
+                        raise RuntimeError(errmsg) from None
+
+                    headers = { "HOST": self._host, "User-Agent": UPNP_HEADERS.USER_AGENT, "CALLBACK": callback_url, "NT": "upnp:event"}
+                    if timeout is not None:
+                        headers["TIMEOUT"] = "Second-%d" % int(timeout)
+
+                    custom_headers = self.get_custom_subscribe_headers()
+                    if custom_headers is not None:
+                        headers.update(custom_headers)
+
+                    resp = upnp_http_request(
+                        "SUBSCRIBE", subscribe_url, headers=headers, auth=subscribe_auth
+                    )
 
                 if resp.status_code == 200:
                     #============================== Expected Response Headers ==============================
@@ -796,7 +893,11 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
                     nxtheader = None
                     try:
                         nxtheader = "SID"
-                        sub_sid = resp_headers[nxtheader]
+                        if prev_sid is not None:
+                            # The SID stays the same on a renewal unless the device hands out a new one
+                            sub_sid = resp_headers.get(nxtheader, prev_sid)
+                        else:
+                            sub_sid = resp_headers[nxtheader]
 
                         nxtheader = "TIMEOUT"
                         sub_timeout_str = resp_headers[nxtheader]
@@ -811,11 +912,15 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
                         sub_timeout = 86400 if timeout_str == "infinite" else int(timeout_str)
 
                     if sub_sid is not None:
+                        if prev_sid is not None and sub_sid != prev_sid:
+                            self._discard_subscription_id(prev_sid)
+
                         sub_expires = datetime.now() + timedelta(seconds=sub_timeout)
                         self._device_lock.acquire()
                         try:
                             self._sid_to_service_lookup[sub_sid] = service
                             self._subscriptions[service_type] = (sub_sid, sub_expires)
+                            self._subscription_timeouts[service_type] = sub_timeout
                         finally:
                             self._device_lock.release()
 
@@ -823,6 +928,9 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
                         # register the subscription ID so the coordinator can forward along
                         # notify message content
                         coord.register_subscription_for_device(sub_sid, self)
+
+                        # Have the coordinator renew the subscription before it expires
+                        coord.schedule_subscription_renewal(self, service_type, sub_expires)
                     else:
                         self._device_lock.acquire()
                         try:
@@ -850,13 +958,17 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
             if subscription_id is None:
                 subscription_id = service.subscriptionId
 
+            coord = self._coord_ref()
+            if coord is not None:
+                coord.cancel_subscription_renewal(self, service.SERVICE_TYPE)
+
             service._clear_subscription()
 
             subscribe_url = urljoin(self.URLBase, service.eventSubURL)
             subscribe_auth = ""
             headers = { "HOST": self._host, "User-Agent": UPNP_HEADERS.USER_AGENT, "SID": subscription_id}
                 
-            resp = requests.request(
+            resp = upnp_http_request(
                     "UNSUBSCRIBE", subscribe_url, headers=headers, auth=subscribe_auth
                 )
             if resp.status_code != 200 and resp.status_code != 412:
@@ -925,6 +1037,26 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
         dev_desc_node = UpnpDevice1Device(devNode, namespaces=namespaces)
         return dev_desc_node
 
+    def _discard_subscription_id(self, sid: str):
+        """
+            Forgets a subscription id the device has stopped using so notifications for the old
+            subscription are no longer routed to this device.
+
+            :param sid: The subscription id to forget.
+        """
+        self._device_lock.acquire()
+        try:
+            if sid in self._sid_to_service_lookup:
+                del self._sid_to_service_lookup[sid]
+        finally:
+            self._device_lock.release()
+
+        coord = self._coord_ref()
+        if coord is not None:
+            coord.unregister_subscription_for_device(sid, self)
+
+        return
+
     def _enhance_device_detail(self):
         """
             Can be implemented by custom devices in order to be able query for and enhance a devices
@@ -1124,9 +1256,8 @@ class UpnpRootDevice(UpnpDevice, ProtocolExtension):
                     print(svc_msg)
 
                 try:
-                    resp = requests.get(scpdUrl)
-                    if resp.status_code == 200:
-                        svc_content = resp.content
+                    status_code, svc_content = upnp_description_fetch(scpdUrl)
+                    if status_code == 200:
                         with open(dyn_svc_filename, 'wb') as sdf:
                             sdf.write(svc_content)
                     else:
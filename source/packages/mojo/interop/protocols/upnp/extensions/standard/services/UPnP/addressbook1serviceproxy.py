@@ -24,6 +24,10 @@ class AddressBook1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "IncomingRequest": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "RetrieveIncomingRequests": (("ActiveIncomingRequests", "string"),),
+    }
+
     def action_Accept(self, RequestID, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the Accept action.
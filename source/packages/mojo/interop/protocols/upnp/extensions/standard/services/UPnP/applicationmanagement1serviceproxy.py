@@ -27,6 +27,17 @@ class ApplicationManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "RunningAppList": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAppConnectionInfo": (("ConnectionInfo", "string"),),
+        "GetAppIDList": (("AppIDs", "string"),),
+        "GetAppInfoByIDs": (("AppInfo", "string"),),
+        "GetRunningAppList": (("RunningAppList", "string"),),
+        "GetRunningStatus": (("RunningStatus", "string"),),
+        "GetSupportedTargetFields": (("SupportedTargetFields", "string"),),
+        "StartAppByURI": (("AppID", "string"),),
+        "StopApp": (("StoppedAppIDs", "string"),),
+    }
+
     def action_GetAppConnectionInfo(self, AppIDs, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetAppConnectionInfo action.
@@ -29,6 +29,24 @@ class ApplicationManagement2ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TransitioningApps": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "ConnectApptoApp": (("ConnectionID", "string"),),
+        "DisconnectApptoApp": (("DisconnectedConnectionIDs", "string"),),
+        "GetAppConnectionInfo": (("ConnectionInfo", "string"),),
+        "GetAppIDList": (("AppIDs", "string"),),
+        "GetAppInfoByIDs": (("AppInfo", "string"),),
+        "GetCurrentConnectionInfo": (("ConnectionIDs", "string"), ("ConnectionAppIDs", "string"),),
+        "GetFeatureList": (("FeatureList", "string"),),
+        "GetInstallationStatus": (("InstallationStatus", "string"),),
+        "GetRunningAppList": (("RunningAppList", "string"),),
+        "GetRunningStatus": (("RunningStatus", "string"),),
+        "GetSupportedTargetFields": (("SupportedTargetFields", "string"),),
+        "InstallAppByURI": (("AppID", "string"),),
+        "StartAppByURI": (("AppID", "string"),),
+        "StopApp": (("StoppedAppIDs", "string"),),
+        "UninstallApp": (("UninstalledAppIDs", "string"),),
+    }
+
     def action_ConnectApptoApp(self, AppID, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the ConnectApptoApp action.
@@ -53,6 +53,19 @@ class AVTransport2ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "LastChange": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetCurrentTransportActions": (("Actions", "string"),),
+        "GetDRMState": (("CurrentDRMState", "string"),),
+        "GetDeviceCapabilities": (("PlayMedia", "string"), ("RecMedia", "string"), ("RecQualityModes", "string"),),
+        "GetMediaInfo": (("NrTracks", "ui4"), ("MediaDuration", "string"), ("CurrentURI", "string"), ("CurrentURIMetaData", "string"), ("NextURI", "string"), ("NextURIMetaData", "string"), ("PlayMedium", "string"), ("RecordMedium", "string"), ("WriteStatus", "string"),),
+        "GetMediaInfo_Ext": (("CurrentType", "string"), ("NrTracks", "ui4"), ("MediaDuration", "string"), ("CurrentURI", "string"), ("CurrentURIMetaData", "string"), ("NextURI", "string"), ("NextURIMetaData", "string"), ("PlayMedium", "string"), ("RecordMedium", "string"), ("WriteStatus", "string"),),
+        "GetPositionInfo": (("Track", "ui4"), ("TrackDuration", "string"), ("TrackMetaData", "string"), ("TrackURI", "string"), ("RelTime", "string"), ("AbsTime", "string"), ("RelCount", "i4"), ("AbsCount", "i4"),),
+        "GetStateVariables": (("StateVariableValuePairs", "string"),),
+        "GetTransportInfo": (("CurrentTransportState", "string"), ("CurrentTransportStatus", "string"), ("CurrentSpeed", "string"),),
+        "GetTransportSettings": (("PlayMode", "string"), ("RecQualityMode", "string"),),
+        "SetStateVariables": (("StateVariableList", "string"),),
+    }
+
     def action_GetCurrentTransportActions(self, InstanceID, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetCurrentTransportActions action.
@@ -54,6 +54,21 @@ class AVTransport3ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "LastChange": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetCurrentTransportActions": (("Actions", "string"),),
+        "GetDRMState": (("CurrentDRMState", "string"),),
+        "GetDeviceCapabilities": (("PlayMedia", "string"), ("RecMedia", "string"), ("RecQualityModes", "string"),),
+        "GetMediaInfo": (("NrTracks", "ui4"), ("MediaDuration", "string"), ("CurrentURI", "string"), ("CurrentURIMetaData", "string"), ("NextURI", "string"), ("NextURIMetaData", "string"), ("PlayMedium", "string"), ("RecordMedium", "string"), ("WriteStatus", "string"),),
+        "GetMediaInfo_Ext": (("CurrentType", "string"), ("NrTracks", "ui4"), ("MediaDuration", "string"), ("CurrentURI", "string"), ("CurrentURIMetaData", "string"), ("NextURI", "string"), ("NextURIMetaData", "string"), ("PlayMedium", "string"), ("RecordMedium", "string"), ("WriteStatus", "string"),),
+        "GetPlaylistInfo": (("PlaylistInfo", "string"),),
+        "GetPositionInfo": (("Track", "ui4"), ("TrackDuration", "string"), ("TrackMetaData", "string"), ("TrackURI", "string"), ("RelTime", "string"), ("AbsTime", "string"), ("RelCount", "i4"), ("AbsCount", "ui4"),),
+        "GetStateVariables": (("StateVariableValuePairs", "string"),),
+        "GetSyncOffset": (("CurrentSyncOffset", "string"),),
+        "GetTransportInfo": (("CurrentTransportState", "string"), ("CurrentTransportStatus", "string"), ("CurrentSpeed", "string"),),
+        "GetTransportSettings": (("PlayMode", "string"), ("RecQualityMode", "string"),),
+        "SetStateVariables": (("StateVariableList", "string"),),
+    }
+
     def action_AdjustSyncOffset(self, InstanceID, Adjustment, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AdjustSyncOffset action.
@@ -27,6 +27,27 @@ class BasicManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetActiveTestIDs": (("TestIDs", "string"),),
+        "GetDeviceStatus": (("DeviceStatus", "string"),),
+        "GetInterfaceResetResult": (("Status", "string"), ("AdditionalInfo", "string"), ("NumberOfSuccesses", "ui4"), ("NumberOfFailures", "ui4"),),
+        "GetLogInfo": (("Configurable", "boolean"), ("Enabled", "boolean"), ("LogLevel", "string"), ("LogURL", "string"), ("MaxSize", "ui4"), ("LastChange", "string"),),
+        "GetLogURIs": (("LogURIs", "string"),),
+        "GetNSLookupResult": (("Status", "string"), ("AdditionalInfo", "string"), ("SuccessCount", "ui4"), ("Result", "string"),),
+        "GetPingResult": (("Status", "string"), ("AdditionalInfo", "string"), ("SuccessCount", "ui4"), ("FailureCount", "ui4"), ("AverageResponseTime", "ui4"), ("MinimumResponseTime", "ui4"), ("MaximumResponseTime", "ui4"),),
+        "GetSelfTestResult": (("Status", "string"), ("AdditionalInfo", "string"),),
+        "GetSequenceMode": (("SequenceMode", "boolean"),),
+        "GetTestInfo": (("Type", "string"), ("State", "string"),),
+        "GetTracerouteResult": (("Status", "string"), ("AdditionalInfo", "string"), ("ResponseTime", "ui4"), ("HopHosts", "string"),),
+        "InterfaceReset": (("TestID", "ui4"),),
+        "NSLookup": (("TestID", "ui4"),),
+        "Ping": (("TestID", "ui4"),),
+        "Reboot": (("RebootStatus", "string"),),
+        "SelfTest": (("TestID", "ui4"),),
+        "SetSequenceMode": (("OldSequenceMode", "boolean"),),
+        "Traceroute": (("TestID", "ui4"),),
+    }
+
     def action_BaselineReset(self, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the BaselineReset action.
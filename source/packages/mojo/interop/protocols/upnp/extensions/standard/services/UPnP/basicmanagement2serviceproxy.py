@@ -28,6 +28,32 @@ class BasicManagement2ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "BandwidthTest": (("TestID", "ui4"),),
+        "GetACLData": (("ACL", "string"),),
+        "GetActiveTestIDs": (("TestIDs", "string"),),
+        "GetBandwidthTestInfo": (("BandwidthTestInfo", "string"),),
+        "GetBandwidthTestResult": (("State", "string"), ("Status", "string"), ("AdditionalInfo", "string"), ("Result", "string"),),
+        "GetDeviceStatus": (("DeviceStatus", "string"),),
+        "GetInterfaceResetResult": (("Status", "string"), ("AdditionalInfo", "string"), ("NumberOfSuccesses", "ui4"), ("NumberOfFailures", "ui4"),),
+        "GetLogInfo": (("Configurable", "boolean"), ("Enabled", "boolean"), ("LogLevel", "string"), ("LogURL", "string"), ("MaxSize", "ui4"), ("LastChange", "string"),),
+        "GetLogURIs": (("LogURIs", "string"),),
+        "GetNSLookupResult": (("Status", "string"), ("AdditionalInfo", "string"), ("SuccessCount", "ui4"), ("Result", "string"),),
+        "GetPingResult": (("Status", "string"), ("AdditionalInfo", "string"), ("SuccessCount", "ui4"), ("FailureCount", "ui4"), ("AverageResponseTime", "ui4"), ("MinimumResponseTime", "ui4"), ("MaximumResponseTime", "ui4"),),
+        "GetSelfTestResult": (("Status", "string"), ("AdditionalInfo", "string"),),
+        "GetSequenceMode": (("SequenceMode", "boolean"),),
+        "GetTestIDs": (("TestIDs", "string"),),
+        "GetTestInfo": (("Type", "string"), ("State", "string"),),
+        "GetTracerouteResult": (("Status", "string"), ("AdditionalInfo", "string"), ("ResponseTime", "ui4"), ("HopHosts", "string"),),
+        "InterfaceReset": (("TestID", "ui4"),),
+        "NSLookup": (("TestID", "ui4"),),
+        "Ping": (("TestID", "ui4"),),
+        "Reboot": (("RebootStatus", "string"),),
+        "SelfTest": (("TestID", "ui4"),),
+        "SetSequenceMode": (("OldSequenceMode", "boolean"),),
+        "Traceroute": (("TestID", "ui4"),),
+    }
+
     def action_BandwidthTest(self, BandwidthTestSpec, TestEndpoint, TestSchedule, TestSessID, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the BandwidthTest action.
@@ -26,6 +26,15 @@ class Calendar1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TriggeredItem": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddCalendarItems": (("ItemIDs", "string"),),
+        "GetCalendarItems": (("Caltems", "string"),),
+        "GetMemo": (("MemoInfoList", "string"),),
+        "GetTelCPNameList": (("TelCPName", "string"),),
+        "GetTriggeredItems": (("TriggeredItemIDs", "string"),),
+        "PostMemo": (("MemoID", "string"),),
+    }
+
     def action_AddCalendarItems(self, Caltems, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddCalendarItems action.
@@ -26,6 +26,20 @@ class CallManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TelCPNameList": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "ChangeTelCPName": (("NewSecretKey", "string"), ("Expires", "string"),),
+        "GetCallBackInfo": (("CallBackInfo", "string"),),
+        "GetCallInfo": (("CallInfoList", "string"),),
+        "GetCallLogs": (("CallLogs", "string"),),
+        "GetMediaCapabilities": (("SupportedMediaCapabilityInfo", "string"),),
+        "GetTelCPNameList": (("TelCPNameList", "string"),),
+        "GetTelephonyIdentity": (("TelephonyIdentity", "string"),),
+        "InitiateCall": (("CallID", "string"),),
+        "RegisterCallBack": (("CallBackID", "string"),),
+        "RegisterTelCPName": (("NewSecretKey", "string"), ("Expires", "string"),),
+        "StartCall": (("CallID", "string"),),
+    }
+
     def action_AcceptCall(self, TelCPName, SecretKey, TargetCallID, MediaCapabilityInfo, CallMode, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AcceptCall action.
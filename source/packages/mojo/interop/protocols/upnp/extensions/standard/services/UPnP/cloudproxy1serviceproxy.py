@@ -28,6 +28,14 @@ class CloudProxy1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "CloudProxyUpdate": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddProxyDevice": (("DeviceJID", "string"),),
+        "AddUCSAccount": (("UCSJID", "string"), ("Password", "string"),),
+        "GetDeviceList": (("DeviceList", "string"),),
+        "GetProxyList": (("ProxyList", "string"),),
+        "GetUCSList": (("UCSList", "string"),),
+    }
+
     def action_AddProxyDevice(self, DeviceId, UserAtCloud, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddProxyDevice action.
@@ -22,6 +22,14 @@ class CloudTransport1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "ConnectMethod": (("Identifier", "string"), ("ConnectWriteCout", "string"),),
+        "HTTPReadBody": (("Body", "string"), ("ReadLength", "string"), ("ConnectReadCount", "string"),),
+        "HTTPReadHeaders": (("Headers", "string"), ("ReadLength", "string"), ("ConnectReadCount", "string"),),
+        "HTTPWriteBody": (("ConnectWriteCount", "string"),),
+        "HTTPWriteHeaders": (("ConnectWriteCount", "string"),),
+    }
+
     def action_ConnectMethod(self, Host, MethodLine, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the ConnectMethod action.
@@ -29,6 +29,25 @@ class ConfigurationManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "CreateInstance": (("InstanceIdentifier", "string"), ("Status", "string"),),
+        "DeleteInstance": (("Status", "string"),),
+        "GetAttributeValuesUpdate": (("StateVariableValue", "string"),),
+        "GetAttributes": (("NodeAttributeValueList", "string"),),
+        "GetConfigurationUpdate": (("StateVariableValue", "string"),),
+        "GetCurrentConfigurationVersion": (("StateVariableValue", "ui4"),),
+        "GetInconsistentStatus": (("StateVariableValue", "boolean"),),
+        "GetInstances": (("Result", "string"),),
+        "GetSelectedValues": (("ParameterValueList", "string"),),
+        "GetSupportedDataModels": (("SupportedDataModels", "string"),),
+        "GetSupportedDataModelsUpdate": (("StateVariableValue", "string"),),
+        "GetSupportedParameters": (("Result", "string"),),
+        "GetSupportedParametersUpdate": (("StateVariableValue", "string"),),
+        "GetValues": (("ParameterValueList", "string"),),
+        "SetAttributes": (("Status", "string"),),
+        "SetValues": (("Status", "string"),),
+    }
+
     def action_CreateInstance(self, MultiInstanceName, ChildrenInitialization, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the CreateInstance action.
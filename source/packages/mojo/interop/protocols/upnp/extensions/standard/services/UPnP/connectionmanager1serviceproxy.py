@@ -26,6 +26,13 @@ class ConnectionManager1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "SourceProtocolInfo": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetCurrentConnectionIDs": (("ConnectionIDs", "string"),),
+        "GetCurrentConnectionInfo": (("RcsID", "i4"), ("AVTransportID", "i4"), ("ProtocolInfo", "string"), ("PeerConnectionManager", "string"), ("PeerConnectionID", "i4"), ("Direction", "string"), ("Status", "string"),),
+        "GetProtocolInfo": (("Source", "string"), ("Sink", "string"),),
+        "PrepareForConnection": (("ConnectionID", "i4"), ("AVTransportID", "i4"), ("RcsID", "i4"),),
+    }
+
     def action_ConnectionComplete(self, ConnectionID, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the ConnectionComplete action.
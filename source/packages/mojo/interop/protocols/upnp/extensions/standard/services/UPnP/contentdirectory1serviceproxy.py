@@ -8,9 +8,9 @@
 from mojo.interop.protocols.upnp.aspects import AspectsUPnP, DEFAULT_UPNP_ASPECTS
 
 from mojo.xmods.extension.dynamic import DynamicExtension
-from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+from mojo.interop.protocols.upnp.services.upnpcontentdirectoryserviceproxy import UpnpContentDirectoryServiceProxy
 
-class ContentDirectory1ServiceProxy(UpnpServiceProxy, DynamicExtension):
+class ContentDirectory1ServiceProxy(UpnpContentDirectoryServiceProxy, DynamicExtension):
     """
         This is a code generated proxy class to the 'urn:schemas-upnp-org:service:ContentDirectory:1' service.
     """
@@ -29,6 +29,19 @@ class ContentDirectory1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TransferIDs": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "Browse": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+        "CreateObject": (("ObjectID", "string"), ("Result", "string"),),
+        "CreateReference": (("NewID", "string"),),
+        "ExportResource": (("TransferID", "ui4"),),
+        "GetSearchCapabilities": (("SearchCaps", "string"),),
+        "GetSortCapabilities": (("SortCaps", "string"),),
+        "GetSystemUpdateID": (("Id", "ui4"),),
+        "GetTransferProgress": (("TransferStatus", "string"), ("TransferLength", "string"), ("TransferTotal", "string"),),
+        "ImportResource": (("TransferID", "ui4"),),
+        "Search": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+    }
+
     def action_Browse(self, ObjectID, BrowseFlag, Filter, StartingIndex, RequestedCount, SortCriteria, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the Browse action.
@@ -8,9 +8,9 @@
 from mojo.interop.protocols.upnp.aspects import AspectsUPnP, DEFAULT_UPNP_ASPECTS
 
 from mojo.xmods.extension.dynamic import DynamicExtension
-from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+from mojo.interop.protocols.upnp.services.upnpcontentdirectoryserviceproxy import UpnpContentDirectoryServiceProxy
 
-class ContentDirectory4ServiceProxy(UpnpServiceProxy, DynamicExtension):
+class ContentDirectory4ServiceProxy(UpnpContentDirectoryServiceProxy, DynamicExtension):
     """
         This is a code generated proxy class to the 'urn:schemas-upnp-org:service:ContentDirectory:4' service.
     """
@@ -37,6 +37,37 @@ class ContentDirectory4ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TransformStatus": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "Browse": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+        "CreateObject": (("ObjectID", "string"), ("Result", "string"),),
+        "CreateReference": (("NewID", "string"),),
+        "EvaluateTransforms": (("EvaluationResult", "string"),),
+        "ExportResource": (("TransferID", "ui4"),),
+        "ExtendDeviceMode": (("DeviceModeStatus", "string"),),
+        "FreeFormQuery": (("QueryResult", "string"), ("UpdateID", "ui4"),),
+        "GetAllAvailableTransforms": (("AllAvailableTransforms", "string"),),
+        "GetAllowedTransforms": (("AllowedTransforms", "string"),),
+        "GetCurrentTransformStatusList": (("TransformStatus", "string"),),
+        "GetDeviceMode": (("DeviceMode", "string"),),
+        "GetDeviceModeStatus": (("DeviceModeStatus", "string"),),
+        "GetFeatureList": (("FeatureList", "string"),),
+        "GetFreeFormQueryCapabilities": (("FFQCapabilities", "string"),),
+        "GetPermissionsInfo": (("PermissionsInfo", "string"),),
+        "GetSearchCapabilities": (("SearchCaps", "string"),),
+        "GetServiceResetToken": (("ResetToken", "string"),),
+        "GetSortCapabilities": (("SortCaps", "string"),),
+        "GetSortExtensionCapabilities": (("SortExtensionCaps", "string"),),
+        "GetSystemUpdateID": (("Id", "ui4"),),
+        "GetTransferProgress": (("TransferStatus", "string"), ("TransferLength", "string"), ("TransferTotal", "string"),),
+        "GetTransformTaskResult": (("TransformTaskResult", "string"),),
+        "GetTransforms": (("CurrentTransformSettings", "string"),),
+        "ImportResource": (("TransferID", "ui4"),),
+        "MoveObject": (("NewObjectID", "string"),),
+        "RequestDeviceMode": (("DeviceModeID", "string"), ("DeviceModeStatus", "string"),),
+        "Search": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+        "StartTransformTask": (("TransformTaskID", "string"),),
+    }
+
     def action_Browse(self, ObjectID, BrowseFlag, Filter, StartingIndex, RequestedCount, SortCriteria, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the Browse action.
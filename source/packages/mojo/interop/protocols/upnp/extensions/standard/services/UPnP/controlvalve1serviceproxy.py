@@ -28,6 +28,13 @@ class ControlValve1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetMinMax": (("CurrentMinPosition", "ui1"), ("CurrentMaxPosition", "ui1"),),
+        "GetMode": (("CurrentControlMode", "string"),),
+        "GetPosition": (("CurrentPositionStatus", "ui1"),),
+        "GetPositionTarget": (("CurrentPositionTarget", "ui1"),),
+    }
+
     def action_GetMinMax(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetMinMax action.
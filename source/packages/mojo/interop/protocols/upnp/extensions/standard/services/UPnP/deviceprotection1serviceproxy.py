@@ -25,6 +25,16 @@ class DeviceProtection1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddIdentityList": (("IdentityListResult", "string"),),
+        "GetACLData": (("ACL", "string"),),
+        "GetAssignedRoles": (("RoleList", "string"),),
+        "GetRolesForAction": (("RoleList", "string"), ("RestrictedRoleList", "string"),),
+        "GetSupportedProtocols": (("ProtocolList", "string"),),
+        "GetUserLoginChallenge": (("Salt", "string"), ("Challenge", "string"),),
+        "SendSetupMessage": (("OutMessage", "string"),),
+    }
+
     def action_AddIdentityList(self, IdentityList, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddIdentityList action.
@@ -34,6 +34,21 @@ class DigitalSecurityCameraMotionImage1ServiceProxy(UpnpServiceProxy, DynamicExt
         "TargetFrameRate": { "data_type": "ui4", "default": "1500", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAvailableCompressionLevels": (("RetAvailableCompressionLevels", "string"),),
+        "GetAvailableEncodings": (("RetAvailableEncodings", "string"),),
+        "GetAvailableResolutions": (("RetAvailableResolutions", "string"),),
+        "GetDefaultCompressionLevel": (("RetCompressionLevel", "string"),),
+        "GetDefaultEncoding": (("RetEncoding", "string"),),
+        "GetDefaultResolution": (("RetResolution", "string"),),
+        "GetDefaultVideoPresentationURL": (("RetVideoPresentationURL", "string"),),
+        "GetDefaultVideoURL": (("RetVideoURL", "string"),),
+        "GetMaxBandwidth": (("RetMaxBandwidth", "ui4"),),
+        "GetTargetFrameRate": (("RetTargetFrameRate", "ui4"),),
+        "GetVideoPresentationURL": (("RetVideoPresentationURL", "string"),),
+        "GetVideoURL": (("RetVideoURL", "string"),),
+    }
+
     def action_GetAvailableCompressionLevels(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetAvailableCompressionLevels action.
@@ -30,6 +30,15 @@ class DigitalSecurityCameraSettings1ServiceProxy(UpnpServiceProxy, DynamicExtens
         "FixedWhiteBalance": { "data_type": "ui4", "default": "3000", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAutomaticWhiteBalance": (("RetAutomaticWhiteBalance", "boolean"),),
+        "GetAvailableRotations": (("RetAvailableRotations", "string"),),
+        "GetBrightness": (("RetBrightness", "ui1"),),
+        "GetColorSaturation": (("RetColorSaturation", "ui1"),),
+        "GetDefaultRotation": (("RetRotation", "string"),),
+        "GetFixedWhiteBalance": (("RetFixedWhiteBalance", "ui4"),),
+    }
+
     def action_DecreaseBrightness(self, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the DecreaseBrightness action.
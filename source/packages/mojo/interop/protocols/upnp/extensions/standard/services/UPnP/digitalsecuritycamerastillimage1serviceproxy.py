@@ -32,6 +32,19 @@ class DigitalSecurityCameraStillImage1ServiceProxy(UpnpServiceProxy, DynamicExte
         "DefaultResolution": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAvailableCompressionLevels": (("RetAvailableCompressionLevels", "string"),),
+        "GetAvailableEncodings": (("RetAvailableEncodings", "string"),),
+        "GetAvailableResolutions": (("RetAvailableResolutions", "string"),),
+        "GetDefaultCompressionLevel": (("RetCompressionLevel", "string"),),
+        "GetDefaultEncoding": (("RetEncoding", "string"),),
+        "GetDefaultImagePresentationURL": (("RetImagePresentationURL", "string"),),
+        "GetDefaultImageURL": (("RetImageURL", "string"),),
+        "GetDefaultResolution": (("RetResolution", "string"),),
+        "GetImagePresentationURL": (("RetImagePresentationURL", "string"),),
+        "GetImageURL": (("RetImageURL", "string"),),
+    }
+
     def action_GetAvailableCompressionLevels(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetAvailableCompressionLevels action.
@@ -34,6 +34,17 @@ class Dimming1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "StepDelta": { "data_type": "ui1", "default": "Manufacturer defined default value", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetIsRamping": (("retIsRamping", "boolean"),),
+        "GetLoadLevelStatus": (("retLoadlevelStatus", "ui1"),),
+        "GetLoadLevelTarget": (("GetLoadlevelTarget", "ui1"),),
+        "GetOnEffectParameters": (("retOnEffect", "string"), ("retOnEffectLevel", "ui1"),),
+        "GetRampPaused": (("retRampPaused", "boolean"),),
+        "GetRampRate": (("retRampRate", "ui1"),),
+        "GetRampTime": (("retRampTime", "ui4"),),
+        "GetStepDelta": (("retStepDelta", "ui1"),),
+    }
+
     def action_GetIsRamping(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetIsRamping action.
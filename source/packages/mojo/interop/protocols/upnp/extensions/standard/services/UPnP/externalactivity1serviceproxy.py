@@ -31,6 +31,10 @@ class ExternalActivity1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "AvailableRegistrations": { "data_type": "boolean", "default": "1", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "Register": (("ActualDurationOut", "i4"), ("RegistrationIDOut", "ui4"),),
+    }
+
     def action_Register(self, ButtonNameIn, DisplayStringIn, DurationIn, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the Register action.
@@ -27,6 +27,13 @@ class FanSpeed1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetFanDirection": (("CurrentDirectionStatus", "boolean"),),
+        "GetFanDirectionTarget": (("CurrentDirectionTarget", "boolean"),),
+        "GetFanSpeed": (("CurrentFanSpeedStatus", "ui1"),),
+        "GetFanSpeedTarget": (("CurrentFanSpeedTarget", "ui1"),),
+    }
+
     def action_GetFanDirection(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetFanDirection action.
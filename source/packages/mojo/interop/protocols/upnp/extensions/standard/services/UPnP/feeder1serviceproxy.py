@@ -35,6 +35,14 @@ class Feeder1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "MorePages": { "data_type": "boolean", "default": "0", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "Eject": (("StateOut", "string"),),
+        "GetFeederMode": (("FeederModeOut", "string"),),
+        "GetState": (("StateOut", "string"), ("MorePagesOut", "boolean"), ("FailureCodeOut", "string"),),
+        "Load": (("StateOut", "string"),),
+        "Reset": (("StateOut", "string"),),
+    }
+
     def action_Eject(self, JobIDIn, EntireDocumentIn, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the Eject action.
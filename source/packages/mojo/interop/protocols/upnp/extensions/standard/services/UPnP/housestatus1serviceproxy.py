@@ -26,6 +26,12 @@ class HouseStatus1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "OccupancyState": { "data_type": "string", "default": "Occupied", "allowed_list": "['Occupied', 'Unoccupied', 'Indeterminate']"},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetActivityLevel": (("CurrentActivityLevel", "string"),),
+        "GetDormancyLevel": (("CurrentDormancyLevel", "string"),),
+        "GetOccupancyState": (("CurrentOccupancyState", "string"),),
+    }
+
     def action_GetActivityLevel(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetActivityLevel action.
@@ -26,6 +26,12 @@ class HVAC_FanOperatingMode1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetFanStatus": (("CurrentStatus", "string"),),
+        "GetMode": (("CurrentMode", "string"),),
+        "GetName": (("CurrentName", "string"),),
+    }
+
     def action_GetFanStatus(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetFanStatus action.
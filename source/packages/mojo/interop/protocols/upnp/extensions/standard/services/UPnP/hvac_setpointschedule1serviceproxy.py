@@ -24,6 +24,10 @@ class HVAC_SetpointSchedule1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetEventsPerDay": (("CurrentEventsPerDay", "string"),),
+    }
+
     def action_GetEventsPerDay(self, SubmittedDayOfWeek, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetEventsPerDay action.
@@ -26,6 +26,12 @@ class HVAC_UserOperatingMode1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetModeStatus": (("CurrentModeStatus", "string"),),
+        "GetModeTarget": (("CurrentModeTarget", "string"),),
+        "GetName": (("CurrentName", "string"),),
+    }
+
     def action_GetModeStatus(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetModeStatus action.
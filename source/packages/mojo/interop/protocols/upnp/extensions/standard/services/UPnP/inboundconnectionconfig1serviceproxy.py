@@ -27,6 +27,11 @@ class InboundConnectionConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetDynamicDNSSupportedProtocols": (("DynamicDNSSupportedProtocols", "string"),),
+        "GetNetworkTopologyInfo": (("CurrentNetworkTopologyInfo", "string"),),
+    }
+
     def action_GetDynamicDNSSupportedProtocols(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetDynamicDNSSupportedProtocols action.
@@ -27,6 +27,12 @@ class InputConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "RequiredInputType": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetInputCapability": (("SupportedCapabilities", "string"),),
+        "GetInputConnectionList": (("CurrentConnectionList", "string"),),
+        "SetInputSession": (("SessionID", "string"), ("ConnectionInfo", "string"),),
+    }
+
     def action_GetInputCapability(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetInputCapability action.
@@ -32,6 +32,17 @@ class LANHostConfigManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAddressRange": (("NewMinAddress", "string"), ("NewMaxAddress", "string"),),
+        "GetDHCPRelay": (("NewDHCPRelay", "boolean"),),
+        "GetDHCPServerConfigurable": (("NewDHCPServerConfigurable", "boolean"),),
+        "GetDNSServers": (("NewDNSServers", "string"),),
+        "GetDomainName": (("NewDomainName", "string"),),
+        "GetIPRoutersList": (("NewIPRouters", "string"),),
+        "GetReservedAddresses": (("NewReservedAddresses", "string"),),
+        "GetSubnetMask": (("NewSubnetMask", "string"),),
+    }
+
     def action_DeleteDNSServer(self, NewDNSServers, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the DeleteDNSServer action.
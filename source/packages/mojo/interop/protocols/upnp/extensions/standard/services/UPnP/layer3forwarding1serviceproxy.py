@@ -24,6 +24,10 @@ class Layer3Forwarding1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetDefaultConnectionService": (("NewDefaultConnectionService", "string"),),
+    }
+
     def action_GetDefaultConnectionService(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetDefaultConnectionService action.
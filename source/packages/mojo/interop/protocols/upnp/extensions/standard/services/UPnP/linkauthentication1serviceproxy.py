@@ -37,6 +37,15 @@ class LinkAuthentication1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "LastError": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddEntry": (("NewNumberOfEntries", "ui2"),),
+        "DeleteEntry": (("NewNumberOfEntries", "ui2"),),
+        "GetGenericEntry": (("NewIdentifier", "string"), ("NewSecret", "string"), ("NewSecretType", "string"), ("NewAuthType", "string"), ("NewAuthState", "string"), ("NewCredentialState", "string"), ("NewDescription", "string"), ("NewMACAddress", "string"), ("NewCredentialDuration", "ui4"), ("NewLinkedIdentifier", "string"),),
+        "GetNumberOfEntries": (("NewNumberOfEntries", "ui2"),),
+        "GetSpecificEntry": (("NewIdentifier", "string"), ("NewSecret", "string"), ("NewSecretType", "string"), ("NewAuthType", "string"), ("NewAuthState", "string"), ("NewCredentialState", "string"), ("NewDescription", "string"), ("NewMACAddress", "string"), ("NewCredentialDuration", "ui4"), ("NewLinkedIdentifier", "string"),),
+        "UpdateEntry": (("NewNumberOfEntries", "ui2"),),
+    }
+
     def action_AddEntry(self, NewIdentifier, NewSecret, NewSecretType, NewAuthType, NewAuthState, NewCredentialState, NewDescription, NewMACAddress, NewCredentialDuration, NewLinkedIdentifier, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddEntry action.
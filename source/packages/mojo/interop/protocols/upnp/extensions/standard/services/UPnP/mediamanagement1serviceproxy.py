@@ -24,6 +24,13 @@ class MediaManagement1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "MediaSessionInfo": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetMediaCapabilities": (("SupportedMediaCapabilityInfo", "string"),),
+        "GetMediaSessionInfo": (("MediaSessionInfoList", "string"),),
+        "ModifyMediaSession": (("TCMediaCapabilityInfo", "string"),),
+        "StartMediaSession": (("MediaSessionID", "string"), ("TCMediaCapabilityInfo", "string"),),
+    }
+
     def action_GetMediaCapabilities(self, TSMediaCapabilityInfo, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetMediaCapabilities action.
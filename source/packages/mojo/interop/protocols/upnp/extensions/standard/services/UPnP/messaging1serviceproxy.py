@@ -25,6 +25,19 @@ class Messaging1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "SessionUpdates": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "CreateSession": (("SessionID", "string"),),
+        "GetFileTransferSession": (("FileInfoList", "string"),),
+        "GetMessagingCapabilities": (("SupportedCapabilities", "string"),),
+        "GetNewMessages": (("NewMessages", "string"),),
+        "GetSessionUpdates": (("SessionUpdates", "string"),),
+        "GetSessions": (("SessionsList", "string"),),
+        "GetTelephonyIdentity": (("TelephonyIdentity", "string"),),
+        "ReadMessage": (("MessageRequested", "string"),),
+        "SearchMessages": (("MessageList", "string"),),
+        "SendMessage": (("MessageID", "string"),),
+    }
+
     def action_AcceptSession(self, SessionID, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AcceptSession action.
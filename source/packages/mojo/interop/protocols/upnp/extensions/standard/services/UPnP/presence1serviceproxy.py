@@ -26,6 +26,13 @@ class Presence1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "Watcher": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetContactPresence": (("ContactPresence", "string"),),
+        "GetPresence": (("UserPresence", "string"),),
+        "GetPresenceOfContactsUpdate": (("ContactPresenceUpdate", "string"),),
+        "RegisterForContactPresence": (("RegistrationResult", "string"),),
+    }
+
     def action_AuthorizePresenceProactive(self, UserPresenceInfo, Expire, WatcherList, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AuthorizePresenceProactive action.
@@ -46,6 +46,12 @@ class PrintBasic1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "PrinterStateReasons": { "data_type": "string", "default": "none", "allowed_list": "['none', 'attention-required', 'media-jam', 'paused', 'door-open', 'media-low', 'media-empty', 'output-area-almost-full', 'output-area-full', 'marker-supply-low', 'marker-supply-empty', 'marker-failure', 'media-change-request']"},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "CreateJob": (("JobId", "i4"), ("DataSink", "uri"),),
+        "GetJobAttributes": (("JobName", "string"), ("JobOriginatingUserName", "string"), ("JobMediaSheetsCompleted", "i4"),),
+        "GetPrinterAttributes": (("PrinterState", "string"), ("PrinterStateReasons", "string"), ("JobIdList", "string"), ("JobId", "i4"),),
+    }
+
     def action_CancelJob(self, JobId, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the CancelJob action.
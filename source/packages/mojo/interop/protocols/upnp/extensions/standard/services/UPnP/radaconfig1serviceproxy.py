@@ -26,6 +26,10 @@ class RADAConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "SystemInfoUpdateID": { "data_type": "ui4", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetSystemInfo": (("SystemInfo", "string"),),
+    }
+
     def action_EditFilter(self, Filter, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the EditFilter action.
@@ -26,6 +26,12 @@ class RADAConfig2ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "SystemInfoUpdateID": { "data_type": "ui4", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "CreateVirtualDevice": (("VirtualDeviceID", "string"),),
+        "GetSystemInfo": (("SystemInfo", "string"),),
+        "GetVirtualDevices": (("VirtualDeviceList", "string"),),
+    }
+
     def action_CreateVirtualDevice(self, VirtualDeviceDescr, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the CreateVirtualDevice action.
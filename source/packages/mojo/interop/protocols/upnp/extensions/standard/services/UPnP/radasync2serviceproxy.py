@@ -24,6 +24,10 @@ class RADASync2ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetLocalNetworkAddressInfo": (("LocalNetworkAddress", "string"),),
+    }
+
     def action_AddRemoteDevices(self, DeviceList, ID, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddRemoteDevices action.
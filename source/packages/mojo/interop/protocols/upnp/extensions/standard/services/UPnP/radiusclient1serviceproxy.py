@@ -28,6 +28,11 @@ class RadiusClient1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "NumberOfAuthenticationServerEntries": { "data_type": "ui2", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetGenericAuthenticationServerEntry": (("NewAuthenticationServerIPAddress", "string"), ("NewAuthenticationServerPortNumber", "ui2"), ("NewAuthenticationServerSharedSecret", "string"),),
+        "GetSpecificAuthenticationServerEntry": (("NewAuthenticationServerSharedSecret", "string"),),
+    }
+
     def action_AddAuthenticationServerEntry(self, NewAuthenticationServerIPAddress, NewAuthenticationServerPortNumber, NewAuthenticationServerSharedSecret, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddAuthenticationServerEntry action.
@@ -29,6 +29,14 @@ class RATAConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "CredentialsList": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetCredentialsList": (("CurrentCredentialsList", "string"),),
+        "GetProfileConfigInfo": (("ProfileConfigInfo", "string"),),
+        "GetProfileList": (("ProfileList", "string"),),
+        "GetSupportedCredentialDelivery": (("SupportedCredentialDelivery", "string"),),
+        "GetTransportAgentCapabilities": (("TransportAgentCapabilities", "string"),),
+    }
+
     def action_AddProfile(self, NewProfileConfigInfo, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddProfile action.
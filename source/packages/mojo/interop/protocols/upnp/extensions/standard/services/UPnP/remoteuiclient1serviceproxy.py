@@ -27,6 +27,15 @@ class RemoteUIClient1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddUIListing": (("TimeToLive", "string"),),
+        "Connect": (("CurrentConnectionsList", "string"),),
+        "Disconnect": (("CurrentConnectionsList", "string"),),
+        "GetCurrentConnections": (("CurrentConnectionsList", "string"),),
+        "GetDeviceProfile": (("StaticDeviceInfo", "string"),),
+        "GetUIListing": (("CompatibleUIList", "string"),),
+    }
+
     def action_AddUIListing(self, InputUIList, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddUIListing action.
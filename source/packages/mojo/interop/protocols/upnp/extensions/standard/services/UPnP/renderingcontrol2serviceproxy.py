@@ -42,6 +42,29 @@ class RenderingControl2ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "LastChange": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetBlueVideoBlackLevel": (("CurrentBlueVideoBlackLevel", "ui2"),),
+        "GetBlueVideoGain": (("CurrentBlueVideoGain", "ui2"),),
+        "GetBrightness": (("CurrentBrightness", "ui2"),),
+        "GetColorTemperature": (("CurrentColorTemperature", "ui2"),),
+        "GetContrast": (("CurrentContrast", "ui2"),),
+        "GetGreenVideoBlackLevel": (("CurrentGreenVideoBlackLevel", "ui2"),),
+        "GetGreenVideoGain": (("CurrentGreenVideoGain", "ui2"),),
+        "GetHorizontalKeystone": (("CurrentHorizontalKeystone", "i2"),),
+        "GetLoudness": (("CurrentLoudness", "boolean"),),
+        "GetMute": (("CurrentMute", "boolean"),),
+        "GetRedVideoBlackLevel": (("CurrentRedVideoBlackLevel", "ui2"),),
+        "GetRedVideoGain": (("CurrentRedVideoGain", "ui2"),),
+        "GetSharpness": (("CurrentSharpness", "ui2"),),
+        "GetStateVariables": (("StateVariableValuePairs", "string"),),
+        "GetVerticalKeystone": (("CurrentVerticalKeystone", "i2"),),
+        "GetVolume": (("CurrentVolume", "ui2"),),
+        "GetVolumeDB": (("CurrentVolume", "i2"),),
+        "GetVolumeDBRange": (("MinValue", "i2"), ("MaxValue", "i2"),),
+        "ListPresets": (("CurrentPresetNameList", "string"),),
+        "SetStateVariables": (("StateVariableList", "string"),),
+    }
+
     def action_GetBlueVideoBlackLevel(self, InstanceID, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetBlueVideoBlackLevel action.
@@ -52,6 +52,13 @@ class Scan1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "State": { "data_type": "string", "default": "Idle", "allowed_list": "['Idle', 'Reserved', 'NotReady', 'Pending', 'Scanning', 'Finishing', 'Erred']"},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetConfiguration": (("JobNameOut", "string"), ("ResolutionOut", "string"), ("ImageXOffsetOut", "string"), ("ImageYOffsetOut", "string"), ("ImageWidthOut", "string"), ("ImageHeightOut", "string"), ("ImageFormatOut", "string"), ("CompressionFactorOut", "i4"), ("ImageTypeOut", "string"), ("ColorTypeOut", "string"), ("BitDepthOut", "string"), ("ColorSpaceOut", "string"), ("BaseNameOut", "string"), ("AppendSideNumberOut", "string"), ("TimeoutOut", "i4"),),
+        "GetSideInformation": (("SideNumberOut", "i4"), ("SideCountOut", "i4"), ("ScanLengthOut", "i4"),),
+        "GetState": (("StateOut", "string"), ("StateReasonOut", "string"), ("FailureCodeOut", "string"),),
+        "StartScan": (("ActualTimeoutOut", "i4"), ("JobIDOut", "ui4"), ("ActualWidthOut", "string"), ("ActualHeightOut", "string"),),
+    }
+
     def action_GetConfiguration(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetConfiguration action.
@@ -28,6 +28,20 @@ class ScheduledRecording1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "LastChange": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "BrowseRecordSchedules": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+        "BrowseRecordTasks": (("Result", "string"), ("NumberReturned", "ui4"), ("TotalMatches", "ui4"), ("UpdateID", "ui4"),),
+        "CreateRecordSchedule": (("RecordScheduleID", "string"), ("Result", "string"), ("UpdateID", "ui4"),),
+        "GetAllowedValues": (("PropertyInfo", "string"),),
+        "GetPropertyList": (("PropertyList", "string"),),
+        "GetRecordSchedule": (("Result", "string"), ("UpdateID", "ui4"),),
+        "GetRecordScheduleConflicts": (("RecordScheduleConflictIDList", "string"), ("UpdateID", "ui4"),),
+        "GetRecordTask": (("Result", "string"), ("UpdateID", "ui4"),),
+        "GetRecordTaskConflicts": (("RecordTaskConflictIDList", "string"), ("UpdateID", "ui4"),),
+        "GetSortCapabilities": (("SortCaps", "string"), ("SortLevelCap", "ui4"),),
+        "GetStateUpdateID": (("Id", "ui4"),),
+    }
+
     def action_BrowseRecordSchedules(self, Filter, StartingIndex, RequestedCount, SortCriteria, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the BrowseRecordSchedules action.
@@ -29,6 +29,24 @@ class SoftwareManagement2ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetACLData": (("ACL", "string"),),
+        "GetActiveEUIDs": (("ActiveEUIDs", "string"),),
+        "GetDUIDs": (("DUIDs", "string"),),
+        "GetDUInfo": (("DUName", "string"), ("DUVersion", "string"), ("DUType", "string"), ("DUState", "string"), ("DUURI", "string"),),
+        "GetEUIDs": (("EUIDs", "string"),),
+        "GetEUInfo": (("EUName", "string"), ("EUVersion", "string"), ("EURequestedState", "string"), ("EURunningState", "string"),),
+        "GetErrorEUIDs": (("ErrorEUIDs", "string"),),
+        "GetOperationIDs": (("OperationIDs", "string"),),
+        "GetOperationInfo": (("OperationState", "string"), ("TargetedIDs", "string"), ("Action", "string"), ("ErrorDescription", "string"), ("AdditionalInfo", "string"),),
+        "GetRunningEUIDs": (("RunningEUIDs", "string"),),
+        "Install": (("OperationID", "string"),),
+        "Start": (("OperationID", "string"),),
+        "Stop": (("OperationID", "string"),),
+        "Uninstall": (("OperationID", "string"),),
+        "Update": (("OperationID", "string"),),
+    }
+
     def action_GetACLData(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetACLData action.
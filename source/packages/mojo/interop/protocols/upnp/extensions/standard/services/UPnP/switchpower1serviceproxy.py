@@ -25,6 +25,11 @@ class SwitchPower1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetStatus": (("ResultStatus", "boolean"),),
+        "GetTarget": (("RetTargetValue", "boolean"),),
+    }
+
     def action_GetStatus(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetStatus action.
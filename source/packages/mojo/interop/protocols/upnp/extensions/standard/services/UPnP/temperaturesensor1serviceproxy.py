@@ -26,6 +26,12 @@ class TemperatureSensor1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "Name": { "data_type": "string", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetApplication": (("CurrentApplication", "string"),),
+        "GetCurrentTemperature": (("CurrentTemp", "i4"),),
+        "GetName": (("CurrentName", "string"),),
+    }
+
     def action_GetApplication(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetApplication action.
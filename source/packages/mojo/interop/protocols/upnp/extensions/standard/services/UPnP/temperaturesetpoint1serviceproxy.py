@@ -27,6 +27,13 @@ class TemperatureSetpoint1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "SetpointAchieved": { "data_type": "boolean", "default": "0", "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetApplication": (("CurrentApplication", "string"),),
+        "GetCurrentSetpoint": (("CurrentSP", "i4"),),
+        "GetName": (("CurrentName", "string"),),
+        "GetSetpointAchieved": (("CurrentSPA", "boolean"),),
+    }
+
     def action_GetApplication(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetApplication action.
@@ -34,6 +34,19 @@ class WANCableLinkConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetBPIEncryptionEnabled": (("NewBPIEncryptionEnabled", "boolean"),),
+        "GetCableLinkConfigInfo": (("NewCableLinkConfigState", "string"), ("NewLinkType", "string"),),
+        "GetConfigFile": (("NewConfigFile", "string"),),
+        "GetDownstreamFrequency": (("NewDownstreamFrequency", "ui4"),),
+        "GetDownstreamModulation": (("NewDownstreamModulation", "string"),),
+        "GetTFTPServer": (("NewTFTPServer", "string"),),
+        "GetUpstreamChannelID": (("NewUpstreamChannelID", "ui4"),),
+        "GetUpstreamFrequency": (("NewUpstreamFrequency", "ui4"),),
+        "GetUpstreamModulation": (("NewUpstreamModulation", "string"),),
+        "GetUpstreamPowerLevel": (("NewUpstreamPowerLevel", "ui4"),),
+    }
+
     def action_GetBPIEncryptionEnabled(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetBPIEncryptionEnabled action.
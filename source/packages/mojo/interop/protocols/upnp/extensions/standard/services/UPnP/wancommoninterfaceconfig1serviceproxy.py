@@ -37,6 +37,18 @@ class WANCommonInterfaceConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetActiveConnection": (("NewActiveConnDeviceContainer", "string"), ("NewActiveConnectionServiceID", "string"),),
+        "GetCommonLinkProperties": (("NewWANAccessType", "string"), ("NewLayer1UpstreamMaxBitRate", "ui4"), ("NewLayer1DownstreamMaxBitRate", "ui4"), ("NewPhysicalLinkStatus", "string"),),
+        "GetEnabledForInternet": (("NewEnabledForInternet", "boolean"),),
+        "GetMaximumActiveConnections": (("NewMaximumActiveConnections", "ui2"),),
+        "GetTotalBytesReceived": (("NewTotalBytesReceived", "ui4"),),
+        "GetTotalBytesSent": (("NewTotalBytesSent", "ui4"),),
+        "GetTotalPacketsReceived": (("NewTotalPacketsReceived", "ui4"),),
+        "GetTotalPacketsSent": (("NewTotalPacketsSent", "ui4"),),
+        "GetWANAccessProvider": (("NewWANAccessProvider", "string"),),
+    }
+
     def action_GetActiveConnection(self, NewActiveConnectionIndex, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetActiveConnection action.
@@ -30,6 +30,15 @@ class WANDSLLinkConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetATMEncapsulation": (("NewATMEncapsulation", "string"),),
+        "GetAutoConfig": (("NewAutoConfig", "boolean"),),
+        "GetDSLLinkInfo": (("NewLinkType", "string"), ("NewLinkStatus", "string"),),
+        "GetDestinationAddress": (("NewDestinationAddress", "string"),),
+        "GetFCSPreserved": (("NewFCSPreserved", "boolean"),),
+        "GetModulationType": (("NewModulationType", "string"),),
+    }
+
     def action_GetATMEncapsulation(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetATMEncapsulation action.
@@ -24,6 +24,10 @@ class WANEthernetLinkConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetEthernetLinkStatus": (("NewEthernetLinkStatus", "string"),),
+    }
+
     def action_GetEthernetLinkStatus(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetEthernetLinkStatus action.
@@ -43,6 +43,18 @@ class WANIPConnection1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetAutoDisconnectTime": (("NewAutoDisconnectTime", "ui4"),),
+        "GetConnectionTypeInfo": (("NewConnectionType", "string"), ("NewPossibleConnectionTypes", "string"),),
+        "GetExternalIPAddress": (("NewExternalIPAddress", "string"),),
+        "GetGenericPortMappingEntry": (("NewRemoteHost", "string"), ("NewExternalPort", "ui2"), ("NewProtocol", "string"), ("NewInternalPort", "ui2"), ("NewInternalClient", "string"), ("NewEnabled", "boolean"), ("NewPortMappingDescription", "string"), ("NewLeaseDuration", "ui4"),),
+        "GetIdleDisconnectTime": (("NewIdleDisconnectTime", "ui4"),),
+        "GetNATRSIPStatus": (("NewRSIPAvailable", "boolean"), ("NewNATEnabled", "boolean"),),
+        "GetSpecificPortMappingEntry": (("NewInternalPort", "ui2"), ("NewInternalClient", "string"), ("NewEnabled", "boolean"), ("NewPortMappingDescription", "string"), ("NewLeaseDuration", "ui4"),),
+        "GetStatusInfo": (("NewConnectionStatus", "string"), ("NewLastConnectionError", "string"), ("NewUptime", "ui4"),),
+        "GetWarnDisconnectDelay": (("NewWarnDisconnectDelay", "ui4"),),
+    }
+
     def action_AddPortMapping(self, NewRemoteHost, NewExternalPort, NewProtocol, NewInternalPort, NewInternalClient, NewEnabled, NewPortMappingDescription, NewLeaseDuration, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddPortMapping action.
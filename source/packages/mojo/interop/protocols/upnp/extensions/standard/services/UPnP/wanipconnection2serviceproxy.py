@@ -44,6 +44,20 @@ class WANIPConnection2ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddAnyPortMapping": (("NewReservedPort", "ui2"),),
+        "GetAutoDisconnectTime": (("NewAutoDisconnectTime", "ui4"),),
+        "GetConnectionTypeInfo": (("NewConnectionType", "string"), ("NewPossibleConnectionTypes", "string"),),
+        "GetExternalIPAddress": (("NewExternalIPAddress", "string"),),
+        "GetGenericPortMappingEntry": (("NewRemoteHost", "string"), ("NewExternalPort", "ui2"), ("NewProtocol", "string"), ("NewInternalPort", "ui2"), ("NewInternalClient", "string"), ("NewEnabled", "boolean"), ("NewPortMappingDescription", "string"), ("NewLeaseDuration", "ui4"),),
+        "GetIdleDisconnectTime": (("NewIdleDisconnectTime", "ui4"),),
+        "GetListOfPortMappings": (("NewPortListing", "string"),),
+        "GetNATRSIPStatus": (("NewRSIPAvailable", "boolean"), ("NewNATEnabled", "boolean"),),
+        "GetSpecificPortMappingEntry": (("NewInternalPort", "ui2"), ("NewInternalClient", "string"), ("NewEnabled", "boolean"), ("NewPortMappingDescription", "string"), ("NewLeaseDuration", "ui4"),),
+        "GetStatusInfo": (("NewConnectionStatus", "string"), ("NewLastConnectionError", "string"), ("NewUptime", "ui4"),),
+        "GetWarnDisconnectDelay": (("NewWarnDisconnectDelay", "ui4"),),
+    }
+
     def action_AddAnyPortMapping(self, NewRemoteHost, NewExternalPort, NewProtocol, NewInternalPort, NewInternalClient, NewEnabled, NewPortMappingDescription, NewLeaseDuration, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddAnyPortMapping action.
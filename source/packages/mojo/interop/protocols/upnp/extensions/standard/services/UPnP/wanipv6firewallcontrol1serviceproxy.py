@@ -25,6 +25,14 @@ class WANIPv6FirewallControl1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "InboundPinholeAllowed": { "data_type": "boolean", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "AddPinhole": (("UniqueID", "ui2"),),
+        "CheckPinholeWorking": (("IsWorking", "boolean"),),
+        "GetFirewallStatus": (("FirewallEnabled", "boolean"), ("InboundPinholeAllowed", "boolean"),),
+        "GetOutboundPinholeTimeout": (("OutboundPinholeTimeout", "i4"),),
+        "GetPinholePackets": (("PinholePackets", "ui4"),),
+    }
+
     def action_AddPinhole(self, RemoteHost, RemotePort, InternalClient, InternalPort, Protocol, LeaseTime, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the AddPinhole action.
@@ -33,6 +33,16 @@ class WANPOTSLinkConfig1ServiceProxy(UpnpServiceProxy, DynamicExtension):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "GetCallRetryInfo": (("NewNumberOfRetries", "ui4"), ("NewDelayBetweenRetries", "ui4"),),
+        "GetDataCompression": (("NewDataCompression", "string"),),
+        "GetDataModulationSupported": (("NewDataModulationSupported", "string"),),
+        "GetDataProtocol": (("NewDataProtocol", "string"),),
+        "GetFclass": (("NewFclass", "string"),),
+        "GetISPInfo": (("NewISPPhoneNumber", "string"), ("NewISPInfo", "string"), ("NewLinkType", "string"),),
+        "GetPlusVTRCommandSupported": (("NewPlusVTRCommandSupported", "boolean"),),
+    }
+
     def action_GetCallRetryInfo(self, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the GetCallRetryInfo action.
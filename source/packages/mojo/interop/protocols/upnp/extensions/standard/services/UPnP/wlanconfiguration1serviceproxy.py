@@ -65,6 +65,35 @@ class WLANConfiguration1ServiceProxy(UpnpServiceProxy, DynamicExtension):
         "TotalAssociations": { "data_type": "ui2", "default": None, "allowed_list": None},
     }
 
+    SERVICE_ACTION_OUT_ARGS = {
+        "Get11iBeaconSecurityProperties": (("NewIEEE11iEncryptionModes", "string"), ("NewIEEE11iAuthenticationMode", "string"),),
+        "GetAuthenticationServiceMode": (("NewAuthenticationServiceMode", "string"),),
+        "GetAutoRateFallBackMode": (("NewAutoRateFallBackEnabled", "boolean"),),
+        "GetBSSID": (("NewBSSID", "string"),),
+        "GetBasicBeaconSecurityProperties": (("NewBasicEncryptionModes", "string"), ("NewBasicAuthenticationMode", "string"),),
+        "GetBeaconAdvertisement": (("NewBeaconAdvertisementEnabled", "boolean"),),
+        "GetBeaconType": (("NewBeaconType", "string"),),
+        "GetByteStatistics": (("NewTotalBytesSent", "ui4"), ("NewTotalBytesReceived", "ui4"),),
+        "GetChannelInfo": (("NewChannel", "ui1"), ("NewPossibleChannels", "string"),),
+        "GetChannelsInUse": (("NewChannelsInUse", "string"),),
+        "GetDataTransmissionRateInfo": (("NewBasicDataTransmissionRates", "string"), ("NewOperationalDataTransmissionRates", "string"), ("NewPossibleDataTransmissionRates", "string"),),
+        "GetDefaultWEPKeyIndex": (("NewDefaultWEPKeyIndex", "string"),),
+        "GetDeviceOperationMode": (("NewDeviceOperationMode", "string"), ("NewSSID", "string"), ("NewBSSID", "string"), ("NewChannel", "ui1"), ("NewBasicDataTransmissionRates", "string"), ("NewOperationalDataTransmissionRates", "string"), ("NewDistanceFromRoot", "ui1"),),
+        "GetFailureStatusInfo": (("NewTotalIntegrityFailures", "ui4"), ("NewTotalPSKFailures", "ui4"),),
+        "GetGenericAssociatedDeviceInfo": (("NewAssociatedDeviceMACAddress", "string"), ("NewAssociatedDeviceIPAddress", "string"), ("NewAssociatedDeviceAuthenticationState", "boolean"),),
+        "GetInsecureOutOfBandAccessMode": (("NewInsecureOutOfBandAccessEnabled", "boolean"),),
+        "GetLocationDescription": (("NewLocationDescription", "string"),),
+        "GetPacketStatistics": (("NewTotalPacketsSent", "ui4"), ("NewTotalPacketsReceived", "ui4"),),
+        "GetPreSharedKey": (("NewPreSharedKey", "string"), ("NewPSKPassphrase", "string"),),
+        "GetRadioMode": (("NewRadioEnabled", "boolean"),),
+        "GetRegulatoryDomain": (("NewRegulatoryDomain", "string"),),
+        "GetSSID": (("NewSSID", "string"),),
+        "GetSecurityKeys": (("NewWEPKey0", "string"), ("NewWEPKey1", "string"), ("NewWEPKey2", "string"), ("NewWEPKey3", "string"), ("NewPreSharedKey", "string"), ("NewKeyPassphrase", "string"),),
+        "GetSpecificAssociatedDeviceInfo": (("NewAssociatedDeviceIPAddress", "string"), ("NewAssociatedDeviceAuthenticationState", "boolean"),),
+        "GetTotalAssociations": (("NewTotalAssociations", "ui2"),),
+        "GetWPABeaconSecurityProperties": (("NewWPAEncryptionModes", "string"), ("NewWPAAuthenticationMode", "string"),),
+    }
+
     def action_FactoryDefaultReset(self, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
         """
             Calls the FactoryDefaultReset action.
@@ -0,0 +1,90 @@
+"""
+    NOTE: This is a code generated file.  This file should not be edited directly.
+
+    The registry index of the extensions in this directory.  The index maps the values the extension
+    key of each extension is generated from to the module, relative to this directory, and the class
+    name of the extension.  It is read without importing the extension modules.
+"""
+
+ROOT_DEVICE_REGISTRY_INDEX = {}
+
+SERVICE_REGISTRY_INDEX = {
+    ('UPnP', 'AVTransport1'): ('UPnP.avtransport1serviceproxy', 'AVTransport1ServiceProxy'),
+    ('UPnP', 'AVTransport2'): ('UPnP.avtransport2serviceproxy', 'AVTransport2ServiceProxy'),
+    ('UPnP', 'AVTransport3'): ('UPnP.avtransport3serviceproxy', 'AVTransport3ServiceProxy'),
+    ('UPnP', 'AddressBook1'): ('UPnP.addressbook1serviceproxy', 'AddressBook1ServiceProxy'),
+    ('UPnP', 'ApplicationManagement1'): ('UPnP.applicationmanagement1serviceproxy', 'ApplicationManagement1ServiceProxy'),
+    ('UPnP', 'ApplicationManagement2'): ('UPnP.applicationmanagement2serviceproxy', 'ApplicationManagement2ServiceProxy'),
+    ('UPnP', 'BasicManagement1'): ('UPnP.basicmanagement1serviceproxy', 'BasicManagement1ServiceProxy'),
+    ('UPnP', 'BasicManagement2'): ('UPnP.basicmanagement2serviceproxy', 'BasicManagement2ServiceProxy'),
+    ('UPnP', 'Calendar1'): ('UPnP.calendar1serviceproxy', 'Calendar1ServiceProxy'),
+    ('UPnP', 'CallManagement1'): ('UPnP.callmanagement1serviceproxy', 'CallManagement1ServiceProxy'),
+    ('UPnP', 'CallManagement2'): ('UPnP.callmanagement2serviceproxy', 'CallManagement2ServiceProxy'),
+    ('UPnP', 'CloudProxy1'): ('UPnP.cloudproxy1serviceproxy', 'CloudProxy1ServiceProxy'),
+    ('UPnP', 'CloudProxyDevice1'): ('UPnP.cloudproxydevice1serviceproxy', 'CloudProxyDevice1ServiceProxy'),
+    ('UPnP', 'CloudTransport1'): ('UPnP.cloudtransport1serviceproxy', 'CloudTransport1ServiceProxy'),
+    ('UPnP', 'ConfigurationManagement1'): ('UPnP.configurationmanagement1serviceproxy', 'ConfigurationManagement1ServiceProxy'),
+    ('UPnP', 'ConfigurationManagement2'): ('UPnP.configurationmanagement2serviceproxy', 'ConfigurationManagement2ServiceProxy'),
+    ('UPnP', 'ConnectionManager1'): ('UPnP.connectionmanager1serviceproxy', 'ConnectionManager1ServiceProxy'),
+    ('UPnP', 'ConnectionManager2'): ('UPnP.connectionmanager2serviceproxy', 'ConnectionManager2ServiceProxy'),
+    ('UPnP', 'ConnectionManager3'): ('UPnP.connectionmanager3serviceproxy', 'ConnectionManager3ServiceProxy'),
+    ('UPnP', 'ContentDirectory1'): ('UPnP.contentdirectory1serviceproxy', 'ContentDirectory1ServiceProxy'),
+    ('UPnP', 'ContentDirectory2'): ('UPnP.contentdirectory2serviceproxy', 'ContentDirectory2ServiceProxy'),
+    ('UPnP', 'ContentDirectory3'): ('UPnP.contentdirectory3serviceproxy', 'ContentDirectory3ServiceProxy'),
+    ('UPnP', 'ContentDirectory4'): ('UPnP.contentdirectory4serviceproxy', 'ContentDirectory4ServiceProxy'),
+    ('UPnP', 'ControlValve1'): ('UPnP.controlvalve1serviceproxy', 'ControlValve1ServiceProxy'),
+    ('UPnP', 'DeviceProtection1'): ('UPnP.deviceprotection1serviceproxy', 'DeviceProtection1ServiceProxy'),
+    ('UPnP', 'DigitalSecurityCameraMotionImage1'): ('UPnP.digitalsecuritycameramotionimage1serviceproxy', 'DigitalSecurityCameraMotionImage1ServiceProxy'),
+    ('UPnP', 'DigitalSecurityCameraSettings1'): ('UPnP.digitalsecuritycamerasettings1serviceproxy', 'DigitalSecurityCameraSettings1ServiceProxy'),
+    ('UPnP', 'DigitalSecurityCameraStillImage1'): ('UPnP.digitalsecuritycamerastillimage1serviceproxy', 'DigitalSecurityCameraStillImage1ServiceProxy'),
+    ('UPnP', 'Dimming1'): ('UPnP.dimming1serviceproxy', 'Dimming1ServiceProxy'),
+    ('UPnP', 'ExternalActivity1'): ('UPnP.externalactivity1serviceproxy', 'ExternalActivity1ServiceProxy'),
+    ('UPnP', 'FanSpeed1'): ('UPnP.fanspeed1serviceproxy', 'FanSpeed1ServiceProxy'),
+    ('UPnP', 'Feeder1'): ('UPnP.feeder1serviceproxy', 'Feeder1ServiceProxy'),
+    ('UPnP', 'HVAC_FanOperatingMode1'): ('UPnP.hvac_fanoperatingmode1serviceproxy', 'HVAC_FanOperatingMode1ServiceProxy'),
+    ('UPnP', 'HVAC_SetpointSchedule1'): ('UPnP.hvac_setpointschedule1serviceproxy', 'HVAC_SetpointSchedule1ServiceProxy'),
+    ('UPnP', 'HVAC_UserOperatingMode1'): ('UPnP.hvac_useroperatingmode1serviceproxy', 'HVAC_UserOperatingMode1ServiceProxy'),
+    ('UPnP', 'HouseStatus1'): ('UPnP.housestatus1serviceproxy', 'HouseStatus1ServiceProxy'),
+    ('UPnP', 'InboundConnectionConfig1'): ('UPnP.inboundconnectionconfig1serviceproxy', 'InboundConnectionConfig1ServiceProxy'),
+    ('UPnP', 'InputConfig1'): ('UPnP.inputconfig1serviceproxy', 'InputConfig1ServiceProxy'),
+    ('UPnP', 'LANHostConfigManagement1'): ('UPnP.lanhostconfigmanagement1serviceproxy', 'LANHostConfigManagement1ServiceProxy'),
+    ('UPnP', 'Layer3Forwarding1'): ('UPnP.layer3forwarding1serviceproxy', 'Layer3Forwarding1ServiceProxy'),
+    ('UPnP', 'LinkAuthentication1'): ('UPnP.linkauthentication1serviceproxy', 'LinkAuthentication1ServiceProxy'),
+    ('UPnP', 'MediaManagement1'): ('UPnP.mediamanagement1serviceproxy', 'MediaManagement1ServiceProxy'),
+    ('UPnP', 'MediaManagement2'): ('UPnP.mediamanagement2serviceproxy', 'MediaManagement2ServiceProxy'),
+    ('UPnP', 'Messaging1'): ('UPnP.messaging1serviceproxy', 'Messaging1ServiceProxy'),
+    ('UPnP', 'Messaging2'): ('UPnP.messaging2serviceproxy', 'Messaging2ServiceProxy'),
+    ('UPnP', 'Presence1'): ('UPnP.presence1serviceproxy', 'Presence1ServiceProxy'),
+    ('UPnP', 'PrintBasic1'): ('UPnP.printbasic1serviceproxy', 'PrintBasic1ServiceProxy'),
+    ('UPnP', 'PrintEnhanced1'): ('UPnP.printenhanced1serviceproxy', 'PrintEnhanced1ServiceProxy'),
+    ('UPnP', 'RADAConfig1'): ('UPnP.radaconfig1serviceproxy', 'RADAConfig1ServiceProxy'),
+    ('UPnP', 'RADAConfig2'): ('UPnP.radaconfig2serviceproxy', 'RADAConfig2ServiceProxy'),
+    ('UPnP', 'RADASync1'): ('UPnP.radasync1serviceproxy', 'RADASync1ServiceProxy'),
+    ('UPnP', 'RADASync2'): ('UPnP.radasync2serviceproxy', 'RADASync2ServiceProxy'),
+    ('UPnP', 'RATAConfig1'): ('UPnP.rataconfig1serviceproxy', 'RATAConfig1ServiceProxy'),
+    ('UPnP', 'RadiusClient1'): ('UPnP.radiusclient1serviceproxy', 'RadiusClient1ServiceProxy'),
+    ('UPnP', 'RemoteUIClient1'): ('UPnP.remoteuiclient1serviceproxy', 'RemoteUIClient1ServiceProxy'),
+    ('UPnP', 'RemoteUIServer1'): ('UPnP.remoteuiserver1serviceproxy', 'RemoteUIServer1ServiceProxy'),
+    ('UPnP', 'RenderingControl1'): ('UPnP.renderingcontrol1serviceproxy', 'RenderingControl1ServiceProxy'),
+    ('UPnP', 'RenderingControl2'): ('UPnP.renderingcontrol2serviceproxy', 'RenderingControl2ServiceProxy'),
+    ('UPnP', 'RenderingControl3'): ('UPnP.renderingcontrol3serviceproxy', 'RenderingControl3ServiceProxy'),
+    ('UPnP', 'Scan1'): ('UPnP.scan1serviceproxy', 'Scan1ServiceProxy'),
+    ('UPnP', 'ScheduledRecording1'): ('UPnP.scheduledrecording1serviceproxy', 'ScheduledRecording1ServiceProxy'),
+    ('UPnP', 'ScheduledRecording2'): ('UPnP.scheduledrecording2serviceproxy', 'ScheduledRecording2ServiceProxy'),
+    ('UPnP', 'SoftwareManagement1'): ('UPnP.softwaremanagement1serviceproxy', 'SoftwareManagement1ServiceProxy'),
+    ('UPnP', 'SoftwareManagement2'): ('UPnP.softwaremanagement2serviceproxy', 'SoftwareManagement2ServiceProxy'),
+    ('UPnP', 'SwitchPower1'): ('UPnP.switchpower1serviceproxy', 'SwitchPower1ServiceProxy'),
+    ('UPnP', 'TemperatureSensor1'): ('UPnP.temperaturesensor1serviceproxy', 'TemperatureSensor1ServiceProxy'),
+    ('UPnP', 'TemperatureSetpoint1'): ('UPnP.temperaturesetpoint1serviceproxy', 'TemperatureSetpoint1ServiceProxy'),
+    ('UPnP', 'WANCableLinkConfig1'): ('UPnP.wancablelinkconfig1serviceproxy', 'WANCableLinkConfig1ServiceProxy'),
+    ('UPnP', 'WANCommonInterfaceConfig1'): ('UPnP.wancommoninterfaceconfig1serviceproxy', 'WANCommonInterfaceConfig1ServiceProxy'),
+    ('UPnP', 'WANDSLLinkConfig1'): ('UPnP.wandsllinkconfig1serviceproxy', 'WANDSLLinkConfig1ServiceProxy'),
+    ('UPnP', 'WANEthernetLinkConfig1'): ('UPnP.wanethernetlinkconfig1serviceproxy', 'WANEthernetLinkConfig1ServiceProxy'),
+    ('UPnP', 'WANIPConnection1'): ('UPnP.wanipconnection1serviceproxy', 'WANIPConnection1ServiceProxy'),
+    ('UPnP', 'WANIPConnection2'): ('UPnP.wanipconnection2serviceproxy', 'WANIPConnection2ServiceProxy'),
+    ('UPnP', 'WANIPv6FirewallControl1'): ('UPnP.wanipv6firewallcontrol1serviceproxy', 'WANIPv6FirewallControl1ServiceProxy'),
+    ('UPnP', 'WANPOTSLinkConfig1'): ('UPnP.wanpotslinkconfig1serviceproxy', 'WANPOTSLinkConfig1ServiceProxy'),
+    ('UPnP', 'WANPPPConnection1'): ('UPnP.wanpppconnection1serviceproxy', 'WANPPPConnection1ServiceProxy'),
+    ('UPnP', 'WLANConfiguration1'): ('UPnP.wlanconfiguration1serviceproxy', 'WLANConfiguration1ServiceProxy'),
+}
+
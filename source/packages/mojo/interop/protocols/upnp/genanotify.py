@@ -0,0 +1,302 @@
+"""
+.. module:: genanotify
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`GenaNotifyReader` which incrementally reads and parses GENA NOTIFY
+               subscription callback requests.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import List, Optional, Tuple
+
+import socket
+
+from xml.etree.ElementTree import Element, XMLPullParser, ParseError
+
+from mojo.networking.constants import HTTP1_1_END_OF_HEADER
+
+from mojo.interop.protocols.upnp.soap import NS_UPNP_EVENT
+from mojo.interop.protocols.upnp.upnpprotocol import http_parse_header
+
+GENA_PROPERTY_TAG = "{%s}property" % NS_UPNP_EVENT
+GENA_PROPERTYSET_TAG = "{%s}propertyset" % NS_UPNP_EVENT
+
+GENA_READER_INITIAL_SIZE = 8192
+GENA_READER_MAX_HEADER_LENGTH = 65536
+
+# The headers of a NOTIFY request that are set by :func:`gena_send_notify`
+GENA_SENDER_HEADERS = ("HOST", "CONTENT-LENGTH", "CONNECTION")
+
+
+class GenaNotifyReader:
+    """
+        The :class:`GenaNotifyReader` reads a GENA NOTIFY request into a single preallocated buffer.  The buffer is
+        filled with `recv_into` so the content is never copied as it is read, the header terminator is found by
+        scanning only the newly received bytes and the body is fed to an incremental XML parser as it arrives.  The
+        `property` elements of the event are collected as they are completed, so large LastChange events are parsed
+        in time that is linear with the size of the request.
+    """
+
+    def __init__(self, initial_size: int = GENA_READER_INITIAL_SIZE):
+        """
+            Creates a :class:`GenaNotifyReader` instance.
+
+            :param initial_size: The initial size of the receive buffer.  The buffer is grown to fit the
+                                 request once the content length is known.
+        """
+        self._buffer = bytearray(initial_size)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+        self._header_scan_from = 0
+        self._eof = False
+
+        self._request_line = None
+        self._headers = None
+        self._header_length = None
+        self._content_length = None
+
+        self._parser = None
+        self._parse_error = None
+        self._body_fed = 0
+        self._root_tag = None
+        self._property_nodes: List[Element] = []
+        return
+
+    @property
+    def body(self) -> bytes:
+        """
+            A copy of the body content of the request.  The copy is only made when the body is asked for.
+        """
+        body = b""
+        if self._header_length is not None:
+            body = bytes(self._view[self._header_length:self._body_end()])
+        return body
+
+    @property
+    def complete(self) -> bool:
+        """
+            Indicates that the full request has been read.
+        """
+        done = self._eof
+        if not done and self._header_length is not None and self._content_length is not None:
+            done = self._filled >= self._header_length + self._content_length
+        return done
+
+    @property
+    def header_complete(self) -> bool:
+        """
+            Indicates that the header of the request has been read and parsed.
+        """
+        return self._headers is not None
+
+    @property
+    def headers(self) -> Optional[dict]:
+        """
+            The headers of the request or None if the header has not been read.
+        """
+        return self._headers
+
+    @property
+    def parse_error(self) -> Optional[ParseError]:
+        """
+            The error encountered by the incremental XML parser, if any.
+        """
+        return self._parse_error
+
+    @property
+    def property_nodes(self) -> Optional[List[Element]]:
+        """
+            The list of `property` elements of the event or None if the body was not a valid
+            GENA property set.
+        """
+        nodes = None
+        if self._parse_error is None and self._root_tag == GENA_PROPERTYSET_TAG:
+            nodes = self._property_nodes
+        return nodes
+
+    @property
+    def request_line(self) -> Optional[bytes]:
+        """
+            The request line of the request or None if the header has not been read.
+        """
+        return self._request_line
+
+    def feed(self, data: bytes):
+        """
+            Feeds data that was received by other means into the reader.
+
+            :param data: The data to append to the request content.
+        """
+        data_len = len(data)
+        if data_len == 0:
+            self._eof = True
+        else:
+            self._ensure_space(data_len)
+            self._view[self._filled:self._filled + data_len] = data
+            self._process_received(data_len)
+        return
+
+    def finish(self):
+        """
+            Completes the parsing of the event body once the request has been read.
+        """
+        if self._parser is not None and self._parse_error is None:
+            try:
+                self._parser.close()
+                self._collect_events()
+            except ParseError as perr:
+                self._parse_error = perr
+            self._parser = None
+        return
+
+    def recv_from(self, sock: socket.socket) -> int:
+        """
+            Receives the next block of the request directly into the buffer of the reader.
+
+            :param sock: The socket to receive the request content from.
+
+            :returns: The number of bytes received, zero indicates the end of the stream.
+        """
+        self._ensure_space(1)
+
+        limit = len(self._buffer)
+        if self._header_length is not None and self._content_length is not None:
+            limit = min(limit, self._header_length + self._content_length)
+
+        received = sock.recv_into(self._view[self._filled:limit])
+        if received == 0:
+            self._eof = True
+        else:
+            self._process_received(received)
+
+        return received
+
+    def release(self):
+        """
+            Releases the view on the buffer of the reader.
+        """
+        self._view.release()
+        return
+
+    def _body_end(self) -> int:
+        """
+            Returns the offset of the end of the body content that has been received.
+        """
+        body_end = self._filled
+        if self._content_length is not None:
+            body_end = min(body_end, self._header_length + self._content_length)
+        return body_end
+
+    def _collect_events(self):
+        """
+            Collects the completed property elements from the incremental parser.
+        """
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root_tag is None:
+                    self._root_tag = elem.tag
+            elif elem.tag == GENA_PROPERTY_TAG:
+                self._property_nodes.append(elem)
+        return
+
+    def _ensure_space(self, needed: int):
+        """
+            Grows the buffer when there is not enough free space for the data that is about to be received.  Once the
+            content length is known the buffer is grown to exactly fit the request, otherwise it is doubled.
+        """
+        free = len(self._buffer) - self._filled
+        if free < needed:
+            new_size = max(len(self._buffer) * 2, self._filled + needed)
+            if self._header_length is not None and self._content_length is not None:
+                new_size = max(self._header_length + self._content_length, self._filled + needed)
+
+            # The view must be released before the bytearray can be resized
+            self._view.release()
+            self._buffer.extend(bytes(new_size - len(self._buffer)))
+            self._view = memoryview(self._buffer)
+        return
+
+    def _feed_body(self):
+        """
+            Feeds the body content that has been received and not yet parsed to the incremental XML parser.
+        """
+        body_end = self._body_end()
+        if self._parse_error is None and body_end > self._body_fed:
+            try:
+                self._parser.feed(self._view[self._body_fed:body_end])
+                self._collect_events()
+            except ParseError as perr:
+                self._parse_error = perr
+            self._body_fed = body_end
+        return
+
+    def _process_received(self, received: int):
+        """
+            Processes the block of content that was just written to the buffer.
+        """
+        self._filled += received
+
+        if self._headers is None:
+            # Only scan the new content, backing up to catch a terminator that straddles two reads
+            scan_from = max(0, self._header_scan_from - (len(HTTP1_1_END_OF_HEADER) - 1))
+            header_end = self._buffer.find(HTTP1_1_END_OF_HEADER, scan_from, self._filled)
+            if header_end > -1:
+                self._request_line, self._headers = http_parse_header(bytes(self._view[:header_end]))
+                self._header_length = header_end + len(HTTP1_1_END_OF_HEADER)
+
+                if "CONTENT-LENGTH" in self._headers:
+                    self._content_length = int(self._headers["CONTENT-LENGTH"])
+
+                self._parser = XMLPullParser(events=("start", "end"))
+                self._body_fed = self._header_length
+            elif self._filled > GENA_READER_MAX_HEADER_LENGTH:
+                raise ValueError("GENA NOTIFY request header exceeded the maximum header length.")
+            else:
+                self._header_scan_from = self._filled
+
+        if self._parser is not None:
+            self._feed_body()
+
+        return
+
+
+def gena_send_notify(address: Tuple[str, int], path: str, headers: dict, content: bytes, timeout: Optional[float] = None) -> bool:
+    """
+        Sends a GENA NOTIFY request to a subscriber and waits for the response.  The HOST, CONTENT-LENGTH and
+        CONNECTION headers are set for the request, the request is made on a new connection that is closed
+        after the response.
+
+        :param address: The (host, port) address of the subscriber.
+        :param path: The path of the callback url.
+        :param headers: The headers of the request, like SID, SEQ, NT and NTS.
+        :param content: The body of the request.
+        :param timeout: The time to wait for the connection and the response.
+
+        :returns: True if the subscriber responded with 200 OK.
+    """
+    accepted = False
+
+    req_lines = [b"NOTIFY %s HTTP/1.1" % (path or "/").encode("utf-8")]
+    req_lines.append(b"HOST: %s:%d" % (address[0].encode("utf-8"), address[1]))
+    for hdr_name, hdr_val in headers.items():
+        if hdr_name.upper() not in GENA_SENDER_HEADERS:
+            req_lines.append(b"%s: %s" % (hdr_name.encode("utf-8"), str(hdr_val).encode("utf-8")))
+    req_lines.append(b"CONTENT-LENGTH: %d" % len(content))
+    req_lines.append(b"CONNECTION: close")
+
+    request = b"\r\n".join(req_lines) + HTTP1_1_END_OF_HEADER + content
+
+    try:
+        with socket.create_connection(address, timeout=timeout) as gsock:
+            gsock.sendall(request)
+            response = gsock.recv(1024)
+            accepted = response.startswith(b"HTTP/1.1 200")
+    except OSError:
+        accepted = False
+
+    return accepted
@@ -27,7 +27,7 @@ from xml.etree.ElementTree import fromstring as xml_fromstring
 
 from mojo.xmods.fspath import ensure_directory_is_package
 
-from mojo.interop.protocols.upnp.coordinators.upnpcoordinator import UpnpCoordinator
+from mojo.interop.protocols.upnp.upnpextensionindex import write_extension_index
 
 # pylint: disable=unused-import
 
@@ -44,6 +44,13 @@ CONTENT_PROXY_FILE_HEADER = """
 PROXY_BASE_CLASS_IMPORT = "from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy"
 PROXY_BASE_CLASS_NAME = "UpnpServiceProxy"
 
+SERVICE_NAME_TO_BASE_CLASSES = {
+    "ContentDirectory": (
+        "from mojo.interop.protocols.upnp.services.upnpcontentdirectoryserviceproxy import UpnpContentDirectoryServiceProxy",
+        "UpnpContentDirectoryServiceProxy"
+    )
+}
+
 TEMPLATE_CLASS_PREFIX = """
 
 from mojo.interop.protocols.upnp.aspects import AspectsUPnP, DEFAULT_UPNP_ASPECTS
@@ -62,7 +69,7 @@ class %(class_name)s(%(base_class_name)s, DynamicExtension):
     SERVICE_DEFAULT_VARIABLES = {%(svc_default_vars)s}
 
     SERVICE_EVENT_VARIABLES = {%(svc_event_vars)s}
-"""
+%(svc_action_out_args)s"""
 
 TEMPLATE_ACTION_NO_RETURN = """
     def action_%(action_name)s(self%(in_params_comma)s%(in_params_list)s, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
@@ -96,6 +103,77 @@ TEMPLATE_ACTION_WITH_RETURN = """
         return rtn_args
 """
 
+TEMPLATE_TYPED_IMPORTS = """
+from typing import NamedTuple
+"""
+
+TEMPLATE_CLASS_TYPED_IN_ARGS = """
+    SERVICE_ACTION_IN_ARGS = {%(svc_action_in_args)s}
+"""
+
+TEMPLATE_TYPED_ACTION_NO_RETURN = """
+    def action_%(action_name)s(self%(in_params_comma)s%(in_params_list)s, *, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS):
+        \"""
+            Calls the %(action_name)s action.
+        \"""
+        self.call_action("%(action_name)s", arguments=(%(args_tuple)s), aspects=aspects)
+
+        return
+"""
+
+TEMPLATE_TYPED_ACTION_WITH_RETURN = """
+    def action_%(action_name)s(self%(in_params_comma)s%(in_params_list)s, *, extract_returns=True, aspects:AspectsUPnP=DEFAULT_UPNP_ASPECTS) -> "%(result_class)s":
+        \"""
+            Calls the %(action_name)s action.
+
+            :returns: A :class:`%(result_class)s` with the %(out_params_list)s out arguments.
+        \"""
+        out_params = self.call_action("%(action_name)s", arguments=(%(args_tuple)s), aspects=aspects)
+
+        rtn_args = out_params
+        if extract_returns:
+            rtn_args = %(result_class)s(%(result_args)s)
+
+        return rtn_args
+"""
+
+TEMPLATE_TYPED_RESULT_CLASS = """
+
+class %(result_class)s(NamedTuple):
+    \"""
+        The out arguments of the %(action_name)s action.
+    \"""
+%(result_fields)s
+"""
+
+# The python types of the UPnP data types that the SOAP decoder converts out arguments to
+UPNP_TO_PYTHON_TYPE_NAMES = {
+    "ui1": "int", "ui2": "int", "ui4": "int", "ui8": "int",
+    "i1": "int", "i2": "int", "i4": "int", "i8": "int", "int": "int",
+    "r4": "float", "r8": "float", "number": "float", "float": "float", "fixed.14.4": "float",
+    "boolean": "bool"
+}
+
+def lookup_related_allowed_values(arg_info: dict, variablesTable: dict, typesTable: dict) -> Optional[list]:
+    """
+        Looks up the allowed values of an action argument from the state variable that the argument is related to.
+
+        :param arg_info: The argument information from the actions table.
+        :param variablesTable: A table containing the information about the variables associated with a service.
+        :param typesTable: A table containing the types associated with the variables used by the service.
+
+        :returns: The list of allowed values or None if the related state variable does not have an allowed value list.
+    """
+    allowed_values = None
+
+    related_var = arg_info["relatedStateVariable"]
+    if related_var in variablesTable:
+        allowed_values = variablesTable[related_var].get("allowedValueList")
+    elif related_var in typesTable:
+        allowed_values = typesTable[related_var].get("allowedValueList")
+
+    return allowed_values
+
 def node_lower_strip_text(txt: Union[str, None]) -> Union[str, None]:
     """
         Converts text to lower case and strips leading and trailing whitespace if not None.
@@ -116,12 +194,34 @@ def node_strip_text(txt: Union[str, None]) -> Union[str, None]:
         txt = txt.strip()
     return txt
 
+def lookup_related_variable_type(arg_info: dict, variablesTable: dict, typesTable: dict) -> str:
+    """
+        Looks up the data type of an action argument from the state variable that the argument is related to.
+
+        :param arg_info: The argument information from the actions table.
+        :param variablesTable: A table containing the information about the variables associated with a service.
+        :param typesTable: A table containing the types associated with the variables used by the service.
+
+        :returns: The UPnP data type of the argument, 'string' if the related state variable is not found.
+    """
+    arg_type = "string"
+
+    related_var = arg_info["relatedStateVariable"]
+    if related_var in variablesTable:
+        arg_type = variablesTable[related_var]["dataType"]
+    elif related_var in typesTable:
+        arg_type = typesTable[related_var]["dataType"]
+
+    return arg_type
+
 def generate_upnp_service_proxy(serviceManufacturer: str, serviceType: str, serviceName: str, className: str,
                                 variablesTable: dict,typesTable: dict, eventsTable: dict, actionsTable: dict,
                                 base_class_name: str=PROXY_BASE_CLASS_NAME,
-                                base_class_import: str=PROXY_BASE_CLASS_IMPORT) -> str:
+                                base_class_import: str=PROXY_BASE_CLASS_IMPORT, typed: bool=False) -> str:
     """
-        Generates a service proxy using the parameters provided.
+        Generates a service proxy using the parameters provided.  In the typed mode the proxy declares the
+        in arguments of its actions so the calls are made with precomputed marshallers, and the actions return
+        NamedTuple result types instead of lists of values.
 
         :param servicesDir: The directory to output the service proxy to.
         :param serviceManufacturer: The name of the manufacturer for the device that a service proxy is being generated for.
@@ -130,6 +230,7 @@ def generate_upnp_service_proxy(serviceManufacturer: str, serviceType: str, serv
         :param typesTable: A table containing the types associated with the variables used by the service.
         :param eventsTable: A table containing information about the events published by the services.
         :param actionsTable: A table containing information about the actions that can be called on the service.
+        :param typed: Generate the proxy in the typed mode.
 
     """
     # pylint: disable=unused-argument
@@ -194,15 +295,41 @@ def generate_upnp_service_proxy(serviceManufacturer: str, serviceType: str, serv
     else:
         class_fill_dict["svc_default_vars"] = ""
 
+    action_names_sorted = [ k for k in actionsTable.keys() ]
+    action_names_sorted.sort()
+
+    action_out_args_lines = []
+    for action_name in action_names_sorted:
+        action_info = actionsTable[action_name]
+
+        args_out_keys = action_info["args_out_keys"]
+        if len(args_out_keys) > 0:
+            out_arg_entries = []
+            for arg_key in args_out_keys:
+                arg_type = lookup_related_variable_type(action_info["args_out"][arg_key], variablesTable, typesTable)
+                out_arg_entries.append("(\"%s\", \"%s\")" % (arg_key, arg_type))
+            action_out_args_lines.append("\"%s\": (%s,),\n" % (action_name, ", ".join(out_arg_entries)))
+
+    if len(action_out_args_lines) > 0:
+        service_out_args_content = "\n        " + "        ".join(action_out_args_lines) + "    "
+        class_fill_dict["svc_action_out_args"] = "\n    SERVICE_ACTION_OUT_ARGS = {%s}\n" % service_out_args_content
+    else:
+        # The proxies without out arguments use the empty table of the base class
+        class_fill_dict["svc_action_out_args"] = ""
+
     spf = io.StringIO()
     spf.write('"""\n')
     spf.write(CONTENT_PROXY_FILE_HEADER)
     spf.write('"""\n')
     spf.write('\n')
+    if typed:
+        spf.write(TEMPLATE_TYPED_IMPORTS)
     spf.write(TEMPLATE_CLASS_PREFIX % class_fill_dict)
 
-    action_names_sorted = [ k for k in actionsTable.keys() ]
-    action_names_sorted.sort()
+    if typed:
+        content = generate_typed_service_proxy_actions(className, variablesTable, typesTable, actionsTable, action_names_sorted)
+        spf.write(content)
+        return spf.getvalue()
 
     for action_name in action_names_sorted:
 
@@ -242,6 +369,93 @@ def generate_upnp_service_proxy(serviceManufacturer: str, serviceType: str, serv
 
     return spf.getvalue()
 
+def generate_typed_service_proxy_actions(className: str, variablesTable: dict, typesTable: dict, actionsTable: dict,
+                                         action_names_sorted: list) -> str:
+    """
+        Generates the in argument table, the action methods and the result types of a typed service proxy.
+
+        :param className: The name of the service proxy class.
+        :param variablesTable: A table containing the information about the variables associated with a service.
+        :param typesTable: A table containing the types associated with the variables used by the service.
+        :param actionsTable: A table containing information about the actions that can be called on the service.
+        :param action_names_sorted: The sorted names of the actions.
+
+        :returns: The content that follows the class prefix of the service proxy.
+    """
+    action_in_args_lines = []
+    for action_name in action_names_sorted:
+        action_info = actionsTable[action_name]
+
+        # Actions without in arguments are declared as well, their calls pass an empty tuple
+        args_in_keys = action_info["args_in_keys"]
+        if len(args_in_keys) > 0:
+            in_arg_entries = []
+            for arg_key in args_in_keys:
+                arg_info = action_info["args_in"][arg_key]
+                arg_type = lookup_related_variable_type(arg_info, variablesTable, typesTable)
+                allowed_values = lookup_related_allowed_values(arg_info, variablesTable, typesTable)
+                if allowed_values is not None:
+                    allowed_values = tuple(allowed_values)
+                in_arg_entries.append("(\"%s\", \"%s\", %r)" % (arg_key, arg_type, allowed_values))
+            action_in_args_lines.append("\"%s\": (%s,),\n" % (action_name, ", ".join(in_arg_entries)))
+        else:
+            action_in_args_lines.append("\"%s\": (),\n" % action_name)
+
+    svc_action_in_args = ""
+    if len(action_in_args_lines) > 0:
+        svc_action_in_args = "\n        " + "        ".join(action_in_args_lines) + "    "
+
+    spf = io.StringIO()
+    spf.write(TEMPLATE_CLASS_TYPED_IN_ARGS % { "svc_action_in_args": svc_action_in_args })
+
+    result_classes = []
+
+    for action_name in action_names_sorted:
+
+        action_info = actionsTable[action_name]
+
+        args_in_keys = action_info["args_in_keys"]
+        in_params_list = ", ".join(args_in_keys)
+        in_params_comma = ", " if len(args_in_keys) > 0 else ""
+
+        args_tuple = ""
+        if len(args_in_keys) > 0:
+            args_tuple = ", ".join(args_in_keys) + ","
+
+        action_fill = {
+            "action_name": action_name,
+            "in_params_list": in_params_list,
+            "in_params_comma": in_params_comma,
+            "args_tuple": args_tuple
+        }
+
+        args_out_keys = action_info["args_out_keys"]
+        if len(args_out_keys) > 0:
+            result_class = "%s%sResult" % (className.replace("ServiceProxy", ""), action_name)
+
+            result_fields = []
+            for arg_key in args_out_keys:
+                arg_type = lookup_related_variable_type(action_info["args_out"][arg_key], variablesTable, typesTable)
+                result_fields.append("    %s: %s" % (arg_key, UPNP_TO_PYTHON_TYPE_NAMES.get(arg_type, "str")))
+
+            action_fill["result_class"] = result_class
+            action_fill["out_params_list"] = ", ".join('"%s"' % ok for ok in args_out_keys)
+            action_fill["result_args"] = ", ".join('out_params.get("%s")' % ok for ok in args_out_keys)
+            spf.write(TEMPLATE_TYPED_ACTION_WITH_RETURN % action_fill)
+
+            result_classes.append(TEMPLATE_TYPED_RESULT_CLASS % {
+                "result_class": result_class,
+                "action_name": action_name,
+                "result_fields": "\n".join(result_fields)
+            })
+        else:
+            spf.write(TEMPLATE_TYPED_ACTION_NO_RETURN % action_fill)
+
+    for result_content in result_classes:
+        spf.write(result_content)
+
+    return spf.getvalue()
+
 def process_action_list(svcActionListNode: Element, namespaces: Optional[dict] = None) -> dict:
     """
         Processes the action list node for a service description and creates a table with all the actions available
@@ -360,13 +574,17 @@ def process_service_state_table(svcStateTableNode: Element, namespaces: Optional
     return variablesTable, typesTable, eventsTable
 
 
-def generate_service_proxies(svc_desc_directory: str, svc_proxy_directory: str):
+def generate_service_proxies(svc_desc_directory: str, svc_proxy_directory: str, typed: bool = False):
     """
         Processes the XML service description documents in the description documents folder and generates the
-        service proxy modules.  Then outputs the generated proxy modules to the service proxy foloder specified.
+        service proxy modules.  Then outputs the generated proxy modules to the service proxy foloder specified
+        along with the registry index of the service proxies, so the :class:`UpnpFactory` can catalog the proxies
+        without importing them.
 
         :param svc_desc_directory: The directory that contains the service description documents to process.
         :param svc_proxy_directory: The directory that is the output directory for the service proxy modules.
+        :param typed: Generate the service proxies in the typed mode with precomputed argument marshallers and
+                      NamedTuple result types.
     """
     for dirpath, _, filenames in os.walk(svc_desc_directory, topdown=True):
         for nxtfile in filenames:
@@ -420,9 +638,15 @@ def generate_service_proxies(svc_desc_directory: str, svc_proxy_directory: str):
                 className = serviceName + "ServiceProxy"
                 file_base = className.lower() + ".py"
 
+                base_class_import = PROXY_BASE_CLASS_IMPORT
+                base_class_name = PROXY_BASE_CLASS_NAME
+                if service_type_parts[3] in SERVICE_NAME_TO_BASE_CLASSES:
+                    base_class_import, base_class_name = SERVICE_NAME_TO_BASE_CLASSES[service_type_parts[3]]
+
                 dest_file_full = os.path.join(manufacturerDir, file_base)
                 content = generate_upnp_service_proxy(serviceManufacturer, serviceName, serviceType,
-                        className, variablesTable, typesTable, eventsTable, actionsTable)
+                        className, variablesTable, typesTable, eventsTable, actionsTable,
+                        base_class_name=base_class_name, base_class_import=base_class_import, typed=typed)
 
                 with open(dest_file_full, 'w') as df:
                     df.write(content)
@@ -431,4 +655,7 @@ def generate_service_proxies(svc_desc_directory: str, svc_proxy_directory: str):
                 errmsg = "WARNING: No serice node found in file:\n    %s\n" % fullpath
                 print(errmsg, file=sys.stderr)
 
+    if os.path.exists(svc_proxy_directory):
+        write_extension_index(svc_proxy_directory)
+
     return
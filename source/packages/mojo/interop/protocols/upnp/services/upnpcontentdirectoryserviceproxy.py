@@ -0,0 +1,131 @@
+"""
+.. module:: upnpcontentdirectoryserviceproxy
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the :class:`UpnpContentDirectoryServiceProxy` class which is the base class
+               of the code generated ContentDirectory service proxies.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Callable, Generator, Optional
+
+from mojo.interop.protocols.upnp.aspects import AspectsUPnP, DEFAULT_UPNP_ASPECTS
+from mojo.interop.protocols.upnp.content.didllite import DidlObject, iter_didl_lite_objects
+from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+
+DEFAULT_CONTENT_PAGE_SIZE = 100
+
+BROWSE_FLAG_DIRECT_CHILDREN = "BrowseDirectChildren"
+BROWSE_FLAG_METADATA = "BrowseMetadata"
+
+
+class UpnpContentDirectoryServiceProxy(UpnpServiceProxy):
+    """
+        The :class:`UpnpContentDirectoryServiceProxy` is the base class of the ContentDirectory service proxies.  It
+        adds generators that walk the Browse and Search actions a page at a time and decode the DIDL-Lite results
+        of each page as they are parsed, so only one page of a large media library is held at a time.
+    """
+
+    def browse_objects(self, object_id: str = "0", *, browse_flag: str = BROWSE_FLAG_DIRECT_CHILDREN, filter: str = "*",
+                       sort_criteria: str = "", starting_index: int = 0, page_size: int = DEFAULT_CONTENT_PAGE_SIZE,
+                       limit: Optional[int] = None, aspects: AspectsUPnP = DEFAULT_UPNP_ASPECTS) -> Generator[DidlObject, None, None]:
+        """
+            Walks the objects of a container with the Browse action and yields the objects as each page arrives.
+
+            :param object_id: The id of the object to browse.
+            :param browse_flag: The BrowseFlag, 'BrowseDirectChildren' or 'BrowseMetadata'.
+            :param filter: The Filter of the properties to return.
+            :param sort_criteria: The SortCriteria of the results.
+            :param starting_index: The index of the first object to return.
+            :param page_size: The RequestedCount of each page.
+            :param limit: The maximum number of objects to return or None for all of them.
+            :param aspects: The aspects to use for the action calls.
+
+            :returns: A generator of the objects.
+        """
+        def browse_page(index: int, count: int):
+            return self.action_Browse(object_id, browse_flag, filter, index, count, sort_criteria, aspects=aspects)
+
+        yield from self._walk_pages(browse_page, starting_index, page_size, limit)
+
+        return
+
+    def search_objects(self, container_id: str, search_criteria: str, *, filter: str = "*", sort_criteria: str = "",
+                       starting_index: int = 0, page_size: int = DEFAULT_CONTENT_PAGE_SIZE, limit: Optional[int] = None,
+                       aspects: AspectsUPnP = DEFAULT_UPNP_ASPECTS) -> Generator[DidlObject, None, None]:
+        """
+            Walks the objects that match a search with the Search action and yields the objects as each page arrives.
+
+            :param container_id: The id of the container to search.
+            :param search_criteria: The SearchCriteria of the search.
+            :param filter: The Filter of the properties to return.
+            :param sort_criteria: The SortCriteria of the results.
+            :param starting_index: The index of the first object to return.
+            :param page_size: The RequestedCount of each page.
+            :param limit: The maximum number of objects to return or None for all of them.
+            :param aspects: The aspects to use for the action calls.
+
+            :returns: A generator of the objects.
+        """
+        def search_page(index: int, count: int):
+            return self.action_Search(container_id, search_criteria, filter, index, count, sort_criteria, aspects=aspects)
+
+        yield from self._walk_pages(search_page, starting_index, page_size, limit)
+
+        return
+
+    def _count_value(self, value) -> int:
+        """
+            Converts a NumberReturned or TotalMatches out argument to an int, some devices send an empty
+            value instead of a count which is treated as zero.
+        """
+        count = 0
+
+        if isinstance(value, int):
+            count = value
+        elif value is not None and value.strip() != "":
+            count = int(value)
+
+        return count
+
+    def _walk_pages(self, call_page: Callable, starting_index: int, page_size: int,
+                    limit: Optional[int]) -> Generator[DidlObject, None, None]:
+        """
+            Calls a paged action until all of the matches have been returned.  A TotalMatches of zero means the
+            device does not know the total, in which case the walk stops on the first short page.
+        """
+        index = starting_index
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            count = page_size
+            if remaining is not None and remaining < count:
+                count = remaining
+
+            result, number_returned, total_matches, _ = call_page(index, count)
+            number_returned = self._count_value(number_returned)
+            total_matches = self._count_value(total_matches)
+
+            if result:
+                for obj in iter_didl_lite_objects(result):
+                    yield obj
+
+            index += number_returned
+            if remaining is not None:
+                remaining -= number_returned
+
+            if number_returned == 0:
+                break
+            if total_matches > 0:
+                if index >= total_matches:
+                    break
+            elif number_returned < count:
+                break
+
+        return
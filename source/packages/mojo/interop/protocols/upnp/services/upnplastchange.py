@@ -0,0 +1,204 @@
+"""
+.. module:: upnplastchange
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the :class:`UpnpLastChangeState` class which decodes the LastChange events of
+               services like AVTransport and RenderingControl into a table of the embedded variables.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from datetime import datetime
+
+from xml.etree.ElementTree import fromstring as xml_fromstring
+from xml.etree.ElementTree import ParseError
+
+LAST_CHANGE_VARIABLE = "LastChange"
+
+DEFAULT_LAST_CHANGE_INSTANCE = "0"
+DEFAULT_LAST_CHANGE_CHANNEL = "Master"
+
+# A listener is called with the key and the new value of each embedded variable that changed
+LastChangeListener = Callable[["UpnpLastChangeKey", Any], None]
+
+
+class UpnpLastChangeKey(NamedTuple):
+    """
+        The key of a variable that is embedded in the LastChange events of a service.  A key can be passed
+        as the variable name of the :func:`wait_any` and :func:`wait_all` conditions.
+    """
+    name: str
+    instance_id: str = DEFAULT_LAST_CHANGE_INSTANCE
+    channel: Optional[str] = None
+
+
+class UpnpLastChangeValue:
+    """
+        The value of an embedded variable and the times it was updated and changed.
+    """
+
+    __slots__ = ("value", "updated", "changed")
+
+    def __init__(self, value: str, updated: datetime):
+        self.value = value
+        self.updated = updated
+        self.changed = updated
+        return
+
+    def __repr__(self) -> str:
+        rstr = "<UpnpLastChangeValue value={!r} updated={} changed={}>".format(self.value, self.updated, self.changed)
+        return rstr
+
+
+def parse_last_change(content: str) -> List[Tuple[UpnpLastChangeKey, str]]:
+    """
+        Parses the XML document of a LastChange event.
+
+        :param content: The value of the LastChange variable.
+
+        :returns: A list of the keys and values of the embedded variables in the event.
+
+        :raises: :class:`xml.etree.ElementTree.ParseError` if the event is not well formed.
+    """
+    changes = []
+
+    event_node = xml_fromstring(content)
+
+    # The instances are usually InstanceID elements but some vendor services use other
+    # element names, like QueueID, so any child of the event with a val is an instance.
+    for instance_node in event_node:
+        instance_id = instance_node.get("val")
+        if instance_id is None:
+            continue
+
+        for var_node in instance_node:
+            value = var_node.get("val")
+            if value is None:
+                continue
+
+            var_name = var_node.tag
+            if var_name[0] == "{":
+                var_name = var_name[var_name.find("}") + 1:]
+
+            key = UpnpLastChangeKey(var_name, instance_id, var_node.get("channel"))
+            changes.append((key, value))
+
+    return changes
+
+
+class UpnpLastChangeState:
+    """
+        The :class:`UpnpLastChangeState` keeps the table of the variables that are embedded in the LastChange events
+        of a service by InstanceID and channel.  Each event is parsed once when it arrives, so reading or waiting on
+        an embedded variable like TransportState or Volume does not parse the LastChange document again.
+
+        The state object is not thread safe on its own, the service proxy that owns it updates and reads it while
+        holding the service lock.
+    """
+
+    def __init__(self):
+        self._table: Dict[UpnpLastChangeKey, UpnpLastChangeValue] = {}
+        self._listeners: Dict[Optional[str], List[LastChangeListener]] = {}
+        return
+
+    def add_listener(self, listener: LastChangeListener, name: Optional[str] = None):
+        """
+            Adds a listener that is called when an embedded variable changes.
+
+            :param listener: The function to call with the key and new value of the variable.
+            :param name: The name of the variable to listen to or None to listen to all of the variables.
+        """
+        listeners = self._listeners.setdefault(name, [])
+        if listener not in listeners:
+            listeners.append(listener)
+        return
+
+    def keys(self) -> List[UpnpLastChangeKey]:
+        """
+            Returns the keys of the embedded variables that have been reported.
+        """
+        return list(self._table.keys())
+
+    def listeners_for_changes(self, changed: List[Tuple[UpnpLastChangeKey, str]]) -> List[Tuple[LastChangeListener, UpnpLastChangeKey, str]]:
+        """
+            Gets the calls to make to the listeners for a list of changes, so the owner can make the calls
+            after releasing its lock.
+        """
+        calls = []
+
+        if len(self._listeners) > 0:
+            all_listeners = self._listeners.get(None, [])
+            for key, value in changed:
+                for listener in self._listeners.get(key.name, []):
+                    calls.append((listener, key, value))
+                for listener in all_listeners:
+                    calls.append((listener, key, value))
+
+        return calls
+
+    def lookup(self, name: str, instance_id: str = DEFAULT_LAST_CHANGE_INSTANCE,
+               channel: Optional[str] = None) -> Optional[UpnpLastChangeValue]:
+        """
+            Looks up an embedded variable.  When a channel is not specified, the variable without a channel is
+            returned or the 'Master' channel of a variable that has channels.
+
+            :param name: The name of the variable.
+            :param instance_id: The InstanceID of the variable.
+            :param channel: The channel of the variable.
+
+            :returns: The value entry of the variable or None if the variable has not been reported.
+        """
+        entry = self._table.get(UpnpLastChangeKey(name, instance_id, channel))
+        if entry is None and channel is None:
+            entry = self._table.get(UpnpLastChangeKey(name, instance_id, DEFAULT_LAST_CHANGE_CHANNEL))
+        return entry
+
+    def remove_listener(self, listener: LastChangeListener, name: Optional[str] = None):
+        """
+            Removes a listener that was added with :meth:`add_listener`.
+        """
+        listeners = self._listeners.get(name)
+        if listeners is not None and listener in listeners:
+            listeners.remove(listener)
+            if len(listeners) == 0:
+                del self._listeners[name]
+        return
+
+    def update(self, content: str) -> List[Tuple[UpnpLastChangeKey, str]]:
+        """
+            Decodes a LastChange event and updates the table.
+
+            :param content: The value of the LastChange variable.
+
+            :returns: The keys and values of the embedded variables whose values changed.
+        """
+        changed = []
+
+        try:
+            changes = parse_last_change(content)
+        except ParseError:
+            changes = []
+
+        now = datetime.now()
+
+        table = self._table
+        for key, value in changes:
+            entry = table.get(key)
+            if entry is None:
+                table[key] = UpnpLastChangeValue(value, now)
+                changed.append((key, value))
+            else:
+                entry.updated = now
+                if entry.value != value:
+                    entry.value = value
+                    entry.changed = now
+                    changed.append((key, value))
+
+        return changed
@@ -13,7 +13,7 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
-from typing import Optional, Union, TYPE_CHECKING
+from typing import Any, Optional, Union, TYPE_CHECKING
 
 import logging
 import os
@@ -38,10 +38,24 @@ from mojo.xmods.eventing.eventedvariable import EventedVariable
 from mojo.xmods.xlogging.scopemonitoring import MonitoredScope
 
 from mojo.interop.protocols.upnp.aspects import AspectsUPnP, DEFAULT_UPNP_ASPECTS
-from mojo.interop.protocols.upnp.soap import SoapProcessor, SOAP_TIMEOUT
+from mojo.interop.protocols.upnp.soap import SoapActionMarshaller, SoapProcessor, SOAP_TIMEOUT
+from mojo.interop.protocols.upnp.upnphttpsession import upnp_http_request
 from mojo.interop.protocols.upnp.upnpconstants import DEFAULT_UPNP_CALL_ASPECTS
 from mojo.interop.protocols.upnp.upnperrors import UpnpError
 from mojo.interop.protocols.upnp.services.upnpdefaultvar import UpnpDefaultVar
+from mojo.interop.protocols.upnp.services.upnplastchange import (
+    DEFAULT_LAST_CHANGE_INSTANCE,
+    LAST_CHANGE_VARIABLE,
+    LastChangeListener,
+    UpnpLastChangeKey,
+    UpnpLastChangeState
+)
+from mojo.interop.protocols.upnp.services.upnpvariablewaiter import (
+    DEFAULT_VARIABLE_WAIT_TIMEOUT,
+    UpnpVariableWaiter,
+    VariablePredicate,
+    wait_all
+)
 
 from mojo.interop.protocols.upnp.xml.upnpdevice1 import UpnpDevice1Service
 
@@ -65,10 +79,22 @@ class UpnpServiceProxy(EventedVariableSink):
 
     SERVICE_EVENT_VARIABLES = {}
 
+    # A table of action name to the (name, data type) of each of the out arguments of the action, it is
+    # used to decode only the expected out arguments of an action response and to convert their types.
+    SERVICE_ACTION_OUT_ARGS = {}
+
+    # A table of action name to the (name, data type, allowed values) of each of the in arguments of the
+    # action, it is emitted by the typed mode of the generator and used to build the action marshallers.
+    SERVICE_ACTION_IN_ARGS = {}
+
     def __init__(self):
 
         self._service_lock = threading.RLock()
 
+        # The waiters that are signaled when the variables of the service are updated, they are
+        # protected by the service lock.
+        self._variable_waiters = set()
+
         self._device_ref = None
         self._soap_processor = SoapProcessor()
 
@@ -87,6 +113,12 @@ class UpnpServiceProxy(EventedVariableSink):
         self._default_variables = {}
         self._create_default_variables_from_list()
 
+        # The variables embedded in the LastChange events of the service, the events are decoded
+        # once when they arrive.  The state is protected by the service lock.
+        self._last_change_state = None
+        if LAST_CHANGE_VARIABLE in self.SERVICE_EVENT_VARIABLES:
+            self._last_change_state = UpnpLastChangeState()
+
         # Initialize the evented variable sink
         super().__init__(self.SERVICE_EVENT_VARIABLES, state_lock=self._service_lock, sink_prefix=self.SERVICE_TYPE, auto_subscribe=True)
 
@@ -159,7 +191,8 @@ class UpnpServiceProxy(EventedVariableSink):
             Method utilize to make direct calls on a service for action APIs that are not published in a service description.
 
             :param action_name: The action name to make a call on.
-            :param arguments: The arguments to pass to the action.
+            :param arguments: The arguments to pass to the action, either a dictionary of argument values or, for
+                              actions declared in SERVICE_ACTION_IN_ARGS, a tuple of the argument values in order.
             :param auth: The authentication parameter to use when making a request on the remote action.
             :param headers: The headers to use when making the request on the remote action.
 
@@ -373,6 +406,16 @@ class UpnpServiceProxy(EventedVariableSink):
 
         return rtnval
 
+    def add_variable_waiter(self, waiter: UpnpVariableWaiter):
+        """
+            Registers a waiter that is signaled each time the variables of the service are updated.
+
+            :param waiter: The waiter to register.
+        """
+        for _ in self.yield_state_lock():
+            self._variable_waiters.add(waiter)
+        return
+
     def invalidate_subscription(self):
         """
             Called in order to invalidate the subscription(s) specified by scope.
@@ -407,6 +450,110 @@ class UpnpServiceProxy(EventedVariableSink):
 
         return varobj
 
+    @classmethod
+    def lookup_action_marshaller(cls, action_name: str) -> Optional[SoapActionMarshaller]:
+        """
+            Looks up the precomputed marshaller for the in arguments of an action, the marshallers of a service
+            proxy class are created the first time they are looked up.
+
+            :param action_name: The name of the action.
+
+            :returns: The marshaller or None if the action is not declared in SERVICE_ACTION_IN_ARGS.
+        """
+        marshallers = cls.__dict__.get("_action_marshallers")
+        if marshallers is None:
+            marshallers = {}
+            for in_action_name, in_args in cls.SERVICE_ACTION_IN_ARGS.items():
+                marshallers[in_action_name] = SoapActionMarshaller(in_action_name, in_args)
+            cls._action_marshallers = marshallers
+
+        marshaller = marshallers.get(action_name)
+        return marshaller
+
+    def read_last_change_value(self, name: str, instance_id: str = DEFAULT_LAST_CHANGE_INSTANCE,
+                               channel: Optional[str] = None) -> Optional[str]:
+        """
+            Reads the value of a variable that is embedded in the LastChange events of the service.
+
+            :param name: The name of the embedded variable, for example 'TransportState' or 'Volume'.
+            :param instance_id: The InstanceID of the variable.
+            :param channel: The channel of the variable, the 'Master' channel is used for variables with
+                            channels when a channel is not specified.
+
+            :returns: The value of the variable or None if it has not been reported.
+        """
+        value = None
+
+        for _ in self.yield_state_lock():
+            if self._last_change_state is not None:
+                entry = self._last_change_state.lookup(name, instance_id=instance_id, channel=channel)
+                if entry is not None:
+                    value = entry.value
+
+        return value
+
+    def read_variable_value(self, varname: Union[str, UpnpLastChangeKey]) -> Any:
+        """
+            Reads the value of an evented or default variable.  For services with LastChange events, the value
+            of a variable embedded in the events takes the place of the default variable with the same name.
+
+            :param varname: The name of the variable or the :class:`UpnpLastChangeKey` of an embedded variable.
+
+            :returns: The value of the variable.
+
+            :raises: :class:`KeyError` if the service does not have a variable with the specified name.
+        """
+        if isinstance(varname, UpnpLastChangeKey):
+            value = self.read_last_change_value(varname.name, instance_id=varname.instance_id, channel=varname.channel)
+            return value
+
+        value = None
+
+        varkey = "{}/{}".format(self.SERVICE_TYPE, varname)
+
+        for _ in self.yield_state_lock():
+            if self._last_change_state is not None:
+                entry = self._last_change_state.lookup(varname)
+                if entry is not None:
+                    return entry.value
+
+            varobj = self._evented_variables.get(varkey)
+            if varobj is None:
+                varobj = self._evented_variables.get(varname)
+            if varobj is None:
+                varobj = self._default_variables.get(varkey)
+            if varobj is None:
+                raise KeyError("The service {} does not have a variable named '{}'.".format(self.SERVICE_TYPE, varname))
+            value = varobj.value
+
+        return value
+
+    def subscribe_last_change(self, listener: LastChangeListener, name: Optional[str] = None):
+        """
+            Adds a listener that is called with the key and value of the variables embedded in the LastChange
+            events of the service when they change.  Listeners are called on the thread that processes the event
+            after the service lock has been released.
+
+            :param listener: The function to call.
+            :param name: The name of the embedded variable to listen to or None for all of the variables.
+        """
+        for _ in self.yield_state_lock():
+            if self._last_change_state is None:
+                errmsg = "The service {} does not have a LastChange event.".format(self.SERVICE_TYPE)
+                raise RuntimeError(errmsg)
+            self._last_change_state.add_listener(listener, name=name)
+        return
+
+    def remove_variable_waiter(self, waiter: UpnpVariableWaiter):
+        """
+            Unregisters a waiter that was registered with :meth:`add_variable_waiter`.
+
+            :param waiter: The waiter to unregister.
+        """
+        for _ in self.yield_state_lock():
+            self._variable_waiters.discard(waiter)
+        return
+
     def renew_subscription(self):
         """
             Called in order to renew the subscription to the 
@@ -432,6 +579,52 @@ class UpnpServiceProxy(EventedVariableSink):
         self.renew_subscription()
         return
 
+    def unsubscribe_last_change(self, listener: LastChangeListener, name: Optional[str] = None):
+        """
+            Removes a listener that was added with :meth:`subscribe_last_change`.
+        """
+        for _ in self.yield_state_lock():
+            if self._last_change_state is not None:
+                self._last_change_state.remove_listener(listener, name=name)
+        return
+
+    def wait_for_last_change_value(self, name: str, predicate: VariablePredicate, instance_id: str = DEFAULT_LAST_CHANGE_INSTANCE,
+                                   channel: Optional[str] = None, timeout: Optional[float] = DEFAULT_VARIABLE_WAIT_TIMEOUT) -> Any:
+        """
+            Waits for a variable embedded in the LastChange events of the service to reach a value.
+
+            :param name: The name of the embedded variable.
+            :param predicate: A function that is passed the value of the variable and returns True when the value
+                              has been reached, or a value to compare the value of the variable to.
+            :param instance_id: The InstanceID of the variable.
+            :param channel: The channel of the variable.
+            :param timeout: The maximum time to wait in seconds or None to wait without a limit.
+
+            :returns: The value of the variable.
+
+            :raises: :class:`TimeoutError` if the variable did not reach the value before the timeout.
+        """
+        lckey = UpnpLastChangeKey(name, instance_id, channel)
+        value = self.wait_for_value(lckey, predicate, timeout=timeout)
+        return value
+
+    def wait_for_value(self, varname: Union[str, UpnpLastChangeKey], predicate: VariablePredicate, timeout: Optional[float] = DEFAULT_VARIABLE_WAIT_TIMEOUT) -> Any:
+        """
+            Waits for an evented or default variable to reach a value.  The wait wakes up when a GENA NOTIFY
+            updates the variables of the service instead of polling the variable.
+
+            :param varname: The name of the variable or the :class:`UpnpLastChangeKey` of an embedded variable.
+            :param predicate: A function that is passed the value of the variable and returns True when the value
+                              has been reached, or a value to compare the value of the variable to.
+            :param timeout: The maximum time to wait in seconds or None to wait without a limit.
+
+            :returns: The value of the variable.
+
+            :raises: :class:`TimeoutError` if the variable did not reach the value before the timeout.
+        """
+        values = wait_all([(self, varname, predicate)], timeout=timeout)
+        return values[0]
+
     def _clear_subscription(self):
 
         for _ in self.yield_state_lock():
@@ -538,7 +731,14 @@ class UpnpServiceProxy(EventedVariableSink):
         if self._baseURL is not None:
             call_url = self._baseURL + call_url
 
-        call_body = self._soap_processor.create_request(action_name, arguments, typed=self.serviceType)
+        if isinstance(arguments, tuple):
+            marshaller = self.lookup_action_marshaller(action_name)
+            if marshaller is None:
+                errmsg = "Argument values were passed as a tuple for action '{}' which is not declared in SERVICE_ACTION_IN_ARGS.".format(action_name)
+                raise ValueError(errmsg)
+            call_body = self._soap_processor.create_marshalled_request(marshaller, arguments, typed=self.serviceType)
+        else:
+            call_body = self._soap_processor.create_request(action_name, arguments, typed=self.serviceType)
 
         call_headers = {
             'SOAPAction': '"%s#%s"' % (self.serviceType, action_name),
@@ -549,9 +749,10 @@ class UpnpServiceProxy(EventedVariableSink):
 
         resp = None
         try:
-            resp = requests.post(
+            resp = upnp_http_request(
+                "POST",
                 call_url,
-                call_body,
+                data=call_body,
                 headers=call_headers,
                 timeout=SOAP_TIMEOUT,
                 auth=auth
@@ -575,7 +776,8 @@ class UpnpServiceProxy(EventedVariableSink):
 
         status_code = resp.status_code
         if status_code >= 200 and status_code < 300: # pylint: disable=chained-comparison
-            resp_dict = self._soap_processor.parse_response(action_name, resp_content, typed=self.serviceType)
+            out_args = self.SERVICE_ACTION_OUT_ARGS.get(action_name)
+            resp_dict = self._soap_processor.parse_response(action_name, resp_content, typed=self.serviceType, out_args=out_args)
         else:
             errorCode, errorDescription = self._soap_processor.parse_response_error_for_upnp(action_name, resp_content, status_code, typed=self.serviceType)
             raise UpnpError(errorCode, errorDescription, "host=%s action=%s args=%s" % (self._host, action_name, repr(arguments)))
@@ -591,6 +793,8 @@ class UpnpServiceProxy(EventedVariableSink):
                                      of child elements for each event variable.
         """
 
+        listener_calls = []
+
         for _ in self.yield_state_lock():
             for propNodeOuter in propertyNodeList:
                 # Get the first node of the outer property node
@@ -611,4 +815,30 @@ class UpnpServiceProxy(EventedVariableSink):
                 except KeyError:
                     logger.debug("UpnpServiceProxy: Received value for unknown event host=%s event=%s value=%r" % (sender_ip, event_name, event_value))
 
+                if event_name == LAST_CHANGE_VARIABLE and self._last_change_state is not None:
+                    changed = self._last_change_state.update(event_value)
+                    listener_calls.extend(self._last_change_state.listeners_for_changes(changed))
+
+        self._notify_variable_waiters()
+
+        for listener, lckey, lcvalue in listener_calls:
+            try:
+                listener(lckey, lcvalue)
+            except Exception:
+                logger.exception("UpnpServiceProxy: LastChange listener failed for {}/{}".format(self.SERVICE_TYPE, lckey))
+
+        return
+
+    def _notify_variable_waiters(self):
+        """
+            Signals the waiters that are waiting on the variables of this service that the variables have been updated.
+            The waiters are signaled outside of the service lock so the waiting threads can read the variables.
+        """
+        waiters = None
+        for _ in self.yield_state_lock():
+            waiters = list(self._variable_waiters)
+
+        for waiter in waiters:
+            waiter.notify()
+
         return
@@ -0,0 +1,202 @@
+"""
+.. module:: upnpvariablewaiter
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the :class:`UpnpVariableWaiter` class and the :func:`wait_any` and :func:`wait_all`
+               functions that wait for the evented and default variables of service proxies to reach a value.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+import threading
+import time
+
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+
+DEFAULT_VARIABLE_WAIT_TIMEOUT = 60
+
+# A predicate on the value of a variable or a value the variable is compared to
+VariablePredicate = Union[Callable[[Any], bool], Any]
+
+# A (service proxy, variable name, predicate) condition
+VariableCondition = Tuple["UpnpServiceProxy", str, VariablePredicate]
+
+
+class UpnpVariableWaiter:
+    """
+        The :class:`UpnpVariableWaiter` is the wake up channel between the service proxies that a wait is watching
+        and the thread that is waiting.  A service proxy signals the waiters that are registered with it each time
+        a GENA NOTIFY updates its variables, so the waiting thread sleeps until a value can have changed instead of
+        polling the variables on an interval.
+    """
+
+    __slots__ = ("_condition", "_generation")
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._generation = 0
+        return
+
+    @property
+    def generation(self) -> int:
+        """
+            The count of the notifications that have been signaled, it is read before the variables are checked
+            and passed to :meth:`wait` so a notification that happens during the check is not missed.
+        """
+        self._condition.acquire()
+        try:
+            generation = self._generation
+        finally:
+            self._condition.release()
+        return generation
+
+    def notify(self):
+        """
+            Signals the waiting thread that the variables of one of the service proxies have been updated.
+        """
+        self._condition.acquire()
+        try:
+            self._generation += 1
+            self._condition.notify_all()
+        finally:
+            self._condition.release()
+        return
+
+    def wait(self, generation: int, timeout: Optional[float] = None) -> bool:
+        """
+            Waits for a notification after the specified generation.
+
+            :param generation: The generation that was read before the variables were checked.
+            :param timeout: The maximum time to wait in seconds or None to wait without a limit.
+
+            :returns: True if there was a notification or False if the wait timed out.
+        """
+        self._condition.acquire()
+        try:
+            notified = self._condition.wait_for(lambda: self._generation != generation, timeout=timeout)
+        finally:
+            self._condition.release()
+        return notified
+
+
+def check_variable_predicate(predicate: VariablePredicate, value: Any) -> bool:
+    """
+        Checks the value of a variable against a predicate or a value to compare to.
+    """
+    if callable(predicate):
+        passed = predicate(value)
+    else:
+        passed = value == predicate
+    return passed
+
+
+def wait_any(conditions: Sequence[VariableCondition], timeout: Optional[float] = DEFAULT_VARIABLE_WAIT_TIMEOUT) -> Tuple[int, Any]:
+    """
+        Waits for any of a set of variables, on one or more service proxies, to reach a value.
+
+        :param conditions: A list of (service proxy, variable name, predicate) conditions.  The predicate is a
+                           function that is passed the value of the variable or a value to compare the value to.
+        :param timeout: The maximum time to wait in seconds or None to wait without a limit.
+
+        :returns: A tuple with the index of the first condition that passed and the value of its variable.
+
+        :raises: :class:`TimeoutError` if none of the conditions passed before the timeout.
+    """
+    index, value = None, None
+
+    watcher = _watch_conditions(conditions, timeout)
+    try:
+        for passed, values in watcher:
+            for cidx, cond_passed in enumerate(passed):
+                if cond_passed:
+                    index, value = cidx, values[cidx]
+                    break
+            if index is not None:
+                break
+    finally:
+        watcher.close()
+
+    return index, value
+
+
+def wait_all(conditions: Sequence[VariableCondition], timeout: Optional[float] = DEFAULT_VARIABLE_WAIT_TIMEOUT) -> List[Any]:
+    """
+        Waits for all of a set of variables, on one or more service proxies, to reach a value at the same time.
+
+        :param conditions: A list of (service proxy, variable name, predicate) conditions.  The predicate is a
+                           function that is passed the value of the variable or a value to compare the value to.
+        :param timeout: The maximum time to wait in seconds or None to wait without a limit.
+
+        :returns: The values of the variables of the conditions.
+
+        :raises: :class:`TimeoutError` if all of the conditions did not pass before the timeout.
+    """
+    all_values = None
+
+    watcher = _watch_conditions(conditions, timeout)
+    try:
+        for passed, values in watcher:
+            if all(passed):
+                all_values = values
+                break
+    finally:
+        watcher.close()
+
+    return all_values
+
+
+def _watch_conditions(conditions: Sequence[VariableCondition], timeout: Optional[float]):
+    """
+        Generator that checks a set of conditions and yields the results each time a service proxy of the
+        conditions signals that its variables have been updated.  The waiter is registered with each of the
+        service proxies while the generator is running.
+    """
+    waiter = UpnpVariableWaiter()
+
+    proxies = []
+    for proxy, _, _ in conditions:
+        if proxy not in proxies:
+            proxies.append(proxy)
+
+    end_time = None
+    if timeout is not None:
+        end_time = time.monotonic() + timeout
+
+    for proxy in proxies:
+        proxy.add_variable_waiter(waiter)
+
+    try:
+        while True:
+            generation = waiter.generation
+
+            passed = []
+            values = []
+            for proxy, varname, predicate in conditions:
+                value = proxy.read_variable_value(varname)
+                values.append(value)
+                passed.append(check_variable_predicate(predicate, value))
+
+            yield passed, values
+
+            remaining = None
+            if end_time is not None:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    cond_names = ", ".join("{}/{}".format(proxy.SERVICE_TYPE, varname) for proxy, varname, _ in conditions)
+                    errmsg = "Timeout waiting for variables to reach a value. variables=[{}] values={}".format(cond_names, values)
+                    raise TimeoutError(errmsg)
+
+            waiter.wait(generation, timeout=remaining)
+    finally:
+        for proxy in proxies:
+            proxy.remove_variable_waiter(waiter)
+
+    return
@@ -12,9 +12,13 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
 import enum
 import re
 
+from xml.parsers import expat
+
 from xml.etree.ElementTree import Element, SubElement, QName, ParseError
 from xml.etree.ElementTree import tostring as xml_tostring
 from xml.etree.ElementTree import fromstring as xml_fromstring
@@ -40,6 +44,9 @@ XML_DOCUMENT_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>'
 
 SOAP_TIMEOUT = 60
 
+# Compiled request templates keyed by (serviceType, action, argument names, encoding, envelope attributes)
+SOAP_REQUEST_TEMPLATE_CACHE: Dict[tuple, "SoapRequestTemplate"] = {}
+
 PYTHON_TO_SOAP_TYPE_MAP = {
     bytes: 'xsd:string',
     str: 'xsd:string',
@@ -48,6 +55,118 @@ PYTHON_TO_SOAP_TYPE_MAP = {
     bool: 'xsd:boolean'
 }
 
+def soap_parse_boolean(val: str) -> Optional[bool]:
+    """
+        Converts the text of a SOAP 'boolean' value to a python bool.
+    """
+    bval = None
+    val = val.strip().lower()
+    if val in ("1", "true", "yes"):
+        bval = True
+    elif val in ("0", "false", "no"):
+        bval = False
+    else:
+        raise ValueError("Invalid SOAP boolean value %r." % val)
+    return bval
+
+# Conversion functions for the UPnP data types of action out arguments, the types that are
+# not in the table are returned as strings.
+SOAP_TYPE_CONVERTERS = {
+    "ui1": int,
+    "ui2": int,
+    "ui4": int,
+    "ui8": int,
+    "i1": int,
+    "i2": int,
+    "i4": int,
+    "i8": int,
+    "int": int,
+    "r4": float,
+    "r8": float,
+    "number": float,
+    "float": float,
+    "fixed.14.4": float,
+    "boolean": soap_parse_boolean
+}
+
+def soap_convert_value(arg_val: str, convert: Optional[Callable]):
+    """
+        Converts the text of an out argument with the converter for its data type.  Empty values of the
+        non-string types are returned as None and values that the device sent in a form that does not
+        match the declared type, like 'NOT_IMPLEMENTED', are returned as they were sent.
+    """
+    if convert is not None:
+        if len(arg_val.strip()) == 0:
+            arg_val = None
+        else:
+            try:
+                arg_val = convert(arg_val)
+            except ValueError:
+                pass
+    return arg_val
+
+def soap_format_boolean(arg_val) -> str:
+    """
+        Formats a value of an in argument with the 'boolean' data type.
+    """
+    if isinstance(arg_val, (str, bytes)):
+        arg_val = soap_parse_boolean(safe_as_str(arg_val))
+    fval = "1" if arg_val else "0"
+    return fval
+
+def soap_format_float(arg_val) -> str:
+    """
+        Formats a value of an in argument with one of the floating point data types.
+    """
+    fval = str(float(arg_val))
+    return fval
+
+def soap_format_integer(arg_val) -> str:
+    """
+        Formats a value of an in argument with one of the integer data types.
+    """
+    if isinstance(arg_val, float) and not arg_val.is_integer():
+        raise ValueError("Invalid integer value %r." % arg_val)
+    fval = str(int(arg_val))
+    return fval
+
+def soap_format_string(arg_val) -> str:
+    """
+        Formats a value of an in argument with the 'string' data type or a data type that does not have
+        a specific formatter.
+    """
+    if isinstance(arg_val, str):
+        fval = arg_val
+    elif isinstance(arg_val, bytes):
+        fval = arg_val.decode("utf-8")
+    else:
+        fval = soap_format_argument(arg_val)
+    return fval
+
+# Formatting functions for the UPnP data types of action in arguments, the types that are
+# not in the table are formatted as strings.
+SOAP_TYPE_FORMATTERS = {
+    "ui1": soap_format_integer,
+    "ui2": soap_format_integer,
+    "ui4": soap_format_integer,
+    "ui8": soap_format_integer,
+    "i1": soap_format_integer,
+    "i2": soap_format_integer,
+    "i4": soap_format_integer,
+    "i8": soap_format_integer,
+    "int": soap_format_integer,
+    "r4": soap_format_float,
+    "r8": soap_format_float,
+    "number": soap_format_float,
+    "float": soap_format_float,
+    "fixed.14.4": soap_format_float,
+    "boolean": soap_format_boolean
+}
+
+# Compiled response decoders keyed by (serviceType, action, out argument schema)
+SOAP_RESPONSE_DECODER_CACHE: Dict[tuple, "SoapResponseDecoder"] = {}
+
+
 class SOAPError(ProtocolError):
     """
         Error that is raised when a Soap error occurs.
@@ -70,6 +189,366 @@ def remove_extraneous_xml_declarations(xml_str):
     xml_str = re.sub(r'<\?xml.*?\?>', '', xml_str, flags=re.I)
     return xml_declaration + xml_str
 
+def soap_escape_attribute(val: str) -> str:
+    """
+        Escapes a string for use as an XML attribute value.
+    """
+    val = val.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    val = val.replace("\n", "&#10;").replace("\r", "&#13;").replace("\t", "&#09;")
+    return val
+
+
+def soap_escape_text(val: str) -> str:
+    """
+        Escapes a string for use as XML element text.
+    """
+    if "&" in val:
+        val = val.replace("&", "&amp;")
+    if "<" in val:
+        val = val.replace("<", "&lt;")
+    if ">" in val:
+        val = val.replace(">", "&gt;")
+    return val
+
+
+def soap_format_argument(arg_val) -> str:
+    """
+        Formats an argument value as the text of a SOAP argument element.
+    """
+    if isinstance(arg_val, enum.Enum):
+        arg_val = arg_val.value
+
+    py_type = type(arg_val)
+    soap_type = PYTHON_TO_SOAP_TYPE_MAP[py_type]
+
+    if soap_type == 'xsd:string':
+        if py_type is bytes:
+            arg_val = arg_val.decode("utf-8")
+    elif soap_type == 'xsd:boolean':
+        arg_val = "1" if arg_val else "0"
+    else:
+        arg_val = str(arg_val)
+
+    return arg_val
+
+
+class SoapRequestTemplate:
+    """
+        A compiled SOAP request envelope for a call on an action with a specific set of argument names.  The
+        fixed parts of the envelope are encoded once when the template is compiled, rendering a request only
+        escapes the argument values and joins them with the prebuilt byte fragments.
+    """
+
+    __slots__ = ("action_name", "arg_names", "_fragments", "_text_fragments")
+
+    def __init__(self, action_name: str, arg_names: Tuple[str, ...], encoding: str, envelope_attrib: Optional[tuple], typed: Optional[str]):
+        self.action_name = action_name
+        self.arg_names = arg_names
+
+        if envelope_attrib:
+            env_attrs = "".join(' %s="%s"' % (eakey, soap_escape_attribute(eaval)) for eakey, eaval in envelope_attrib)
+        else:
+            env_attrs = ' xmlns:s="%s" s:encodingStyle="%s"' % (NS_SOAP_ENV, soap_escape_attribute(encoding))
+
+        if typed:
+            meth_open = '<u:%s xmlns:u="%s">' % (action_name, soap_escape_attribute(typed))
+            meth_close = '</u:%s>' % action_name
+        else:
+            meth_open = '<%s>' % action_name
+            meth_close = '</%s>' % action_name
+
+        head = XML_DOCUMENT_DECLARATION + '<s:Envelope%s><s:Body>' % env_attrs + meth_open
+        tail = meth_close + '</s:Body></s:Envelope>'
+
+        # The fragments alternate between the fixed markup and the slots for the argument values,
+        # the markup between two arguments is merged into a single fragment.
+        fragments = []
+        markup = head
+        for arg_name in arg_names:
+            fragments.append((markup + '<%s>' % arg_name).encode("utf-8"))
+            markup = '</%s>' % arg_name
+        fragments.append((markup + tail).encode("utf-8"))
+
+        self._fragments = tuple(fragments)
+        self._text_fragments = tuple(frag.decode("utf-8") for frag in fragments)
+        return
+
+    def render(self, arg_values: Iterable) -> bytes:
+        """
+            Renders the request content for the specified argument values.
+
+            :param arg_values: The argument values in the same order as the argument names of the template.
+
+            :returns: The utf-8 encoded content of the request.
+        """
+        fragments = self._fragments
+
+        parts = [fragments[0]]
+        for fidx, arg_val in enumerate(arg_values, start=1):
+            parts.append(soap_escape_text(soap_format_argument(arg_val)).encode("utf-8"))
+            parts.append(fragments[fidx])
+
+        content = b"".join(parts)
+        return content
+
+    def render_text(self, arg_texts: Iterable[str]) -> bytes:
+        """
+            Renders the request content for argument values that have already been formatted and escaped.
+
+            :param arg_texts: The escaped text of the argument values in the same order as the argument names
+                              of the template.
+
+            :returns: The utf-8 encoded content of the request.
+        """
+        fragments = self._text_fragments
+
+        parts = [fragments[0]]
+        for fidx, arg_text in enumerate(arg_texts, start=1):
+            parts.append(arg_text)
+            parts.append(fragments[fidx])
+
+        content = "".join(parts).encode("utf-8")
+        return content
+
+
+class SoapActionMarshaller:
+    """
+        A precomputed marshaller for the in arguments of an action.  The marshaller knows the order of the in
+        arguments, the formatter for the data type of each argument and the allowed values of the arguments
+        that have an allowed value list, so a call validates and formats the argument values without looking
+        up the python type of each value.  The request templates of the marshaller are compiled the first time
+        the marshaller is used with a service type.
+    """
+
+    __slots__ = ("action_name", "arg_names", "_arg_specs", "_templates")
+
+    def __init__(self, action_name: str, in_args: Tuple[Tuple[str, str, Optional[Tuple[str, ...]]], ...]):
+        """
+            Creates a :class:`SoapActionMarshaller` for an action.
+
+            :param action_name: The name of the action.
+            :param in_args: The (name, data type, allowed values) of each of the in arguments of the action,
+                            the allowed values are None for arguments without an allowed value list.
+        """
+        self.action_name = action_name
+        self.arg_names = tuple(arg_name for arg_name, _, _ in in_args)
+
+        # The (name, formatter, allowed values) of each argument, string arguments have a formatter
+        # of None so their values can be used as they are.
+        arg_specs = []
+        for arg_name, arg_type, allowed in in_args:
+            formatter = SOAP_TYPE_FORMATTERS.get(arg_type)
+            arg_specs.append((arg_name, formatter, frozenset(allowed) if allowed else None))
+        self._arg_specs = tuple(arg_specs)
+
+        self._templates: Dict[tuple, SoapRequestTemplate] = {}
+        return
+
+    def marshal(self, arg_values: Tuple[Any, ...]) -> List[str]:
+        """
+            Validates and formats the values of the in arguments of a call.
+
+            :param arg_values: The argument values in the order of the in arguments of the action.
+
+            :returns: The escaped text of each of the argument values.
+
+            :raises: :class:`ValueError` if a value is not valid for the data type of its argument or is not
+                     one of the allowed values of the argument.
+        """
+        if len(arg_values) != len(self.arg_names):
+            errmsg = "The action '%s' expects %d arguments but %d were passed." % (
+                self.action_name, len(self.arg_names), len(arg_values))
+            raise ValueError(errmsg)
+
+        arg_texts = []
+        for (arg_name, formatter, allowed), arg_val in zip(self._arg_specs, arg_values):
+            if formatter is None and type(arg_val) is str:
+                arg_text = arg_val
+            else:
+                if isinstance(arg_val, enum.Enum):
+                    arg_val = arg_val.value
+                try:
+                    arg_text = formatter(arg_val) if formatter is not None else soap_format_string(arg_val)
+                except (KeyError, TypeError, ValueError):
+                    errmsg = "Invalid value %r for argument '%s' of action '%s'." % (arg_val, arg_name, self.action_name)
+                    raise ValueError(errmsg) from None
+
+            if allowed is not None and arg_text not in allowed:
+                errmsg = "Invalid value %r for argument '%s' of action '%s', allowed values are %s." % (
+                    arg_val, arg_name, self.action_name, sorted(allowed))
+                raise ValueError(errmsg)
+
+            arg_texts.append(soap_escape_text(arg_text))
+
+        return arg_texts
+
+    def render(self, arg_values: Tuple[Any, ...], encoding: str, envelope_attrib: Optional[tuple], typed: Optional[str]) -> bytes:
+        """
+            Renders the request content of a call with the specified argument values.
+
+            :returns: The utf-8 encoded content of the request.
+        """
+        template_key = (typed, encoding, envelope_attrib)
+
+        template = self._templates.get(template_key)
+        if template is None:
+            template = SoapRequestTemplate(self.action_name, self.arg_names, encoding, envelope_attrib, typed)
+            self._templates[template_key] = template
+
+        content = template.render_text(self.marshal(arg_values))
+        return content
+
+
+class _SoapResponseComplete(Exception):
+    """
+        Raised from the expat handlers to stop parsing once the action response element has been read.
+    """
+
+
+class SoapResponseDecoder:
+    """
+        Decodes the out arguments of an action response with a streaming expat parser.  The decoder knows the
+        out arguments that the action is declared with and their data types, so it only collects the text of the
+        expected argument elements, converts the values to their declared types and stops parsing once the
+        action response element has been read.
+
+        Devices sometimes return XML documents as argument values without escaping them, the content of such
+        an argument is returned exactly as it was sent by slicing it out of the response content.
+    """
+
+    __slots__ = ("action_name", "out_args", "_response_tag", "_converters")
+
+    def __init__(self, action_name: str, out_args: Optional[Tuple[Tuple[str, str], ...]] = None, typed: Optional[str] = None):
+        """
+            Creates a :class:`SoapResponseDecoder` for an action.
+
+            :param action_name: The name of the action.
+            :param out_args: The (name, data type) of each of the out arguments of the action or None to collect
+                             all of the arguments in the response as strings.
+            :param typed: The service type namespace of the action response element.
+        """
+        self.action_name = action_name
+        self.out_args = out_args
+
+        if typed:
+            self._response_tag = "%s %sResponse" % (typed, action_name)
+        else:
+            self._response_tag = "%sResponse" % action_name
+
+        self._converters = None
+        if out_args is not None:
+            self._converters = {arg_name: SOAP_TYPE_CONVERTERS.get(arg_type) for arg_name, arg_type in out_args}
+
+        return
+
+    def decode(self, content: Union[bytes, str]) -> dict:
+        """
+            Decodes the out arguments from the content of an action response.
+
+            :param content: The content of the action response.
+
+            :returns: A dictionary of the out argument values.
+
+            :raises: :class:`expat.ExpatError` if the content is not a well formed document and :class:`SOAPProtocolError`
+                     if the response element was not found.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+        converters = self._converters
+        response_tag = self._response_tag
+
+        resp_dict = {}
+
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+
+        # Parser state, the depth of the response element and the argument being collected
+        state = {"depth": 0, "resp_depth": None, "arg": None, "text": [], "inner_start": None}
+
+        def start_element(name, attrs):
+            # pylint: disable=unused-argument
+            state["depth"] += 1
+            depth = state["depth"]
+            resp_depth = state["resp_depth"]
+
+            if resp_depth is None:
+                if name == response_tag or (name.endswith(response_tag) and name[-len(response_tag) - 1] == " "):
+                    state["resp_depth"] = depth
+            elif depth == resp_depth + 1:
+                arg_name = name.rsplit(" ", 1)[-1]
+                if converters is None or arg_name in converters:
+                    state["arg"] = arg_name
+                    state["text"] = []
+                    state["inner_start"] = None
+            elif state["arg"] is not None and state["inner_start"] is None:
+                state["inner_start"] = parser.CurrentByteIndex
+            return
+
+        def end_element(name):
+            # pylint: disable=unused-argument
+            depth = state["depth"]
+            resp_depth = state["resp_depth"]
+
+            if resp_depth is not None:
+                if depth == resp_depth:
+                    raise _SoapResponseComplete()
+
+                arg_name = state["arg"]
+                if depth == resp_depth + 1 and arg_name is not None:
+                    inner_start = state["inner_start"]
+                    if inner_start is not None:
+                        arg_val = content[inner_start:parser.CurrentByteIndex].decode("utf-8")
+                    else:
+                        arg_val = "".join(state["text"])
+
+                    if converters is not None:
+                        arg_val = soap_convert_value(arg_val, converters[arg_name])
+
+                    resp_dict[arg_name] = arg_val
+                    state["arg"] = None
+
+            state["depth"] = depth - 1
+            return
+
+        def character_data(data):
+            if state["arg"] is not None and state["depth"] == state["resp_depth"] + 1:
+                state["text"].append(data)
+            return
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+
+        try:
+            parser.Parse(content, True)
+        except _SoapResponseComplete:
+            pass
+        else:
+            if state["resp_depth"] is None:
+                msg = ('Returned XML did not include an element which matches tag name'
+                       ' \'%sResponse\'.' % self.action_name)
+                raise SOAPProtocolError(msg)
+
+        return resp_dict
+
+    def convert(self, resp_dict: dict) -> dict:
+        """
+            Converts the string values of a dictionary of out arguments to the declared data types of the
+            out arguments and drops the arguments that are not declared.
+        """
+        converters = self._converters
+
+        if converters is not None:
+            converted = {}
+            for arg_name, arg_val in resp_dict.items():
+                if arg_name in converters:
+                    converted[arg_name] = soap_convert_value(arg_val, converters[arg_name])
+            resp_dict = converted
+
+        return resp_dict
+
+
 class SoapProcessor:
     """
         The Soap processor object stores encoding and decoding settings for processing the Soap messages
@@ -81,12 +560,14 @@ class SoapProcessor:
         self._typed = typed
         return
 
-    def create_request(self, action_name: str, arguments: dict, encoding=None, envelope_attrib=None, typed=None):
-        """
-            Creates a Soap request for a call on the specified action and with the specified arguments.
+    def create_request(self, action_name: str, arguments: dict, encoding=None, envelope_attrib=None, typed=None) -> bytes:
         """
-        register_namespace('', None)
+            Creates a Soap request for a call on the specified action and with the specified arguments.  The
+            request is rendered from a compiled :class:`SoapRequestTemplate` that is cached by the service type,
+            action name and argument names of the call.
 
+            :returns: The utf-8 encoded content of the request.
+        """
         if encoding is None:
             encoding = self._encoding
         if envelope_attrib is None:
@@ -94,50 +575,43 @@ class SoapProcessor:
         if typed is None:
             typed = self._typed
 
-        envelope = Element("s:Envelope")
+        arg_names = tuple(arguments.keys()) if arguments else ()
         if envelope_attrib:
-            for eakey, eaval in envelope_attrib:
-                envelope.attrib.update({eakey: eaval})
-        else:
-            envelope.attrib.update({'xmlns:s': NS_SOAP_ENV})
-            envelope.attrib.update({'s:encodingStyle': encoding})
+            envelope_attrib = tuple(envelope_attrib)
 
-        body = SubElement(envelope, "s:Body")
+        template_key = (typed, action_name, arg_names, encoding, envelope_attrib)
 
-        if typed:
-            methElement = SubElement(body, "u:" + action_name)
-            methElement.attrib.update({'xmlns:u': typed})
-        else:
-            methElement = SubElement(body, action_name)
+        template = SOAP_REQUEST_TEMPLATE_CACHE.get(template_key)
+        if template is None:
+            template = SoapRequestTemplate(action_name, arg_names, encoding, envelope_attrib, typed)
+            SOAP_REQUEST_TEMPLATE_CACHE[template_key] = template
 
-        if arguments:
-            for arg_name, arg_val in arguments.items():
-                if isinstance(arg_val, enum.Enum):
-                    arg_val = arg_val.value
+        arg_values = arguments.values() if arguments else ()
+        content = template.render(arg_values)
 
-                py_type = type(arg_val)
-                soap_type = PYTHON_TO_SOAP_TYPE_MAP[py_type]
+        return content
 
-                if soap_type == 'xsd:string':
-                    arg_val = arg_val # pylint: disable=self-assigning-variable
-                elif soap_type == 'xsd:int' or soap_type == 'xsd:float':
-                    arg_val = str(arg_val)
-                elif soap_type == 'xsd:boolean':
-                    arg_val = "1" if arg_val else "0"
+    def create_marshalled_request(self, marshaller: SoapActionMarshaller, arg_values: Tuple[Any, ...], encoding=None,
+                                  envelope_attrib=None, typed=None) -> bytes:
+        """
+            Creates a Soap request for a call on an action with a precomputed :class:`SoapActionMarshaller`.
 
-                argElement = SubElement(methElement, arg_name)
-                #if typed and soap_type:
-                #    if not isinstance(type, QName):
-                #        soap_type = QName(NS_XSD, soap_type)
-                #    argElement.set(NS_XSI + "type", soap_type)
+            :param marshaller: The marshaller of the action.
+            :param arg_values: The argument values in the order of the in arguments of the action.
 
-                argElement.text = arg_val
-        else:
-            methElement.text = ""
+            :returns: The utf-8 encoded content of the request.
+        """
+        if encoding is None:
+            encoding = self._encoding
+        if envelope_attrib is None:
+            envelope_attrib = self._envelope_attrib
+        if typed is None:
+            typed = self._typed
 
-        envelope_content = xml_tostring(envelope, short_empty_elements=False)
-        content = XML_DOCUMENT_DECLARATION + safe_as_str(envelope_content)
+        if envelope_attrib:
+            envelope_attrib = tuple(envelope_attrib)
 
+        content = marshaller.render(arg_values, encoding, envelope_attrib, typed)
         return content
 
     def create_response(self, action_name: str, arguments: dict, encoding=None, envelope_attrib=None, typed=None):
@@ -195,9 +669,46 @@ class SoapProcessor:
 
         return content
 
-    def parse_response(self, action_name, content, encoding=None, envelope_attrib=None, typed=None):
+    def parse_response(self, action_name, content, encoding=None, envelope_attrib=None, typed=None,
+                       out_args: Optional[Tuple[Tuple[str, str], ...]] = None) -> dict:
+        """
+            Parses a response from the server with the given action name and content.  The response is decoded by a
+            streaming :class:`SoapResponseDecoder`, when the out arguments of the action are provided only the
+            declared arguments are returned and their values are converted to their declared data types.
+
+            :param action_name: The name of the action the response is for.
+            :param content: The content of the response.
+            :param typed: The service type namespace of the action.
+            :param out_args: The (name, data type) of the out arguments of the action.
+
+            :returns: A dictionary of the out argument values.
+        """
+        if typed is None:
+            typed = self._typed
+
+        decoder_key = (typed, action_name, out_args)
+
+        decoder = SOAP_RESPONSE_DECODER_CACHE.get(decoder_key)
+        if decoder is None:
+            decoder = SoapResponseDecoder(action_name, out_args=out_args, typed=typed)
+            SOAP_RESPONSE_DECODER_CACHE[decoder_key] = decoder
+
+        try:
+            resp_dict = decoder.decode(content)
+        except expat.ExpatError:
+            # The content is not well formed, this sometimes happens when a device sends its own XML
+            # config files with extra XML declarations, so fallback to the document parser that
+            # corrects the content.
+            resp_dict = self._parse_response_document(action_name, content, encoding=encoding,
+                                                      envelope_attrib=envelope_attrib, typed=typed)
+            resp_dict = decoder.convert(resp_dict)
+
+        return resp_dict
+
+    def _parse_response_document(self, action_name, content, encoding=None, envelope_attrib=None, typed=None):
         """
-            Parses a response from the server with the given action name and content.
+            Parses a response from the server with the given action name and content into a document and
+            returns the arguments of the response as strings.
         """
         register_namespace('', None)
 
@@ -213,7 +724,7 @@ class SoapProcessor:
         except ParseError:
             # Try removing any extra XML declarations in case there are more than one.
             # This sometimes happens when a device sends its own XML config files.
-            content = remove_extraneous_xml_declarations(content)
+            content = remove_extraneous_xml_declarations(safe_as_str(content))
             docNode = xml_fromstring(content)
         except ValueError:
             # This can occur when requests returns a `str` (unicode) but there's also an XML
@@ -235,10 +746,10 @@ class SoapProcessor:
         # Sometimes devices return XML strings as their argument values without escaping them with
         # CDATA. This checks to see if the argument has been parsed as XML and un-parses it if so.
         resp_dict = {}
-        for arg in resp_body.getchildren():
-            children = arg.getchildren()
+        for arg in resp_body:
+            children = list(arg)
             if children:
-                resp_dict[arg.tag] = "\n".join(xml_tostring(x) for x in children)
+                resp_dict[arg.tag] = "\n".join(safe_as_str(xml_tostring(x)) for x in children)
             else:
                 if arg.text is None:
                     resp_dict[arg.tag] = ""
@@ -265,7 +776,7 @@ class SoapProcessor:
         except ParseError:
             # Try removing any extra XML declarations in case there are more than one.
             # This sometimes happens when a device sends its own XML config files.
-            content = remove_extraneous_xml_declarations(content)
+            content = remove_extraneous_xml_declarations(safe_as_str(content))
             docNode = xml_fromstring(content)
         except ValueError:
             # This can occur when requests returns a `str` (unicode) but there's also an XML
@@ -0,0 +1,244 @@
+"""
+.. module:: ssdpcodec
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the bytes level SSDP message codec that is shared by the MSEARCH, NOTIFY and
+               HTTP header parsing functions.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Optional, Tuple, Union
+
+import sys
+
+SSDP_KIND_NOTIFY = "NOTIFY"
+SSDP_KIND_MSEARCH = "M-SEARCH"
+SSDP_KIND_RESPONSE = "RESPONSE"
+
+# The header names that show up in most SSDP messages, they are interned up front so the
+# dictionaries of every message share the same key objects.
+SSDP_KNOWN_HEADER_NAMES = [
+    "CACHE-CONTROL", "EXT", "HOST", "LOCATION", "MAN", "MX", "NT", "NTS", "SERVER", "ST", "USN",
+    "BOOTID.UPNP.ORG", "CONFIGID.UPNP.ORG", "NEXTBOOTID.UPNP.ORG", "SEARCHPORT.UPNP.ORG", "SECURELOCATION.UPNP.ORG",
+    "OPT", "01-NLS", "DATE", "USER-AGENT", "CONTENT-LENGTH", "CONTENT-TYPE", "CONNECTION", "SEQ", "SID"
+]
+
+# Unknown header names are interned as they are seen, up to a limit so a noisy network
+# cannot grow the table without bound.
+SSDP_HEADER_NAME_CACHE_LIMIT = 1024
+
+SSDP_HEADER_NAME_CACHE: Dict[str, str] = {}
+
+# The markers used to find the value of a header in the raw content of a message without
+# parsing the message, keyed by the upper case header name.
+SSDP_HEADER_MARKER_CACHE: Dict[str, bytes] = {}
+
+for _hname in SSDP_KNOWN_HEADER_NAMES:
+    _hname = sys.intern(_hname)
+    for _variant in (_hname, _hname.lower(), _hname.title()):
+        SSDP_HEADER_NAME_CACHE[_variant] = _hname
+    SSDP_HEADER_MARKER_CACHE[_hname] = b"\r\n" + _hname.encode("utf-8") + b":"
+del _hname
+del _variant
+
+
+def ssdp_intern_header_name(raw_name: str) -> str:
+    """
+        Gets the interned upper case header name for a header name as it appeared in a message.
+
+        :param raw_name: The header name as it appeared in the message.
+
+        :returns: The upper case header name.
+    """
+    name = SSDP_HEADER_NAME_CACHE.get(raw_name)
+    if name is None:
+        name = sys.intern(raw_name.strip().upper())
+        if len(SSDP_HEADER_NAME_CACHE) < SSDP_HEADER_NAME_CACHE_LIMIT:
+            SSDP_HEADER_NAME_CACHE[raw_name] = name
+    return name
+
+
+def ssdp_parse_headers(header_content: bytes) -> Tuple[bytes, Dict[str, str]]:
+    """
+        Parses the header content of a message into the start line and a dictionary of header values
+        keyed by interned upper case header name.
+
+        :param header_content: The header content without the end of header marker.
+
+        :returns: A tuple with the start line and the dictionary of header values.
+    """
+    headers = {}
+
+    start_end = header_content.find(b"\n")
+    if start_end < 0:
+        start_end = len(header_content)
+    start_line = header_content[:start_end].strip()
+
+    name_cache = SSDP_HEADER_NAME_CACHE
+    for hline in header_content[start_end + 1:].decode("utf-8").splitlines():
+        raw_name, sep, val = hline.partition(":")
+        if sep:
+            name = name_cache.get(raw_name)
+            if name is None:
+                name = ssdp_intern_header_name(raw_name)
+            headers[name] = val.strip()
+
+    return start_line, headers
+
+
+def ssdp_header_end(content: bytes) -> Tuple[int, int]:
+    """
+        Finds the end of the header content of a message.
+
+        :param content: The content of the message.
+
+        :returns: A tuple with the offset of the end of the header content and the offset of the start
+                  of the body, the body offset is -1 if the message does not have an end of header marker.
+    """
+    header_end = content.find(b"\r\n\r\n")
+    if header_end > -1:
+        body_start = header_end + 4
+    else:
+        header_end = content.find(b"\n\n")
+        if header_end > -1:
+            body_start = header_end + 2
+        else:
+            header_end = len(content)
+            body_start = -1
+
+    return header_end, body_start
+
+
+class SsdpMessage:
+    """
+        An SSDP message that is parsed lazily.  Looking up a single header searches the raw content of the
+        message for the header and only decodes its value, the full set of headers is only parsed when it is
+        asked for.  Most of the messages that are received are dropped after looking at one or two headers.
+    """
+
+    __slots__ = ("kind", "_content", "_header_end", "_body_start", "_start_line", "_headers")
+
+    def __init__(self, kind: str, content: bytes, header_end: int, body_start: int):
+        self.kind = kind
+        self._content = content
+        self._header_end = header_end
+        self._body_start = body_start
+        self._start_line = None
+        self._headers: Optional[Dict[str, str]] = None
+        return
+
+    @property
+    def body(self) -> Optional[bytes]:
+        """
+            The content following the message headers or None if the message did not have an end of header marker.
+        """
+        body = None
+        if self._body_start > -1:
+            body = self._content[self._body_start:]
+        return body
+
+    @property
+    def content(self) -> bytes:
+        """
+            The raw content of the message.
+        """
+        return self._content
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+            A new dictionary of all of the header values keyed by upper case header name.
+        """
+        if self._headers is None:
+            self._parse_headers()
+        return dict(self._headers)
+
+    @property
+    def start_line(self) -> bytes:
+        """
+            The request or status line of the message.
+        """
+        if self._start_line is None:
+            line_end = self._content.find(b"\n", 0, self._header_end)
+            if line_end < 0:
+                line_end = self._header_end
+            self._start_line = self._content[:line_end].strip()
+        return self._start_line
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+            Gets the value of a header.
+
+            :param name: The upper case name of the header.
+            :param default: The value to return if the message does not have the header.
+        """
+        val = None
+
+        if self._headers is None:
+            marker = SSDP_HEADER_MARKER_CACHE.get(name)
+            if marker is not None:
+                content = self._content
+                header_end = self._header_end
+
+                midx = content.find(marker, 0, header_end)
+                if midx > -1:
+                    vstart = midx + len(marker)
+                    vend = content.find(b"\r\n", vstart, header_end)
+                    if vend < 0:
+                        vend = header_end
+                    val = content[vstart:vend].decode("utf-8").strip()
+
+            if val is None:
+                # The header is not in its usual form, it might be in a different case or
+                # the message might use bare line feeds, so parse the full header.
+                self._parse_headers()
+
+        if val is None:
+            val = self._headers.get(name, default)
+
+        return val
+
+    def __repr__(self) -> str:
+        rstr = "<SsdpMessage kind={} start_line={!r}>".format(self.kind, self.start_line)
+        return rstr
+
+    def _parse_headers(self):
+        self._start_line, self._headers = ssdp_parse_headers(self._content[:self._header_end])
+        return
+
+
+def ssdp_parse(content: Union[bytes, bytearray, memoryview]) -> Optional[SsdpMessage]:
+    """
+        Classifies an SSDP NOTIFY, M-SEARCH or M-SEARCH response message.  The headers of the message
+        are parsed on demand.
+
+        :param content: The content of the datagram.
+
+        :returns: The message or None if the content is not an SSDP message.
+    """
+    msg = None
+
+    if not isinstance(content, bytes):
+        content = bytes(content)
+
+    kind = None
+    if content.startswith(b"NOTIFY"):
+        kind = SSDP_KIND_NOTIFY
+    elif content.startswith(b"HTTP/"):
+        kind = SSDP_KIND_RESPONSE
+    elif content.startswith(b"M-SEARCH"):
+        kind = SSDP_KIND_MSEARCH
+
+    if kind is not None:
+        header_end, body_start = ssdp_header_end(content)
+        msg = SsdpMessage(kind, content, header_end, body_start)
+
+    return msg
@@ -0,0 +1,255 @@
+"""
+.. module:: upnpactionbatch
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpActionBatch` which is used to make action calls on many UPnP
+               service proxies concurrently.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, List, Optional, TYPE_CHECKING
+
+import asyncio
+import threading
+import time
+
+from concurrent.futures import Executor, Future, wait as wait_futures
+
+from mojo.interop.protocols.upnp.aspects import AspectsUPnP
+from mojo.interop.protocols.upnp.upnpconstants import DEFAULT_UPNP_CALL_ASPECTS
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+
+
+class UpnpActionCall:
+    """
+        An action call that is part of a :class:`UpnpActionBatch`, once the batch has been executed the
+        call holds the result or the error of the call.  The outcome of a call is only set once, a call that
+        timed out keeps its :class:`TimeoutError` even if the action finishes later.
+    """
+
+    __slots__ = ("proxy", "action_name", "arguments", "aspects", "auth", "headers", "result", "error", "elapsed",
+                 "_future", "_outcome_lock")
+
+    def __init__(self, proxy: "UpnpServiceProxy", action_name: str, arguments: Optional[dict] = None,
+                 aspects: AspectsUPnP = DEFAULT_UPNP_CALL_ASPECTS, auth: Optional[dict] = None, headers: Optional[dict] = None):
+        self.proxy = proxy
+        self.action_name = action_name
+        self.arguments = arguments if arguments is not None else {}
+        self.aspects = aspects
+        self.auth = auth
+        self.headers = headers if headers is not None else {}
+
+        self.result = None
+        self.error = None
+        self.elapsed = None
+
+        self._future = None
+        self._outcome_lock = threading.Lock()
+        return
+
+    @property
+    def completed(self) -> bool:
+        """
+            Indicates if the call has finished, either with a result or with an error.
+        """
+        return self.elapsed is not None or self.error is not None
+
+    @property
+    def succeeded(self) -> bool:
+        """
+            Indicates if the call finished without an error.
+        """
+        return self.elapsed is not None and self.error is None
+
+    def __repr__(self) -> str:
+        rstr = "<UpnpActionCall host={} action={} succeeded={}>".format(self.proxy.host, self.action_name, self.succeeded)
+        return rstr
+
+    def _run(self) -> Any:
+        """
+            Runs the call on an executor thread, the call is made with `call_action` so the action
+            pattern of the call aspects is applied to each call individually.
+        """
+        result = None
+        error = None
+
+        start = time.perf_counter()
+        try:
+            result = self.proxy.call_action(self.action_name, arguments=self.arguments, auth=self.auth,
+                                            headers=self.headers, aspects=self.aspects)
+        except Exception as xcpt: # pylint: disable=broad-except
+            error = xcpt
+        elapsed = time.perf_counter() - start
+
+        self._set_outcome(result, error, elapsed)
+
+        return result
+
+    def _set_outcome(self, result: Any, error: Optional[Exception], elapsed: Optional[float]) -> bool:
+        """
+            Sets the result, error and elapsed time of the call if the call does not have an outcome yet.
+
+            :param result: The result of the call.
+            :param error: The error of the call.
+            :param elapsed: The time the call took or None if the call did not finish.
+
+            :returns: True if the outcome was set, False if the call already had an outcome.
+        """
+        applied = False
+
+        self._outcome_lock.acquire()
+        try:
+            if not self.completed:
+                self.result = result
+                self.error = error
+                self.elapsed = elapsed
+                applied = True
+        finally:
+            self._outcome_lock.release()
+
+        return applied
+
+
+class UpnpActionBatch:
+    """
+        The :class:`UpnpActionBatch` collects action calls on many service proxies and runs them concurrently
+        on the bounded executor of the coordinator, so calling an action on N devices takes about the wall time of
+        the slowest call instead of the sum of all the calls.  Each call keeps its own :class:`AspectsUPnP` and
+        the results and errors are reported per call, an error in one call does not affect the other calls.
+
+        .. code-block:: python
+
+            batch = coord.create_action_batch()
+            for player in players:
+                batch.add(player.rendering_control, "GetVolume", {"InstanceID": 0, "Channel": "Master"})
+
+            for call in batch.execute(timeout=10):
+                if call.succeeded:
+                    print(call.proxy.host, call.result["CurrentVolume"])
+    """
+
+    def __init__(self, executor: Executor):
+        """
+            Creates a :class:`UpnpActionBatch` that runs its calls on the specified executor.
+
+            :param executor: The executor to run the action calls on.
+        """
+        self._executor = executor
+        self._calls: List[UpnpActionCall] = []
+        return
+
+    @property
+    def calls(self) -> List[UpnpActionCall]:
+        """
+            The calls in the batch, in the order they were added.
+        """
+        return self._calls
+
+    @property
+    def errors(self) -> List[UpnpActionCall]:
+        """
+            The calls in the batch that finished with an error.
+        """
+        errors = [call for call in self._calls if call.error is not None]
+        return errors
+
+    def add(self, proxy: "UpnpServiceProxy", action_name: str, arguments: Optional[dict] = None,
+            aspects: AspectsUPnP = DEFAULT_UPNP_CALL_ASPECTS, auth: Optional[dict] = None,
+            headers: Optional[dict] = None) -> UpnpActionCall:
+        """
+            Adds an action call to the batch.
+
+            :param proxy: The service proxy to make the call on.
+            :param action_name: The name of the action to call.
+            :param arguments: The arguments to pass to the action.
+            :param aspects: The aspects, including the action pattern, to use for the call.
+            :param auth: The authentication parameter to use when making the call.
+            :param headers: The headers to use when making the call.
+
+            :returns: The call that will hold the result or error of the call once the batch is executed.
+        """
+        call = UpnpActionCall(proxy, action_name, arguments=arguments, aspects=aspects, auth=auth, headers=headers)
+        self._calls.append(call)
+        return call
+
+    def execute(self, timeout: Optional[float] = None) -> List[UpnpActionCall]:
+        """
+            Runs all of the calls in the batch concurrently and waits for them to finish.
+
+            :param timeout: The maximum time in seconds to wait for the calls to finish, the calls that have
+                            not finished are given a :class:`TimeoutError` as their error.
+
+            :returns: The calls in the batch, in the order they were added.
+        """
+        futures = self._submit_calls()
+
+        wait_futures(futures, timeout=timeout)
+
+        self._collect_calls()
+
+        return self._calls
+
+    async def execute_async(self, timeout: Optional[float] = None) -> List[UpnpActionCall]:
+        """
+            Runs all of the calls in the batch concurrently and waits for them to finish without blocking
+            the event loop of the caller.
+
+            :param timeout: The maximum time in seconds to wait for the calls to finish, the calls that have
+                            not finished are given a :class:`TimeoutError` as their error.
+
+            :returns: The calls in the batch, in the order they were added.
+        """
+        futures = self._submit_calls()
+
+        if len(futures) > 0:
+            await asyncio.wait([asyncio.wrap_future(fut) for fut in futures], timeout=timeout)
+
+        self._collect_calls()
+
+        return self._calls
+
+    def results(self) -> List[Any]:
+        """
+            Returns the results of the calls in the order the calls were added, raising the error of the
+            first call that failed.
+        """
+        results = []
+        for call in self._calls:
+            if call.error is not None:
+                raise call.error
+            results.append(call.result)
+        return results
+
+    def _collect_calls(self):
+        """
+            Releases the futures of the calls and marks the calls that did not finish in time with a
+            :class:`TimeoutError`.
+        """
+        for call in self._calls:
+            future = call._future # pylint: disable=protected-access
+            if future is not None and not future.done():
+                future.cancel()
+                timeout_error = TimeoutError("Timeout waiting for action call host={} action={}.".format(
+                    call.proxy.host, call.action_name))
+                # A call that finishes after the check above keeps its own outcome
+                call._set_outcome(None, timeout_error, None) # pylint: disable=protected-access
+            call._future = None # pylint: disable=protected-access
+        return
+
+    def _submit_calls(self) -> List[Future]:
+        """
+            Submits all of the calls in the batch to the executor.
+        """
+        futures = []
+        for call in self._calls:
+            call._future = self._executor.submit(call._run) # pylint: disable=protected-access
+            futures.append(call._future) # pylint: disable=protected-access
+        return futures
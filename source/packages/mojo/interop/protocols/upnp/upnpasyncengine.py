@@ -0,0 +1,278 @@
+"""
+.. module:: upnpasyncengine
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpAsyncEngine` which is an optional asyncio based network engine
+               that the UpnpCoordinator can use in place of its monitor and callback threads.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import asyncio
+import functools
+import logging
+import socket
+import threading
+import weakref
+
+from xml.etree.ElementTree import ParseError
+
+from mojo.networking.interfaces import get_ipv4_address
+from mojo.networking.multicast import create_multicast_socket
+
+from mojo.interop.protocols.upnp.upnpprotocol import UpnpProtocol
+from mojo.interop.protocols.upnp.upnpprotocol import UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_BAD_REQUEST
+from mojo.interop.protocols.upnp.upnpprotocol import UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK
+from mojo.interop.protocols.upnp.genanotify import GenaNotifyReader
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.upnpcoordinator import UpnpCoordinator
+
+logger = logging.getLogger()
+
+GENA_READ_TIMEOUT = 30
+GENA_MAX_HEADER_LENGTH = 65536
+GENA_READ_CHUNK_SIZE = 8192
+
+ENGINE_STOP_TIMEOUT = 10
+
+
+class UpnpSsdpMonitorProtocol(asyncio.DatagramProtocol):
+    """
+        The datagram protocol that receives the SSDP multicast traffic and hands it to the
+        coordinator work queue.
+    """
+
+    def __init__(self, coord_ref: weakref.ReferenceType):
+        super().__init__()
+        self._coord_ref = coord_ref
+        return
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        coord = self._coord_ref()
+        if coord is not None:
+            coord._queue_ssdp_datagram(data, addr) # pylint: disable=protected-access
+        return
+
+    def error_received(self, exc: Exception):
+        logger.debug("UpnpAsyncEngine: SSDP monitor socket error. %r" % exc)
+        return
+
+
+class UpnpAsyncEngine:
+    """
+        The :class:`UpnpAsyncEngine` runs the SSDP multicast monitor and the GENA NOTIFY HTTP callback server on
+        a single asyncio event loop that is hosted by a single thread.  The engine only performs network I/O, the
+        processing of notifications and callbacks is still handed off to the coordinator work queue and its worker
+        threads so the event loop is never blocked.
+
+        Subscription renewals are not run on the event loop, they are scheduled by the coordinator's
+        :class:`UpnpRenewalScheduler` whether or not the engine is in use.
+
+        A single GENA server socket is bound to all IPv4 addresses, the callback URL that is handed to the devices
+        for each interface is built from the address of the interface and the port of the shared server socket.
+    """
+
+    def __init__(self, coordinator: "UpnpCoordinator"):
+        """
+            Creates a :class:`UpnpAsyncEngine` for the specified coordinator.
+
+            :param coordinator: The coordinator that the engine is servicing network traffic for.
+        """
+        self._coord_ref = weakref.ref(coordinator)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+        self._ssdp_transport = None
+        self._gena_server = None
+        return
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+            The event loop that is running the engine.
+        """
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        """
+            Indicates if the engine event loop is running.
+        """
+        running = self._loop is not None and self._loop.is_running()
+        return running
+
+    def start(self, ifacelist: List[str]) -> Dict[str, str]:
+        """
+            Starts the event loop thread and sets up the SSDP and GENA endpoints.
+
+            :param ifacelist: The list of interfaces to provide subscription callback addresses for.
+
+            :returns: A table of interface name to callback address.
+        """
+        if self._loop is not None:
+            raise RuntimeError("UpnpAsyncEngine.start called twice, the engine is already running.") from None
+
+        self._loop = asyncio.new_event_loop()
+
+        sgate = threading.Event()
+        self._loop_thread = threading.Thread(name="UpnpCoordinator - AsyncEngine", target=self._thread_entry_loop,
+                                             daemon=True, args=(sgate,))
+        self._loop_thread.start()
+        sgate.wait()
+
+        setup_future = asyncio.run_coroutine_threadsafe(self._setup_endpoints(ifacelist), self._loop)
+        try:
+            callback_addr_lookup = setup_future.result()
+        except:
+            self.stop()
+            raise
+
+        return callback_addr_lookup
+
+    def stop(self, timeout: float = ENGINE_STOP_TIMEOUT):
+        """
+            Closes the network endpoints, stops the event loop and waits for the loop thread to exit.
+
+            :param timeout: The time to wait for the endpoints to close and the loop thread to exit.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            teardown_future = asyncio.run_coroutine_threadsafe(self._teardown_endpoints(), loop)
+            try:
+                teardown_future.result(timeout)
+            except Exception: # pylint: disable=broad-except
+                logger.exception("UpnpAsyncEngine: Error tearing down the engine endpoints.")
+
+            loop.call_soon_threadsafe(loop.stop)
+
+        if self._loop_thread is not None:
+            self._loop_thread.join(timeout)
+            self._loop_thread = None
+
+        if loop is not None and not loop.is_running():
+            loop.close()
+
+        self._loop = None
+
+        return
+
+    async def _handle_gena_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+            Reads a GENA NOTIFY request from a device, responds to the device and queues the callback content
+            for processing by a coordinator worker.
+        """
+        claddr = writer.get_extra_info("peername")
+
+        gena_reader = GenaNotifyReader()
+        req_headers = None
+
+        try:
+            # Feed the content to the reader as it arrives so the event body is parsed
+            # incrementally instead of after the whole request has been buffered.
+            while not gena_reader.complete:
+                nxtbuff = await asyncio.wait_for(reader.read(GENA_READ_CHUNK_SIZE), GENA_READ_TIMEOUT)
+                gena_reader.feed(nxtbuff)
+
+            gena_reader.finish()
+
+            # The reader holds on to the error of the incremental parser so the rest of
+            # the request can still be read off of the connection.
+            if gena_reader.parse_error is not None:
+                raise gena_reader.parse_error
+
+            req_headers = gena_reader.headers
+
+            writer.write(UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK)
+            await writer.drain()
+
+        except ParseError as perr:
+            logger.debug("UpnpAsyncEngine: Malformed subscription callback from claddr={}. {!r}".format(claddr, perr))
+            req_headers = None
+
+            try:
+                writer.write(UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_BAD_REQUEST)
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as xcpt:
+            logger.debug("UpnpAsyncEngine: Incomplete subscription callback from claddr={}. {!r}".format(claddr, xcpt))
+            req_headers = None
+
+        finally:
+            writer.close()
+
+        coord = self._coord_ref()
+        if req_headers is not None and coord is not None:
+            work_queue = coord._work_queue # pylint: disable=protected-access
+
+            wkfunc = coord._dispatch_subscription_callback # pylint: disable=protected-access
+            wkargs = (claddr, req_headers, gena_reader, gena_reader.property_nodes)
+            order_key = claddr[0]
+
+            if work_queue.depth < work_queue.max_depth:
+                work_queue.enqueue(wkfunc, wkargs, order_key=order_key)
+            else:
+                # The queue is full, wait for space on an executor thread so the event
+                # loop can continue to service the other connections.
+                enqueue_blocking = functools.partial(work_queue.enqueue, wkfunc, wkargs, order_key=order_key, block=True)
+                await asyncio.get_running_loop().run_in_executor(None, enqueue_blocking)
+
+        return
+
+    async def _setup_endpoints(self, ifacelist: List[str]) -> Dict[str, str]:
+        """
+            Creates the SSDP datagram endpoint and the GENA callback server.
+        """
+        loop = asyncio.get_running_loop()
+
+        msock = create_multicast_socket(UpnpProtocol.MULTICAST_ADDRESS, UpnpProtocol.PORT)
+        self._ssdp_transport, _ = await loop.create_datagram_endpoint(
+            lambda: UpnpSsdpMonitorProtocol(self._coord_ref), sock=msock)
+
+        self._gena_server = await asyncio.start_server(self._handle_gena_connection, host="0.0.0.0", port=0,
+                                                       family=socket.AF_INET, limit=GENA_MAX_HEADER_LENGTH)
+
+        _, port = self._gena_server.sockets[0].getsockname()
+
+        callback_addr_lookup = {}
+        for ifname in ifacelist:
+            host = get_ipv4_address(ifname)
+            callback_addr_lookup[ifname] = "%s:%s" % (host, port)
+
+        return callback_addr_lookup
+
+    async def _teardown_endpoints(self):
+        """
+            Closes the SSDP and GENA endpoints.
+        """
+        if self._ssdp_transport is not None:
+            self._ssdp_transport.close()
+            self._ssdp_transport = None
+
+        if self._gena_server is not None:
+            self._gena_server.close()
+            await self._gena_server.wait_closed()
+            self._gena_server = None
+
+        return
+
+    def _thread_entry_loop(self, sgate: threading.Event):
+        """
+            The entry point for the thread that hosts the engine event loop.
+        """
+        asyncio.set_event_loop(self._loop)
+
+        self._loop.call_soon(sgate.set)
+        self._loop.run_forever()
+
+        return
@@ -16,12 +16,17 @@ from typing import Dict, List, Optional, TYPE_CHECKING, Union
 import os
 import socket
 import threading
+import time
 import traceback
 import uuid
 import weakref
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from datetime import datetime
 from http import HTTPStatus
-from io import BytesIO, SEEK_END
+from io import SEEK_END
+from xml.etree.ElementTree import Element, ElementTree
 
 import netifaces
 import yaml
@@ -34,7 +39,6 @@ from mojo.landscaping.friendlyidentifier import FriendlyIdentifier
 from mojo.collections.context import Context
 from mojo.collections.contextpaths import ContextPaths
 
-from mojo.networking.constants import HTTP1_1_LINESEP, HTTP1_1_END_OF_HEADER
 from mojo.networking.interfaces import get_interface_for_ip
 from mojo.networking.multicast import create_multicast_socket
 from mojo.networking.resolution import get_arp_table, refresh_arp_table
@@ -45,14 +49,24 @@ import mojo.interop.protocols.upnp as upnp_module
 from mojo.landscaping.coordinators.coordinatorbase import CoordinatorBase
 from mojo.landscaping.landscapedevice import LandscapeDevice
 
-from mojo.interop.protocols.upnp.upnpconstants import UPNP_HEADERS
 from mojo.interop.protocols.upnp.devices.upnprootdevice import UpnpRootDevice
 from mojo.interop.protocols.upnp.devices.upnprootdevice import device_description_load
 from mojo.interop.protocols.upnp.devices.upnprootdevice import device_description_find_components
 
 from mojo.interop.protocols.upnp.upnpfactory import UpnpFactory
-from mojo.interop.protocols.upnp.upnpprotocol import msearch_query_host, msearch_scan, notify_parse_request
+from mojo.interop.protocols.upnp.upnpprotocol import msearch_query_host, msearch_scan
+from mojo.interop.protocols.upnp.upnpprotocol import UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK
 from mojo.interop.protocols.upnp.upnpprotocol import MSearchKeys, MSearchRouteKeys, UpnpProtocol
+from mojo.interop.protocols.upnp.upnpworkqueue import UpnpWorkQueue, DEFAULT_WORK_QUEUE_MAX_DEPTH
+from mojo.interop.protocols.upnp.upnpdeviceregistry import UpnpDeviceRegistry
+from mojo.interop.protocols.upnp.upnphttpsession import UpnpHttpSessionPool
+from mojo.interop.protocols.upnp.upnpdescriptioncache import UpnpDescriptionCache, HEADER_BOOTID, HEADER_CONFIGID
+from mojo.interop.protocols.upnp.upnpactionbatch import UpnpActionBatch
+from mojo.interop.protocols.upnp.upnprenewalscheduler import UpnpRenewalScheduler
+from mojo.interop.protocols.upnp.upnpasyncengine import UpnpAsyncEngine
+from mojo.interop.protocols.upnp.upnptrafficrecorder import UpnpTrafficRecorder
+from mojo.interop.protocols.upnp.ssdpcodec import SsdpMessage, ssdp_parse
+from mojo.interop.protocols.upnp.genanotify import GenaNotifyReader
 from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
 from mojo.interop.protocols.upnp.xml.upnpdevice1 import UPNP_DEVICE1_NAMESPACE
 
@@ -67,28 +81,11 @@ EMPTY_LIST = []
 
 UPNP_DIR = os.path.dirname(upnp_module.__file__)
 
-UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK = HTTP1_1_LINESEP.join([
-    b'HTTP/1.1 200 OK',
-    b'Connection: close',
-    b'Content-Length: 0',
-    b'Content-Type: text/html',
-    b'Server: %s,UPnP/1.0' % UPNP_HEADERS.SERVER.encode(),
-    b''
-])
-
-def http_parse_header(header_content):
-    headers = {}
-    header_lines = header_content.splitlines(False)
-
-    assert len(header_lines) > 0, "The header content was not a valid HTTP request header."
-    req_line = header_lines[0]
-    for hline in header_lines[1:]:
-        name_end = hline.find(b":")
-        if name_end > -1:
-            hname = hline[:name_end].upper().decode().strip()
-            hval = hline[name_end + 1:].decode().strip()
-            headers[hname] = hval
-    return req_line, headers
+DEFAULT_ACTION_BATCH_WORKERS = 16
+DEFAULT_ACTIVATION_WORKERS = 8
+
+MONITOR_POLL_INTERVAL = 2
+THREAD_SHUTDOWN_TIMEOUT = 10
 
 
 class UpnpCoordinator(CoordinatorBase):
@@ -100,8 +97,10 @@ class UpnpCoordinator(CoordinatorBase):
     """
     # pylint: disable=attribute-defined-outside-init
 
-    def __init__(self, lscape: "Landscape", control_point=None, workers: int = 5):
-        super(UpnpCoordinator, self).__init__(lscape, control_point=control_point, workers=workers)
+    def __init__(self, lscape: "Landscape", control_point=None, workers: int = 5, queue_depth: int = DEFAULT_WORK_QUEUE_MAX_DEPTH,
+                 action_workers: int = DEFAULT_ACTION_BATCH_WORKERS):
+        super(UpnpCoordinator, self).__init__(lscape, control_point=control_point, workers=workers, queue_depth=queue_depth,
+                                              action_workers=action_workers)
 
         context = Context()
         self._upnp_cache_dir = context.lookup(ContextPaths.RUNTIME_HOME_DIRECTORY, default=os.path.expanduser("~/mjr"))
@@ -109,13 +108,16 @@ class UpnpCoordinator(CoordinatorBase):
 
         return
 
-    def _initialize(self, *_args, control_point=None, workers: int = 5, **_kwargs):
+    def _initialize(self, *_args, control_point=None, workers: int = 5, queue_depth: int = DEFAULT_WORK_QUEUE_MAX_DEPTH,
+                    action_workers: int = DEFAULT_ACTION_BATCH_WORKERS, **_kwargs):
         """
             Called by the CoordinatorBase constructor to perform the one time initialization of the coordinator Singleton
             of a given type.
 
             :param control_point: An object that acts as a UPNP control point.
             :param workers: The number of worker threads to spin up for handling work packets.
+            :param queue_depth: The maximum number of work packets that can be waiting for a worker.
+            :param action_workers: The maximum number of threads used to run the calls of action batches.
         """
         # pylint: disable=arguments-differ
 
@@ -125,6 +127,7 @@ class UpnpCoordinator(CoordinatorBase):
 
         self._control_point = control_point
         self._worker_count = workers
+        self._action_worker_count = action_workers
 
         self._factory = UpnpFactory()
 
@@ -132,6 +135,13 @@ class UpnpCoordinator(CoordinatorBase):
         self._allow_unknown_devices = False
         self._upnp_recording = True
 
+        # The network engine is selected at startup, either the monitor and callback
+        # threads are used or an optional asyncio engine that services all of the
+        # network endpoints from a single event loop thread.
+        self._use_async_engine = False
+        self._async_engine = None
+        self._monitor_thread = None
+
         # The count for the shutdown gate semaphore is set at startup so we don't
         # need to lock protect it.  Once it is set, it is fixed for the lifespan
         # of the UpnpCoordinator
@@ -173,11 +183,26 @@ class UpnpCoordinator(CoordinatorBase):
         # Callback capture management dictionaries
         self._cl_callback_traffic_capture_from = {}
 
-        # =========================== Queue Lock Variables ==========================
-        # Variables that manage the work queue and dispatching of work to worker threads
-        self._queue_lock = threading.RLock()
-        self._queue_available = threading.Semaphore(0)
-        self._queue_work = []
+        # The recorder that the SSDP, GENA and SOAP traffic is written to while traffic is
+        # being recorded.  It is read without the lock by the network and worker threads.
+        self._traffic_recorder = None
+
+        # ================================ Work Queue ================================
+        # The work queue manages the dispatching of work to worker threads, it has its
+        # own internal lock and work packets are processed outside of that lock.  Work
+        # from the same device is keyed by the device address so it stays in sequence.
+        self._work_queue = UpnpWorkQueue(max_depth=queue_depth)
+
+        # ============================= Device Registry ==============================
+        # The device registry maintains the USN, MAC, IP and hint indexes used by the
+        # device lookup methods, it has its own lock so lookups from test code do not
+        # contend with the coordinator lock.
+        self._device_registry = UpnpDeviceRegistry()
+
+        # ============================ Renewal Scheduler =============================
+        # The renewal scheduler renews the event subscriptions of the devices ahead of
+        # their expiration, the renewals are processed on the work queue by host.
+        self._renewal_scheduler = UpnpRenewalScheduler(self._work_queue)
 
         self._match_table = {
             "modelName": ('upnp', UpnpRootDevice._matches_model_name), # pylint: disable=protected-access
@@ -186,8 +211,20 @@ class UpnpCoordinator(CoordinatorBase):
 
         self._excluded_interfaces = ["lo"]
 
+        # The count of NOTIFY messages that were dropped before reaching the work queue
+        # because they were not for a device the coordinator is managing.
+        self._ssdp_notify_filtered = 0
+
+        # The device counts and elapsed times of the stages of the device activation
+        # done by the startup scan, it is replaced once the activation completes.
+        self._activation_statistics = {}
+
         self._cl_callback_interface_sockets = {}
 
+        # The executor that runs the calls of action batches, it is created the
+        # first time an action batch is created.
+        self._cl_action_executor = None
+
         return
 
     @property
@@ -212,6 +249,51 @@ class UpnpCoordinator(CoordinatorBase):
 
         return wlist
 
+    @property
+    def activation_statistics(self) -> dict:
+        """
+            Returns the device counts and elapsed times of the fetch, activate and record stages of the device
+            activation done by the startup scan.
+        """
+        return self._activation_statistics
+
+    @property
+    def ssdp_notify_filtered(self) -> int:
+        """
+            Returns the count of NOTIFY messages that were dropped because they were not for a device the coordinator
+            is managing.
+        """
+        return self._ssdp_notify_filtered
+
+    @property
+    def work_queue_statistics(self) -> dict:
+        """
+            Returns a snapshot of the work queue depth and backpressure counters.
+        """
+        return self._work_queue.statistics()
+
+    def create_action_batch(self) -> UpnpActionBatch:
+        """
+            Creates an action batch that can be used to make action calls on many devices concurrently.  The
+            calls of all action batches are run on a shared bounded executor owned by the coordinator.
+
+            :returns: A new empty action batch.
+        """
+        executor = None
+
+        self._coord_lock.acquire()
+        try:
+            if self._cl_action_executor is None:
+                self._cl_action_executor = ThreadPoolExecutor(max_workers=self._action_worker_count,
+                                                              thread_name_prefix="UpnpCoordinator - ActionBatch")
+            executor = self._cl_action_executor
+        finally:
+            self._coord_lock.release()
+
+        batch = UpnpActionBatch(executor)
+
+        return batch
+
     def create_callback_traffic_capture_context(self, fromip: str):
         
         identifier = uuid.uuid4()
@@ -244,6 +326,55 @@ class UpnpCoordinator(CoordinatorBase):
 
         return
 
+    def start_traffic_recording(self, filename: str) -> UpnpTrafficRecorder:
+        """
+            Starts recording the SSDP datagrams, GENA NOTIFY callbacks and SOAP exchanges seen by the coordinator
+            into a capture file that can be played back with a :class:`UpnpTrafficReplayer`.
+
+            :param filename: The full path of the capture file.
+
+            :returns: The recorder that the traffic is being written to.
+
+            :raises: :class:`SemanticError` if traffic is already being recorded.
+        """
+        recorder = None
+
+        self._coord_lock.acquire()
+        try:
+            if self._traffic_recorder is not None:
+                errmsg = "Traffic is already being recorded to '{}'.".format(self._traffic_recorder.filename)
+                raise SemanticError(errmsg)
+
+            recorder = UpnpTrafficRecorder(filename)
+            self._traffic_recorder = recorder
+        finally:
+            self._coord_lock.release()
+
+        UpnpHttpSessionPool().set_traffic_recorder(recorder)
+
+        return recorder
+
+    def stop_traffic_recording(self) -> Optional[UpnpTrafficRecorder]:
+        """
+            Stops the recording of traffic and closes the capture file.
+
+            :returns: The recorder that the traffic was written to or None if traffic was not being recorded.
+        """
+        recorder = None
+
+        self._coord_lock.acquire()
+        try:
+            recorder = self._traffic_recorder
+            self._traffic_recorder = None
+        finally:
+            self._coord_lock.release()
+
+        if recorder is not None:
+            UpnpHttpSessionPool().set_traffic_recorder(None)
+            recorder.close()
+
+        return recorder
+
     def establish_presence(self):
         watched_devices = self.watch_devices
 
@@ -283,14 +414,9 @@ class UpnpCoordinator(CoordinatorBase):
 
         found = None
 
-        self._coord_lock.acquire()
-        try:
-            for nxtdev in self._cl_children.values():
-                if mac == nxtdev.MACAddress:
-                    found = nxtdev.basedevice
-                    break
-        finally:
-            self._coord_lock.release()
+        dev = self._device_registry.find_by_mac(mac)
+        if dev is not None:
+            found = dev.basedevice
 
         return found
 
@@ -303,27 +429,16 @@ class UpnpCoordinator(CoordinatorBase):
             :returns: The device found with the associated hint address or None
         """
 
-        found = None
-
-        self._coord_lock.acquire()
-        try:
-            for nxtdev in self._cl_children.values():
-                if nxtdev.USN.find(hint) > -1:
-                    found = nxtdev
-                    break
-            
-            if found is None:
-                errmsg_lines = [
-                    "lookup_device_by_upnp_hint did not find a device for hint={}.".format(hint),
-                    "DEVICE USN(s):"
-                ]
-                for nxtdev in self._cl_children.values():
-                    errmsg_lines.append(nxtdev.USN)
-                errmsg = os.linesep.join(errmsg_lines)
-                self.logger.debug(errmsg)
+        found = self._device_registry.find_by_substring(hint)
 
-        finally:
-            self._coord_lock.release()
+        if found is None:
+            errmsg_lines = [
+                "lookup_device_by_upnp_hint did not find a device for hint={}.".format(hint),
+                "DEVICE USN(s):"
+            ]
+            errmsg_lines.extend(self._device_registry.usn_list())
+            errmsg = os.linesep.join(errmsg_lines)
+            self.logger.debug(errmsg)
 
         return found
     
@@ -336,27 +451,16 @@ class UpnpCoordinator(CoordinatorBase):
             :returns: The device found with the associated USN address or None
         """
 
-        found = None
-
-        self._coord_lock.acquire()
-        try:
-            for nxtdev in self._cl_children.values():
-                if nxtdev.USN.find(usn) > -1:
-                    found = nxtdev
-                    break
-            
-            if found is None:
-                errmsg_lines = [
-                    "lookup_device_by_upnp_usn did not find a device for usn={}.".format(usn),
-                    "DEVICE USN(s):"
-                ]
-                for nxtdev in self._cl_children.values():
-                    errmsg_lines.append(nxtdev.USN)
-                errmsg = os.linesep.join(errmsg_lines)
-                self.logger.debug(errmsg)
+        found = self._device_registry.find_by_substring(usn)
 
-        finally:
-            self._coord_lock.release()
+        if found is None:
+            errmsg_lines = [
+                "lookup_device_by_upnp_usn did not find a device for usn={}.".format(usn),
+                "DEVICE USN(s):"
+            ]
+            errmsg_lines.extend(self._device_registry.usn_list())
+            errmsg = os.linesep.join(errmsg_lines)
+            self.logger.debug(errmsg)
 
         return found
 
@@ -368,16 +472,20 @@ class UpnpCoordinator(CoordinatorBase):
 
             :returns: A list of devices found with USN(s) in the usn search list.
         """
-        found = []
+        found = self._device_registry.find_list_by_usn(usnlist)
 
-        self._coord_lock.acquire()
-        try:
-            for usn in usnlist:
-                for nxtdev in self._cl_children.values():
-                    if usn == nxtdev.USN:
-                        found.append(nxtdev)
-        finally:
-            self._coord_lock.release()
+        return found
+
+    def lookup_device_by_ip(self, ip_addr: str) -> Union[UpnpRootDevice, None]:
+        """
+            Lookup an active UPNP device by its IP address.
+
+            :param ip_addr: The IP address of the device to search for.
+
+            :returns: The device found with the associated IP address or None
+        """
+
+        found = self._device_registry.find_by_ip(ip_addr)
 
         return found
 
@@ -400,6 +508,23 @@ class UpnpCoordinator(CoordinatorBase):
 
         return device_inst
 
+    @property
+    def renewal_scheduler(self) -> UpnpRenewalScheduler:
+        """
+            The scheduler that renews the event subscriptions of the devices.
+        """
+        return self._renewal_scheduler
+
+    def cancel_subscription_renewal(self, device: UpnpRootDevice, service_type: str):
+        """
+            Stops the renewal of the event subscription of a device service.
+
+            :param device: The device that owns the subscription.
+            :param service_type: The service type of the subscription.
+        """
+        self._renewal_scheduler.cancel(device, service_type)
+        return
+
     def register_subscription_for_device(self, sid: str, device: LandscapeDevice):
         """
             Registers a service instance for event callbacks via a 'sid'.
@@ -416,10 +541,47 @@ class UpnpCoordinator(CoordinatorBase):
 
         return
 
+    def unregister_subscription_for_device(self, sid: str, device: LandscapeDevice):
+        """
+            Unregisters a subscription id that was registered with :meth:`register_subscription_for_device`.
+
+            :param sid: The service subscription id to unregister.
+            :param device: The device the sid was registered for, the sid is only removed if it still
+                           belongs to the device.
+        """
+
+        self._coord_lock.acquire()
+        try:
+            if self._cl_subscription_id_to_device.get(sid) is device:
+                del self._cl_subscription_id_to_device[sid]
+        finally:
+            self._coord_lock.release()
+
+        return
+
+    def start_monitoring(self, ifacelist: List[str], async_engine: bool = False):
+        """
+            Starts the network engine and the worker threads of the coordinator for the specified interfaces without
+            scanning for devices.  This allows the traffic handling of the coordinator to be driven for devices that
+            are registered with it directly, such as when replaying a traffic capture.
+
+            :param ifacelist: The names of the interfaces to service subscription callbacks for.
+            :param async_engine: Use the asyncio network engine instead of the monitor and callback threads.
+        """
+        if self._running:
+            raise RuntimeError("UpnpCoordinator.start_monitoring called while the UpnpCoordinator is already running.") from None
+
+        self._use_async_engine = async_engine
+
+        self._start_all_threads(ifacelist=ifacelist)
+
+        return
+
     def startup_scan(self, query_devices: Dict[str, dict], required_devices: Optional[List[str]] = None,
                            watchlist: Optional[List[str]] = None, exclude_interfaces: Optional[List] = None,
                             response_timeout: float = 20, pre_msearch_timeout=20, retry: int = 2, 
-                            upnp_recording: bool = False, allow_unknown_devices: bool = False):
+                            upnp_recording: bool = False, allow_unknown_devices: bool = False,
+                            async_engine: bool = False, activation_workers: int = DEFAULT_ACTIVATION_WORKERS):
         """
             Starts up and initilizes the UPNP coordinator by utilizing a hint list to determine
             what network interfaces to setup UPNP monitoring on.
@@ -430,12 +592,17 @@ class UpnpCoordinator(CoordinatorBase):
             :param response_timeout: A timeout to wait for a response.
             :param retry: The number of retry attempts to make before giving up on finding devices.
             :param upnp_recording: Forces the updating or recording of device descriptions from devices found on the network.
+            :param async_engine: Use the asyncio network engine to service the SSDP monitor and subscription callbacks
+                                 instead of a monitor thread and a callback thread per interface.
+            :param activation_workers: The maximum number of device descriptions to fetch concurrently while activating
+                                       the matching devices.
         """
         # pylint: disable=dangerous-default-value
 
         if exclude_interfaces is None:
             exclude_interfaces = []
 
+        self._use_async_engine = async_engine
         self._allow_unknown_devices = allow_unknown_devices
         self._upnp_recording = upnp_recording
         self._excluded_interfaces = exclude_interfaces
@@ -543,10 +710,7 @@ class UpnpCoordinator(CoordinatorBase):
 
         config_lookup = lscape._internal_get_upnp_device_config_lookup_table() # pylint: disable=protected-access
 
-        for dhint, dval in matching_devices.items():
-            addr = dval[MSearchKeys.IP]
-            location = dval[MSearchKeys.LOCATION]
-            self._update_root_device(lscape, config_lookup, addr, location, dhint, dval)
+        self._activate_matching_devices(lscape, config_lookup, matching_devices, activation_workers)
 
         if watchlist is not None and len(watchlist) > 0:
             for hint in watchlist:
@@ -565,6 +729,77 @@ class UpnpCoordinator(CoordinatorBase):
 
         return found_devices, matching_devices, missing_devices
 
+    def schedule_subscription_renewal(self, device: UpnpRootDevice, service_type: str, expires: datetime):
+        """
+            Schedules the renewal of the event subscription of a device service ahead of its expiration.
+
+            :param device: The device that owns the subscription.
+            :param service_type: The service type of the subscription.
+            :param expires: The time the subscription expires.
+        """
+        self._renewal_scheduler.schedule(device, service_type, device.host, expires)
+        return
+
+    def shutdown_monitoring(self, timeout: float = THREAD_SHUTDOWN_TIMEOUT):
+        """
+            Stops the network engine and the worker threads of the coordinator.  The callback server sockets are
+            closed in order to interrupt any threads that are blocked accepting connections.
+
+            :param timeout: The time to wait for each thread to exit.
+        """
+        callback_sockets = []
+        threads_to_join = []
+
+        self._coord_lock.acquire()
+        try:
+            if self._running:
+                self._running = False
+
+                callback_sockets = [sock for sock in self._cl_callback_interface_sockets.values()]
+                self._cl_callback_interface_sockets.clear()
+
+                threads_to_join.extend(self._cl_callback_threads)
+                threads_to_join.extend(self._cl_worker_threads)
+                if self._monitor_thread is not None:
+                    threads_to_join.append(self._monitor_thread)
+
+                self._cl_callback_threads = []
+                self._cl_worker_threads = []
+                self._monitor_thread = None
+
+            action_executor = self._cl_action_executor
+            self._cl_action_executor = None
+        finally:
+            self._coord_lock.release()
+
+        if action_executor is not None:
+            action_executor.shutdown(wait=False)
+
+        self._renewal_scheduler.stop(timeout=timeout)
+
+        if self._async_engine is not None:
+            self._async_engine.stop(timeout=timeout)
+            self._async_engine = None
+
+        for sock in callback_sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+        # Shutting down the work queue wakes up all the worker threads
+        self._work_queue.shutdown()
+
+        this_thread = threading.current_thread()
+        for nxt_thread in threads_to_join:
+            if nxt_thread is not this_thread:
+                nxt_thread.join(timeout)
+
+        self.stop_traffic_recording()
+
+        return
+
     def wakeup_device(self, usn, dev_hint):
         self.logger.info("TODO: Implement an overload for UpnpCoordinatorIntegration:wakeup_device.")
         return
@@ -624,7 +859,8 @@ class UpnpCoordinator(CoordinatorBase):
             location_url = device_info["LOCATION"]
 
             try:
-                dev_desc = device_description_load(location_url)
+                dev_desc = device_description_load(location_url, udn=device_info[MSearchKeys.USN_DEV],
+                    configid=device_info.get(HEADER_CONFIGID), bootid=device_info.get(HEADER_BOOTID))
                 if dev_desc is not None:
                     namespaces = {"": UPNP_DEVICE1_NAMESPACE}
 
@@ -728,6 +964,22 @@ class UpnpCoordinator(CoordinatorBase):
         """
         return []
 
+    def _log_description_error(self, ip_addr: str, location: str, deviceinfo: dict, exmsg: str):
+        """
+            Logs the failure to load or process the description of a device.
+        """
+        errmsg_lines = [
+            "ERROR: Unable to parse description for. IP: %s LOCATION: %s" % (ip_addr, location),
+            exmsg
+        ]
+        for k, v in deviceinfo.items():
+            errmsg_lines.append("    %s: %s" % (k, v))
+
+        errmsg = os.linesep.join(errmsg_lines)
+        self.logger.debug(errmsg)
+
+        return
+
     def _log_scan_results(self, found_devices: dict, matching_devices:dict , missing_devices: list):
         """
             Logs the results of the device scan.
@@ -823,58 +1075,48 @@ class UpnpCoordinator(CoordinatorBase):
 
             :param ifname: The name of the ifname the request came from.
             :param claddr: The address of the client that made the callback.
-            :param request: The content of the callback request.
+            :param asock: The accepted socket the callback request is read from.
         """
         # pylint: disable=unused-argument
 
-        cbbuffer = BytesIO()
-
-        req_headers = None
-
-        headers_length = None
-        content_length = None
+        reader = GenaNotifyReader()
 
-        message_length = None
-        read_so_far = 0
-        remaining_length = 1024
         try:
-            # Read To Header
-            while self._running and remaining_length > 0:
-                # Process the requests
-                nxtbuff = asock.recv(remaining_length)
-                read_so_far += len(nxtbuff)
-
-                # If we didn't get anything from recv, it means we hit the end of
-                # the pipe.  We can exit the read loop.
-                if len(nxtbuff) == 0:
+            while self._running and not reader.complete:
+                # The reader receives directly into its buffer and feeds the body
+                # to its incremental parser as the content arrives.
+                if reader.recv_from(asock) == 0:
                     break
 
-                cbbuffer.write(nxtbuff)
-
-                if req_headers is None:
-                    current_content = cbbuffer.getvalue()
-                    header_end = current_content.find(HTTP1_1_END_OF_HEADER)
-                    if header_end > -1:
-                        header_content = current_content[:header_end]
-                        headers_length = len(header_content) + len(HTTP1_1_END_OF_HEADER)
-                        req_line, req_headers = http_parse_header(header_content)
-                        if "CONTENT-LENGTH" in req_headers:
-                            content_length = int(req_headers["CONTENT-LENGTH"])
-                            message_length = headers_length + content_length
-                
-                if message_length is not None:
-                    remaining_length = message_length - read_so_far
+            reader.finish()
+
+        except (OSError, ValueError) as xcpt:
+            self.logger.debug("Error reading subscription callback from claddr={}. {!r}".format(claddr, xcpt))
 
         finally:
             asock.sendall(UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK)
             asock.close()
 
-        request = cbbuffer.getvalue()
+        if reader.header_complete:
+            self._dispatch_subscription_callback(claddr, reader.headers, reader, property_nodes=reader.property_nodes)
+
+        reader.release()
+
+        return
 
-        cbbuffer.truncate(0)
-        cbbuffer.seek(0)
+    def _dispatch_subscription_callback(self, claddr: tuple, req_headers: dict, req_body: Union[bytes, GenaNotifyReader],
+                                        property_nodes: Optional[List[Element]] = None):
+        """
+            Dispatches the content of a subscription callback to the traffic capture contexts and to the
+            device that registered the subscription id of the callback.
 
-        req_body = request[headers_length:]
+            :param claddr: The address of the client that made the callback.
+            :param req_headers: The headers of the callback request.
+            :param req_body: The body content of the callback request or the reader that holds the body content.  When
+                             a reader is passed, the body is only copied out of the reader if it is needed.
+            :param property_nodes: The property elements of the event if they were already parsed while the
+                                   request was being read.
+        """
 
         capture_to = None
         self._coord_lock.acquire()
@@ -884,10 +1126,21 @@ class UpnpCoordinator(CoordinatorBase):
         finally:
             self._coord_lock.release()
 
+        recorder = self._traffic_recorder
+
+        if isinstance(req_body, GenaNotifyReader):
+            if capture_to is not None or recorder is not None or property_nodes is None or "SID" not in req_headers:
+                req_body = req_body.body
+            else:
+                req_body = None
+
         if capture_to is not None:
             for cc in capture_to:
                 cc.append_capture(req_headers, req_body)
 
+        if recorder is not None:
+            recorder.record_gena(claddr, req_headers, req_body)
+
         if "SID" in req_headers:
             sid = req_headers["SID"]
 
@@ -901,7 +1154,10 @@ class UpnpCoordinator(CoordinatorBase):
                 self._coord_lock.release()
 
             if device is not None:
-                device.process_subscription_callback(claddr, sid, req_headers, req_body)
+                if property_nodes is not None:
+                    device.process_subscription_properties(claddr, sid, req_headers, property_nodes)
+                else:
+                    device.process_subscription_callback(claddr, sid, req_headers, req_body)
             else:
                 errmsg = "Received subscription notification for unknown sid.  claddr={} sid={}".format(claddr, sid)
                 self.logger.error(errmsg)
@@ -935,14 +1191,14 @@ class UpnpCoordinator(CoordinatorBase):
 
         return
 
-    def _process_request_for_notify(self, addr: str, request: str):
+    def _process_request_for_notify(self, addr: str, request: SsdpMessage):
         """
             Process a notify request.
 
             :param addr: The address of machine making the notify request.
-            :param request: The request content of the notify request to process.
+            :param request: The parsed notify request to process.
         """
-        req_headers, _ = notify_parse_request(request)
+        req_headers = request.headers
 
         usn = req_headers["USN"]
         host = req_headers["HOST"]
@@ -983,27 +1239,93 @@ class UpnpCoordinator(CoordinatorBase):
 
         return
 
-    def _start_all_threads(self):
+    def _queue_ssdp_datagram(self, request: bytes, addr: tuple):
+        """
+            Queues an SSDP datagram received by the network engine for processing by a worker thread.
+
+            :param request: The content of the datagram.
+            :param addr: The address of the sender of the datagram.
+        """
+        recorder = self._traffic_recorder
+        if recorder is not None:
+            recorder.record_ssdp(addr, request)
+
+        # The monitor does not block on a full queue, if we stop reading the multicast
+        # socket the datagrams are dropped by the kernel anyway, so we drop them here
+        # and count them so the backpressure is visible.
+        if request.startswith(b"M-SEARCH"):
+            if self._control_point:
+                self._work_queue.enqueue(self._process_request_for_msearch, (addr, request))
+        elif request.startswith(b"NOTIFY"):
+            # Most of the NOTIFY traffic on a network is from devices and services we are not
+            # managing, the notifications are parsed here and only the ones that will result
+            # in processing are handed to the workers.
+            notify_msg = ssdp_parse(request)
+            if notify_msg is not None and self._ssdp_notify_filter(notify_msg):
+                self._work_queue.enqueue(self._process_request_for_notify, (addr, notify_msg), order_key=addr[0])
+            else:
+                self._ssdp_notify_filtered += 1
+        else:
+            dbgmsg = b"UNKNOWN REQUEST TYPE:\n" + request
+            dbgmsg = dbgmsg.decode("utf-8")
+            self.logger.debug(dbgmsg)
+
+        return
+
+    def _ssdp_notify_filter(self, notify_msg: SsdpMessage) -> bool:
+        """
+            Indicates if a NOTIFY message should be processed.  Only root device notifications are processed, and
+            only for the devices that are registered with the coordinator unless unknown devices are allowed.
+
+            :param notify_msg: The parsed notify message.
+
+            :returns: True if the message should be processed by a worker.
+        """
+        interesting = False
+
+        usn = notify_msg.get("USN")
+        if usn is not None:
+            usn_dev, sep, usn_cls = usn.partition("::")
+            if sep and usn_cls == "upnp:rootdevice" and "NTS" in notify_msg and "HOST" in notify_msg:
+                if self._allow_unknown_devices:
+                    interesting = True
+                else:
+                    usn_dev = usn_dev.lstrip("uuid:")
+                    interesting = self._device_registry.find_by_substring(usn_dev) is not None
+
+        return interesting
+
+    def _start_all_threads(self, ifacelist: Optional[List[str]] = None):
         """
             Starts up all the thread the UPNP coordinator uses for monitoring, callback notification servicing and
             the worker threads used for processing work packges from notifications and callbacks.
+
+            :param ifacelist: The interfaces to service callbacks for, by default the interfaces of the primary
+                              routes of the watched devices are used.
         """
 
-        ifacelist = []
-        for wdev in self.watch_devices:
-            primary_route = wdev.upnp.primary_route
-            ifname = primary_route[MSearchRouteKeys.IFNAME]
-            if ifname not in ifacelist:
-                ifacelist.append(ifname)
+        if ifacelist is None:
+            ifacelist = []
+            for wdev in self.watch_devices:
+                primary_route = wdev.upnp.primary_route
+                ifname = primary_route[MSearchRouteKeys.IFNAME]
+                if ifname not in ifacelist:
+                    ifacelist.append(ifname)
         ifacecount = len(ifacelist)
 
+        # When the async engine is being used, the monitor and callback endpoints are serviced
+        # by the engine event loop instead of by the monitor and callback threads.
+        network_thread_count = ifacecount + 1
+        if self._use_async_engine:
+            network_thread_count = 0
+
         self._coord_lock.acquire()
         try:
             sgate = threading.Event()
 
             self._running = True
 
-            self._shutdown_gate = threading.Semaphore(self._worker_count + ifacecount + 1)
+            self._shutdown_gate = threading.Semaphore(self._worker_count + network_thread_count)
 
             # Spin-up the worker threads first so they will be ready to handle work packets
             for wkrid in range(0, self._worker_count):
@@ -1021,15 +1343,29 @@ class UpnpCoordinator(CoordinatorBase):
                 finally:
                     self._coord_lock.acquire()
 
-            # Spin-up the Monitor thread so it can monitor notification traffic
-            sgate.clear()
-            self._monitor_thread = threading.Thread(name="UpnpCoordinator - Monitor", target=self._thread_entry_monitor,
-                                                   daemon=True, args=(sgate,))
-            self._monitor_thread.start()
-            sgate.wait()
+            self._renewal_scheduler.start()
 
-            # Spin-up a Callback thread for each interface
-            self._cl_iface_callback_addr_lookup = {}
+            if self._use_async_engine:
+                self._async_engine = UpnpAsyncEngine(self)
+
+                self._coord_lock.release()
+                try:
+                    callback_addr_lookup = self._async_engine.start(ifacelist)
+                finally:
+                    self._coord_lock.acquire()
+
+                self._cl_iface_callback_addr_lookup = callback_addr_lookup
+                ifacecount = 0
+            else:
+                # Spin-up the Monitor thread so it can monitor notification traffic
+                sgate.clear()
+                self._monitor_thread = threading.Thread(name="UpnpCoordinator - Monitor", target=self._thread_entry_monitor,
+                                                       daemon=True, args=(sgate,))
+                self._monitor_thread.start()
+                sgate.wait()
+
+                # Spin-up a Callback thread for each interface
+                self._cl_iface_callback_addr_lookup = {}
 
             for ifaceidx in range(0, ifacecount):
                 ifname = ifacelist[ifaceidx]
@@ -1050,7 +1386,7 @@ class UpnpCoordinator(CoordinatorBase):
         except:
             self._running = False
 
-            for _ in range(0, self._worker_count + ifacecount + 1):
+            for _ in range(0, self._worker_count + network_thread_count):
                 self._shutdown_gate.release()
 
             raise
@@ -1091,17 +1427,23 @@ class UpnpCoordinator(CoordinatorBase):
             sock.listen(1)
 
             while self._running:
-                asock, claddr = sock.accept()
-
-                # Queue the callback workpacket for dispatching by a worker thread
-                wkpacket = (self._process_subscription_callback, (ifname, claddr, asock))
-
-                self._queue_lock.acquire()
                 try:
-                    self._queue_work.append(wkpacket)
-                    self._queue_available.release()
-                finally:
-                    self._queue_lock.release()
+                    asock, claddr = sock.accept()
+                except OSError:
+                    # The callback socket is closed by 'shutdown_monitoring' in order to
+                    # interrupt the accept call.
+                    if not self._running:
+                        break
+                    raise
+
+                # Queue the callback workpacket for dispatching by a worker thread.  We block when the
+                # queue is full so the backpressure is pushed out to the listen backlog instead of
+                # dropping event content.
+                cl_ip, _ = claddr
+                queued = self._work_queue.enqueue(self._process_subscription_callback, (ifname, claddr, asock),
+                                                  order_key=cl_ip, block=True)
+                if not queued:
+                    asock.close()
 
         finally:
             self._shutdown_gate.release()
@@ -1125,34 +1467,19 @@ class UpnpCoordinator(CoordinatorBase):
             sgate.set()
 
             while self._running:
-                sock = create_multicast_socket(multicast_address, multicast_port)
+                # We use a socket timeout so the monitor thread can periodically check
+                # to see if the coordinator is still running.
+                sock = create_multicast_socket(multicast_address, multicast_port, timeout=MONITOR_POLL_INTERVAL)
 
                 try:
-                    
+
                     while self._running:
-                        request, addr = sock.recvfrom(1024)
+                        try:
+                            request, addr = sock.recvfrom(1024)
+                        except socket.timeout:
+                            continue
 
-                        if request.startswith(b"M-SEARCH"):
-                            if self._control_point:
-                                wkpacket = (self._process_request_for_msearch, (addr, request))
-                                self._queue_lock.acquire()
-                                try:
-                                    self._queue_work.append(wkpacket)
-                                    self._queue_available.release()
-                                finally:
-                                    self._queue_lock.release()
-                        elif request.startswith(b"NOTIFY"):
-                            wkpacket = (self._process_request_for_notify, (addr, request))
-                            self._queue_lock.acquire()
-                            try:
-                                self._queue_work.append(wkpacket)
-                                self._queue_available.release()
-                            finally:
-                                self._queue_lock.release()
-                        else:
-                            dbgmsg = b"UNKNOWN REQUEST TYPE:\n" + request
-                            dbgmsg = dbgmsg.decode("utf-8")
-                            self.logger.debug(dbgmsg)
+                        self._queue_ssdp_datagram(request, addr)
 
                 finally:
                     sock.close()
@@ -1174,22 +1501,124 @@ class UpnpCoordinator(CoordinatorBase):
             sgate.set()
 
             while self._running:
-                self._queue_available.acquire()
+                wkpacket = self._work_queue.dequeue()
+                if wkpacket is None:
+                    break
 
-                self._queue_lock.acquire()
+                # The work packet is run outside of the queue lock so the workers can
+                # process packets in parallel.
                 try:
-                    wkfunc, wkargs = self._queue_work.pop(0)
-                    wkfunc(*wkargs)
+                    wkpacket.execute()
                 except: # pylint: disable=bare-except
                     self.logger.exception("UpnpCoordinator: Worker exception.")
                 finally:
-                    self._queue_lock.release()
+                    self._work_queue.complete(wkpacket)
 
         finally:
             self._shutdown_gate.release()
 
         return
 
+    def _activate_matching_devices(self, lscape: "Landscape", config_lookup: dict, matching_devices: dict, activation_workers: int):
+        """
+            Activates the devices that matched the startup scan in stages.
+
+            * Fetch - The device descriptions are fetched and parsed concurrently by a bounded pool of threads.
+            * Activate - The devices are created and attached to the landscape and their service proxies are
+              created in the order the devices were found, the landscape is updated from a single thread.
+            * Record - The descriptions are recorded by a background thread while the remaining devices are
+              activated and the activation waits for the recording to finish before it returns.
+
+            :param lscape: The landscape singleton instance.
+            :param config_lookup: A configuration lookup table that can be used to lookup configuration information for upnp devices.
+            :param matching_devices: The msearch response headers of the matching devices by device hint.
+            :param activation_workers: The maximum number of device descriptions to fetch concurrently.
+        """
+        device_count = len(matching_devices)
+
+        # ======================== FETCH ========================
+        fetch_start = time.perf_counter()
+
+        descriptions = {}
+
+        fetch_hints = [dhint for dhint, dval in matching_devices.items() if MSearchKeys.USN_DEV in dval]
+        if len(fetch_hints) > 0:
+            max_workers = max(1, min(activation_workers, len(fetch_hints)))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="UpnpCoordinator - Activation") as executor:
+                future_to_hint = {}
+                for dhint in fetch_hints:
+                    dval = matching_devices[dhint]
+                    future = executor.submit(device_description_load, dval[MSearchKeys.LOCATION], udn=dval[MSearchKeys.USN_DEV],
+                                             configid=dval.get(HEADER_CONFIGID), bootid=dval.get(HEADER_BOOTID))
+                    future_to_hint[future] = dhint
+
+                for future in as_completed(future_to_hint):
+                    dhint = future_to_hint[future]
+                    dval = matching_devices[dhint]
+
+                    try:
+                        docTree = future.result()
+                        if docTree is not None:
+                            descriptions[dhint] = docTree
+                        else:
+                            self._log_description_error(dval[MSearchKeys.IP], dval[MSearchKeys.LOCATION], dval,
+                                                        "The device description could not be retrieved.")
+                    except Exception:  # pylint: disable=broad-except
+                        self._log_description_error(dval[MSearchKeys.IP], dval[MSearchKeys.LOCATION], dval,
+                                                    traceback.format_exc())
+
+                    self.logger.debug("UpnpCoordinator - Fetched {} of {} device descriptions.".format(
+                        len(descriptions), len(fetch_hints)))
+
+        fetch_elapsed = time.perf_counter() - fetch_start
+
+        self.logger.info("UpnpCoordinator - Fetch stage loaded {} of {} device descriptions in {:.3f}s.".format(
+            len(descriptions), device_count, fetch_elapsed))
+
+        # ======================= ACTIVATE ======================
+        activate_start = time.perf_counter()
+
+        description_cache = UpnpDescriptionCache()
+        current_count = 0
+
+        record_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="UpnpCoordinator - Recording")
+        try:
+            for dhint, dval in matching_devices.items():
+                if dhint in descriptions:
+                    location = dval[MSearchKeys.LOCATION]
+                    if description_cache.is_current(location):
+                        current_count += 1
+
+                    self._update_root_device(lscape, config_lookup, dval[MSearchKeys.IP], location, dhint, dval,
+                                             docTree=descriptions[dhint], record_executor=record_executor)
+
+            activate_elapsed = time.perf_counter() - activate_start
+
+            self.logger.info("UpnpCoordinator - Activate stage activated {} devices in {:.3f}s.".format(
+                len(descriptions), activate_elapsed))
+
+        finally:
+            # ======================== RECORD =======================
+            record_start = time.perf_counter()
+            record_executor.shutdown(wait=True)
+            record_wait = time.perf_counter() - record_start
+
+        self.logger.info("UpnpCoordinator - Record stage finished {:.3f}s after activation, {} of {} descriptions were current.".format(
+            record_wait, current_count, len(descriptions)))
+
+        self._activation_statistics = {
+            "devices": device_count,
+            "fetched": len(descriptions),
+            "current": current_count,
+            "workers": activation_workers,
+            "fetch_elapsed": fetch_elapsed,
+            "activate_elapsed": activate_elapsed,
+            "record_wait": record_wait,
+            "elapsed": time.perf_counter() - fetch_start
+        }
+
+        return
+
     def _activate_root_device(self, lscape: "Landscape", usn_device: str, ip_addr: str, location: str, deviceinfo: dict):
         """
         """
@@ -1198,6 +1627,7 @@ class UpnpCoordinator(CoordinatorBase):
         if dev is not None:
             # Mark the device active
             dev.mark_alive()
+            self._device_registry.update(dev)
         elif self._allow_unknown_devices:
             config_lookup = lscape._internal_get_upnp_device_config_lookup_table() # pylint: disable=protected-access
 
@@ -1226,12 +1656,37 @@ class UpnpCoordinator(CoordinatorBase):
         """
         dev = self.lookup_device_by_upnp_usn(usn_device)
         if dev is not None:
-            # Mark the device active
+            # Mark the device inactive
             dev.mark_byebye()
+            self._device_registry.deactivate(dev)
+
+            # Drop the pooled connections to the device, they will not survive the device going away
+            UpnpHttpSessionPool().close_host(dev.host)
+
+            # The device may come back with a new configuration, so validate its documents again
+            UpnpDescriptionCache().invalidate_host(dev.host)
 
         return
 
-    def _update_root_device(self, lscape, config_lookup: dict, ip_addr: str, location: str, devhint: str, deviceinfo: dict):
+    def _record_root_device_description(self, dev_extension: UpnpRootDevice, ip_addr: str, location: str, urlBase: str,
+                                        manufacturer: str, modelName: str, docTree: ElementTree, devNode: Element,
+                                        namespaces: dict, description_current: bool):
+        """
+            Records the description of a root device and its services, errors are logged so they do not
+            prevent the activation of the device.
+        """
+        # pylint: disable=broad-except
+
+        try:
+            dev_extension.record_description(ip_addr, urlBase, manufacturer, modelName, docTree, devNode, namespaces=namespaces,
+                                             upnp_recording=self._upnp_recording, description_current=description_current)
+        except Exception:
+            self.logger.exception("Unable to record the description of device location={}.".format(location))
+
+        return
+
+    def _update_root_device(self, lscape, config_lookup: dict, ip_addr: str, location: str, devhint: str, deviceinfo: dict,
+                            docTree: Optional[ElementTree] = None, record_executor: Optional[ThreadPoolExecutor] = None):
         """
             Updates a UPNP root device.
 
@@ -1241,6 +1696,9 @@ class UpnpCoordinator(CoordinatorBase):
             :param location: The location URL associated with the device.
             :param deviceinfo: The device information from the msearch response headers.
             :param devhint: The identifier hint used to identify the device.
+            :param docTree: The device description if it has already been loaded, otherwise it is loaded from the location.
+            :param record_executor: An executor to record the device description on, otherwise it is recorded before
+                                    the device is activated.
         """
 
         if MSearchKeys.USN_DEV in deviceinfo:
@@ -1252,7 +1710,9 @@ class UpnpCoordinator(CoordinatorBase):
                 if usn_dev in config_lookup:
                     configinfo = config_lookup[usn_dev]
 
-                docTree = device_description_load(location)
+                if docTree is None:
+                    docTree = device_description_load(location, udn=usn_dev, configid=deviceinfo.get(HEADER_CONFIGID),
+                                                      bootid=deviceinfo.get(HEADER_BOOTID))
 
                 try:
                     # {urn:schemas-upnp-org:device-1-0}root
@@ -1263,6 +1723,8 @@ class UpnpCoordinator(CoordinatorBase):
 
                     dev_extension = None
                     skip_device = False
+                    registered = False
+                    refresh_existing = False
                     try:
                         # Acquire the lock before we decide if the location exists in the children table
                         self._coord_lock.acquire()
@@ -1282,7 +1744,12 @@ class UpnpCoordinator(CoordinatorBase):
                                     raise
 
                                 if isinstance(dev_extension, UpnpRootDevice):
-                                    dev_extension.record_description(ip_addr, urlBase, manufacturer, modelName, docTree, devNode, namespaces=namespaces, upnp_recording=self._upnp_recording)
+                                    record_args = (dev_extension, ip_addr, location, urlBase, manufacturer, modelName, docTree, devNode,
+                                                   namespaces, UpnpDescriptionCache().is_current(location))
+                                    if record_executor is not None:
+                                        record_executor.submit(self._record_root_device_description, *record_args)
+                                    else:
+                                        self._record_root_device_description(*record_args)
 
                                 coord_ref = weakref.ref(self)
 
@@ -1333,16 +1800,27 @@ class UpnpCoordinator(CoordinatorBase):
                             # If the device is still not in the table, add it
                             elif location not in self._cl_children:
                                 self._cl_children[location] = dev_extension
+                                registered = True
 
                             self._cl_usn_to_hint[usn_dev] = devhint
 
                         else:
                             dev_extension = self._cl_children[location]
-                            # Refresh the description
-                            dev_extension.refresh_description(ip_addr, self._factory, docTree.getroot(), namespaces=namespaces)
+                            refresh_existing = True
+                            registered = True
                     finally:
                         self._coord_lock.release()
 
+                    if refresh_existing:
+                        # Refresh the description outside of the coordinator lock, processing the
+                        # description creates the service proxies of the device.
+                        dev_extension.refresh_description(ip_addr, self._factory, docTree.getroot(), namespaces=namespaces)
+
+                    # Update the registry indexes outside of the coordinator lock, reading the
+                    # device addresses requires the device lock.
+                    if registered:
+                        self._device_registry.register(location, dev_extension)
+
                 except SemanticError:
                     # Always allow semantic errors to propagate, semantic errors represent
                     # misuse of a test framework API and can be definitively classified
@@ -1350,16 +1828,7 @@ class UpnpCoordinator(CoordinatorBase):
                     raise
 
                 except:  # pylint: disable=bare-except
-                    exmsg = traceback.format_exc()
-                    errmsg_lines = [
-                        "ERROR: Unable to parse description for. IP: %s LOCATION: %s" % (ip_addr, location),
-                        exmsg
-                    ]
-                    for k, v in deviceinfo.items():
-                        errmsg_lines.append("    %s: %s" % (k, v))
-
-                    errmsg = os.linesep.join(errmsg_lines)
-                    self.logger.debug(errmsg)
+                    self._log_description_error(ip_addr, location, deviceinfo, traceback.format_exc())
 
             except SemanticError:
                 # Always allow semantic errors to propagate, semantic errors represent
@@ -1368,15 +1837,6 @@ class UpnpCoordinator(CoordinatorBase):
                 raise
 
             except:  # pylint: disable=bare-except
-                exmsg = traceback.format_exc()
-                errmsg_lines = [
-                    "ERROR: Unable to parse description for. IP: %s LOCATION: %s" % (ip_addr, location),
-                    exmsg
-                ]
-                for k, v in deviceinfo.items():
-                    errmsg_lines.append("    %s: %s" % (k, v))
-
-                errmsg = os.linesep.join(errmsg_lines)
-                self.logger.debug(errmsg)
+                self._log_description_error(ip_addr, location, deviceinfo, traceback.format_exc())
 
         return
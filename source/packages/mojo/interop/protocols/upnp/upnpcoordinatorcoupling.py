@@ -151,7 +151,8 @@ class UpnpCoordinatorIntegration(CoordinatorCoupling):
             "upnp": {
                 "found": found_device_results,
                 "matching": matching_device_results,
-                "missing": missing_device_results
+                "missing": missing_device_results,
+                "activation": cls.coordinator.activation_statistics
             }
         }
 
@@ -0,0 +1,431 @@
+"""
+.. module:: upnpdescriptioncache
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpDescriptionCache` which is a persistent cache of the device description
+               and service description documents of UPnP devices.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Optional, Set, Tuple
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from urllib.parse import urlparse
+
+from mojo.collections.context import Context
+from mojo.collections.contextpaths import ContextPaths
+
+from mojo.interop.protocols.upnp.upnphttpsession import upnp_http_request
+
+DEFAULT_DESCRIPTION_CACHE_ENABLED = True
+
+HEADER_BOOTID = "BOOTID.UPNP.ORG"
+HEADER_CONFIGID = "CONFIGID.UPNP.ORG"
+
+
+class UpnpDescriptionCachePaths:
+    ENABLED = "/upnp/descriptioncache/enabled"
+    DIRECTORY = "/upnp/descriptioncache/directory"
+
+
+class UpnpDescriptionCacheEntry:
+    """
+        The validators and the content digest of a cached document.
+    """
+
+    __slots__ = ("url", "token", "etag", "last_modified", "digest")
+
+    def __init__(self, url: str, token: Optional[str] = None, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, digest: Optional[str] = None):
+        self.url = url
+        self.token = token
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        return
+
+    def as_dict(self) -> dict:
+        dval = {
+            "url": self.url,
+            "token": self.token,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "digest": self.digest
+        }
+        return dval
+
+
+def description_cache_token(udn: Optional[str], configid: Optional[str] = None, bootid: Optional[str] = None) -> Optional[str]:
+    """
+        Creates the validation token for the documents of a device from the UDN of the device and the
+        CONFIGID.UPNP.ORG or BOOTID.UPNP.ORG header values that the device advertised.  The CONFIGID changes
+        whenever the device or service descriptions change, the BOOTID changes whenever the device reboots.
+
+        :returns: The validation token or None if the device does not advertise either header.
+    """
+    token = None
+    if udn is not None:
+        if configid is not None:
+            token = "%s|config|%s" % (udn, configid)
+        elif bootid is not None:
+            token = "%s|boot|%s" % (udn, bootid)
+    return token
+
+
+class UpnpDescriptionCache:
+    """
+        The :class:`UpnpDescriptionCache` object is a singleton that keeps the device description and SCPD documents
+        of UPnP devices on disk so they do not have to be downloaded again every time the automation starts.
+
+        * Documents are stored content addressed by the SHA-256 digest of their content, so devices of the same
+          model share the storage for their service descriptions.
+        * Each URL has a small entry file with the digest and the validators of the document, the entries are
+          loaded lazily the first time a URL is requested.
+        * When a device description is fetched with the UDN and the CONFIGID.UPNP.ORG or BOOTID.UPNP.ORG value
+          from the SSDP headers of the device, the cached documents from the device host with the same token are
+          used without a request.  Otherwise a cached document is validated with a conditional GET using the
+          ETag and Last-Modified validators.
+
+        The cache can be disabled or moved in the global context with the paths in :class:`UpnpDescriptionCachePaths`.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        """
+            Constructs new instances of the UpnpDescriptionCache object.  This is a singleton object.
+        """
+        if cls._instance is None:
+            cls._instance = super(UpnpDescriptionCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+            Initializes the Singleton initializer class
+        """
+        thisType = type(self)
+        if not thisType._initialized:
+            thisType._initialized = True
+
+            ctx = Context()
+
+            self._enabled = ctx.lookup(UpnpDescriptionCachePaths.ENABLED, default=DEFAULT_DESCRIPTION_CACHE_ENABLED)
+
+            cache_dir = ctx.lookup(UpnpDescriptionCachePaths.DIRECTORY, default=None)
+            if cache_dir is None:
+                runtime_home = ctx.lookup(ContextPaths.RUNTIME_HOME_DIRECTORY, default=os.path.expanduser("~/mjr"))
+                cache_dir = os.path.join(runtime_home, "upnp", "descriptions")
+            self._cache_dir = cache_dir
+
+            self._hits = 0
+            self._revalidated = 0
+            self._misses = 0
+
+            self._cache_lock = threading.Lock()
+
+            # ======================== Cache Lock Variables =========================
+            # These variables are protected by the cache lock and are prefixed with
+            # _dl_ so it is easy to identify if the lock is being held when they are
+            # being accessed.
+            self._dl_entries: Dict[str, Optional[UpnpDescriptionCacheEntry]] = {}
+            self._dl_host_tokens: Dict[str, str] = {}
+            self._dl_current_urls: Set[str] = set()
+        return
+
+    @property
+    def cache_dir(self) -> str:
+        """
+            The directory the cached documents are stored in.
+        """
+        return self._cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        """
+            Indicates if the documents are being cached.
+        """
+        return self._enabled
+
+    def configure(self, enabled: Optional[bool] = None, cache_dir: Optional[str] = None):
+        """
+            Updates the cache configuration and drops the entries that have been loaded.
+
+            :param enabled: Enable or disable the caching of documents.
+            :param cache_dir: The directory to store the cached documents in.
+        """
+        self._cache_lock.acquire()
+        try:
+            if enabled is not None:
+                self._enabled = enabled
+            if cache_dir is not None:
+                self._cache_dir = cache_dir
+            self._dl_entries.clear()
+            self._dl_host_tokens.clear()
+            self._dl_current_urls.clear()
+        finally:
+            self._cache_lock.release()
+
+        return
+
+    def fetch(self, url: str, udn: Optional[str] = None, configid: Optional[str] = None,
+              bootid: Optional[str] = None) -> Tuple[int, Optional[bytes]]:
+        """
+            Gets the content of a description document, from the cache when the cached document is still valid or
+            from the device when it is not.  Passing the UDN and the SSDP CONFIGID or BOOTID values of the device
+            with the device description marks the cached documents of the device host as valid for that token.
+
+            :param url: The url of the document.
+            :param udn: The UDN of the device the document belongs to.
+            :param configid: The CONFIGID.UPNP.ORG value the device advertised.
+            :param bootid: The BOOTID.UPNP.ORG value the device advertised.
+
+            :returns: A tuple with the HTTP status code and the content of the document, the content is None
+                      if the document could not be retrieved.
+        """
+        if not self._enabled:
+            resp = upnp_http_request("GET", url)
+            content = resp.content if resp.status_code == 200 else None
+            return resp.status_code, content
+
+        host = urlparse(url).netloc
+        token = description_cache_token(udn, configid=configid, bootid=bootid)
+
+        entry = self._lookup_entry(url)
+
+        self._cache_lock.acquire()
+        try:
+            if token is not None:
+                self._dl_host_tokens[host] = token
+            else:
+                token = self._dl_host_tokens.get(host)
+        finally:
+            self._cache_lock.release()
+
+        content = None
+        if entry is not None and entry.digest is not None:
+            if token is not None and entry.token == token:
+                content = self._read_blob(entry.digest)
+                if content is not None:
+                    self._hits += 1
+                    self._mark_current(url, True)
+                    return 200, content
+
+        headers = {}
+        if entry is not None and entry.digest is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        resp = upnp_http_request("GET", url, headers=headers)
+
+        status_code = resp.status_code
+        if status_code == 304 and entry is not None:
+            content = self._read_blob(entry.digest)
+            if content is None:
+                # The document content went missing from the cache so get it again
+                resp = upnp_http_request("GET", url)
+                status_code = resp.status_code
+            else:
+                status_code = 200
+                self._revalidated += 1
+                if entry.token != token:
+                    entry.token = token
+                    self._store_entry(entry)
+                self._mark_current(url, True)
+
+        if content is None and status_code == 200:
+            content = resp.content
+            self._misses += 1
+
+            digest = hashlib.sha256(content).hexdigest()
+            self._write_blob(digest, content)
+
+            entry = UpnpDescriptionCacheEntry(url, token=token, etag=resp.headers.get("ETag"),
+                                              last_modified=resp.headers.get("Last-Modified"), digest=digest)
+            self._store_entry(entry)
+            self._mark_current(url, False)
+
+        return status_code, content
+
+    def invalidate_host(self, host: str):
+        """
+            Drops the validation token of a host so its documents are validated with the device again.
+
+            :param host: The host:port of the device.
+        """
+        self._cache_lock.acquire()
+        try:
+            if host in self._dl_host_tokens:
+                del self._dl_host_tokens[host]
+            for url in [url for url in self._dl_current_urls if urlparse(url).netloc == host]:
+                self._dl_current_urls.discard(url)
+        finally:
+            self._cache_lock.release()
+
+        return
+
+    def is_current(self, url: str) -> bool:
+        """
+            Indicates if the last fetch of a document was answered with the cached copy, either because the
+            token of the device matched or because the device confirmed the copy with a 304.  Documents that
+            are current have not changed since they were last downloaded.
+
+            :param url: The url of the document.
+        """
+        current = False
+
+        self._cache_lock.acquire()
+        try:
+            current = url in self._dl_current_urls
+        finally:
+            self._cache_lock.release()
+
+        return current
+
+    def statistics(self) -> dict:
+        """
+            Returns the counts of documents that came from the cache, that were revalidated with the device
+            and that were downloaded.
+        """
+        stats = {
+            "hits": self._hits,
+            "revalidated": self._revalidated,
+            "misses": self._misses
+        }
+        return stats
+
+    def _blob_filename(self, digest: str) -> str:
+        filename = os.path.join(self._cache_dir, "blobs", digest[:2], digest + ".xml")
+        return filename
+
+    def _entry_filename(self, url: str) -> str:
+        url_hash = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        filename = os.path.join(self._cache_dir, "entries", url_hash + ".json")
+        return filename
+
+    def _lookup_entry(self, url: str) -> Optional[UpnpDescriptionCacheEntry]:
+        """
+            Looks up the entry for a url, the entry is loaded from disk the first time the url is requested.
+        """
+        self._cache_lock.acquire()
+        try:
+            if url in self._dl_entries:
+                return self._dl_entries[url]
+        finally:
+            self._cache_lock.release()
+
+        entry = None
+
+        entry_filename = self._entry_filename(url)
+        if os.path.exists(entry_filename):
+            try:
+                with open(entry_filename, 'r') as ef:
+                    entry_info = json.load(ef)
+                if entry_info.get("url") == url:
+                    entry = UpnpDescriptionCacheEntry(url, token=entry_info.get("token"), etag=entry_info.get("etag"),
+                        last_modified=entry_info.get("last_modified"), digest=entry_info.get("digest"))
+            except (OSError, ValueError):
+                entry = None
+
+        self._cache_lock.acquire()
+        try:
+            entry = self._dl_entries.setdefault(url, entry)
+        finally:
+            self._cache_lock.release()
+
+        return entry
+
+    def _mark_current(self, url: str, current: bool):
+        self._cache_lock.acquire()
+        try:
+            if current:
+                self._dl_current_urls.add(url)
+            else:
+                self._dl_current_urls.discard(url)
+        finally:
+            self._cache_lock.release()
+        return
+
+    def _read_blob(self, digest: str) -> Optional[bytes]:
+        content = None
+
+        blob_filename = self._blob_filename(digest)
+        try:
+            with open(blob_filename, 'rb') as bf:
+                content = bf.read()
+        except OSError:
+            content = None
+
+        return content
+
+    def _store_entry(self, entry: UpnpDescriptionCacheEntry):
+        """
+            Updates the entry for a url in memory and on disk.
+        """
+        self._cache_lock.acquire()
+        try:
+            self._dl_entries[entry.url] = entry
+        finally:
+            self._cache_lock.release()
+
+        entry_content = json.dumps(entry.as_dict()).encode("utf-8")
+        self._write_file(self._entry_filename(entry.url), entry_content)
+
+        return
+
+    def _write_blob(self, digest: str, content: bytes):
+        blob_filename = self._blob_filename(digest)
+        if not os.path.exists(blob_filename):
+            self._write_file(blob_filename, content)
+        return
+
+    def _write_file(self, filename: str, content: bytes):
+        """
+            Writes a cache file by replacing it with a temporary file, so readers never see a partial file.
+        """
+        file_dir = os.path.dirname(filename)
+        try:
+            os.makedirs(file_dir, exist_ok=True)
+
+            tmp_fd, tmp_filename = tempfile.mkstemp(dir=file_dir, suffix=".tmp")
+            try:
+                with os.fdopen(tmp_fd, 'wb') as tf:
+                    tf.write(content)
+                os.replace(tmp_filename, filename)
+            except:
+                os.remove(tmp_filename)
+                raise
+        except OSError:
+            # Failing to write the cache only costs a download the next time
+            pass
+
+        return
+
+
+def upnp_description_fetch(url: str, udn: Optional[str] = None, configid: Optional[str] = None,
+                           bootid: Optional[str] = None) -> Tuple[int, Optional[bytes]]:
+    """
+        Gets the content of a UPnP description document through the description cache.
+
+        :param url: The url of the document.
+        :param udn: The UDN of the device the document belongs to.
+        :param configid: The CONFIGID.UPNP.ORG value the device advertised.
+        :param bootid: The BOOTID.UPNP.ORG value the device advertised.
+
+        :returns: A tuple with the HTTP status code and the content of the document.
+    """
+    cache = UpnpDescriptionCache()
+    status_code, content = cache.fetch(url, udn=udn, configid=configid, bootid=bootid)
+    return status_code, content
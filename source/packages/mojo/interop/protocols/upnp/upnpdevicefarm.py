@@ -0,0 +1,1075 @@
+"""
+.. module:: upnpdevicefarm
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpDeviceFarm` which simulates a farm of UPnP devices on loopback so the
+               discovery, activation and eventing of the UpnpCoordinator can be measured at scale.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import inspect
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from xml.etree.ElementTree import fromstring as xml_fromstring
+from xml.etree.ElementTree import ParseError
+
+from mojo.xmods.ximport import import_by_name
+
+import mojo.interop.protocols.upnp.extensions.standard.services as standard_services
+
+from mojo.interop.protocols.upnp.genanotify import gena_send_notify
+from mojo.interop.protocols.upnp.soap import NS_SOAP_ENV, NS_UPNP_CONTROL, NS_UPNP_EVENT, URI_SOAP_ENCODING
+from mojo.interop.protocols.upnp.soap import XML_DOCUMENT_DECLARATION, soap_escape_attribute, soap_escape_text
+from mojo.interop.protocols.upnp.ssdpcodec import ssdp_header_end, ssdp_parse_headers
+from mojo.interop.protocols.upnp.upnpextensionindex import REGISTRY_INDEX_FILENAME, read_extension_index
+from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServiceProxy
+from mojo.interop.protocols.upnp.xml.upnpdevice1 import UPNP_DEVICE1_NAMESPACE
+
+LOOPBACK_ADDRESS = "127.0.0.1"
+
+DEFAULT_FARM_SERVICES = ("AVTransport1", "ConnectionManager1", "RenderingControl1")
+DEFAULT_FARM_DEVICE_TYPE = "urn:schemas-upnp-org:device:MediaRenderer:1"
+DEFAULT_FARM_MANUFACTURER = "Automation Mojo"
+DEFAULT_FARM_MODEL_NAME = "Simulated Renderer"
+DEFAULT_FARM_MODEL_NUMBER = "SIM-1"
+
+DEFAULT_NOTIFY_WORKERS = 16
+DEFAULT_NOTIFY_TIMEOUT = 10
+DEFAULT_SUBSCRIPTION_TIMEOUT = 1800
+
+FARM_SERVER_HEADER = "Linux UPnP/1.0 UpnpDeviceFarm/1.0"
+
+NS_UPNP_SERVICE1 = "urn:schemas-upnp-org:service-1-0"
+
+# The namespaces of the LastChange events of the services that report their state with LastChange
+LAST_CHANGE_NAMESPACES = {
+    "AVTransport": "urn:schemas-upnp-org:metadata-1-0/AVT/",
+    "RenderingControl": "urn:schemas-upnp-org:metadata-1-0/RCS/"
+}
+
+# The LastChange variables that are reported with a channel
+LAST_CHANGE_CHANNEL_VARIABLES = ("Loudness", "Mute", "Volume", "VolumeDB")
+
+# The TransportState the AVTransport actions move a device to
+TRANSPORT_ACTION_STATES = {
+    "Pause": "PAUSED_PLAYBACK",
+    "Play": "PLAYING",
+    "Stop": "STOPPED"
+}
+
+# The in arguments that select the instance or channel an action applies to and are not state
+SELECTOR_ARGUMENTS = ("Channel", "InstanceID")
+
+REGEX_SERVICE_TYPE = re.compile(r"^(.*?)(\d+)$")
+REGEX_SUBSCRIBE_TIMEOUT = re.compile(r"^Second-([0-9]+|infinite)", flags=re.IGNORECASE)
+
+# The out arguments of an action as they are listed in the docstring of a generated action method
+REGEX_ACTION_RETURNS = re.compile(r":returns:\s*(.+)")
+REGEX_ACTION_RETURN_NAME = re.compile(r'"([^"]+)"')
+
+
+def lookup_standard_service_proxy(service_type: str) -> Type[UpnpServiceProxy]:
+    """
+        Looks up the standard service proxy class for a service type like 'RenderingControl1' with the registry
+        index of the standard service extensions.
+
+        :param service_type: The service type of the proxy.
+
+        :returns: The service proxy class.
+
+        :raises: :class:`KeyError` if there is no standard service proxy for the service type.
+    """
+    index_filename = os.path.join(os.path.dirname(standard_services.__file__), REGISTRY_INDEX_FILENAME)
+    _, service_index = read_extension_index(index_filename)
+
+    module_name, class_name = service_index[("UPnP", service_type)]
+    extmod = import_by_name(standard_services.__name__ + "." + module_name)
+    proxy_class = getattr(extmod, class_name)
+
+    return proxy_class
+
+
+class SimulatedService:
+    """
+        The :class:`SimulatedService` is the model of a service that is simulated by the device farm.  The model is
+        built from the variable and action tables of a service proxy, so every service that has a generated proxy
+        can be simulated.  The model is shared by all of the devices that have the service, the state of each
+        device is kept by the device.
+    """
+
+    def __init__(self, proxy_class: Type[UpnpServiceProxy]):
+        """
+            Creates the model of a service from a service proxy class.
+
+            :param proxy_class: The service proxy class of the service.
+        """
+        self.proxy_type = proxy_class.SERVICE_TYPE
+
+        mobj = REGEX_SERVICE_TYPE.match(self.proxy_type)
+        self.name, self.version = (mobj.group(1), mobj.group(2)) if mobj is not None else (self.proxy_type, "1")
+
+        self.service_type = "urn:schemas-upnp-org:service:{}:{}".format(self.name, self.version)
+        self.service_id = "urn:upnp-org:serviceId:{}".format(self.name)
+
+        self.variables: Dict[str, dict] = {}
+        self.variables.update(proxy_class.SERVICE_DEFAULT_VARIABLES)
+        self.variables.update(proxy_class.SERVICE_EVENT_VARIABLES)
+
+        self.evented = tuple(proxy_class.SERVICE_EVENT_VARIABLES.keys())
+        self.last_change = "LastChange" in proxy_class.SERVICE_EVENT_VARIABLES
+        self.last_change_namespace = LAST_CHANGE_NAMESPACES.get(self.name, "urn:schemas-upnp-org:metadata-1-0/{}/".format(self.name))
+
+        # The variable a NOTIFY storm changes, a variable reported in LastChange for services that
+        # have LastChange or the first evented variable for the other services.
+        self.storm_variable = None
+        if self.last_change:
+            self.storm_variable = next((name for name in sorted(self.variables) if name not in self.evented), None)
+        elif len(self.evented) > 0:
+            self.storm_variable = sorted(self.evented)[0]
+
+        # The actions of the service with their in and out argument names
+        self.actions: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+        # The data types of the arguments that are declared by the argument tables of the proxy, they are used
+        # for the A_ARG_TYPE variables of the arguments that are not related to a state variable.
+        self.argument_types: Dict[str, str] = {}
+
+        typed_in_args = getattr(proxy_class, "SERVICE_ACTION_IN_ARGS", {})
+        for attr_name, attr_val in inspect.getmembers(proxy_class, inspect.isfunction):
+            if attr_name.startswith("action_"):
+                action_name = attr_name[len("action_"):]
+                if action_name in typed_in_args:
+                    in_args = tuple(arg_name for arg_name, _, _ in typed_in_args[action_name])
+                    for arg_name, arg_type, _ in typed_in_args[action_name]:
+                        self.argument_types.setdefault(arg_name, arg_type)
+                else:
+                    in_args = tuple(param.name for param in list(inspect.signature(attr_val).parameters.values())[1:]
+                                    if param.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD)
+                if action_name in proxy_class.SERVICE_ACTION_OUT_ARGS:
+                    out_args = tuple(arg_name for arg_name, _ in proxy_class.SERVICE_ACTION_OUT_ARGS[action_name])
+                    for arg_name, arg_type in proxy_class.SERVICE_ACTION_OUT_ARGS[action_name]:
+                        self.argument_types.setdefault(arg_name, arg_type)
+                else:
+                    # Proxies that were not generated with an out argument table list the out arguments
+                    # in the docstring of the action method
+                    out_args = ()
+                    mobj = REGEX_ACTION_RETURNS.search(attr_val.__doc__ or "")
+                    if mobj is not None:
+                        out_args = tuple(REGEX_ACTION_RETURN_NAME.findall(mobj.group(1)))
+                self.actions[action_name] = (in_args, out_args)
+
+        self._scpd = None
+        return
+
+    def initial_state(self) -> Dict[str, str]:
+        """
+            Creates the initial state of the variables of a device.  A variable starts with its default value,
+            the first of its allowed values or the zero value of its data type.
+        """
+        state = {}
+        for var_name, var_info in self.variables.items():
+            value = var_info.get("default")
+            if value is None:
+                allowed_list = var_info.get("allowed_list")
+                if allowed_list:
+                    value = allowed_list[0]
+                elif var_info.get("data_type", "string") in ("string", "uri"):
+                    value = ""
+                else:
+                    value = "0"
+            state[var_name] = str(value)
+
+        if "TransportState" in state:
+            state["TransportState"] = "STOPPED"
+
+        return state
+
+    def lookup_variable_for_argument(self, arg_name: str) -> Optional[str]:
+        """
+            Finds the state variable that an action argument reads or writes, like 'CurrentVolume' or
+            'DesiredVolume' for 'Volume'.
+        """
+        found = None
+
+        if arg_name in self.variables:
+            found = arg_name
+        else:
+            for prefix in ("Current", "Desired", "New"):
+                if arg_name.startswith(prefix) and arg_name[len(prefix):] in self.variables:
+                    found = arg_name[len(prefix):]
+                    break
+
+        return found
+
+    def scpd_xml(self) -> bytes:
+        """
+            Returns the service description document of the service.
+        """
+        if self._scpd is None:
+            lines = [XML_DOCUMENT_DECLARATION, '<scpd xmlns="{}">'.format(NS_UPNP_SERVICE1),
+                     "<specVersion><major>1</major><minor>0</minor></specVersion>", "<actionList>"]
+
+            # The arguments that are not related to a state variable of the service are related to an
+            # A_ARG_TYPE variable, which has to be declared in the state table as well.
+            arg_type_variables = {}
+
+            for action_name, (in_args, out_args) in sorted(self.actions.items()):
+                lines.append("<action><name>{}</name><argumentList>".format(action_name))
+                for direction, arg_names in (("in", in_args), ("out", out_args)):
+                    for arg_name in arg_names:
+                        related = self.lookup_variable_for_argument(arg_name)
+                        if related is None:
+                            related = "A_ARG_TYPE_{}".format(arg_name)
+                            arg_type_variables[related] = {"data_type": self.argument_types.get(arg_name, "string")}
+                        lines.append("<argument><name>{}</name><direction>{}</direction><relatedStateVariable>{}"
+                                     "</relatedStateVariable></argument>".format(arg_name, direction, related))
+                lines.append("</argumentList></action>")
+
+            state_variables = dict(self.variables)
+            state_variables.update(arg_type_variables)
+
+            lines.append("</actionList><serviceStateTable>")
+            for var_name, var_info in sorted(state_variables.items()):
+                send_events = "yes" if var_name in self.evented else "no"
+                lines.append('<stateVariable sendEvents="{}"><name>{}</name><dataType>{}</dataType>'.format(
+                    send_events, var_name, var_info.get("data_type", "string")))
+                allowed_list = var_info.get("allowed_list")
+                if allowed_list:
+                    lines.append("<allowedValueList>")
+                    for allowed in allowed_list:
+                        lines.append("<allowedValue>{}</allowedValue>".format(soap_escape_text(str(allowed))))
+                    lines.append("</allowedValueList>")
+                lines.append("</stateVariable>")
+            lines.append("</serviceStateTable></scpd>")
+
+            self._scpd = "".join(lines).encode("utf-8")
+
+        return self._scpd
+
+
+class SimulatedSubscription:
+    """
+        An event subscription made to a service of a simulated device.
+    """
+
+    __slots__ = ("sid", "service", "callback_address", "callback_path", "seq", "expires")
+
+    def __init__(self, sid: str, service: SimulatedService, callback_address: Tuple[str, int], callback_path: str, expires: float):
+        self.sid = sid
+        self.service = service
+        self.callback_address = callback_address
+        self.callback_path = callback_path
+        self.seq = 0
+        self.expires = expires
+        return
+
+
+class SimulatedDevice:
+    """
+        A simulated root device.  The device has the state of its services and the subscriptions that have been
+        made to them, the state and subscriptions are protected by the device lock.
+    """
+
+    def __init__(self, index: int, udn: str, services: Sequence[SimulatedService], manufacturer: str,
+                 model_name: str, model_number: str, device_type: str):
+        self.index = index
+        self.udn = udn
+        self.manufacturer = manufacturer
+        self.model_name = model_name
+        self.model_number = model_number
+        self.device_type = device_type
+        self.friendly_name = "{} {}".format(model_name, index)
+        self.serial_number = "SIM-{:06d}".format(index)
+
+        self.services: Dict[str, SimulatedService] = {svc.name: svc for svc in services}
+
+        self._device_lock = threading.Lock()
+
+        # ======================= Device Lock Variables ========================
+        # These variables are protected by the device lock and are prefixed with
+        # _dl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._dl_state: Dict[str, Dict[str, str]] = {svc.name: svc.initial_state() for svc in services}
+        self._dl_subscriptions: Dict[str, SimulatedSubscription] = {}
+        return
+
+    @property
+    def usn(self) -> str:
+        return "uuid:{}::upnp:rootdevice".format(self.udn)
+
+    def add_subscription(self, service: SimulatedService, callback_address: Tuple[str, int], callback_path: str,
+                         timeout: int) -> SimulatedSubscription:
+        """
+            Adds a subscription to a service of the device.
+        """
+        sid = "uuid:{}_sub{:010d}".format(self.udn, uuid.uuid4().int % 10000000000)
+        subscription = SimulatedSubscription(sid, service, callback_address, callback_path, time.monotonic() + timeout)
+
+        self._device_lock.acquire()
+        try:
+            self._dl_subscriptions[sid] = subscription
+        finally:
+            self._device_lock.release()
+
+        return subscription
+
+    def description_xml(self, base_url: str) -> bytes:
+        """
+            Returns the device description document of the device.
+        """
+        lines = [
+            XML_DOCUMENT_DECLARATION,
+            '<root xmlns="{}">'.format(UPNP_DEVICE1_NAMESPACE),
+            "<specVersion><major>1</major><minor>0</minor></specVersion>",
+            "<URLBase>{}</URLBase>".format(base_url),
+            "<device>",
+            "<deviceType>{}</deviceType>".format(self.device_type),
+            "<friendlyName>{}</friendlyName>".format(soap_escape_text(self.friendly_name)),
+            "<manufacturer>{}</manufacturer>".format(soap_escape_text(self.manufacturer)),
+            "<modelDescription>{}</modelDescription>".format(soap_escape_text(self.model_name)),
+            "<modelName>{}</modelName>".format(soap_escape_text(self.model_name)),
+            "<modelNumber>{}</modelNumber>".format(soap_escape_text(self.model_number)),
+            "<serialNum>{}</serialNum>".format(self.serial_number),
+            "<UDN>uuid:{}</UDN>".format(self.udn),
+            "<serviceList>"
+        ]
+
+        for svc in self.services.values():
+            lines.extend([
+                "<service>",
+                "<serviceType>{}</serviceType>".format(svc.service_type),
+                "<serviceId>{}</serviceId>".format(svc.service_id),
+                "<controlURL>/{}/{}/Control</controlURL>".format(self.udn, svc.name),
+                "<eventSubURL>/{}/{}/Event</eventSubURL>".format(self.udn, svc.name),
+                "<SCPDURL>/{}/{}/scpd.xml</SCPDURL>".format(self.udn, svc.name),
+                "</service>"
+            ])
+
+        lines.append("</serviceList></device></root>")
+
+        content = "".join(lines).encode("utf-8")
+        return content
+
+    def invoke_action(self, service: SimulatedService, action_name: str, arguments: Dict[str, str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+            Runs an action against the state model of a service.  The in arguments that match a state variable
+            update the variable and the out arguments are read from the state variables they match.
+
+            :returns: A tuple with the (name, value) out arguments and the names of the variables that changed.
+
+            :raises: :class:`KeyError` if the service does not have the action.
+        """
+        in_args, out_args = service.actions[action_name]
+
+        out_values = []
+        changed = []
+
+        self._device_lock.acquire()
+        try:
+            state = self._dl_state[service.name]
+
+            for arg_name in in_args:
+                if arg_name in arguments and arg_name not in SELECTOR_ARGUMENTS:
+                    var_name = service.lookup_variable_for_argument(arg_name)
+                    if var_name is not None and state[var_name] != arguments[arg_name]:
+                        state[var_name] = arguments[arg_name]
+                        changed.append(var_name)
+
+            if action_name in TRANSPORT_ACTION_STATES and "TransportState" in state:
+                next_state = TRANSPORT_ACTION_STATES[action_name]
+                if state["TransportState"] != next_state:
+                    state["TransportState"] = next_state
+                    changed.append("TransportState")
+
+            for arg_name in out_args:
+                var_name = service.lookup_variable_for_argument(arg_name)
+                out_values.append((arg_name, state[var_name] if var_name is not None else ""))
+        finally:
+            self._device_lock.release()
+
+        return out_values, changed
+
+    def lookup_subscription(self, sid: str) -> Optional[SimulatedSubscription]:
+        """
+            Looks up a subscription by its SID.
+        """
+        subscription = None
+
+        self._device_lock.acquire()
+        try:
+            subscription = self._dl_subscriptions.get(sid)
+        finally:
+            self._device_lock.release()
+
+        return subscription
+
+    def remove_subscription(self, sid: str) -> bool:
+        """
+            Removes a subscription, returns False if there was no subscription with the SID.
+        """
+        removed = False
+
+        self._device_lock.acquire()
+        try:
+            if sid in self._dl_subscriptions:
+                del self._dl_subscriptions[sid]
+                removed = True
+        finally:
+            self._device_lock.release()
+
+        return removed
+
+    def set_variables(self, service: SimulatedService, values: Dict[str, str]) -> List[str]:
+        """
+            Sets the values of state variables and returns the names of the variables that changed.
+        """
+        changed = []
+
+        self._device_lock.acquire()
+        try:
+            state = self._dl_state[service.name]
+            for var_name, value in values.items():
+                value = str(value)
+                if state.get(var_name) != value:
+                    state[var_name] = value
+                    changed.append(var_name)
+        finally:
+            self._device_lock.release()
+
+        return changed
+
+    def subscriptions_for_service(self, service: SimulatedService) -> List[SimulatedSubscription]:
+        """
+            Returns the active subscriptions to a service.
+        """
+        now = time.monotonic()
+
+        subscriptions = None
+
+        self._device_lock.acquire()
+        try:
+            subscriptions = [sub for sub in self._dl_subscriptions.values() if sub.service is service and sub.expires > now]
+        finally:
+            self._device_lock.release()
+
+        return subscriptions
+
+    def take_event(self, subscription: SimulatedSubscription, changed: Optional[Sequence[str]] = None) -> Tuple[int, bytes]:
+        """
+            Creates the event body for a subscription and takes the next event sequence number.  When changed
+            is None the event has all of the evented state, which is what is sent when a subscription is made.
+        """
+        service = subscription.service
+
+        self._device_lock.acquire()
+        try:
+            state = self._dl_state[service.name]
+
+            properties = []
+            if service.last_change:
+                lc_names = [name for name in (changed if changed is not None else state.keys()) if name not in service.evented]
+                properties.append(("LastChange", self._last_change_xml(service, state, lc_names)))
+                other_names = [name for name in service.evented if name != "LastChange" and (changed is None or name in changed)]
+            else:
+                other_names = [name for name in service.evented if changed is None or name in changed]
+
+            for name in other_names:
+                properties.append((name, state[name]))
+
+            seq = subscription.seq
+            subscription.seq += 1
+        finally:
+            self._device_lock.release()
+
+        body_parts = ['<e:propertyset xmlns:e="{}">'.format(NS_UPNP_EVENT)]
+        for name, value in properties:
+            body_parts.append("<e:property><{0}>{1}</{0}></e:property>".format(name, soap_escape_text(value)))
+        body_parts.append("</e:propertyset>")
+
+        body = "".join(body_parts).encode("utf-8")
+
+        return seq, body
+
+    def _last_change_xml(self, service: SimulatedService, state: Dict[str, str], names: Sequence[str]) -> str:
+        """
+            Creates the LastChange document for the specified state variables.  The device lock must be held.
+        """
+        parts = ['<Event xmlns="{}"><InstanceID val="0">'.format(service.last_change_namespace)]
+        for name in names:
+            if name in LAST_CHANGE_CHANNEL_VARIABLES:
+                parts.append('<{} channel="Master" val="{}"/>'.format(name, soap_escape_attribute(state[name])))
+            else:
+                parts.append('<{} val="{}"/>'.format(name, soap_escape_attribute(state[name])))
+        parts.append("</InstanceID></Event>")
+        return "".join(parts)
+
+
+class UpnpDeviceFarm:
+    """
+        The :class:`UpnpDeviceFarm` simulates a farm of UPnP root devices on loopback.
+
+        * A single HTTP server serves the device and service descriptions of all of the devices, answers
+          their SOAP actions from the state model of each device and accepts SUBSCRIBE and UNSUBSCRIBE requests.
+        * An SSDP socket answers M-SEARCH requests for the devices and the farm can send the alive and byebye
+          announcements of all of the devices to an address.
+        * Event NOTIFY requests are sent to the subscribers by a pool of notify workers, a change to the state
+          of a device from an action, from :meth:`set_variables` or from a NOTIFY storm is evented to the
+          subscribers of the service.
+
+        The devices are told apart by the first segment of the url paths, which is the UDN of the device, so
+        a farm of any size only uses one HTTP port and one SSDP port.
+    """
+
+    def __init__(self, device_count: int, service_types: Sequence[str] = DEFAULT_FARM_SERVICES,
+                 manufacturer: str = DEFAULT_FARM_MANUFACTURER, model_name: str = DEFAULT_FARM_MODEL_NAME,
+                 model_number: str = DEFAULT_FARM_MODEL_NUMBER, device_type: str = DEFAULT_FARM_DEVICE_TYPE,
+                 host: str = LOOPBACK_ADDRESS, notify_workers: int = DEFAULT_NOTIFY_WORKERS):
+        """
+            Creates a device farm.
+
+            :param device_count: The number of devices to simulate.
+            :param service_types: The service types of the standard service proxies the services are modeled on.
+            :param manufacturer: The manufacturer of the devices.
+            :param model_name: The model name of the devices.
+            :param model_number: The model number of the devices.
+            :param device_type: The device type of the devices.
+            :param host: The loopback address to serve on.
+            :param notify_workers: The number of threads that send event NOTIFY requests.
+        """
+        self._host = host
+        self._notify_workers = notify_workers
+
+        self._services = [SimulatedService(lookup_standard_service_proxy(svc_type)) for svc_type in service_types]
+
+        self._devices: List[SimulatedDevice] = []
+        self._devices_by_udn: Dict[str, SimulatedDevice] = {}
+
+        namespace = uuid.UUID("6ba7b811-9dad-11d1-80b4-00c04fd430c8")
+        for didx in range(device_count):
+            udn = str(uuid.uuid5(namespace, "upnpdevicefarm-{}-{}".format(model_number, didx)))
+            device = SimulatedDevice(didx, udn, self._services, manufacturer, model_name, model_number, device_type)
+            self._devices.append(device)
+            self._devices_by_udn[udn] = device
+
+        self._farm_lock = threading.Lock()
+
+        # ========================= Farm Lock Variables ==========================
+        # These variables are protected by the farm lock and are prefixed with
+        # _fl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._fl_counters = {
+            "descriptions": 0,
+            "actions": 0,
+            "action_errors": 0,
+            "msearch": 0,
+            "msearch_responses": 0,
+            "subscribes": 0,
+            "unsubscribes": 0,
+            "notify_sent": 0,
+            "notify_failed": 0
+        }
+
+        self._running = False
+        self._http_server = None
+        self._http_thread = None
+        self._ssdp_sock = None
+        self._ssdp_thread = None
+        self._notify_executor = None
+        return
+
+    @property
+    def base_url(self) -> str:
+        """
+            The base url of the HTTP server of the farm.
+        """
+        host, port = self._http_server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    @property
+    def devices(self) -> List[SimulatedDevice]:
+        """
+            The simulated devices of the farm.
+        """
+        return self._devices
+
+    @property
+    def ssdp_address(self) -> Tuple[str, int]:
+        """
+            The address M-SEARCH requests can be sent to.
+        """
+        return self._ssdp_sock.getsockname()
+
+    def announce(self, address: Tuple[str, int], nts: str = "ssdp:alive", devices: Optional[Sequence[SimulatedDevice]] = None) -> int:
+        """
+            Sends the SSDP announcements of the root devices and services of the devices to an address.
+
+            :param address: The address to send the announcements to.
+            :param nts: The notification sub type, 'ssdp:alive' or 'ssdp:byebye'.
+            :param devices: The devices to announce or None to announce all of the devices.
+
+            :returns: The number of datagrams that were sent.
+        """
+        sent = 0
+
+        if devices is None:
+            devices = self._devices
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as asock:
+            for device in devices:
+                for target, usn in self._search_targets(device):
+                    lines = [
+                        "NOTIFY * HTTP/1.1",
+                        "HOST: 239.255.255.250:1900",
+                        "CACHE-CONTROL: max-age=1800",
+                        "LOCATION: {}".format(self.location_for(device)),
+                        "NT: {}".format(target),
+                        "NTS: {}".format(nts),
+                        "SERVER: {}".format(FARM_SERVER_HEADER),
+                        "USN: {}".format(usn),
+                        "BOOTID.UPNP.ORG: 1",
+                        "CONFIGID.UPNP.ORG: 1",
+                        "", ""
+                    ]
+                    asock.sendto("\r\n".join(lines).encode("utf-8"), address)
+                    sent += 1
+
+        return sent
+
+    def emit_notify_storm(self, events_per_subscription: int, variable: Optional[str] = None) -> dict:
+        """
+            Emits a storm of events to all of the subscribers of the farm.  Each event changes the value of a
+            state variable of the subscribed service and is sent as soon as a notify worker is available.
+
+            :param events_per_subscription: The number of events to send to each subscription.
+            :param variable: The state variable to change, the services that do not have the variable change
+                             their :attr:`SimulatedService.storm_variable`.
+
+            :returns: A dictionary with the number of events that were sent and failed, the elapsed time and
+                      the events per second.
+        """
+        counters_before = self.statistics()
+
+        started = time.perf_counter()
+
+        futures = []
+        for eidx in range(events_per_subscription):
+            for device in self._devices:
+                for svc in self._services:
+                    var_name = variable if variable in svc.variables else svc.storm_variable
+                    if var_name is None:
+                        continue
+
+                    changed = device.set_variables(svc, {var_name: "storm-{}".format(eidx)})
+                    futures.extend(self._event_changes(device, svc, changed))
+
+        for future in futures:
+            future.result()
+
+        elapsed = time.perf_counter() - started
+
+        counters_after = self.statistics()
+        sent = counters_after["notify_sent"] - counters_before["notify_sent"]
+        failed = counters_after["notify_failed"] - counters_before["notify_failed"]
+
+        stats = {
+            "sent": sent,
+            "failed": failed,
+            "elapsed": elapsed,
+            "events_per_second": sent / elapsed if elapsed > 0 else 0.0
+        }
+
+        return stats
+
+    def location_for(self, device: SimulatedDevice) -> str:
+        """
+            Returns the location of the description document of a device.
+        """
+        return "{}/{}/description.xml".format(self.base_url, device.udn)
+
+    def set_variables(self, device: SimulatedDevice, service_name: str, values: Dict[str, str]):
+        """
+            Sets the values of state variables of a service of a device and events the changes to the subscribers.
+
+            :param device: The device to update.
+            :param service_name: The name of the service, like 'RenderingControl'.
+            :param values: The new values of the state variables.
+        """
+        svc = device.services[service_name]
+        changed = device.set_variables(svc, values)
+        self._event_changes(device, svc, changed)
+        return
+
+    def start(self):
+        """
+            Starts the HTTP server, the SSDP socket and the notify workers of the farm.
+        """
+        farm = self
+
+        class FarmRequestHandler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return
+
+            def do_GET(self):
+                farm._handle_get(self)
+                return
+
+            def do_POST(self):
+                farm._handle_post(self)
+                return
+
+            def do_SUBSCRIBE(self):
+                farm._handle_subscribe(self)
+                return
+
+            def do_UNSUBSCRIBE(self):
+                farm._handle_unsubscribe(self)
+                return
+
+            def log_message(self, format, *args): # pylint: disable=redefined-builtin
+                return
+
+        self._running = True
+
+        self._notify_executor = ThreadPoolExecutor(max_workers=self._notify_workers, thread_name_prefix="UpnpDeviceFarm - Notify")
+
+        self._http_server = ThreadingHTTPServer((self._host, 0), FarmRequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.request_queue_size = 1024
+        self._http_thread = threading.Thread(name="UpnpDeviceFarm - HTTP", target=self._http_server.serve_forever, daemon=True)
+        self._http_thread.start()
+
+        self._ssdp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._ssdp_sock.bind((self._host, 0))
+        self._ssdp_sock.settimeout(0.5)
+        self._ssdp_thread = threading.Thread(name="UpnpDeviceFarm - SSDP", target=self._thread_entry_ssdp, daemon=True)
+        self._ssdp_thread.start()
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the request and event counters of the farm.
+        """
+        stats = None
+
+        self._farm_lock.acquire()
+        try:
+            stats = dict(self._fl_counters)
+        finally:
+            self._farm_lock.release()
+
+        return stats
+
+    def stop(self):
+        """
+            Stops the farm and waits for its threads to exit.
+        """
+        if self._running:
+            self._running = False
+
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_thread.join()
+
+            self._ssdp_thread.join()
+            self._ssdp_sock.close()
+
+            self._notify_executor.shutdown(wait=True)
+
+        return
+
+    def _count(self, counter: str, increment: int = 1):
+        self._farm_lock.acquire()
+        try:
+            self._fl_counters[counter] += increment
+        finally:
+            self._farm_lock.release()
+        return
+
+    def _event_changes(self, device: SimulatedDevice, service: SimulatedService, changed: Sequence[str]) -> list:
+        """
+            Queues the events for a change to the state of a service to the subscribers of the service.
+        """
+        futures = []
+        if len(changed) > 0:
+            for subscription in device.subscriptions_for_service(service):
+                futures.append(self._notify_executor.submit(self._send_event, device, subscription, changed))
+        return futures
+
+    def _handle_get(self, handler: BaseHTTPRequestHandler):
+        """
+            Serves the device and service description documents.
+        """
+        device, svc, leaf = self._route(handler.path)
+
+        content = None
+        if device is not None:
+            if svc is None and leaf == "description.xml":
+                content = device.description_xml(self.base_url)
+            elif svc is not None and leaf == "scpd.xml":
+                content = svc.scpd_xml()
+
+        if content is not None:
+            self._count("descriptions")
+            self._send_response(handler, 200, content, content_type='text/xml; charset="utf-8"')
+        else:
+            self._send_response(handler, 404)
+
+        return
+
+    def _handle_post(self, handler: BaseHTTPRequestHandler):
+        """
+            Answers a SOAP action request from the state model of the device.
+        """
+        content_length = int(handler.headers.get("Content-Length", 0))
+        body = handler.rfile.read(content_length) if content_length > 0 else b""
+
+        device, svc, leaf = self._route(handler.path)
+        if device is None or svc is None or leaf != "Control":
+            self._send_response(handler, 404)
+            return
+
+        action_name = None
+        arguments = {}
+        try:
+            envelope = xml_fromstring(body)
+            body_node = envelope.find("{%s}Body" % NS_SOAP_ENV)
+            action_node = body_node[0] if body_node is not None and len(body_node) > 0 else None
+            if action_node is not None:
+                action_name = action_node.tag.rpartition("}")[2]
+                for arg_node in action_node:
+                    arguments[arg_node.tag.rpartition("}")[2]] = arg_node.text or ""
+        except ParseError:
+            action_name = None
+
+        if action_name is None or action_name not in svc.actions:
+            self._count("action_errors")
+            self._send_response(handler, 500, self._soap_fault(401, "Invalid Action"), content_type='text/xml; charset="utf-8"')
+            return
+
+        out_values, changed = device.invoke_action(svc, action_name, arguments)
+
+        parts = [
+            XML_DOCUMENT_DECLARATION,
+            '<s:Envelope xmlns:s="{}" s:encodingStyle="{}"><s:Body>'.format(NS_SOAP_ENV, URI_SOAP_ENCODING),
+            '<u:{}Response xmlns:u="{}">'.format(action_name, svc.service_type)
+        ]
+        for arg_name, arg_val in out_values:
+            parts.append("<{0}>{1}</{0}>".format(arg_name, soap_escape_text(arg_val)))
+        parts.append("</u:{}Response></s:Body></s:Envelope>".format(action_name))
+
+        self._count("actions")
+        self._send_response(handler, 200, "".join(parts).encode("utf-8"), content_type='text/xml; charset="utf-8"')
+
+        self._event_changes(device, svc, changed)
+
+        return
+
+    def _handle_subscribe(self, handler: BaseHTTPRequestHandler):
+        """
+            Accepts a new subscription or the renewal of a subscription.
+        """
+        device, svc, leaf = self._route(handler.path)
+        if device is None or svc is None or leaf != "Event" or len(svc.evented) == 0:
+            self._send_response(handler, 404)
+            return
+
+        timeout = DEFAULT_SUBSCRIPTION_TIMEOUT
+        mobj = REGEX_SUBSCRIBE_TIMEOUT.match(handler.headers.get("TIMEOUT", ""))
+        if mobj is not None and mobj.group(1) != "infinite":
+            timeout = int(mobj.group(1))
+
+        sid = handler.headers.get("SID")
+        if sid is not None:
+            subscription = device.lookup_subscription(sid)
+            if subscription is None:
+                self._send_response(handler, 412)
+            else:
+                subscription.expires = time.monotonic() + timeout
+                self._send_response(handler, 200, headers={"SID": sid, "TIMEOUT": "Second-{}".format(timeout)})
+            return
+
+        callback = handler.headers.get("CALLBACK", "").strip()
+        callback_url = urlparse(callback[1:callback.find(">")] if callback.startswith("<") else callback)
+        if callback_url.hostname is None or callback_url.port is None:
+            self._send_response(handler, 412)
+            return
+
+        subscription = device.add_subscription(svc, (callback_url.hostname, callback_url.port),
+                                               callback_url.path or "/", timeout)
+        self._count("subscribes")
+
+        self._send_response(handler, 200, headers={"SID": subscription.sid, "TIMEOUT": "Second-{}".format(timeout)})
+
+        # The initial event with all of the evented state is sent after the subscription is accepted
+        self._notify_executor.submit(self._send_event, device, subscription, None)
+
+        return
+
+    def _handle_unsubscribe(self, handler: BaseHTTPRequestHandler):
+        """
+            Cancels a subscription.
+        """
+        device, svc, _ = self._route(handler.path)
+
+        sid = handler.headers.get("SID")
+        if device is not None and svc is not None and sid is not None and device.remove_subscription(sid):
+            self._count("unsubscribes")
+            self._send_response(handler, 200)
+        else:
+            self._send_response(handler, 412)
+
+        return
+
+    def _route(self, path: str) -> Tuple[Optional[SimulatedDevice], Optional[SimulatedService], Optional[str]]:
+        """
+            Finds the device, service and leaf name of a request path.
+        """
+        device = None
+        svc = None
+        leaf = None
+
+        segments = urlparse(path).path.strip("/").split("/")
+        if len(segments) >= 2:
+            device = self._devices_by_udn.get(segments[0])
+            if len(segments) == 2:
+                leaf = segments[1]
+            elif device is not None and len(segments) == 3:
+                svc = device.services.get(segments[1])
+                leaf = segments[2]
+
+        return device, svc, leaf
+
+    def _search_targets(self, device: SimulatedDevice) -> List[Tuple[str, str]]:
+        """
+            Returns the (search target, USN) pairs a device is announced and found with.
+        """
+        device_uuid = "uuid:{}".format(device.udn)
+        targets = [
+            ("upnp:rootdevice", "{}::upnp:rootdevice".format(device_uuid)),
+            (device_uuid, device_uuid),
+            (device.device_type, "{}::{}".format(device_uuid, device.device_type))
+        ]
+        for svc in device.services.values():
+            targets.append((svc.service_type, "{}::{}".format(device_uuid, svc.service_type)))
+        return targets
+
+    def _send_event(self, device: SimulatedDevice, subscription: SimulatedSubscription, changed: Optional[Sequence[str]]):
+        """
+            Sends an event to a subscriber, runs on a notify worker.
+        """
+        seq, body = device.take_event(subscription, changed)
+
+        headers = {
+            "CONTENT-TYPE": 'text/xml; charset="utf-8"',
+            "NT": "upnp:event",
+            "NTS": "upnp:propchange",
+            "SID": subscription.sid,
+            "SEQ": str(seq)
+        }
+
+        if gena_send_notify(subscription.callback_address, subscription.callback_path, headers, body, timeout=DEFAULT_NOTIFY_TIMEOUT):
+            self._count("notify_sent")
+        else:
+            self._count("notify_failed")
+
+        return
+
+    def _send_response(self, handler: BaseHTTPRequestHandler, status: int, content: bytes = b"",
+                       content_type: Optional[str] = None, headers: Optional[dict] = None):
+        """
+            Sends a response to a request.
+        """
+        handler.send_response(status)
+        handler.send_header("SERVER", FARM_SERVER_HEADER)
+        if content_type is not None:
+            handler.send_header("CONTENT-TYPE", content_type)
+        if headers is not None:
+            for hdr_name, hdr_val in headers.items():
+                handler.send_header(hdr_name, hdr_val)
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        if content:
+            handler.wfile.write(content)
+        return
+
+    def _soap_fault(self, error_code: int, error_description: str) -> bytes:
+        """
+            Creates the body of a UPnP error response.
+        """
+        content = (
+            XML_DOCUMENT_DECLARATION +
+            '<s:Envelope xmlns:s="{}" s:encodingStyle="{}"><s:Body><s:Fault>'.format(NS_SOAP_ENV, URI_SOAP_ENCODING) +
+            "<faultcode>s:Client</faultcode><faultstring>UPnPError</faultstring><detail>" +
+            '<UPnPError xmlns="{}"><errorCode>{}</errorCode>'.format(NS_UPNP_CONTROL, error_code) +
+            "<errorDescription>{}</errorDescription></UPnPError>".format(soap_escape_text(error_description)) +
+            "</detail></s:Fault></s:Body></s:Envelope>"
+        ).encode("utf-8")
+        return content
+
+    def _thread_entry_ssdp(self):
+        """
+            Answers the M-SEARCH requests sent to the SSDP socket of the farm.
+        """
+        while self._running:
+            try:
+                request, addr = self._ssdp_sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            if not request.startswith(b"M-SEARCH"):
+                continue
+
+            self._count("msearch")
+
+            header_end, _ = ssdp_header_end(request)
+            _, req_headers = ssdp_parse_headers(request[:header_end])
+            search_target = req_headers.get("ST", "ssdp:all")
+
+            responses = 0
+            for device in self._devices:
+                for target, usn in self._search_targets(device):
+                    if search_target == "ssdp:all" or search_target == target:
+                        lines = [
+                            "HTTP/1.1 200 OK",
+                            "CACHE-CONTROL: max-age=1800",
+                            "EXT:",
+                            "LOCATION: {}".format(self.location_for(device)),
+                            "SERVER: {}".format(FARM_SERVER_HEADER),
+                            "ST: {}".format(target),
+                            "USN: {}".format(usn),
+                            "BOOTID.UPNP.ORG: 1",
+                            "CONFIGID.UPNP.ORG: 1",
+                            "", ""
+                        ]
+                        try:
+                            self._ssdp_sock.sendto("\r\n".join(lines).encode("utf-8"), addr)
+                            responses += 1
+                        except OSError:
+                            break
+
+            self._count("msearch_responses", responses)
+
+        return
@@ -0,0 +1,297 @@
+"""
+.. module:: upnpdeviceregistry
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpDeviceRegistry` which maintains the lookup indexes that the
+               UpnpCoordinator uses to find its root devices.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import bisect
+import threading
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.devices.upnprootdevice import UpnpRootDevice
+
+
+class UpnpDeviceRegistry:
+    """
+        The :class:`UpnpDeviceRegistry` maintains a set of indexes over the root devices that have been
+        registered with the coordinator so device lookups do not have to scan every device.
+
+        * Exact indexes from USN, USN device identifier, MAC address and IP address to a device.
+        * A sorted suffix index over the device USN(s) that answers the substring searches used to
+          match device hints with a binary search.
+
+        When more than one device matches a substring search, the device that was registered first
+        is returned, which is consistent with scanning the devices in the order they were added.  The
+        registry has its own lock so lookups do not contend with the coordinator lock.  The device
+        properties are always read before the registry lock is acquired so the registry lock is never
+        held while waiting on a device lock.
+    """
+
+    def __init__(self):
+        self._registry_lock = threading.Lock()
+
+        # ======================= Registry Lock Variables ========================
+        # These variables are protected by the registry lock and are prefixed with
+        # _rl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._rl_devices: Dict[int, "UpnpRootDevice"] = {}
+        self._rl_location_to_seq: Dict[str, int] = {}
+        self._rl_device_to_seq: Dict[int, int] = {}
+        self._rl_indexed_keys: Dict[int, Tuple[str, str, str, str]] = {}
+        self._rl_next_seq = 0
+
+        self._rl_usn_index: Dict[str, int] = {}
+        self._rl_usn_dev_index: Dict[str, int] = {}
+        self._rl_mac_index: Dict[str, int] = {}
+        self._rl_ip_index: Dict[str, int] = {}
+
+        # A sorted list of (suffix, seq) entries for every suffix of every indexed USN, a
+        # substring of a USN is a prefix of one of its suffixes so it can be found by bisection.
+        self._rl_suffix_index: List[Tuple[str, int]] = []
+        return
+
+    def __len__(self) -> int:
+        return len(self._rl_devices)
+
+    def deactivate(self, device: "UpnpRootDevice"):
+        """
+            Removes a device that is no longer active from the IP address index.  The device is still found
+            by its identifiers so it can be re-activated when it comes back.
+
+            :param device: The device that has been deactivated or has said byebye.
+        """
+        self._registry_lock.acquire()
+        try:
+            seq = self._locked_find_seq(device)
+            if seq is not None:
+                usn, usn_dev, mac, ipaddr = self._rl_indexed_keys[seq]
+                if ipaddr is not None and self._rl_ip_index.get(ipaddr) == seq:
+                    del self._rl_ip_index[ipaddr]
+                self._rl_indexed_keys[seq] = (usn, usn_dev, mac, None)
+        finally:
+            self._registry_lock.release()
+
+        return
+
+    def find_by_ip(self, ipaddr: str) -> Optional["UpnpRootDevice"]:
+        """
+            Finds the active device with the specified IP address.
+        """
+        found = None
+
+        self._registry_lock.acquire()
+        try:
+            if ipaddr in self._rl_ip_index:
+                found = self._rl_devices[self._rl_ip_index[ipaddr]]
+        finally:
+            self._registry_lock.release()
+
+        return found
+
+    def find_by_mac(self, mac: str) -> Optional["UpnpRootDevice"]:
+        """
+            Finds the device with the specified MAC address.
+        """
+        found = None
+
+        self._registry_lock.acquire()
+        try:
+            if mac in self._rl_mac_index:
+                found = self._rl_devices[self._rl_mac_index[mac]]
+        finally:
+            self._registry_lock.release()
+
+        return found
+
+    def find_by_substring(self, usn_part: str) -> Optional["UpnpRootDevice"]:
+        """
+            Finds the first registered device whose USN contains the specified text.  Full USN(s) and
+            USN device identifiers are resolved from the exact indexes without searching.
+        """
+        found = None
+
+        self._registry_lock.acquire()
+        try:
+            seq = None
+            if usn_part in self._rl_usn_index:
+                seq = self._rl_usn_index[usn_part]
+            elif usn_part in self._rl_usn_dev_index:
+                seq = self._rl_usn_dev_index[usn_part]
+            else:
+                seq = self._locked_search_suffixes(usn_part)
+
+            if seq is not None:
+                found = self._rl_devices[seq]
+        finally:
+            self._registry_lock.release()
+
+        return found
+
+    def find_list_by_usn(self, usnlist: List[str]) -> List["UpnpRootDevice"]:
+        """
+            Finds the devices whose USN exactly matches one of the USN(s) in the list.
+        """
+        found = []
+
+        self._registry_lock.acquire()
+        try:
+            for usn in usnlist:
+                if usn in self._rl_usn_index:
+                    found.append(self._rl_devices[self._rl_usn_index[usn]])
+        finally:
+            self._registry_lock.release()
+
+        return found
+
+    def register(self, location: str, device: "UpnpRootDevice"):
+        """
+            Registers a device found at the specified location and indexes the device identifiers.  If the
+            location has already been registered, the device identifiers are re-indexed.
+        """
+        dev_keys = self._get_device_keys(device)
+
+        self._registry_lock.acquire()
+        try:
+            if location in self._rl_location_to_seq:
+                seq = self._rl_location_to_seq[location]
+            else:
+                seq = self._rl_next_seq
+                self._rl_next_seq += 1
+
+                self._rl_location_to_seq[location] = seq
+                self._rl_devices[seq] = device
+                self._rl_device_to_seq[id(device)] = seq
+                self._rl_indexed_keys[seq] = (None, None, None, None)
+
+            self._locked_index_device(seq, dev_keys)
+        finally:
+            self._registry_lock.release()
+
+        return
+
+    def update(self, device: "UpnpRootDevice"):
+        """
+            Re-indexes a device when it is activated or its description has been refreshed, so changes to its
+            addresses are reflected in the indexes.
+        """
+        dev_keys = self._get_device_keys(device)
+
+        self._registry_lock.acquire()
+        try:
+            seq = self._locked_find_seq(device)
+            if seq is not None:
+                self._locked_index_device(seq, dev_keys)
+        finally:
+            self._registry_lock.release()
+
+        return
+
+    def usn_list(self) -> List[str]:
+        """
+            Returns the list of USN(s) of the registered devices in the order they were registered.
+        """
+        usnlist = None
+
+        self._registry_lock.acquire()
+        try:
+            usnlist = [dev.USN for dev in self._rl_devices.values()]
+        finally:
+            self._registry_lock.release()
+
+        return usnlist
+
+    def _get_device_keys(self, device: "UpnpRootDevice") -> Tuple[str, str, str, str]:
+        """
+            Reads the identifiers of a device that are indexed by the registry.
+        """
+        dev_keys = (device.USN, device.USN_DEV, device.MACAddress, device.IPAddress)
+        return dev_keys
+
+    def _locked_find_seq(self, device: "UpnpRootDevice") -> Optional[int]:
+        """
+            Finds the registration sequence number of a device.  The registry lock must be held by the caller.
+        """
+        seq = self._rl_device_to_seq.get(id(device))
+        return seq
+
+    def _locked_index_device(self, seq: int, dev_keys: Tuple[str, str, str, str]):
+        """
+            Updates the index entries for a device, removing any entries for identifiers that have changed.
+            The registry lock must be held by the caller.
+        """
+        prev_usn, prev_usn_dev, prev_mac, prev_ip = self._rl_indexed_keys[seq]
+
+        usn, usn_dev, mac, ipaddr = dev_keys
+
+        if usn != prev_usn:
+            if prev_usn is not None:
+                if self._rl_usn_index.get(prev_usn) == seq:
+                    del self._rl_usn_index[prev_usn]
+                for sidx in range(len(prev_usn)):
+                    entry = (prev_usn[sidx:], seq)
+                    eidx = bisect.bisect_left(self._rl_suffix_index, entry)
+                    if eidx < len(self._rl_suffix_index) and self._rl_suffix_index[eidx] == entry:
+                        del self._rl_suffix_index[eidx]
+            if usn is not None:
+                self._rl_usn_index.setdefault(usn, seq)
+                for sidx in range(len(usn)):
+                    bisect.insort(self._rl_suffix_index, (usn[sidx:], seq))
+
+        self._locked_update_exact_index(self._rl_usn_dev_index, seq, prev_usn_dev, usn_dev)
+        self._locked_update_exact_index(self._rl_mac_index, seq, prev_mac, mac)
+
+        # The most recently activated device owns an IP address, addresses get re-used.
+        if prev_ip is not None and prev_ip != ipaddr and self._rl_ip_index.get(prev_ip) == seq:
+            del self._rl_ip_index[prev_ip]
+        if ipaddr is not None:
+            self._rl_ip_index[ipaddr] = seq
+
+        self._rl_indexed_keys[seq] = (usn, usn_dev, mac, ipaddr)
+
+        return
+
+    def _locked_search_suffixes(self, usn_part: str) -> Optional[int]:
+        """
+            Searches the suffix index for the earliest registered device with a USN that contains
+            the specified text.  The registry lock must be held by the caller.
+        """
+        found_seq = None
+
+        if len(usn_part) > 0:
+            sfx_index = self._rl_suffix_index
+            eidx = bisect.bisect_left(sfx_index, (usn_part, -1))
+            while eidx < len(sfx_index):
+                suffix, seq = sfx_index[eidx]
+                if not suffix.startswith(usn_part):
+                    break
+                if found_seq is None or seq < found_seq:
+                    found_seq = seq
+                eidx += 1
+        elif len(self._rl_devices) > 0:
+            # Every USN contains the empty string
+            found_seq = min(self._rl_devices.keys())
+
+        return found_seq
+
+    def _locked_update_exact_index(self, index: Dict[str, int], seq: int, prev_key: Optional[str], key: Optional[str]):
+        """
+            Moves the entry for a device in one of the exact indexes.  The first registered device keeps
+            an identifier that is claimed by more than one device.
+        """
+        if key != prev_key:
+            if prev_key is not None and index.get(prev_key) == seq:
+                del index[prev_key]
+            if key is not None:
+                index.setdefault(key, seq)
+        return
@@ -0,0 +1,221 @@
+"""
+.. module:: upnpextensionindex
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module containing the functions that build, write and read the static registry index of the UPnP
+               root device and service proxy extensions, so the extension modules do not have to be imported
+               to find out which device or service each one of them is for.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Optional, Tuple
+
+import ast
+import io
+import os
+
+from mojo.errors.exceptions import SemanticError
+
+REGISTRY_INDEX_MODULE = "registryindex"
+REGISTRY_INDEX_FILENAME = REGISTRY_INDEX_MODULE + ".py"
+
+ROOT_DEVICE_INDEX_VARIABLE = "ROOT_DEVICE_REGISTRY_INDEX"
+SERVICE_INDEX_VARIABLE = "SERVICE_REGISTRY_INDEX"
+
+ROOT_DEVICE_KEY_ATTRIBUTES = ("MANUFACTURER", "MODEL_NUMBER", "MODEL_DESCRIPTION")
+SERVICE_KEY_ATTRIBUTES = ("SERVICE_MANUFACTURER", "SERVICE_TYPE")
+
+# The index tables map the tuple of values that an extension key is generated from to a tuple
+# of the module name, relative to the directory the index is for, and the name of the class.
+ExtensionIndexTable = Dict[Tuple[str, ...], Tuple[str, str]]
+
+TEMPLATE_REGISTRY_INDEX_HEADER = '''"""
+    NOTE: This is a code generated file.  This file should not be edited directly.
+
+    The registry index of the extensions in this directory.  The index maps the values the extension
+    key of each extension is generated from to the module, relative to this directory, and the class
+    name of the extension.  It is read without importing the extension modules.
+"""
+
+'''
+
+
+def scan_extension_index(directory: str, module_prefix: str = "") -> Tuple[ExtensionIndexTable, ExtensionIndexTable]:
+    """
+        Builds the registry index of the root device and service proxy extensions under a directory by parsing
+        the extension modules, the modules are not imported.  When a directory in the tree has a registry index
+        module, the entries of the index are used instead of parsing the modules in the directory.
+
+        :param directory: The directory to index.
+        :param module_prefix: The prefix to add to the module names of the extensions found.
+
+        :returns: A tuple with the root device index table and the service index table.
+    """
+    root_device_index = {}
+    service_index = {}
+
+    index_filename = os.path.join(directory, REGISTRY_INDEX_FILENAME)
+    if os.path.exists(index_filename):
+        dev_table, svc_table = read_extension_index(index_filename)
+        _merge_index_table(root_device_index, dev_table, module_prefix, unique=True)
+        _merge_index_table(service_index, svc_table, module_prefix, unique=False)
+        return root_device_index, service_index
+
+    for item in sorted(os.listdir(directory)):
+        if item.startswith("_") or item.startswith("."):
+            continue
+
+        item_full = os.path.join(directory, item)
+        if os.path.isdir(item_full):
+            dev_table, svc_table = scan_extension_index(item_full, module_prefix + item + ".")
+            _merge_index_table(root_device_index, dev_table, "", unique=True)
+            _merge_index_table(service_index, svc_table, "", unique=False)
+
+        elif item.endswith(".py") and item != REGISTRY_INDEX_FILENAME:
+            module_name = module_prefix + item[:-3]
+            dev_table, svc_table = _scan_extension_module(item_full, module_name)
+            _merge_index_table(root_device_index, dev_table, "", unique=True)
+            _merge_index_table(service_index, svc_table, "", unique=False)
+
+    return root_device_index, service_index
+
+
+def read_extension_index(index_filename: str) -> Tuple[ExtensionIndexTable, ExtensionIndexTable]:
+    """
+        Reads a registry index module without importing it.
+
+        :param index_filename: The full path of the registry index module.
+
+        :returns: A tuple with the root device index table and the service index table.
+    """
+    root_device_index = {}
+    service_index = {}
+
+    with open(index_filename, 'r') as idxf:
+        index_content = idxf.read()
+
+    index_tree = ast.parse(index_content, filename=index_filename)
+    for node in index_tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target_name = node.targets[0].id
+            if target_name == ROOT_DEVICE_INDEX_VARIABLE:
+                root_device_index = ast.literal_eval(node.value)
+            elif target_name == SERVICE_INDEX_VARIABLE:
+                service_index = ast.literal_eval(node.value)
+
+    return root_device_index, service_index
+
+
+def generate_extension_index_module(root_device_index: ExtensionIndexTable, service_index: ExtensionIndexTable) -> str:
+    """
+        Generates the content of a registry index module.
+
+        :param root_device_index: The root device index table.
+        :param service_index: The service index table.
+
+        :returns: The content of the registry index module.
+    """
+    imf = io.StringIO()
+    imf.write(TEMPLATE_REGISTRY_INDEX_HEADER)
+
+    for var_name, index_table in ((ROOT_DEVICE_INDEX_VARIABLE, root_device_index), (SERVICE_INDEX_VARIABLE, service_index)):
+        if len(index_table) > 0:
+            imf.write("%s = {\n" % var_name)
+            for key_parts in sorted(index_table.keys()):
+                module_name, class_name = index_table[key_parts]
+                imf.write("    %r: (%r, %r),\n" % (key_parts, module_name, class_name))
+            imf.write("}\n\n")
+        else:
+            imf.write("%s = {}\n\n" % var_name)
+
+    return imf.getvalue()
+
+
+def write_extension_index(directory: str) -> str:
+    """
+        Scans the extension modules under a directory and writes the registry index module for the directory.
+
+        :param directory: The directory to index.
+
+        :returns: The full path of the registry index module.
+    """
+    index_filename = os.path.join(directory, REGISTRY_INDEX_FILENAME)
+    if os.path.exists(index_filename):
+        os.remove(index_filename)
+
+    root_device_index, service_index = scan_extension_index(directory)
+
+    content = generate_extension_index_module(root_device_index, service_index)
+    with open(index_filename, 'w') as idxf:
+        idxf.write(content)
+
+    return index_filename
+
+
+def _class_key_parts(class_node: ast.ClassDef, key_attributes: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """
+        Gets the values of the string constant class attributes that make up an extension key or None
+        if the class does not define all of them.
+    """
+    found = {}
+    for node in class_node.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target_name = node.targets[0].id
+            if target_name in key_attributes and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                found[target_name] = node.value.value
+
+    key_parts = None
+    if len(found) == len(key_attributes):
+        key_parts = tuple(found[attr] for attr in key_attributes)
+
+    return key_parts
+
+
+def _merge_index_table(to_table: ExtensionIndexTable, from_table: ExtensionIndexTable, module_prefix: str, unique: bool):
+    """
+        Merges the entries of an index table into another.  Root device keys must be unique, a service key
+        that shows up again replaces the earlier entry the same way the service registration does.
+    """
+    for key_parts, (module_name, class_name) in from_table.items():
+        if unique and key_parts in to_table:
+            errmsg = "A root device extension with the key=%r was already indexed. (%s.%s)" % (
+                key_parts, module_prefix + module_name, class_name)
+            raise SemanticError(errmsg) from None
+        to_table[key_parts] = (module_prefix + module_name, class_name)
+    return
+
+
+def _scan_extension_module(filename: str, module_name: str) -> Tuple[ExtensionIndexTable, ExtensionIndexTable]:
+    """
+        Parses an extension module and indexes the classes that define the root device or service key attributes.
+    """
+    root_device_index = {}
+    service_index = {}
+
+    with open(filename, 'r') as mf:
+        module_content = mf.read()
+
+    try:
+        module_tree = ast.parse(module_content, filename=filename)
+    except SyntaxError:
+        module_tree = None
+
+    if module_tree is not None:
+        for node in module_tree.body:
+            if isinstance(node, ast.ClassDef):
+                key_parts = _class_key_parts(node, SERVICE_KEY_ATTRIBUTES)
+                if key_parts is not None:
+                    service_index[key_parts] = (module_name, node.name)
+                    continue
+
+                key_parts = _class_key_parts(node, ROOT_DEVICE_KEY_ATTRIBUTES)
+                if key_parts is not None:
+                    root_device_index[key_parts] = (module_name, node.name)
+
+    return root_device_index, service_index
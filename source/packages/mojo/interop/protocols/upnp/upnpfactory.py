@@ -12,14 +12,15 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
-from typing import Union
+from typing import Dict, Optional, Tuple, Type, Union
+
+import sys
+import threading
+
+from types import ModuleType
 
 from mojo.errors.exceptions import SemanticError
-from mojo.xmods.extension.dynamic import (
-    collect_extensions_under_code_container,
-    collect_extensions_under_folder,
-    generate_extension_key
-)
+from mojo.xmods.extension.dynamic import generate_extension_key
 from mojo.xmods.ximport import import_by_name
 from mojo.collections.context import Context
 
@@ -29,6 +30,8 @@ from mojo.interop.protocols.upnp.services.upnpserviceproxy import UpnpServicePro
 
 from mojo.interop.protocols.upnp.extensions import standard as standard_extensions
 
+from mojo.interop.protocols.upnp.upnpextensionindex import ExtensionIndexTable, scan_extension_index
+
 
 class UpnpFactory:
     """
@@ -36,6 +39,11 @@ class UpnpFactory:
         of code generated UPnP device and service extensions.  We utilize code generated device classes and
         service proxy classes because that makes each class of device and each method on those classes
         individually isolatable and debugable.
+
+        The extensions are cataloged from a static registry index of extension key to module and class name,
+        either from the ``registryindex`` module that the generator writes next to the extensions or by parsing
+        the extension modules.  An extension module is only imported the first time an instance of one of its
+        extensions is created.
     """
 
     _instance = None
@@ -66,6 +74,15 @@ class UpnpFactory:
             self._std_root_device_registry = {}
             self._std_service_registry = {}
 
+            self._dyn_root_device_index: Dict[str, Tuple[str, str]] = {}
+            self._dyn_service_index: Dict[str, Tuple[str, str]] = {}
+            self._std_root_device_index: Dict[str, Tuple[str, str]] = {}
+            self._std_service_index: Dict[str, Tuple[str, str]] = {}
+
+            self._dyn_ext_folder = None
+
+            self._factory_lock = threading.Lock()
+
             gcontext = Context() 
 
             dyn_ext_module = None
@@ -76,14 +93,12 @@ class UpnpFactory:
             dyn_ext_folder = gcontext.lookup("/upnp/extensions/dynamic/folder")
 
             if dyn_ext_module is not None:
-                self._scan_for_device_extensions_under_code_container(dyn_ext_module, self._dyn_root_device_registry)
-                self._scan_for_service_extensions_under_code_container(dyn_ext_module, self._dyn_service_registry)
+                self._index_extensions_under_code_container(dyn_ext_module, self._dyn_root_device_index, self._dyn_service_index)
             elif dyn_ext_folder is not None:
-                self._scan_for_device_extensions_under_folder(dyn_ext_folder, self._dyn_root_device_registry)
-                self._scan_for_service_extensions_under_folder(dyn_ext_folder, self._dyn_service_registry)
-            
-            self._scan_for_device_extensions_under_code_container(standard_extensions, self._std_root_device_registry)
-            self._scan_for_service_extensions_under_code_container(standard_extensions, self._std_service_registry)
+                self._dyn_ext_folder = dyn_ext_folder
+                self._index_extensions_under_folder(dyn_ext_folder, self._dyn_root_device_index, self._dyn_service_index)
+
+            self._index_extensions_under_code_container(standard_extensions, self._std_root_device_index, self._std_service_index)
         return
 
     def create_embedded_device_instance(self, manufacturer:str, modelNumber: str, modelDescription: str) -> UpnpEmbeddedDevice:
@@ -124,10 +139,12 @@ class UpnpFactory:
 
         if manufacturer is not None and modelNumber is not None and modelDescription is not None:
             extkey = generate_extension_key(manufacturer, modelNumber, modelDescription)
-            if extkey in self._dyn_root_device_registry:
-                deviceClass = self._dyn_root_device_registry[extkey]
-            elif extkey in self._std_root_device_registry:
-                deviceClass = self._std_root_device_registry[extkey]
+            extcls = self._lookup_extension(extkey, self._dyn_root_device_index, self._dyn_root_device_registry, UpnpRootDevice,
+                                            search_path=self._dyn_ext_folder)
+            if extcls is None:
+                extcls = self._lookup_extension(extkey, self._std_root_device_index, self._std_root_device_registry, UpnpRootDevice)
+            if extcls is not None:
+                deviceClass = extcls
 
         dev_inst = deviceClass(manufacturer, modelNumber, modelDescription)
         return dev_inst
@@ -147,80 +164,89 @@ class UpnpFactory:
         serviceInst = None
         if serviceType is not None:
             extkey = generate_extension_key(serviceManufacturer, serviceType)
-            if extkey in self._dyn_service_registry:
-                serviceClass = self._dyn_service_registry[extkey]
-                serviceInst = serviceClass()
-            elif extkey in self._std_service_registry:
-                serviceClass = self._std_service_registry[extkey]
+            serviceClass = self._lookup_extension(extkey, self._dyn_service_index, self._dyn_service_registry, UpnpServiceProxy,
+                                                 search_path=self._dyn_ext_folder)
+            if serviceClass is None:
+                serviceClass = self._lookup_extension(extkey, self._std_service_index, self._std_service_registry, UpnpServiceProxy)
+            if serviceClass is not None:
                 serviceInst = serviceClass()
         return serviceInst
 
-    def _register_root_device(self, extkey, extcls, device_table):
+    def _index_extensions(self, directory: str, module_prefix: str, device_index: Dict[str, Tuple[str, str]],
+                          service_index: Dict[str, Tuple[str, str]]):
         """
-            Method that registers the extension class of a specific type of root device.
+            Method that adds the root device and service proxy extensions found in the registry index of a
+            directory to the device and service indexes.
         """
-        if extkey not in device_table:
-            device_table[extkey] = extcls
-        else:
-            raise SemanticError("A root device extension with the key=%r was already registered. (%s)" % (extkey, extcls)) from None
+        dev_table, svc_table = scan_extension_index(directory, module_prefix=module_prefix)
+        self._register_index_entries(dev_table, device_index, unique=True)
+        self._register_index_entries(svc_table, service_index, unique=False)
         return
 
-    def _register_service(self, extkey, extcls, service_table):
+    def _index_extensions_under_code_container(self, container: ModuleType, device_index: Dict[str, Tuple[str, str]],
+                                               service_index: Dict[str, Tuple[str, str]]):
         """
-            Method that registers the extension class of a specific type of service proxy.
+            Method that indexes the extensions of a code container and its descendants without importing them.
         """
-        if extkey not in service_table:
-            service_table[extkey] = extcls
-        else:
-            service_table[extkey] = extcls
+        module_prefix = container.__name__ + "."
+        for container_dir in list(container.__path__):
+            self._index_extensions(container_dir, module_prefix, device_index, service_index)
         return
 
-    def _scan_for_device_extensions_under_code_container(self, container, device_table):
+    def _index_extensions_under_folder(self, directory: str, device_index: Dict[str, Tuple[str, str]],
+                                       service_index: Dict[str, Tuple[str, str]]):
         """
-            Method that scans a code container and its descendants for UpnpRootDevice objects.
+            Method that indexes the extensions under a folder and its descendants without importing them.
         """
-        extcoll = collect_extensions_under_code_container(container, UpnpRootDevice)
-        for _, extcls in extcoll:
-            if hasattr(extcls, "MANUFACTURER") and hasattr(extcls, "MODEL_NUMBER") and hasattr(extcls, "MODEL_DESCRIPTION"):
-                extkey = generate_extension_key(getattr(extcls, "MANUFACTURER"),
-                    getattr(extcls, "MODEL_NUMBER"), getattr(extcls, "MODEL_DESCRIPTION"))
-                self._register_root_device(extkey, extcls, device_table)
+        self._index_extensions(directory, "", device_index, service_index)
         return
 
-    def _scan_for_service_extensions_under_code_container(self, container, service_table):
-        """
-            Method that scans a code container and its descendants for UpnpServiceProxy objects.
-        """
-        extcoll = collect_extensions_under_code_container(container, UpnpServiceProxy)
-        for _, extcls in extcoll:
-            if (hasattr(extcls, "SERVICE_MANUFACTURER") and hasattr(extcls, "SERVICE_TYPE")):
-                svc_manufacturer = getattr(extcls, "SERVICE_MANUFACTURER")
-                svc_type = getattr(extcls, "SERVICE_TYPE")
-                extkey = generate_extension_key(svc_manufacturer, svc_type)
-                self._register_service(extkey, extcls, service_table)
-        return
-    
-    def _scan_for_device_extensions_under_folder(self, directory, device_table):
-        """
-            Method that scans a code container and its descendants for UpnpRootDevice objects.
-        """
-        extcoll = collect_extensions_under_folder(directory, UpnpRootDevice)
-        for _, extcls in extcoll:
-            if hasattr(extcls, "MANUFACTURER") and hasattr(extcls, "MODEL_NUMBER") and hasattr(extcls, "MODEL_DESCRIPTION"):
-                extkey = generate_extension_key(getattr(extcls, "MANUFACTURER"),
-                    getattr(extcls, "MODEL_NUMBER"), getattr(extcls, "MODEL_DESCRIPTION"))
-                self._register_root_device(extkey, extcls, device_table)
-        return
-
-    def _scan_for_service_extensions_under_folder(self, directory, service_table):
-        """
-            Method that scans a code container and its descendants for UpnpServiceProxy objects.
-        """
-        extcoll = collect_extensions_under_folder(directory, UpnpServiceProxy)
-        for _, extcls in extcoll:
-            if (hasattr(extcls, "SERVICE_MANUFACTURER") and hasattr(extcls, "SERVICE_TYPE")):
-                svc_manufacturer = getattr(extcls, "SERVICE_MANUFACTURER")
-                svc_type = getattr(extcls, "SERVICE_TYPE")
-                extkey = generate_extension_key(svc_manufacturer, svc_type)
-                self._register_service(extkey, extcls, service_table)
+    def _lookup_extension(self, extkey: str, extension_index: Dict[str, Tuple[str, str]], extension_registry: dict,
+                          base_class: type, search_path: Optional[str] = None) -> Optional[Type]:
+        """
+            Method that looks up the extension class for an extension key, the module of the extension is
+            imported the first time the extension is looked up.  The search path is the folder that the
+            module names of a dynamic extension folder are relative to.
+        """
+        extcls = extension_registry.get(extkey)
+
+        if extcls is None and extkey in extension_index:
+            module_name, class_name = extension_index[extkey]
+
+            self._factory_lock.acquire()
+            try:
+                extcls = extension_registry.get(extkey)
+                if extcls is None:
+                    if search_path is not None and search_path not in sys.path:
+                        sys.path.append(search_path)
+
+                    extmod = import_by_name(module_name)
+                    extcls = getattr(extmod, class_name, None)
+                    if extcls is None:
+                        errmsg = "The registry index is out of date, the extension module '%s' does not have a class named '%s'." % (
+                            module_name, class_name)
+                        raise SemanticError(errmsg) from None
+
+                    if issubclass(extcls, base_class):
+                        extension_registry[extkey] = extcls
+                    else:
+                        # The class has the key attributes but is not an extension of the type
+                        # being looked up, so it is dropped from the index like the scan would.
+                        del extension_index[extkey]
+                        extcls = None
+            finally:
+                self._factory_lock.release()
+
+        return extcls
+
+    def _register_index_entries(self, from_table: ExtensionIndexTable, extension_index: Dict[str, Tuple[str, str]], unique: bool):
+        """
+            Method that registers the entries of a registry index table by extension key.
+        """
+        for key_parts, entry in from_table.items():
+            extkey = generate_extension_key(*key_parts)
+            if unique and extkey in extension_index:
+                raise SemanticError("A root device extension with the key=%r was already registered. (%s.%s)" % (
+                    extkey, entry[0], entry[1])) from None
+            extension_index[extkey] = entry
         return
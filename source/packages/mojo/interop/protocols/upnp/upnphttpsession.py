@@ -0,0 +1,283 @@
+"""
+.. module:: upnphttpsession
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpHttpSessionPool` which provides pooled keep-alive HTTP sessions
+               for the SOAP, description and subscription requests made to UPnP devices.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Optional, TYPE_CHECKING
+
+import threading
+
+from urllib.parse import urlparse
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+
+from mojo.collections.context import Context
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.upnptrafficrecorder import UpnpTrafficRecorder
+
+DEFAULT_HTTP_KEEP_ALIVE = True
+DEFAULT_HTTP_POOL_SIZE = 4
+DEFAULT_HTTP_POOL_BLOCK = False
+
+# The methods that are safe to send a second time if a pooled connection drops before the response,
+# SOAP action POSTs such as Seek or Next could be applied twice so they are never retried.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD"])
+
+# Subscription requests that carry a SID renew or cancel an existing subscription and can be
+# sent again, a SUBSCRIBE without a SID would create a second subscription.
+IDEMPOTENT_SID_METHODS = frozenset(["SUBSCRIBE", "UNSUBSCRIBE"])
+
+
+class UpnpHttpSessionPoolPaths:
+    KEEP_ALIVE = "/upnp/http/keepalive"
+    POOL_SIZE = "/upnp/http/poolsize"
+    POOL_BLOCK = "/upnp/http/poolblock"
+
+
+class UpnpHttpSessionPool:
+    """
+        The :class:`UpnpHttpSessionPool` object is a singleton that maintains one `requests.Session` for each
+        device host:port.  All the service proxies of a root device share the host:port of the device, so they
+        share the session and its pool of persistent connections instead of paying for a new TCP connection
+        and a new session on every action call.
+
+        Devices that answer with a `Connection: close` header are remembered, the requests to those hosts are
+        sent with `Connection: close` so a connection the device is about to drop is never reused.  An idempotent
+        request that fails because a pooled connection was closed by the device between requests is retried
+        once on a fresh connection, action calls are not retried because the device may have applied them.
+
+        The keep-alive behavior and the pool size can be set in the global context with the paths in
+        :class:`UpnpHttpSessionPoolPaths` or by calling :meth:`configure`.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        """
+            Constructs new instances of the UpnpHttpSessionPool object.  This is a singleton object.
+        """
+        if cls._instance is None:
+            cls._instance = super(UpnpHttpSessionPool, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """
+            Initializes the Singleton initializer class
+        """
+        thisType = type(self)
+        if not thisType._initialized:
+            thisType._initialized = True
+
+            ctx = Context()
+
+            self._keep_alive = ctx.lookup(UpnpHttpSessionPoolPaths.KEEP_ALIVE, default=DEFAULT_HTTP_KEEP_ALIVE)
+            self._pool_size = ctx.lookup(UpnpHttpSessionPoolPaths.POOL_SIZE, default=DEFAULT_HTTP_POOL_SIZE)
+            self._pool_block = ctx.lookup(UpnpHttpSessionPoolPaths.POOL_BLOCK, default=DEFAULT_HTTP_POOL_BLOCK)
+
+            self._pool_lock = threading.Lock()
+
+            # ========================= Pool Lock Variables =========================
+            # These variables are protected by the pool lock and are prefixed with
+            # _pl_ so it is easy to identify if the lock is being held when they are
+            # being accessed.
+            self._pl_sessions: Dict[str, requests.Session] = {}
+            self._pl_close_hosts = set()
+
+            # The recorder that SOAP exchanges are written to while traffic is being recorded
+            self._traffic_recorder: Optional["UpnpTrafficRecorder"] = None
+        return
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+            Indicates if connections are kept alive between requests to the same host.
+        """
+        return self._keep_alive
+
+    @property
+    def pool_size(self) -> int:
+        """
+            The maximum number of connections that are kept for each host.
+        """
+        return self._pool_size
+
+    def configure(self, keep_alive: Optional[bool] = None, pool_size: Optional[int] = None, pool_block: Optional[bool] = None):
+        """
+            Updates the pool configuration.  The existing sessions are closed so the new configuration
+            applies to all following requests.
+
+            :param keep_alive: Keep connections alive between requests to the same host.
+            :param pool_size: The maximum number of connections that are kept for each host.
+            :param pool_block: Block requests when all the connections of a host are in use.
+        """
+        if keep_alive is not None:
+            self._keep_alive = keep_alive
+        if pool_size is not None:
+            self._pool_size = pool_size
+        if pool_block is not None:
+            self._pool_block = pool_block
+
+        self.close_all()
+
+        return
+
+    def close_all(self):
+        """
+            Closes all of the sessions and their connections.
+        """
+        sessions = None
+
+        self._pool_lock.acquire()
+        try:
+            sessions = list(self._pl_sessions.values())
+            self._pl_sessions.clear()
+            self._pl_close_hosts.clear()
+        finally:
+            self._pool_lock.release()
+
+        for session in sessions:
+            session.close()
+
+        return
+
+    def close_host(self, host: str):
+        """
+            Closes the session and connections for a host, used when a device goes away.
+
+            :param host: The host:port of the device.
+        """
+        session = None
+
+        self._pool_lock.acquire()
+        try:
+            if host in self._pl_sessions:
+                session = self._pl_sessions.pop(host)
+            self._pl_close_hosts.discard(host)
+        finally:
+            self._pool_lock.release()
+
+        if session is not None:
+            session.close()
+
+        return
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+            Makes an HTTP request using the pooled session for the host of the url.
+
+            :param method: The HTTP method of the request.
+            :param url: The url to make the request to.
+            :param headers: The headers to send with the request.
+            :param kwargs: Additional keyword arguments that are passed to `requests.Session.request`.
+
+            :returns: The response to the request.
+        """
+        host = urlparse(url).netloc
+
+        session, keep_alive = self._get_session(host)
+
+        if not keep_alive:
+            headers = {} if headers is None else dict(headers)
+            headers["Connection"] = "close"
+
+        try:
+            resp = session.request(method, url, headers=headers, **kwargs)
+        except requests.exceptions.ConnectionError as cerr:
+            # The device may have closed an idle pooled connection after we picked it up, in
+            # that case the connection is aborted before a response and an idempotent request
+            # can be made again on a fresh connection.  Connect failures are not retried.
+            if not keep_alive or len(cerr.args) == 0 or not isinstance(cerr.args[0], ProtocolError):
+                raise
+            if not self._is_idempotent(method, headers):
+                raise
+            resp = session.request(method, url, headers=headers, **kwargs)
+
+        recorder = self._traffic_recorder
+        if recorder is not None and headers is not None and "SOAPAction" in headers:
+            recorder.record_soap(url, headers, kwargs.get("data") or b"", resp.status_code, resp.headers, resp.content)
+
+        if keep_alive and resp.headers.get("Connection", "").lower() == "close":
+            self._pool_lock.acquire()
+            try:
+                self._pl_close_hosts.add(host)
+            finally:
+                self._pool_lock.release()
+
+        return resp
+
+    def set_traffic_recorder(self, recorder: Optional["UpnpTrafficRecorder"]):
+        """
+            Sets the recorder that the SOAP exchanges made through the pool are recorded to.
+
+            :param recorder: The traffic recorder or None to stop recording.
+        """
+        self._traffic_recorder = recorder
+        return
+
+    def _is_idempotent(self, method: str, headers: Optional[dict]) -> bool:
+        """
+            Indicates if a request can be sent again without the risk of the device applying it twice.
+        """
+        method = method.upper()
+
+        idempotent = method in IDEMPOTENT_METHODS
+        if not idempotent and method in IDEMPOTENT_SID_METHODS and headers is not None:
+            idempotent = any(hname.upper() == "SID" for hname in headers)
+
+        return idempotent
+
+    def _get_session(self, host: str):
+        """
+            Gets or creates the session for a host and indicates if connections to the host are kept alive.
+        """
+        session = None
+        keep_alive = self._keep_alive
+
+        self._pool_lock.acquire()
+        try:
+            if host in self._pl_sessions:
+                session = self._pl_sessions[host]
+            else:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size, pool_block=self._pool_block)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._pl_sessions[host] = session
+
+            if host in self._pl_close_hosts:
+                keep_alive = False
+        finally:
+            self._pool_lock.release()
+
+        return session, keep_alive
+
+
+def upnp_http_request(method: str, url: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+    """
+        Makes an HTTP request to a UPnP device using the pooled keep-alive sessions.
+
+        :param method: The HTTP method of the request.
+        :param url: The url to make the request to.
+        :param headers: The headers to send with the request.
+        :param kwargs: Additional keyword arguments that are passed to `requests.Session.request`.
+
+        :returns: The response to the request.
+    """
+    pool = UpnpHttpSessionPool()
+    resp = pool.request(method, url, headers=headers, **kwargs)
+    return resp
@@ -15,25 +15,51 @@ __credits__ = []
 
 from typing import Optional, Tuple
 
-import copy
 import logging
 import os
 import re
+import selectors
 import socket
 import threading
+import time
 
 import netifaces
 
+from mojo.networking.constants import HTTP1_1_LINESEP
 from mojo.networking.multicast import create_multicast_socket_for_iface, create_multicast_socket
 from mojo.networking.unicast import create_unicast_socket
 from mojo.networking.interfaces import get_interface_for_ip
 
 from mojo.waiting.waitmodel import WaitContext
 
+from mojo.interop.protocols.upnp.upnpconstants import UPNP_HEADERS
+from mojo.interop.protocols.upnp.ssdpcodec import ssdp_header_end, ssdp_parse_headers
+
 REGEX_NOTIFY_HEADER = re.compile("NOTIFY[ ]+[*/]+[ ]+HTTP/1")
 
 logger = logging.getLogger()
 
+MSEARCH_RECV_BUFFER_SIZE = 8192
+MSEARCH_RESEND_INTERVAL_MAX = 10
+
+UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_OK = HTTP1_1_LINESEP.join([
+    b'HTTP/1.1 200 OK',
+    b'Connection: close',
+    b'Content-Length: 0',
+    b'Content-Type: text/html',
+    b'Server: %s,UPnP/1.0' % UPNP_HEADERS.SERVER.encode(),
+    b''
+])
+
+UPNP_SUBSCRIPTION_NOTIFY_RESPONSE_BAD_REQUEST = HTTP1_1_LINESEP.join([
+    b'HTTP/1.1 400 Bad Request',
+    b'Connection: close',
+    b'Content-Length: 0',
+    b'Content-Type: text/html',
+    b'Server: %s,UPnP/1.0' % UPNP_HEADERS.SERVER.encode(),
+    b''
+])
+
 class MSearchTargets:
     """
         MSearch target constants.
@@ -145,6 +171,21 @@ class MSearchScanContext:
 
         return
 
+def http_parse_header(header_content: bytes) -> Tuple[bytes, dict]:
+    """
+        Parses the header content of an HTTP request into the request line and a dictionary
+        of headers with upper case header names.
+
+        :param header_content: The header content of the request without the end of header marker.
+
+        :returns: A tuple with the request line and the dictionary of headers.
+    """
+    assert len(header_content) > 0, "The header content was not a valid HTTP request header."
+
+    req_line, headers = ssdp_parse_headers(header_content)
+
+    return req_line, headers
+
 def msearch_parse_request(content: bytes) -> dict:
     """
         Takes in the content of the MSEARCH request and parses it into a
@@ -154,23 +195,13 @@ def msearch_parse_request(content: bytes) -> dict:
 
         :return: A python dictionary with key and values from the MSearch request
     """
-    content = content.decode('utf-8')
-
-    respinfo = None
+    reqinfo = None
 
-    resplines = content.splitlines(False)
-    if len(resplines) > 0:
-        header = resplines.pop(0).strip()
-        if header.startswith("M-SEARCH *"):
-            respinfo = {}
-            for nxtline in resplines:
-                cidx = nxtline.find(":")
-                if cidx > -1:
-                    key = nxtline[:cidx].upper()
-                    val = nxtline[cidx+1:].strip()
-                    respinfo[key] = val
+    if content.startswith(b"M-SEARCH *"):
+        header_end, _ = ssdp_header_end(content)
+        _, reqinfo = ssdp_parse_headers(content[:header_end])
 
-    return respinfo
+    return reqinfo
 
 def msearch_parse_response(content: bytes) -> dict:
     """
@@ -181,21 +212,11 @@ def msearch_parse_response(content: bytes) -> dict:
 
         :return: A python dictionary with key and values from the MSearch response
     """
-    content = content.decode('utf-8')
-
     respinfo = None
 
-    resplines = content.splitlines(False)
-    if len(resplines) > 0:
-        header = resplines.pop(0).strip()
-        if header.startswith("HTTP/"):
-            respinfo = {}
-            for nxtline in resplines:
-                cidx = nxtline.find(":")
-                if cidx > -1:
-                    key = nxtline[:cidx].upper()
-                    val = nxtline[cidx+1:].strip()
-                    respinfo[key] = val
+    if content.startswith(b"HTTP/"):
+        header_end, _ = ssdp_header_end(content)
+        _, respinfo = ssdp_parse_headers(content[:header_end])
 
     return respinfo
 
@@ -318,6 +339,71 @@ def msearch_query_host(target_address: str, query_usn: Optional[str]=None, mx: i
     return found_device_info
 
 
+def msearch_create_message(st: str = MSearchTargets.ROOTDEVICE, custom_headers: Optional[dict] = None) -> bytes:
+    """
+        Creates the content of an M-SEARCH request.
+
+        :param st: The search target of the MSearch.
+        :param custom_headers: Optional custom msearch headers.
+
+        :returns: The M-SEARCH request content.
+    """
+    msearch_msg_lines = [
+        b'M-SEARCH * HTTP/1.1',
+        b'HOST: %s:%d' % (UpnpProtocol.MULTICAST_ADDRESS.encode("utf-8"), UpnpProtocol.PORT),
+        b'MAN: "ssdp:discover"',
+        b'ST: %s' % st.encode("utf-8")
+    ]
+
+    if custom_headers is not None:
+        for hname, hval in custom_headers.items():
+            hname = hname.upper().encode("utf-8")
+            msearch_msg_lines.append(b'%s: %s' % (hname, hval.encode("utf-8")))
+
+    msearch_msg_lines.append(b'')
+
+    msearch_msg = b"\r\n".join(msearch_msg_lines)
+
+    return msearch_msg
+
+def msearch_process_response(scan_context: MSearchScanContext, ifname: str, route_info: dict, st: str, resp: bytes, addr: tuple):
+    """
+        Processes a response to an M-SEARCH request that was received on an interface and registers the root
+        device that sent it with the scan context.
+
+        :param scan_context: The scan context to register the device with.
+        :param ifname: The name of the interface the response was received on.
+        :param route_info: The route info about the interface the response was received on.
+        :param st: The search target of the MSearch.
+        :param resp: The content of the response.
+        :param addr: The address the response was received from.
+    """
+    if resp.startswith(b"NOTIFY * HTTP/"):
+        resp = resp.lstrip(b"NOTIFY * ")
+
+    if resp.startswith(b"HTTP/"):
+        device_info = msearch_parse_response(resp)
+
+        if device_info is not None:
+            foundst = device_info.get(MSearchKeys.ST, None)
+            if foundst == st:
+                if MSearchKeys.USN in device_info:
+                    usn_dev, usn_cls = device_info[MSearchKeys.USN].split("::")
+                    usn_dev = usn_dev.lstrip("uuid:")
+                    if usn_cls == "upnp:rootdevice":
+                        device_info[MSearchKeys.USN_DEV] = usn_dev
+                        device_info[MSearchKeys.USN_CLS] = usn_cls
+
+                        device_info[MSearchKeys.IP] = addr[0]
+
+                        scan_context.register_device(ifname, usn_dev, device_info, route_info)
+                else:
+                    print("device_info didn't have a USN. %r" % device_info)
+        else:
+            print("device_info was None.")
+
+    return
+
 def msearch_on_interface(scan_context: MSearchScanContext, ifname: str, ifaddress: str, *,
                          mx: int = 5, st: str = MSearchTargets.ROOTDEVICE, response_timeout: float = 45,
                          ttl: int = 1, custom_headers: Optional[dict]=None, wctx: Optional[WaitContext]=None):
@@ -357,21 +443,7 @@ def msearch_on_interface(scan_context: MSearchScanContext, ifname: str, ifaddres
     multicast_address = UpnpProtocol.MULTICAST_ADDRESS
     multicast_port = UpnpProtocol.PORT
 
-    msearch_msg_lines = [
-        b'M-SEARCH * HTTP/1.1',
-        b'HOST: %s:%d' % (UpnpProtocol.MULTICAST_ADDRESS.encode("utf-8"), UpnpProtocol.PORT),
-        b'MAN: "ssdp:discover"',
-        b'ST: %s' % st.encode("utf-8")
-    ]
-
-    if custom_headers is not None:
-        for hname, hval in custom_headers.items():
-            hname = hname.upper().encode("utf-8")
-            msearch_msg_lines.append(b'%s: %s' % (hname, hval.encode("utf-8")))
-
-    msearch_msg_lines.append(b'')
-
-    msearch_msg = b"\r\n".join(msearch_msg_lines)
+    msearch_msg = msearch_create_message(st=st, custom_headers=custom_headers)
 
     sock = None
 
@@ -388,30 +460,8 @@ def msearch_on_interface(scan_context: MSearchScanContext, ifname: str, ifaddres
         while True:
 
             try:
-                resp, addr = sock.recvfrom(1024)
-                if resp.startswith(b"NOTIFY * HTTP/"):
-                    resp = resp.lstrip(b"NOTIFY * ")
-
-                if resp.startswith(b"HTTP/"):
-                    device_info = msearch_parse_response(resp)
-
-                    if device_info is not None:
-                        foundst = device_info.get(MSearchKeys.ST, None)
-                        if foundst == st:
-                            if MSearchKeys.USN in device_info:
-                                usn_dev, usn_cls = device_info[MSearchKeys.USN].split("::")
-                                usn_dev = usn_dev.lstrip("uuid:")
-                                if usn_cls == "upnp:rootdevice":
-                                    device_info[MSearchKeys.USN_DEV] = usn_dev
-                                    device_info[MSearchKeys.USN_CLS] = usn_cls
-
-                                    device_info[MSearchKeys.IP] = addr[0]
-
-                                    scan_context.register_device(ifname, usn_dev, device_info, route_info)
-                            else:
-                                print("device_info didn't have a USN. %r" % device_info)
-                    else:
-                        print("device_info was None.")
+                resp, addr = sock.recvfrom(MSEARCH_RECV_BUFFER_SIZE)
+                msearch_process_response(scan_context, ifname, route_info, st, resp, addr)
 
             except socket.timeout:
                 pass
@@ -433,18 +483,25 @@ def msearch_on_interface(scan_context: MSearchScanContext, ifname: str, ifaddres
 
 
 def msearch_scan(expected_devices, interface_list=None, response_timeout=45, interval=2, raise_exception=False,
-                 custom_headers: Optional[dict]=None, show_progress=False) -> Tuple[dict, dict]:
+                 custom_headers: Optional[dict]=None, show_progress=False, st: str = MSearchTargets.ROOTDEVICE,
+                 ttl: int = 1) -> Tuple[dict, dict]:
     """
         Performs a msearch across a list of interfaces for a specific expected device.  This method is typically used
         during a persistent search when a device was not found in a broad msearch.
 
+        The sockets for all of the interfaces are serviced from a single selector loop on the calling thread.  The
+        M-SEARCH is sent again on all of the interfaces, with a growing interval, for as long as expected devices
+        are missing and the scan stops as soon as all of the expected devices have been found.
+
         :param expected_devices: A list of USN(s) of a list of devices to search for.
         :param interface_list: A list of interface names to scan for the device.
         :param response_timeout:  The timeout to wait for responses from all the expected devices.
-        :param interval: The retry interval to wait before retrying to search for an expected device.
+        :param interval: The retry interval to wait before sending the M-SEARCH again when expected devices are missing.
         :param raise_exception: A boolean indicating if the mquery should raise an exception on failure.
         :param custom_headers: Custom headers to include in the msearch message
         :param show_progress: Should progress be rendered to the console.
+        :param st: The search target of the MSearch.
+        :param ttl: The time to live for the multicast packets.
 
         :returns: A tuple with a dictionary of found and a dictionary of matching devices found.
     """
@@ -453,16 +510,14 @@ def msearch_scan(expected_devices, interface_list=None, response_timeout=45, int
 
     scan_context = MSearchScanContext(expected_devices)
 
-    search_threads = []
+    multicast_address = (UpnpProtocol.MULTICAST_ADDRESS, UpnpProtocol.PORT)
 
-    progress = None
-    if show_progress:
-        progress = ProgressOfDurationWaitContext.create_rich_progress()
+    msearch_msg = msearch_create_message(st=st, custom_headers=custom_headers)
 
-    try:
-        if progress is not None:
-            progress.start()
+    selector = selectors.DefaultSelector()
+    search_sockets = []
 
+    try:
         for ifname in interface_list:
             ifaddress = None
 
@@ -479,31 +534,79 @@ def msearch_scan(expected_devices, interface_list=None, response_timeout=45, int
                 #    ifaddress = addr_info["addr"]
 
                 if ifaddress is not None:
-                    thname = "msearch-%s" % ifname
-                    thargs = (scan_context, ifname, ifaddress)
-                    wctx = None
-                    if progress is not None:
-                        wctx = ProgressOfDurationWaitContext(progress, thname, timeout=response_timeout)
-                    else:
-                        wctx = WaitContext(timeout=response_timeout)
+                    route_info = {
+                        MSearchRouteKeys.IFNAME: ifname,
+                        MSearchRouteKeys.IP: ifaddress
+                    }
+
+                    try:
+                        sock = create_multicast_socket_for_iface(UpnpProtocol.MULTICAST_ADDRESS, ifname, UpnpProtocol.PORT,
+                                                                 socket.AF_INET, ttl=ttl)
+                    except OSError:
+                        logger.exception("msearch_scan: Unable to create a search socket for interface %s." % ifname)
+                        continue
+
+                    sock.setblocking(False)
+                    search_sockets.append(sock)
+                    selector.register(sock, selectors.EVENT_READ, (ifname, route_info))
+
+        found_count = 0
+        search_count = 0
+
+        now = time.monotonic()
+        end_time = now + response_timeout
+        send_time = now
+        send_interval = interval
+
+        while scan_context.continue_scan and now < end_time:
+
+            if now >= send_time:
+                # Only search again while we are still looking for devices, without hints we
+                # are collecting every device that answers the first search.
+                if search_count == 0 or len(scan_context.remaining_device_hints) > 0:
+                    for sock in search_sockets:
+                        try:
+                            sock.sendto(msearch_msg, multicast_address)
+                        except OSError:
+                            pass
+                    search_count += 1
+                send_time = now + send_interval
+                send_interval = min(send_interval * 2, MSEARCH_RESEND_INTERVAL_MAX)
+
+            select_timeout = min(send_time, end_time) - now
+            for skey, _ in selector.select(timeout=select_timeout):
+                ifname, route_info = skey.data
+                sock = skey.fileobj
+
+                # Drain all of the responses that are waiting on the socket
+                while True:
+                    try:
+                        resp, addr = sock.recvfrom(MSEARCH_RECV_BUFFER_SIZE)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        logger.exception("msearch_scan: Error receiving on interface %s." % ifname)
+                        break
 
-                    thkwargs = { "wctx": wctx, "custom_headers": custom_headers}
+                    try:
+                        msearch_process_response(scan_context, ifname, route_info, st, resp, addr)
+                    except Exception: # pylint: disable=broad-except
+                        logger.exception("msearch_scan: Error processing response from %s." % addr[0])
 
-                    sthread = threading.Thread(name=thname, target=msearch_on_interface, args=thargs, kwargs=thkwargs)
-                    sthread.start()
-                    search_threads.append(sthread)
+            if show_progress and len(scan_context.matching_devices) > found_count:
+                found_count = len(scan_context.matching_devices)
+                print("MSEARCH: found %d of %d expected devices." % (found_count, len(expected_devices)))
 
-        # Wait for all the search threads to finish
-        while len(search_threads) > 0:
-            nxt_thread = search_threads.pop(0)
-            nxt_thread.join()
+            now = time.monotonic()
 
     finally:
-        if progress is not None:
-            progress.stop()
+        selector.close()
+        for sock in search_sockets:
+            sock.close()
 
-    found_devices = copy.deepcopy(scan_context.found_devices)
-    matching_devices = copy.deepcopy(scan_context.matching_devices)
+    # The scan context is not shared with any other thread so the results can be handed back as they are
+    found_devices = scan_context.found_devices
+    matching_devices = scan_context.matching_devices
 
     if raise_exception and len(matching_devices) != len(expected_devices):
         err_msg = "Failed to find expected UPNP devices after a timeout of %s seconds.\n" % response_timeout
@@ -539,46 +642,25 @@ def msearch_scan(expected_devices, interface_list=None, response_timeout=45, int
 
     return found_devices, matching_devices
 
-def notify_parse_request(content: str) -> dict:
+def notify_parse_request(content: bytes) -> Tuple[dict, str]:
     """
         Takes in the content of the NOTIFY request and parses it into a
         python dictionary object.
 
-        :param content: Notify request content as a string.
+        :param content: Notify request content as bytes.
 
         :return: A python dictionary with key and values from the Notify request
     """
-    content = content.decode('utf-8')
-
     resp_headers = None
     resp_body = None
 
-    mobj = REGEX_NOTIFY_HEADER.search(content)
-    if mobj is not None:
-        header_content = None
-        body_content = None
-
-        if content.find("\r\n\r\n") > -1:
-            header_content, body_content = content.split("\r\n\r\n", 1)
-        elif content.find("\n\n") > -1:
-            header_content, body_content = content.split("\n\n", 1)
-        else:
-            header_content = content
-
-        resplines = header_content.splitlines(False)
-
-        # Pop the NOTIFY header
-        resplines.pop(0).strip()
+    header_end, body_start = ssdp_header_end(content)
 
-        resp_headers = {}
-        for nxtline in resplines:
-            cidx = nxtline.find(":")
-            if cidx > -1:
-                key = nxtline[:cidx].upper()
-                val = nxtline[cidx+1:].strip()
-                resp_headers[key] = val
+    start_line, headers = ssdp_parse_headers(content[:header_end])
+    if REGEX_NOTIFY_HEADER.match(start_line.decode("utf-8")):
+        resp_headers = headers
 
-        if body_content is not None:
-            resp_body = body_content
+        if body_start > -1:
+            resp_body = content[body_start:].decode("utf-8")
 
     return resp_headers, resp_body
@@ -0,0 +1,398 @@
+"""
+.. module:: upnprenewalscheduler
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpRenewalScheduler` which renews the event subscriptions of the
+               UpnpCoordinator devices ahead of their expiration.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
+
+import heapq
+import logging
+import random
+import threading
+import time
+
+from datetime import datetime
+
+from mojo.interop.protocols.upnp.upnpconstants import TIMEDELTA_RENEWAL_WINDOW
+from mojo.interop.protocols.upnp.upnpworkqueue import UpnpWorkQueue
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.devices.upnprootdevice import UpnpRootDevice
+
+logger = logging.getLogger()
+
+# A subscription is renewed when this fraction of its lifetime remains, but never
+# earlier than the renewal window before it expires.
+RENEWAL_LEAD_FRACTION = 0.5
+RENEWAL_LEAD_MAX = TIMEDELTA_RENEWAL_WINDOW
+
+# The renewal times are moved earlier by a random amount of up to this fraction of
+# the lead time so subscriptions created together are not renewed together.
+RENEWAL_JITTER_FRACTION = 0.2
+
+# Subscriptions of the same host that are due within the coalesce window of a due
+# subscription are renewed in the same batch.
+RENEWAL_COALESCE_WINDOW = 10
+
+RENEWAL_RETRY_BASE = 2
+RENEWAL_RETRY_MAX = 60
+RENEWAL_RETRY_LIMIT = 8
+
+# The delay before trying to queue a batch again when the work queue is full.
+RENEWAL_REQUEUE_DELAY = 1
+
+RENEWAL_STOP_TIMEOUT = 10
+
+
+class UpnpRenewalEntry:
+    """
+        The scheduling state of a single event subscription.
+    """
+
+    __slots__ = ("key", "device", "service_type", "host", "expires", "renew_at", "failures", "seq", "pending")
+
+    def __init__(self, key: Hashable, device: "UpnpRootDevice", service_type: str, host: str, expires: float, renew_at: float, seq: int):
+        self.key = key
+        self.device = device
+        self.service_type = service_type
+        self.host = host
+        self.expires = expires
+        self.renew_at = renew_at
+        self.failures = 0
+        self.seq = seq
+        self.pending = False
+        return
+
+
+class UpnpRenewalScheduler:
+    """
+        The :class:`UpnpRenewalScheduler` keeps a heap of the event subscriptions ordered by the time they need to
+        be renewed and renews each subscription before it expires, instead of waiting for something to touch the
+        subscription inside of the renewal window.
+
+        * Renewals are scheduled early, when :data:`RENEWAL_LEAD_FRACTION` of the subscription lifetime remains,
+          and are moved earlier by a random jitter so the renewal traffic is spread out.
+        * The subscriptions of a host that are due at about the same time are renewed together in one work packet
+          that is keyed by the host, so they share the keep-alive connection to the device.
+        * Failed renewals are retried with an exponential backoff.
+        * The renewal latency and failure counts are published through :meth:`statistics`.
+
+        The scheduler thread only decides when renewals are due, the renewals are made by the coordinator worker
+        threads through the work queue.
+    """
+
+    def __init__(self, work_queue: UpnpWorkQueue):
+        """
+            Creates a :class:`UpnpRenewalScheduler` that queues its renewal batches on the specified work queue.
+
+            :param work_queue: The work queue the renewal batches are processed on.
+        """
+        self._work_queue = work_queue
+
+        self._random = random.Random()
+
+        self._schedule_lock = threading.Lock()
+        self._schedule_changed = threading.Condition(self._schedule_lock)
+
+        self._sched_thread: Optional[threading.Thread] = None
+
+        # ======================= Schedule Lock Variables ========================
+        # These variables are protected by the schedule lock and are prefixed with
+        # _sl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._sl_running = False
+        self._sl_entries: Dict[Hashable, UpnpRenewalEntry] = {}
+        self._sl_heap: List[Tuple[float, int, Hashable]] = []
+        self._sl_next_seq = 0
+
+        self._sl_renewed = 0
+        self._sl_failed = 0
+        self._sl_retried = 0
+        self._sl_dropped = 0
+        self._sl_late = 0
+        self._sl_batches = 0
+        self._sl_latency_total = 0.0
+        self._sl_latency_max = 0.0
+        self._sl_latency_last = 0.0
+        return
+
+    def __len__(self) -> int:
+        return len(self._sl_entries)
+
+    @property
+    def running(self) -> bool:
+        """
+            Indicates if the scheduler thread is running.
+        """
+        return self._sl_running
+
+    def cancel(self, device: "UpnpRootDevice", service_type: str):
+        """
+            Stops renewing the subscription of a device service.
+
+            :param device: The device that owns the subscription.
+            :param service_type: The service type of the subscription.
+        """
+        key = (id(device), service_type)
+
+        self._schedule_lock.acquire()
+        try:
+            if key in self._sl_entries:
+                del self._sl_entries[key]
+        finally:
+            self._schedule_lock.release()
+
+        return
+
+    def schedule(self, device: "UpnpRootDevice", service_type: str, host: str, expires: datetime):
+        """
+            Schedules the renewal of the subscription of a device service, replacing any renewal that was
+            already scheduled for the subscription.
+
+            :param device: The device that owns the subscription.
+            :param service_type: The service type of the subscription.
+            :param host: The host:port of the device, renewals are batched by host.
+            :param expires: The time the subscription expires.
+        """
+        key = (id(device), service_type)
+
+        now = time.monotonic()
+
+        lifetime = (expires - datetime.now()).total_seconds()
+        expires_at = now + lifetime
+
+        lead = min(max(lifetime, 0) * RENEWAL_LEAD_FRACTION, RENEWAL_LEAD_MAX)
+        lead += self._random.uniform(0, lead * RENEWAL_JITTER_FRACTION)
+        renew_at = expires_at - lead
+
+        self._schedule_lock.acquire()
+        try:
+            entry = UpnpRenewalEntry(key, device, service_type, host, expires_at, renew_at, self._sl_next_seq)
+            self._sl_next_seq += 1
+
+            self._sl_entries[key] = entry
+            self._locked_push_entry(entry)
+        finally:
+            self._schedule_lock.release()
+
+        return
+
+    def start(self):
+        """
+            Starts the scheduler thread.
+        """
+        self._schedule_lock.acquire()
+        try:
+            if self._sl_running:
+                raise RuntimeError("UpnpRenewalScheduler.start called twice, the scheduler is already running.") from None
+            self._sl_running = True
+        finally:
+            self._schedule_lock.release()
+
+        self._sched_thread = threading.Thread(name="UpnpCoordinator - Renewal", target=self._thread_entry_scheduler, daemon=True)
+        self._sched_thread.start()
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the renewal counters and latencies.
+        """
+        stats = None
+
+        self._schedule_lock.acquire()
+        try:
+            latency_avg = 0.0
+            if self._sl_renewed > 0:
+                latency_avg = self._sl_latency_total / self._sl_renewed
+
+            stats = {
+                "scheduled": len(self._sl_entries),
+                "batches": self._sl_batches,
+                "renewed": self._sl_renewed,
+                "failed": self._sl_failed,
+                "retried": self._sl_retried,
+                "dropped": self._sl_dropped,
+                "late": self._sl_late,
+                "latency_avg": latency_avg,
+                "latency_max": self._sl_latency_max,
+                "latency_last": self._sl_latency_last
+            }
+        finally:
+            self._schedule_lock.release()
+
+        return stats
+
+    def stop(self, timeout: float = RENEWAL_STOP_TIMEOUT):
+        """
+            Stops the scheduler thread and clears the schedule.
+
+            :param timeout: The time to wait for the scheduler thread to exit.
+        """
+        self._schedule_lock.acquire()
+        try:
+            self._sl_running = False
+            self._sl_entries.clear()
+            self._sl_heap.clear()
+            self._schedule_changed.notify_all()
+        finally:
+            self._schedule_lock.release()
+
+        if self._sched_thread is not None:
+            if self._sched_thread is not threading.current_thread():
+                self._sched_thread.join(timeout)
+            self._sched_thread = None
+
+        return
+
+    def _locked_collect_due(self, now: float) -> Dict[str, List[UpnpRenewalEntry]]:
+        """
+            Pops the due entries off of the heap, along with the entries of the same hosts that are due within
+            the coalesce window, grouped by host.  The schedule lock must be held by the caller.
+        """
+        batches: Dict[str, List[UpnpRenewalEntry]] = {}
+
+        heap = self._sl_heap
+        while len(heap) > 0 and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self._sl_entries.get(key)
+            if entry is not None and entry.seq == seq and not entry.pending:
+                entry.pending = True
+                batches.setdefault(entry.host, []).append(entry)
+
+        if len(batches) > 0:
+            coalesce_before = now + RENEWAL_COALESCE_WINDOW
+            for entry in self._sl_entries.values():
+                if not entry.pending and entry.host in batches and entry.renew_at <= coalesce_before:
+                    entry.pending = True
+                    batches[entry.host].append(entry)
+
+        return batches
+
+    def _locked_push_entry(self, entry: UpnpRenewalEntry):
+        """
+            Pushes an entry onto the heap and wakes the scheduler thread if the entry is the next one due.
+            The schedule lock must be held by the caller.
+        """
+        heapq.heappush(self._sl_heap, (entry.renew_at, entry.seq, entry.key))
+        if self._sl_heap[0][2] == entry.key:
+            self._schedule_changed.notify()
+        return
+
+    def _locked_retry_entry(self, entry: UpnpRenewalEntry, delay: float):
+        """
+            Puts an entry back on the heap to be tried again after a delay.  The schedule lock must be
+            held by the caller.
+        """
+        entry.pending = False
+        entry.seq = self._sl_next_seq
+        self._sl_next_seq += 1
+        entry.renew_at = time.monotonic() + delay
+        self._locked_push_entry(entry)
+        return
+
+    def _renew_batch(self, host: str, batch: List[UpnpRenewalEntry]):
+        """
+            Renews a batch of subscriptions for a host.  This runs on a coordinator worker thread.
+        """
+        for entry in batch:
+            renewed = False
+            failed = False
+
+            start = time.monotonic()
+            try:
+                renewed = entry.device.renew_subscription(entry.service_type)
+            except Exception: # pylint: disable=broad-except
+                failed = True
+                logger.exception("UpnpRenewalScheduler: Error renewing subscription host={} service={}.".format(
+                    host, entry.service_type))
+            finish = time.monotonic()
+
+            self._schedule_lock.acquire()
+            try:
+                current = self._sl_entries.get(entry.key) is entry
+
+                if failed:
+                    self._sl_failed += 1
+                    entry.failures += 1
+                    if current:
+                        if entry.failures <= RENEWAL_RETRY_LIMIT and self._sl_running:
+                            delay = min(RENEWAL_RETRY_BASE * (2 ** (entry.failures - 1)), RENEWAL_RETRY_MAX)
+                            delay += self._random.uniform(0, delay * RENEWAL_JITTER_FRACTION)
+                            self._sl_retried += 1
+                            self._locked_retry_entry(entry, delay)
+                        else:
+                            self._sl_dropped += 1
+                            del self._sl_entries[entry.key]
+
+                elif renewed:
+                    # A successful renewal re-schedules the subscription through 'schedule'
+                    latency = finish - start
+                    self._sl_renewed += 1
+                    self._sl_latency_total += latency
+                    self._sl_latency_last = latency
+                    if latency > self._sl_latency_max:
+                        self._sl_latency_max = latency
+                    if start > entry.expires:
+                        self._sl_late += 1
+
+                    if current:
+                        del self._sl_entries[entry.key]
+
+                elif current:
+                    # The device no longer has the subscription
+                    self._sl_dropped += 1
+                    del self._sl_entries[entry.key]
+            finally:
+                self._schedule_lock.release()
+
+        return
+
+    def _thread_entry_scheduler(self):
+        """
+            The entry point for the scheduler thread.  The thread sleeps until the next renewal is due and
+            then queues the due renewals as per host batches on the work queue.
+        """
+        self._schedule_lock.acquire()
+        try:
+            while self._sl_running:
+                now = time.monotonic()
+
+                batches = self._locked_collect_due(now)
+
+                if len(batches) > 0:
+                    self._schedule_lock.release()
+                    try:
+                        unqueued = []
+                        for host, batch in batches.items():
+                            if not self._work_queue.enqueue(self._renew_batch, (host, batch), order_key=host):
+                                unqueued.append(batch)
+                    finally:
+                        self._schedule_lock.acquire()
+
+                    self._sl_batches += len(batches) - len(unqueued)
+                    for batch in unqueued:
+                        for entry in batch:
+                            if self._sl_entries.get(entry.key) is entry:
+                                self._locked_retry_entry(entry, RENEWAL_REQUEUE_DELAY)
+                    continue
+
+                wait_time = None
+                if len(self._sl_heap) > 0:
+                    wait_time = max(self._sl_heap[0][0] - now, 0)
+
+                self._schedule_changed.wait(wait_time)
+        finally:
+            self._schedule_lock.release()
+
+        return
@@ -0,0 +1,275 @@
+"""
+.. module:: upnptrafficrecorder
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpTrafficRecorder` which records the SSDP datagrams, GENA NOTIFY callbacks
+               and SOAP exchanges seen by the UpnpCoordinator into a capture file that can be replayed.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Generator, Optional, Tuple
+
+import base64
+import json
+import threading
+import time
+
+from datetime import datetime
+
+TRAFFIC_CAPTURE_FORMAT = "upnp-traffic"
+TRAFFIC_CAPTURE_VERSION = 1
+
+
+class UpnpTrafficKind:
+    SSDP = "ssdp"
+    GENA = "gena"
+    SOAP = "soap"
+
+
+class UpnpTrafficRecord:
+    """
+        A single item of recorded UPnP traffic.
+
+        * SSDP records have the sender address and the datagram content.
+        * GENA records have the sender address, the path and headers of the NOTIFY request and the event body.
+        * SOAP records have the url and headers of the request, the request body and the status, headers and
+          body of the response.
+    """
+
+    __slots__ = ("offset", "kind", "address", "path", "headers", "content", "status", "response_headers", "response_content")
+
+    def __init__(self, offset: float, kind: str, address: Optional[Tuple[str, int]] = None, path: Optional[str] = None,
+                 headers: Optional[dict] = None, content: bytes = b"", status: Optional[int] = None,
+                 response_headers: Optional[dict] = None, response_content: bytes = b""):
+        self.offset = offset
+        self.kind = kind
+        self.address = address
+        self.path = path
+        self.headers = headers
+        self.content = content
+        self.status = status
+        self.response_headers = response_headers
+        self.response_content = response_content
+        return
+
+    def __repr__(self) -> str:
+        rstr = "<UpnpTrafficRecord offset={:.6f} kind={} address={} path={}>".format(self.offset, self.kind, self.address, self.path)
+        return rstr
+
+    def to_json(self) -> str:
+        """
+            Encodes the record as a single line of JSON, the content fields are base64 encoded.
+        """
+        rinfo = {
+            "t": round(self.offset, 6),
+            "k": self.kind
+        }
+
+        if self.address is not None:
+            rinfo["a"] = list(self.address)
+        if self.path is not None:
+            rinfo["p"] = self.path
+        if self.headers is not None:
+            rinfo["h"] = self.headers
+        if self.content:
+            rinfo["c"] = base64.b64encode(self.content).decode("ascii")
+        if self.status is not None:
+            rinfo["s"] = self.status
+        if self.response_headers is not None:
+            rinfo["rh"] = self.response_headers
+        if self.response_content:
+            rinfo["rc"] = base64.b64encode(self.response_content).decode("ascii")
+
+        rjson = json.dumps(rinfo, separators=(",", ":"))
+        return rjson
+
+    @classmethod
+    def from_json(cls, line: str) -> "UpnpTrafficRecord":
+        """
+            Decodes a record from a line of JSON written by :meth:`to_json`.
+        """
+        rinfo = json.loads(line)
+
+        address = rinfo.get("a")
+        if address is not None:
+            address = tuple(address)
+
+        content = rinfo.get("c")
+        content = base64.b64decode(content) if content is not None else b""
+
+        response_content = rinfo.get("rc")
+        response_content = base64.b64decode(response_content) if response_content is not None else b""
+
+        record = cls(rinfo["t"], rinfo["k"], address=address, path=rinfo.get("p"), headers=rinfo.get("h"),
+                     content=content, status=rinfo.get("s"), response_headers=rinfo.get("rh"),
+                     response_content=response_content)
+
+        return record
+
+
+class UpnpTrafficRecorder:
+    """
+        The :class:`UpnpTrafficRecorder` writes the UPnP traffic handed to it into a JSONL capture file.  The
+        first line of the file is a header that identifies the format, each line after that is a record with
+        the time offset of the traffic from the start of the recording.  The recorder is called from the
+        monitor, callback and worker threads of the coordinator so writes are serialized by a lock.
+    """
+
+    def __init__(self, filename: str):
+        """
+            Creates a recorder and opens the capture file for writing.
+
+            :param filename: The full path of the capture file.
+        """
+        self._filename = filename
+
+        self._record_lock = threading.Lock()
+
+        # ======================= Record Lock Variables ========================
+        # These variables are protected by the record lock and are prefixed with
+        # _rl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._rl_capture_file = open(filename, 'w')
+        self._rl_record_count = 0
+
+        self._started = time.perf_counter()
+
+        header = {
+            "format": TRAFFIC_CAPTURE_FORMAT,
+            "version": TRAFFIC_CAPTURE_VERSION,
+            "started": datetime.now().isoformat()
+        }
+        self._rl_capture_file.write(json.dumps(header) + "\n")
+
+        return
+
+    def __enter__(self) -> "UpnpTrafficRecorder":
+        return self
+
+    def __exit__(self, ex_type, ex_inst, ex_tb):
+        self.close()
+        return False
+
+    @property
+    def filename(self) -> str:
+        """
+            The full path of the capture file.
+        """
+        return self._filename
+
+    @property
+    def record_count(self) -> int:
+        """
+            The number of records that have been written.
+        """
+        return self._rl_record_count
+
+    def close(self):
+        """
+            Closes the capture file, traffic handed to the recorder after it is closed is ignored.
+        """
+        self._record_lock.acquire()
+        try:
+            if self._rl_capture_file is not None:
+                self._rl_capture_file.close()
+                self._rl_capture_file = None
+        finally:
+            self._record_lock.release()
+
+        return
+
+    def record_gena(self, address: Tuple[str, int], headers: dict, content: bytes, path: str = "/"):
+        """
+            Records a GENA NOTIFY subscription callback.
+
+            :param address: The address of the device that made the callback.
+            :param headers: The headers of the NOTIFY request.
+            :param content: The body of the NOTIFY request.
+            :param path: The path of the NOTIFY request.
+        """
+        record = UpnpTrafficRecord(self._offset(), UpnpTrafficKind.GENA, address=address, path=path,
+                                   headers=dict(headers), content=content)
+        self._write_record(record)
+        return
+
+    def record_soap(self, url: str, headers: dict, content: bytes, status: int, response_headers: dict, response_content: bytes):
+        """
+            Records a SOAP action exchange.
+
+            :param url: The control url the action request was made to.
+            :param headers: The headers of the action request.
+            :param content: The body of the action request.
+            :param status: The status code of the response.
+            :param response_headers: The headers of the response.
+            :param response_content: The body of the response.
+        """
+        record = UpnpTrafficRecord(self._offset(), UpnpTrafficKind.SOAP, path=url, headers=dict(headers), content=content,
+                                   status=status, response_headers=dict(response_headers), response_content=response_content)
+        self._write_record(record)
+        return
+
+    def record_ssdp(self, address: Tuple[str, int], content: bytes):
+        """
+            Records an SSDP datagram.
+
+            :param address: The address of the sender of the datagram.
+            :param content: The content of the datagram.
+        """
+        record = UpnpTrafficRecord(self._offset(), UpnpTrafficKind.SSDP, address=address, content=content)
+        self._write_record(record)
+        return
+
+    def _offset(self) -> float:
+        """
+            The time offset from the start of the recording.
+        """
+        offset = time.perf_counter() - self._started
+        return offset
+
+    def _write_record(self, record: UpnpTrafficRecord):
+        """
+            Encodes a record and writes it to the capture file.
+        """
+        # Encode outside of the lock so the recording threads only serialize on the write
+        rline = record.to_json() + "\n"
+
+        self._record_lock.acquire()
+        try:
+            if self._rl_capture_file is not None:
+                self._rl_capture_file.write(rline)
+                self._rl_record_count += 1
+        finally:
+            self._record_lock.release()
+
+        return
+
+
+def read_traffic_capture(filename: str) -> Generator[UpnpTrafficRecord, None, None]:
+    """
+        Reads the records of a capture file written by a :class:`UpnpTrafficRecorder`.
+
+        :param filename: The full path of the capture file.
+
+        :returns: A generator of the records in the order they were recorded.
+
+        :raises: :class:`ValueError` if the file is not a UPnP traffic capture.
+    """
+    with open(filename, 'r') as cf:
+        header_line = cf.readline()
+
+        header = json.loads(header_line) if header_line else {}
+        if header.get("format") != TRAFFIC_CAPTURE_FORMAT:
+            errmsg = "The file '{}' is not a UPnP traffic capture.".format(filename)
+            raise ValueError(errmsg)
+
+        for line in cf:
+            line = line.strip()
+            if line:
+                yield UpnpTrafficRecord.from_json(line)
+
+    return
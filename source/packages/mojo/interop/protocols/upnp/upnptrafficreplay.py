@@ -0,0 +1,326 @@
+"""
+.. module:: upnptrafficreplay
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpTrafficReplayer` which plays back a traffic capture against the UpnpCoordinator
+               over loopback and the :class:`UpnpTrafficReplayServer` which answers the recorded SOAP exchanges.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import socket
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from mojo.interop.protocols.upnp.genanotify import gena_send_notify
+from mojo.interop.protocols.upnp.upnpprotocol import UpnpProtocol
+from mojo.interop.protocols.upnp.upnptrafficrecorder import UpnpTrafficKind, UpnpTrafficRecord
+
+# Types imported only for type checking purposes
+if TYPE_CHECKING:
+    from mojo.interop.protocols.upnp.upnpcoordinator import UpnpCoordinator
+
+LOOPBACK_ADDRESS = "127.0.0.1"
+
+DEFAULT_GENA_RESPONSE_TIMEOUT = 10
+
+
+class UpnpTrafficReplayServer:
+    """
+        The :class:`UpnpTrafficReplayServer` is a loopback HTTP server that answers SOAP action requests with the
+        responses that were recorded for them.  Requests are matched by the path of the control url and the
+        SOAPAction header, when the same action was recorded more than once the responses are returned in the
+        order they were recorded and the last response is repeated once they have all been used.
+    """
+
+    def __init__(self, records: Iterable[UpnpTrafficRecord], host: str = LOOPBACK_ADDRESS, port: int = 0):
+        """
+            Creates a replay server for the SOAP records of a capture.
+
+            :param records: The records of the capture, the records that are not SOAP exchanges are ignored.
+            :param host: The address to serve on.
+            :param port: The port to serve on or zero to use an ephemeral port.
+        """
+        self._host = host
+        self._port = port
+
+        self._server_lock = threading.Lock()
+
+        # ======================= Server Lock Variables ========================
+        # These variables are protected by the server lock and are prefixed with
+        # _sl_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._sl_responses: Dict[Tuple[str, str], List[UpnpTrafficRecord]] = {}
+        self._sl_response_index: Dict[Tuple[str, str], int] = {}
+        self._sl_answered = 0
+        self._sl_unmatched = 0
+
+        for record in records:
+            if record.kind == UpnpTrafficKind.SOAP:
+                key = (urlparse(record.path).path, self._soap_action_header(record.headers))
+                self._sl_responses.setdefault(key, []).append(record)
+
+        self._server = None
+        self._server_thread = None
+        return
+
+    @property
+    def base_url(self) -> str:
+        """
+            The base url of the server, the control urls of service proxies are rebased to this url so their
+            action calls are answered by the server.
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """
+            Starts serving the recorded responses on a background thread.
+        """
+        replay_server = self
+
+        class ReplayRequestHandler(BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # The headers and body are written separately, without NODELAY the body
+                # waits on the delayed acknowledgement of the headers.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return
+
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length", 0))
+                if content_length > 0:
+                    self.rfile.read(content_length)
+
+                key = (urlparse(self.path).path, self.headers.get("SOAPAction", ""))
+                record = replay_server._next_response(key)
+
+                if record is not None:
+                    body = record.response_content
+                    self.send_response(record.status)
+                    for hdr_name, hdr_val in record.response_headers.items():
+                        if hdr_name.upper() not in ("CONTENT-LENGTH", "CONNECTION", "TRANSFER-ENCODING", "CONTENT-ENCODING"):
+                            self.send_header(hdr_name, hdr_val)
+                else:
+                    body = b""
+                    self.send_response(404)
+
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            def log_message(self, format, *args): # pylint: disable=redefined-builtin
+                return
+
+        self._server = ThreadingHTTPServer((self._host, self._port), ReplayRequestHandler)
+        self._server.daemon_threads = True
+
+        self._server_thread = threading.Thread(name="UpnpTrafficReplayServer", target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the counts of the requests that were answered and that had no recorded response.
+        """
+        stats = None
+
+        self._server_lock.acquire()
+        try:
+            stats = {
+                "answered": self._sl_answered,
+                "unmatched": self._sl_unmatched
+            }
+        finally:
+            self._server_lock.release()
+
+        return stats
+
+    def stop(self):
+        """
+            Stops the server and waits for the server thread to exit.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server_thread.join()
+            self._server = None
+            self._server_thread = None
+        return
+
+    def _next_response(self, key: Tuple[str, str]) -> Optional[UpnpTrafficRecord]:
+        """
+            Gets the next recorded response for a request.
+        """
+        record = None
+
+        self._server_lock.acquire()
+        try:
+            responses = self._sl_responses.get(key)
+            if responses is not None:
+                rindex = self._sl_response_index.get(key, 0)
+                record = responses[min(rindex, len(responses) - 1)]
+                self._sl_response_index[key] = rindex + 1
+                self._sl_answered += 1
+            else:
+                self._sl_unmatched += 1
+        finally:
+            self._server_lock.release()
+
+        return record
+
+    def _soap_action_header(self, headers: Optional[dict]) -> str:
+        """
+            Gets the SOAPAction header of a recorded request regardless of the case of the header name.
+        """
+        soap_action = ""
+        if headers is not None:
+            for hdr_name, hdr_val in headers.items():
+                if hdr_name.upper() == "SOAPACTION":
+                    soap_action = hdr_val
+                    break
+        return soap_action
+
+
+class UpnpTrafficReplayer:
+    """
+        The :class:`UpnpTrafficReplayer` plays back the SSDP datagrams and GENA NOTIFY callbacks of a capture over
+        loopback.  The datagrams are sent to the SSDP port the coordinator is listening on and the callbacks are
+        made to its callback server, so the traffic goes through the same sockets, parsing and work queue as the
+        traffic from real devices.  The SOAP exchanges of a capture are answered by a :class:`UpnpTrafficReplayServer`.
+
+        The traffic is played back with the timing it was recorded with, divided by the speed.  A speed of zero
+        plays the traffic back as fast as it can be sent.
+    """
+
+    def __init__(self, records: Iterable[UpnpTrafficRecord], speed: float = 1.0):
+        """
+            Creates a replayer for the records of a capture.
+
+            :param records: The records of the capture in the order they were recorded.
+            :param speed: The playback speed, 1.0 for the recorded timing or zero for no delays.
+        """
+        self._records = [rec for rec in records if rec.kind in (UpnpTrafficKind.SSDP, UpnpTrafficKind.GENA)]
+        self._speed = speed
+        return
+
+    @property
+    def records(self) -> List[UpnpTrafficRecord]:
+        """
+            The SSDP and GENA records that are played back.
+        """
+        return self._records
+
+    def replay(self, ssdp_address: Optional[Tuple[str, int]] = None, gena_address: Optional[Tuple[str, int]] = None,
+               gena_timeout: float = DEFAULT_GENA_RESPONSE_TIMEOUT) -> dict:
+        """
+            Plays back the records of the capture.
+
+            :param ssdp_address: The address to send the SSDP datagrams to or None to skip the datagrams.
+            :param gena_address: The address to make the GENA callbacks to or None to skip the callbacks.
+            :param gena_timeout: The time to wait for the response to each callback.
+
+            :returns: A dictionary with the counts of the traffic sent, the elapsed time, the events per second,
+                      the maximum time the playback fell behind the schedule and the callback response times.
+        """
+        ssdp_sent = 0
+        gena_sent = 0
+        gena_failed = 0
+        gena_response_total = 0.0
+        gena_response_max = 0.0
+        lag_max = 0.0
+
+        speed = self._speed
+
+        ssdp_sock = None
+        if ssdp_address is not None:
+            ssdp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        try:
+            started = time.perf_counter()
+            first_offset = self._records[0].offset if len(self._records) > 0 else 0.0
+
+            for record in self._records:
+                if speed:
+                    due = started + (record.offset - first_offset) / speed
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        lag = -delay
+                        if lag > lag_max:
+                            lag_max = lag
+
+                if record.kind == UpnpTrafficKind.SSDP:
+                    if ssdp_sock is not None:
+                        ssdp_sock.sendto(record.content, ssdp_address)
+                        ssdp_sent += 1
+
+                elif gena_address is not None:
+                    request_start = time.perf_counter()
+                    if gena_send_notify(gena_address, record.path, record.headers, record.content, timeout=gena_timeout):
+                        gena_sent += 1
+                        response_time = time.perf_counter() - request_start
+                        gena_response_total += response_time
+                        if response_time > gena_response_max:
+                            gena_response_max = response_time
+                    else:
+                        gena_failed += 1
+
+            elapsed = time.perf_counter() - started
+
+        finally:
+            if ssdp_sock is not None:
+                ssdp_sock.close()
+
+        events = ssdp_sent + gena_sent
+
+        stats = {
+            "ssdp_sent": ssdp_sent,
+            "gena_sent": gena_sent,
+            "gena_failed": gena_failed,
+            "elapsed": elapsed,
+            "events_per_second": events / elapsed if elapsed > 0 else 0.0,
+            "lag_max": lag_max,
+            "gena_response_avg": gena_response_total / gena_sent if gena_sent > 0 else 0.0,
+            "gena_response_max": gena_response_max
+        }
+
+        return stats
+
+    def replay_to_coordinator(self, coordinator: "UpnpCoordinator", ifname: str,
+                              ssdp_address: Optional[Tuple[str, int]] = (LOOPBACK_ADDRESS, UpnpProtocol.PORT)) -> dict:
+        """
+            Plays back the records of the capture against a running coordinator.  The callbacks are made to the
+            callback server of the coordinator for the specified interface.
+
+            :param coordinator: The running coordinator.
+            :param ifname: The interface whose callback server the GENA callbacks are made to.
+            :param ssdp_address: The address to send the SSDP datagrams to.
+
+            :returns: The statistics of the playback, see :meth:`replay`.
+        """
+        gena_address = None
+
+        callback_url = coordinator.lookup_callback_url_for_interface(ifname)
+        if callback_url is not None:
+            callback_url = urlparse(callback_url.strip("<>"))
+            gena_address = (LOOPBACK_ADDRESS, callback_url.port)
+
+        stats = self.replay(ssdp_address=ssdp_address, gena_address=gena_address)
+
+        return stats
@@ -0,0 +1,263 @@
+"""
+.. module:: upnpworkqueue
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Contains the :class:`UpnpWorkQueue` which is the work dispatching engine that sits between
+               the UpnpCoordinator network threads and its pool of worker threads.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import threading
+import time
+
+from collections import deque
+
+DEFAULT_WORK_QUEUE_MAX_DEPTH = 4096
+
+
+class UpnpWorkPacket:
+    """
+        A unit of work that is queued by a network thread and processed by a worker thread.  Work packets
+        that share an `order_key` are processed one at a time in the order they were queued.
+    """
+
+    __slots__ = ("wkfunc", "wkargs", "order_key", "queued")
+
+    def __init__(self, wkfunc: Callable, wkargs: Tuple, order_key: Optional[Hashable] = None):
+        self.wkfunc = wkfunc
+        self.wkargs = wkargs
+        self.order_key = order_key
+        self.queued = time.perf_counter()
+        return
+
+    def execute(self) -> Any:
+        """
+            Runs the work function of the work packet with the work packet arguments.
+        """
+        rtnval = self.wkfunc(*self.wkargs)
+        return rtnval
+
+
+class UpnpWorkQueue:
+    """
+        The :class:`UpnpWorkQueue` is a bounded, condition based work queue.  The queue lock is only held
+        while work packets are being moved in and out of the queue, work functions are always run by the
+        caller of :meth:`dequeue` after the lock has been released so the workers run in parallel.
+
+        Work packets are ordered by an optional key, typically the address of the device that sent the
+        traffic.  Only one packet for any given key is released to the workers at a time, the remaining
+        packets for that key are held in a backlog until :meth:`complete` is called for the packet that is
+        in flight.  This keeps the notifications and event callbacks for a single device in sequence while
+        allowing the traffic for different devices to be processed concurrently.
+    """
+
+    def __init__(self, max_depth: int = DEFAULT_WORK_QUEUE_MAX_DEPTH):
+        """
+            Creates a :class:`UpnpWorkQueue` instance.
+
+            :param max_depth: The maximum number of packets that can be waiting in the queue before
+                              producers are blocked or the packets are dropped.
+        """
+        self._max_depth = max_depth
+
+        self._queue_lock = threading.Lock()
+        self._queue_available = threading.Condition(self._queue_lock)
+        self._queue_space = threading.Condition(self._queue_lock)
+
+        # ========================= Queue Lock Variables =========================
+        # These variables are protected by the queue lock and are prefixed with
+        # _ql_ so it is easy to identify if the lock is being held when they are
+        # being accessed.
+        self._ql_ready = deque()
+        self._ql_keyed_backlog: Dict[Hashable, deque] = {}
+        self._ql_depth = 0
+        self._ql_shutdown = False
+
+        self._ql_enqueued = 0
+        self._ql_dispatched = 0
+        self._ql_completed = 0
+        self._ql_dropped = 0
+        self._ql_blocked = 0
+        self._ql_high_water = 0
+        self._ql_wait_total = 0.0
+        self._ql_wait_max = 0.0
+        return
+
+    @property
+    def depth(self) -> int:
+        """
+            The number of work packets currently waiting to be processed.
+        """
+        return self._ql_depth
+
+    @property
+    def max_depth(self) -> int:
+        """
+            The maximum number of packets that can be waiting in the queue.
+        """
+        return self._max_depth
+
+    def complete(self, packet: UpnpWorkPacket):
+        """
+            Marks the processing of a packet as complete.  This must be called by the worker that dequeued the
+            packet once the work function has returned so the next packet for the same order key can be released.
+
+            :param packet: The packet that was returned by :meth:`dequeue` and has finished processing.
+        """
+        order_key = packet.order_key
+
+        self._queue_lock.acquire()
+        try:
+            self._ql_completed += 1
+
+            if order_key is not None and order_key in self._ql_keyed_backlog:
+                backlog = self._ql_keyed_backlog[order_key]
+                if len(backlog) > 0:
+                    nxt_packet = backlog.popleft()
+                    self._ql_ready.append(nxt_packet)
+                    self._queue_available.notify()
+                else:
+                    del self._ql_keyed_backlog[order_key]
+        finally:
+            self._queue_lock.release()
+
+        return
+
+    def dequeue(self, timeout: Optional[float] = None) -> Optional[UpnpWorkPacket]:
+        """
+            Waits for the next work packet that is ready to be processed.
+
+            :param timeout: An optional timeout in seconds to wait for a work packet.
+
+            :returns: The next ready work packet or None if the queue was shutdown or the wait timed out.
+        """
+        packet = None
+
+        self._queue_lock.acquire()
+        try:
+            while not self._ql_shutdown and len(self._ql_ready) == 0:
+                if not self._queue_available.wait(timeout=timeout):
+                    break
+
+            if not self._ql_shutdown and len(self._ql_ready) > 0:
+                packet = self._ql_ready.popleft()
+
+                self._ql_depth -= 1
+                self._ql_dispatched += 1
+
+                waited = time.perf_counter() - packet.queued
+                self._ql_wait_total += waited
+                if waited > self._ql_wait_max:
+                    self._ql_wait_max = waited
+
+                self._queue_space.notify()
+        finally:
+            self._queue_lock.release()
+
+        return packet
+
+    def enqueue(self, wkfunc: Callable, wkargs: Tuple, order_key: Optional[Hashable] = None,
+                block: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+            Queues a work packet for processing by a worker.
+
+            :param wkfunc: The function to call to process the work.
+            :param wkargs: The arguments to pass to the work function.
+            :param order_key: An optional key, packets with the same key are processed in sequence.
+            :param block: If True, wait for space in the queue when the queue is full, otherwise the packet is dropped.
+            :param timeout: The maximum time to wait for space in the queue when blocking.
+
+            :returns: True if the packet was queued, False if the packet was dropped.
+        """
+        queued = False
+
+        packet = UpnpWorkPacket(wkfunc, wkargs, order_key=order_key)
+
+        self._queue_lock.acquire()
+        try:
+            if self._ql_depth >= self._max_depth and block and not self._ql_shutdown:
+                self._ql_blocked += 1
+                while self._ql_depth >= self._max_depth and not self._ql_shutdown:
+                    if not self._queue_space.wait(timeout=timeout):
+                        break
+
+            if self._ql_shutdown or self._ql_depth >= self._max_depth:
+                self._ql_dropped += 1
+            else:
+                if order_key is None:
+                    self._ql_ready.append(packet)
+                    self._queue_available.notify()
+                elif order_key in self._ql_keyed_backlog:
+                    # There is already a packet with this key in flight or ready, so hold
+                    # this packet until the packets ahead of it have completed.
+                    self._ql_keyed_backlog[order_key].append(packet)
+                else:
+                    self._ql_keyed_backlog[order_key] = deque()
+                    self._ql_ready.append(packet)
+                    self._queue_available.notify()
+
+                self._ql_depth += 1
+                self._ql_enqueued += 1
+                if self._ql_depth > self._ql_high_water:
+                    self._ql_high_water = self._ql_depth
+
+                queued = True
+        finally:
+            self._queue_lock.release()
+
+        return queued
+
+    def shutdown(self):
+        """
+            Shuts down the work queue and wakes up any threads that are waiting on the queue.  Packets that
+            have not been dispatched are discarded.
+        """
+        self._queue_lock.acquire()
+        try:
+            self._ql_shutdown = True
+            self._ql_ready.clear()
+            self._ql_keyed_backlog.clear()
+            self._ql_depth = 0
+            self._queue_available.notify_all()
+            self._queue_space.notify_all()
+        finally:
+            self._queue_lock.release()
+
+        return
+
+    def statistics(self) -> dict:
+        """
+            Returns a snapshot of the queue depth and backpressure counters.
+        """
+        stats = None
+
+        self._queue_lock.acquire()
+        try:
+            wait_avg = 0.0
+            if self._ql_dispatched > 0:
+                wait_avg = self._ql_wait_total / self._ql_dispatched
+
+            stats = {
+                "depth": self._ql_depth,
+                "max_depth": self._max_depth,
+                "high_water": self._ql_high_water,
+                "enqueued": self._ql_enqueued,
+                "dispatched": self._ql_dispatched,
+                "completed": self._ql_completed,
+                "dropped": self._ql_dropped,
+                "blocked": self._ql_blocked,
+                "ordered_keys": len(self._ql_keyed_backlog),
+                "wait_avg": wait_avg,
+                "wait_max": self._ql_wait_max
+            }
+        finally:
+            self._queue_lock.release()
+
+        return stats
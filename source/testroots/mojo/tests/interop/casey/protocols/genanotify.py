@@ -0,0 +1,148 @@
+
+import socket
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.genanotify import GenaNotifyReader
+
+
+EVENT_BODY = (
+    b'<?xml version="1.0"?>'
+    b'<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0">'
+    b'<e:property><LastChange>&lt;Event&gt;&lt;InstanceID val="0"&gt;&lt;Volume val="12"/&gt;&lt;/InstanceID&gt;&lt;/Event&gt;</LastChange></e:property>'
+    b'<e:property><Mute>0</Mute></e:property>'
+    b'</e:propertyset>'
+)
+
+
+def create_notify_request(body: bytes) -> bytes:
+    header = b"\r\n".join([
+        b"NOTIFY /notify HTTP/1.1",
+        b"HOST: 127.0.0.1:8000",
+        b"SID: uuid:device-1",
+        b"SEQ: 3",
+        b"CONTENT-LENGTH: %d" % len(body),
+    ])
+    request = header + b"\r\n\r\n" + body
+    return request
+
+
+def feed_in_chunks(reader: GenaNotifyReader, request: bytes, chunk_size: int):
+    for offset in range(0, len(request), chunk_size):
+        reader.feed(request[offset:offset + chunk_size])
+    reader.finish()
+    return
+
+
+def property_values(reader: GenaNotifyReader) -> dict:
+    values = {}
+    for pnode in reader.property_nodes:
+        for child in pnode:
+            values[child.tag] = child.text
+    return values
+
+
+def test_gena_reader_single_read():
+
+    reader = GenaNotifyReader()
+    feed_in_chunks(reader, create_notify_request(EVENT_BODY), 65536)
+
+    testplus.assert_equal(reader.complete, True, "The request was not read completely.")
+    testplus.assert_equal(reader.request_line, b"NOTIFY /notify HTTP/1.1", "The request line was not parsed.")
+    testplus.assert_equal(reader.headers["SID"], "uuid:device-1", "The SID header was not parsed.")
+    testplus.assert_equal(reader.body, EVENT_BODY, "The body does not match the content that was sent.")
+    testplus.assert_equal(reader.parse_error, None, "A well formed event reported a parse error.")
+
+    values = property_values(reader)
+    testplus.assert_equal(values["Mute"], "0", "The Mute property was not collected.")
+    testplus.assert_equal(values["LastChange"].startswith('<Event><InstanceID val="0">'), True,
+                          "The escaped LastChange value was not unescaped.")
+
+    return
+
+
+def test_gena_reader_incremental_reads_match_single_read():
+
+    expected = GenaNotifyReader()
+    feed_in_chunks(expected, create_notify_request(EVENT_BODY), 65536)
+
+    # Small chunks split the header terminator and the elements across reads and the
+    # small initial size forces the buffer to grow.
+    for chunk_size in (1, 3, 7, 64):
+        reader = GenaNotifyReader(initial_size=16)
+        feed_in_chunks(reader, create_notify_request(EVENT_BODY), chunk_size)
+
+        testplus.assert_equal(reader.headers, expected.headers, f"The headers differ when read in chunks of {chunk_size}.")
+        testplus.assert_equal(reader.body, EVENT_BODY, f"The body differs when read in chunks of {chunk_size}.")
+        testplus.assert_equal(property_values(reader), property_values(expected),
+                              f"The properties differ when read in chunks of {chunk_size}.")
+
+    return
+
+
+def test_gena_reader_malformed_body():
+
+    body = b'<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"><e:property><Mute>0</Volume></e:property></e:propertyset>'
+
+    reader = GenaNotifyReader()
+    feed_in_chunks(reader, create_notify_request(body), 65536)
+
+    testplus.assert_equal(reader.complete, True, "The request with a malformed body was not read completely.")
+    testplus.assert_equal(reader.parse_error is not None, True, "The malformed body did not report a parse error.")
+    testplus.assert_equal(reader.property_nodes, None, "The properties of a malformed body were reported.")
+    testplus.assert_equal(reader.body, body, "The malformed body was not kept.")
+
+    return
+
+
+def test_gena_reader_body_is_not_a_property_set():
+
+    body = b'<root><Mute>0</Mute></root>'
+
+    reader = GenaNotifyReader()
+    feed_in_chunks(reader, create_notify_request(body), 65536)
+
+    testplus.assert_equal(reader.parse_error, None, "A well formed body reported a parse error.")
+    testplus.assert_equal(reader.property_nodes, None, "A body that is not a property set reported properties.")
+
+    return
+
+
+def test_gena_reader_header_too_long():
+
+    reader = GenaNotifyReader()
+
+    refused = False
+    try:
+        reader.feed(b"NOTIFY /notify HTTP/1.1\r\nX-PAD: " + b"a" * 70000)
+    except ValueError:
+        refused = True
+
+    testplus.assert_equal(refused, True, "A header without an end was read past the maximum header length.")
+
+    return
+
+
+def test_gena_reader_recv_from_socket():
+
+    request = create_notify_request(EVENT_BODY)
+
+    sender, receiver = socket.socketpair()
+    try:
+        sender.sendall(request)
+
+        reader = GenaNotifyReader(initial_size=32)
+        while not reader.complete:
+            if reader.recv_from(receiver) == 0:
+                break
+        reader.finish()
+
+        testplus.assert_equal(reader.body, EVENT_BODY, "The body received from the socket does not match the content that was sent.")
+        testplus.assert_equal(len(reader.property_nodes), 2, "The properties received from the socket were not collected.")
+
+        reader.release()
+    finally:
+        sender.close()
+        receiver.close()
+
+    return
@@ -0,0 +1,34 @@
+
+from typing import Generator, Tuple
+
+import threading
+import time
+
+from contextlib import contextmanager
+
+from rpyc.utils.server import ThreadedServer
+
+
+@contextmanager
+def start_rpyc_service(service_type: type, protocol_config: dict) -> Generator[Tuple[str, int], None, None]:
+    """
+        Runs a local RPyC service of the specified type on a free port and yields its address.  The service
+        is closed when the context exits.
+    """
+    server = ThreadedServer(service_type, hostname="127.0.0.1", port=0, protocol_config=protocol_config)
+
+    sthread = threading.Thread(target=server.start, name="%s-server" % service_type.__name__, daemon=True)
+    sthread.start()
+
+    # Wait for the service to start listening
+    while not server.active:
+        time.sleep(0.01)
+
+    ipaddr, port = server.listener.getsockname()[:2]
+
+    try:
+        yield ipaddr, port
+    finally:
+        server.close()
+
+    return
@@ -0,0 +1,135 @@
+
+from xml.etree.ElementTree import fromstring
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.soap import (
+    NS_SOAP_ENV,
+    URI_SOAP_ENCODING,
+    SoapProcessor,
+    SoapRequestTemplate
+)
+
+
+SERVICE_TYPE = "urn:schemas-upnp-org:service:RenderingControl:1"
+
+
+def find_action_arguments(content: bytes, action_tag: str) -> dict:
+    """
+        Parses the content of a request and returns the text of the arguments of the action element.
+    """
+    envelope = fromstring(content)
+    body = envelope.find("{%s}Body" % NS_SOAP_ENV)
+    action = body.find(action_tag)
+    arguments = {child.tag: child.text or "" for child in action}
+    return arguments
+
+
+def test_request_template_render():
+
+    template = SoapRequestTemplate("SetVolume", ("InstanceID", "Channel", "DesiredVolume"), URI_SOAP_ENCODING, None, SERVICE_TYPE)
+
+    content = template.render((0, "Master", 12))
+
+    expected = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">'
+        '<s:Body><u:SetVolume xmlns:u="urn:schemas-upnp-org:service:RenderingControl:1">'
+        '<InstanceID>0</InstanceID><Channel>Master</Channel><DesiredVolume>12</DesiredVolume>'
+        '</u:SetVolume></s:Body></s:Envelope>'
+    ).encode("utf-8")
+
+    testplus.assert_equal(content, expected, "The rendered request does not match the expected envelope.")
+
+    return
+
+
+def test_request_template_render_escapes_values():
+
+    template = SoapRequestTemplate("SetAVTransportURI", ("InstanceID", "CurrentURI", "CurrentURIMetaData"), URI_SOAP_ENCODING, None, SERVICE_TYPE)
+
+    uri = "http://10.0.0.5/stream?a=1&b=2"
+    metadata = '<DIDL-Lite><item id="1"><dc:title>Rock & Roll</dc:title></item></DIDL-Lite>'
+
+    content = template.render((0, uri, metadata))
+
+    testplus.assert_equal(b"<CurrentURI>http://10.0.0.5/stream?a=1&amp;b=2</CurrentURI>" in content, True,
+                          "The ampersand of the URI was not escaped.")
+    testplus.assert_equal(b"&lt;DIDL-Lite&gt;" in content, True, "The markup of the metadata was not escaped.")
+
+    arguments = find_action_arguments(content, "{%s}SetAVTransportURI" % SERVICE_TYPE)
+    testplus.assert_equal(arguments, {"InstanceID": "0", "CurrentURI": uri, "CurrentURIMetaData": metadata},
+                          "The escaped values do not round trip through an XML parser.")
+
+    return
+
+
+def test_request_template_formats_values():
+
+    template = SoapRequestTemplate("SetMute", ("InstanceID", "DesiredMute", "Name", "Level"), URI_SOAP_ENCODING, None, SERVICE_TYPE)
+
+    content = template.render((0, True, "Café".encode("utf-8"), 0.5))
+
+    arguments = find_action_arguments(content, "{%s}SetMute" % SERVICE_TYPE)
+    testplus.assert_equal(arguments, {"InstanceID": "0", "DesiredMute": "1", "Name": "Café", "Level": "0.5"},
+                          "The values were not formatted for their python types.")
+
+    return
+
+
+def test_request_template_render_text_matches_render():
+
+    template = SoapRequestTemplate("SetVolume", ("InstanceID", "Channel", "DesiredVolume"), URI_SOAP_ENCODING, None, SERVICE_TYPE)
+
+    testplus.assert_equal(template.render_text(("0", "Master", "12")), template.render((0, "Master", 12)),
+                          "The request rendered from the argument text does not match the rendered values.")
+
+    return
+
+
+def test_request_template_without_arguments_or_type():
+
+    template = SoapRequestTemplate("GetMute", (), URI_SOAP_ENCODING, None, None)
+
+    content = template.render(())
+
+    testplus.assert_equal(content.endswith(b"<s:Body><GetMute></GetMute></s:Body></s:Envelope>"), True,
+                          "The request without arguments or a service type does not have an empty action element.")
+
+    return
+
+
+def test_request_template_envelope_attributes():
+
+    envelope_attrib = (("xmlns:s", NS_SOAP_ENV), ("s:encodingStyle", 'http://example.com/"quoted"'))
+
+    template = SoapRequestTemplate("GetMute", (), URI_SOAP_ENCODING, envelope_attrib, SERVICE_TYPE)
+
+    content = template.render(())
+
+    testplus.assert_equal(b's:encodingStyle="http://example.com/&quot;quoted&quot;"' in content, True,
+                          "The envelope attribute value was not escaped.")
+    testplus.assert_equal(URI_SOAP_ENCODING.encode("utf-8") in content, False,
+                          "The default encoding was used when the envelope attributes were provided.")
+
+    return
+
+
+def test_processor_create_request_uses_template():
+
+    processor = SoapProcessor(typed=SERVICE_TYPE)
+
+    arguments = {"InstanceID": 0, "Channel": "Master", "DesiredVolume": 30}
+    content = processor.create_request("SetVolume", arguments)
+
+    template = SoapRequestTemplate("SetVolume", tuple(arguments.keys()), URI_SOAP_ENCODING, None, SERVICE_TYPE)
+    testplus.assert_equal(content, template.render(arguments.values()), "The processor request does not match the template.")
+
+    # A second call with other values reuses the cached template
+    content = processor.create_request("SetVolume", {"InstanceID": 0, "Channel": "LF", "DesiredVolume": 5})
+
+    arguments = find_action_arguments(content, "{%s}SetVolume" % SERVICE_TYPE)
+    testplus.assert_equal(arguments, {"InstanceID": "0", "Channel": "LF", "DesiredVolume": "5"},
+                          "The cached template rendered the values of an earlier call.")
+
+    return
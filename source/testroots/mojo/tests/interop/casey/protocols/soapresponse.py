@@ -0,0 +1,148 @@
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.soap import SOAPProtocolError, SoapProcessor, SoapResponseDecoder
+
+
+SERVICE_TYPE = "urn:schemas-upnp-org:service:RenderingControl:1"
+
+VOLUME_DB_RANGE_OUT_ARGS = (("MinValue", "i2"), ("MaxValue", "i2"))
+
+MEDIA_INFO_OUT_ARGS = (("NrTracks", "ui4"), ("CurrentURI", "string"), ("CurrentURIMetaData", "string"))
+
+
+def create_response(action_name: str, args_content: str, typed: str = SERVICE_TYPE) -> bytes:
+    content = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">'
+        '<s:Body><u:%sResponse xmlns:u="%s">%s</u:%sResponse></s:Body></s:Envelope>'
+    ) % (action_name, typed, args_content, action_name)
+    return content.encode("utf-8")
+
+
+def test_response_decoder_typed_out_args():
+
+    decoder = SoapResponseDecoder("GetVolumeDBRange", out_args=VOLUME_DB_RANGE_OUT_ARGS, typed=SERVICE_TYPE)
+
+    resp_dict = decoder.decode(create_response("GetVolumeDBRange", "<MinValue>-17</MinValue><MaxValue>0</MaxValue>"))
+
+    testplus.assert_equal(resp_dict, {"MinValue": -17, "MaxValue": 0}, "The out arguments were not converted to their types.")
+
+    return
+
+
+def test_response_decoder_without_out_args():
+
+    decoder = SoapResponseDecoder("GetVolumeDBRange", typed=SERVICE_TYPE)
+
+    resp_dict = decoder.decode(create_response("GetVolumeDBRange", "<MinValue>-17</MinValue><MaxValue>0</MaxValue>"))
+
+    testplus.assert_equal(resp_dict, {"MinValue": "-17", "MaxValue": "0"}, "The out arguments were not returned as strings.")
+
+    return
+
+
+def test_response_decoder_collects_declared_args_only():
+
+    decoder = SoapResponseDecoder("GetMute", out_args=(("CurrentMute", "boolean"),), typed=SERVICE_TYPE)
+
+    resp_dict = decoder.decode(create_response("GetMute", "<CurrentMute>1</CurrentMute><VendorExtra>abc</VendorExtra>"))
+
+    testplus.assert_equal(resp_dict, {"CurrentMute": True}, "An argument that is not declared was collected.")
+
+    return
+
+
+def test_response_decoder_empty_and_invalid_values():
+
+    out_args = (("CurrentMute", "boolean"), ("CurrentVolume", "ui2"), ("CurrentChannel", "string"))
+    decoder = SoapResponseDecoder("GetState", out_args=out_args, typed=SERVICE_TYPE)
+
+    resp_dict = decoder.decode(create_response("GetState",
+        "<CurrentMute>maybe</CurrentMute><CurrentVolume></CurrentVolume><CurrentChannel></CurrentChannel>"))
+
+    testplus.assert_equal(resp_dict["CurrentMute"], "maybe", "A value that does not match its type was not returned as sent.")
+    testplus.assert_equal(resp_dict["CurrentVolume"], None, "An empty number was not returned as None.")
+    testplus.assert_equal(resp_dict["CurrentChannel"], "", "An empty string was not returned as an empty string.")
+
+    return
+
+
+def test_response_decoder_unescapes_values():
+
+    decoder = SoapResponseDecoder("GetMediaInfo", out_args=MEDIA_INFO_OUT_ARGS, typed=SERVICE_TYPE)
+
+    args_content = (
+        "<NrTracks>1</NrTracks>"
+        "<CurrentURI>http://10.0.0.5/stream?a=1&amp;b=2</CurrentURI>"
+        "<CurrentURIMetaData>&lt;DIDL-Lite&gt;&lt;item id=&quot;1&quot;/&gt;&lt;/DIDL-Lite&gt;</CurrentURIMetaData>"
+    )
+    resp_dict = decoder.decode(create_response("GetMediaInfo", args_content))
+
+    testplus.assert_equal(resp_dict["NrTracks"], 1, "The track count was not converted.")
+    testplus.assert_equal(resp_dict["CurrentURI"], "http://10.0.0.5/stream?a=1&b=2", "The escaped URI was not unescaped.")
+    testplus.assert_equal(resp_dict["CurrentURIMetaData"], '<DIDL-Lite><item id="1"/></DIDL-Lite>', "The escaped metadata was not unescaped.")
+
+    return
+
+
+def test_response_decoder_nested_xml_is_returned_raw():
+
+    decoder = SoapResponseDecoder("GetMediaInfo", out_args=MEDIA_INFO_OUT_ARGS, typed=SERVICE_TYPE)
+
+    nested = '<DIDL-Lite xmlns="urn:schemas-upnp-org:metadata-1-0/DIDL-Lite/"><item id="1"><title>Rock &amp; Roll</title></item></DIDL-Lite>'
+    args_content = "<NrTracks>1</NrTracks><CurrentURI></CurrentURI><CurrentURIMetaData>%s</CurrentURIMetaData>" % nested
+
+    resp_dict = decoder.decode(create_response("GetMediaInfo", args_content))
+
+    testplus.assert_equal(resp_dict["CurrentURIMetaData"], nested, "The unescaped XML argument was not returned as it was sent.")
+    testplus.assert_equal(resp_dict["NrTracks"], 1, "The argument before the XML argument was not collected.")
+
+    return
+
+
+def test_response_decoder_missing_response_element():
+
+    decoder = SoapResponseDecoder("GetMute", out_args=(("CurrentMute", "boolean"),), typed=SERVICE_TYPE)
+
+    refused = False
+    try:
+        decoder.decode(create_response("GetVolume", "<CurrentVolume>10</CurrentVolume>"))
+    except SOAPProtocolError:
+        refused = True
+
+    testplus.assert_equal(refused, True, "A response for another action was decoded.")
+
+    return
+
+
+def test_processor_parse_response_with_out_args():
+
+    processor = SoapProcessor(typed=SERVICE_TYPE)
+
+    content = create_response("GetVolumeDBRange", "<MinValue>-17</MinValue><MaxValue>0</MaxValue>")
+
+    resp_dict = processor.parse_response("GetVolumeDBRange", content, out_args=VOLUME_DB_RANGE_OUT_ARGS)
+    testplus.assert_equal(resp_dict, {"MinValue": -17, "MaxValue": 0}, "The processor did not convert the declared out arguments.")
+
+    resp_dict = processor.parse_response("GetVolumeDBRange", content)
+    testplus.assert_equal(resp_dict, {"MinValue": "-17", "MaxValue": "0"}, "The processor did not return the out arguments as strings.")
+
+    return
+
+
+def test_processor_parse_response_with_extra_declaration():
+
+    processor = SoapProcessor(typed=SERVICE_TYPE)
+
+    # Some devices embed their own XML files with an XML declaration which is not well formed
+    args_content = '<CurrentURIMetaData><?xml version="1.0"?><DIDL-Lite/></CurrentURIMetaData><NrTracks>2</NrTracks>'
+    content = create_response("GetMediaInfo", args_content)
+
+    resp_dict = processor.parse_response("GetMediaInfo", content, out_args=MEDIA_INFO_OUT_ARGS)
+
+    testplus.assert_equal(resp_dict["NrTracks"], 2, "The out arguments of the corrected document were not converted.")
+    testplus.assert_equal(resp_dict["CurrentURIMetaData"], "<DIDL-Lite />", "The embedded document was not returned.")
+    testplus.assert_equal("CurrentURI" in resp_dict, False, "An argument that was not sent was returned.")
+
+    return
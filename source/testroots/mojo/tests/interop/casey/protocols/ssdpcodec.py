@@ -0,0 +1,225 @@
+
+import logging
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.ssdpcodec import (
+    SSDP_KIND_MSEARCH,
+    SSDP_KIND_NOTIFY,
+    SSDP_KIND_RESPONSE,
+    ssdp_parse
+)
+from mojo.interop.protocols.upnp.upnpcoordinator import UpnpCoordinator
+from mojo.interop.protocols.upnp.upnpdeviceregistry import UpnpDeviceRegistry
+from mojo.interop.protocols.upnp.upnpprotocol import msearch_create_message, msearch_parse_request, notify_parse_request
+from mojo.interop.protocols.upnp.upnpworkqueue import UpnpWorkQueue
+
+
+KNOWN_USN_DEV = "uuid:RINCON_000E58000001"
+
+UNKNOWN_USN_DEV = "uuid:RINCON_000E58000099"
+
+
+def create_notify(usn: str, nts: str = "ssdp:alive", extra_lines: tuple = ()) -> bytes:
+    lines = [
+        b"NOTIFY * HTTP/1.1",
+        b"HOST: 239.255.255.250:1900",
+        b"CACHE-CONTROL: max-age = 1800",
+        b"LOCATION: http://192.168.1.10:1400/xml/device_description.xml",
+        b"NT: upnp:rootdevice",
+        b"NTS: %s" % nts.encode("utf-8"),
+        b"USN: %s" % usn.encode("utf-8"),
+        b"BOOTID.UPNP.ORG: 12",
+    ]
+    lines.extend(extra_lines)
+    content = b"\r\n".join(lines) + b"\r\n\r\n"
+    return content
+
+
+class FakeRootDevice:
+    """
+        Stands in for a registered :class:`UpnpRootDevice`.
+    """
+
+    def __init__(self, usn_dev: str, ipaddr: str):
+        self.USN_DEV = usn_dev
+        self.USN = usn_dev + "::upnp:rootdevice"
+        self.MACAddress = None
+        self.IPAddress = ipaddr
+        return
+
+
+class FakeCoordinator:
+    """
+        Stands in for the :class:`UpnpCoordinator` with the state the SSDP filtering reads, the filtering
+        methods are the ones of the coordinator.
+    """
+
+    # pylint: disable=protected-access
+    _queue_ssdp_datagram = UpnpCoordinator._queue_ssdp_datagram
+    _ssdp_notify_filter = UpnpCoordinator._ssdp_notify_filter
+
+    def __init__(self, allow_unknown_devices: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self._allow_unknown_devices = allow_unknown_devices
+        self._control_point = None
+        self._traffic_recorder = None
+        self._ssdp_notify_filtered = 0
+        self._work_queue = UpnpWorkQueue()
+
+        self._device_registry = UpnpDeviceRegistry()
+        self._device_registry.register("http://192.168.1.10:1400/xml/device_description.xml",
+                                       FakeRootDevice(KNOWN_USN_DEV, "192.168.1.10"))
+        return
+
+    def _process_request_for_notify(self, addr, request):
+        return
+
+    def _process_request_for_msearch(self, addr, request):
+        return
+
+
+def notify_filter(coord: FakeCoordinator, content: bytes) -> bool:
+    interesting = coord._ssdp_notify_filter(ssdp_parse(content)) # pylint: disable=protected-access
+    return interesting
+
+
+def test_ssdp_msearch_round_trip():
+
+    content = msearch_create_message(st="urn:schemas-upnp-org:device:ZonePlayer:1", custom_headers={"user-agent": "mojo/1.0"})
+
+    msg = ssdp_parse(content)
+
+    testplus.assert_equal(msg.kind, SSDP_KIND_MSEARCH, "The M-SEARCH was not classified.")
+    testplus.assert_equal(msg.start_line, b"M-SEARCH * HTTP/1.1", "The request line was not found.")
+    testplus.assert_equal(msg.get("ST"), "urn:schemas-upnp-org:device:ZonePlayer:1", "The search target did not round trip.")
+    testplus.assert_equal(msg.get("MAN"), '"ssdp:discover"', "The MAN header did not round trip.")
+    testplus.assert_equal(msg.get("USER-AGENT"), "mojo/1.0", "The custom header did not round trip.")
+    testplus.assert_equal(msg.headers, msearch_parse_request(content), "The lazy headers do not match the parsed request.")
+
+    return
+
+
+def test_ssdp_notify_lazy_lookup_matches_full_parse():
+
+    content = create_notify(KNOWN_USN_DEV + "::upnp:rootdevice", extra_lines=(b"X-RINCON-HOUSEHOLD: Sonos_abc",))
+
+    msg = ssdp_parse(content)
+
+    testplus.assert_equal(msg.kind, SSDP_KIND_NOTIFY, "The NOTIFY was not classified.")
+    testplus.assert_equal(msg.get("USN"), KNOWN_USN_DEV + "::upnp:rootdevice", "The USN was not found in the raw content.")
+    testplus.assert_equal(msg.get("CACHE-CONTROL"), "max-age = 1800", "The value with spaces was not kept.")
+    testplus.assert_equal(msg.get("X-RINCON-HOUSEHOLD"), "Sonos_abc", "The header without a marker was not found.")
+    testplus.assert_equal(msg.get("SID", "none"), "none", "The default was not returned for a missing header.")
+    testplus.assert_equal("NTS" in msg, True, "The NTS header was not found.")
+    testplus.assert_equal(msg.body, b"", "The message without a body did not have an empty body.")
+
+    headers, _ = notify_parse_request(content)
+    testplus.assert_equal(msg.headers, headers, "The lazy headers do not match the parsed request.")
+
+    # The headers are a copy, so the processing code can add to them
+    msg.headers["IP"] = "192.168.1.10"
+    testplus.assert_equal("IP" in msg, False, "Changing the headers changed the message.")
+
+    return
+
+
+def test_ssdp_header_variants():
+
+    content = (
+        b"NOTIFY * HTTP/1.1\n"
+        b"host: 239.255.255.250:1900\n"
+        b"Nts: ssdp:byebye\n"
+        b"usn: " + KNOWN_USN_DEV.encode("utf-8") + b"::upnp:rootdevice\n"
+        b"\n"
+    )
+
+    msg = ssdp_parse(memoryview(content))
+
+    testplus.assert_equal(msg.get("NTS"), "ssdp:byebye", "The title case header was not found.")
+    testplus.assert_equal(msg.get("USN"), KNOWN_USN_DEV + "::upnp:rootdevice", "The lower case header with bare line feeds was not found.")
+    testplus.assert_equal(msg.start_line, b"NOTIFY * HTTP/1.1", "The request line with a bare line feed was not found.")
+
+    return
+
+
+def test_ssdp_parse_classification():
+
+    response = b"HTTP/1.1 200 OK\r\nST: upnp:rootdevice\r\nUSN: uuid:abc::upnp:rootdevice\r\n\r\n"
+
+    msg = ssdp_parse(response)
+    testplus.assert_equal(msg.kind, SSDP_KIND_RESPONSE, "The M-SEARCH response was not classified.")
+    testplus.assert_equal(msg.get("ST"), "upnp:rootdevice", "The search target of the response was not found.")
+
+    testplus.assert_equal(ssdp_parse(b"GET / HTTP/1.1\r\n\r\n"), None, "A message that is not SSDP was classified.")
+
+    msg = ssdp_parse(b"NOTIFY * HTTP/1.1\r\nNTS: ssdp:alive\r\nCONTENT-LENGTH: 4\r\n\r\nbody")
+    testplus.assert_equal(msg.body, b"body", "The body after the end of header marker was not found.")
+
+    msg = ssdp_parse(b"NOTIFY * HTTP/1.1\r\nNTS: ssdp:alive")
+    testplus.assert_equal(msg.body, None, "A message without an end of header marker had a body.")
+    testplus.assert_equal(msg.get("NTS"), "ssdp:alive", "The last header of a truncated message was not found.")
+
+    return
+
+
+def test_ssdp_notify_filter_registered_root_device():
+
+    coord = FakeCoordinator()
+
+    testplus.assert_equal(notify_filter(coord, create_notify(KNOWN_USN_DEV + "::upnp:rootdevice")), True,
+                          "The root device notification of a registered device was filtered.")
+    testplus.assert_equal(notify_filter(coord, create_notify(KNOWN_USN_DEV + "::upnp:rootdevice", nts="ssdp:byebye")), True,
+                          "The byebye notification of a registered device was filtered.")
+    testplus.assert_equal(notify_filter(coord, create_notify(KNOWN_USN_DEV + "::urn:schemas-upnp-org:service:AVTransport:1")), False,
+                          "A service notification was not filtered.")
+    testplus.assert_equal(notify_filter(coord, create_notify(KNOWN_USN_DEV)), False,
+                          "A notification without a device class was not filtered.")
+
+    return
+
+
+def test_ssdp_notify_filter_unknown_device():
+
+    content = create_notify(UNKNOWN_USN_DEV + "::upnp:rootdevice")
+
+    testplus.assert_equal(notify_filter(FakeCoordinator(), content), False,
+                          "The notification of an unknown device was not filtered.")
+    testplus.assert_equal(notify_filter(FakeCoordinator(allow_unknown_devices=True), content), True,
+                          "The notification of an unknown device was filtered when unknown devices are allowed.")
+
+    return
+
+
+def test_ssdp_notify_filter_incomplete_notification():
+
+    coord = FakeCoordinator(allow_unknown_devices=True)
+
+    content = b"NOTIFY * HTTP/1.1\r\nHOST: 239.255.255.250:1900\r\nUSN: %s::upnp:rootdevice\r\n\r\n" % KNOWN_USN_DEV.encode("utf-8")
+    testplus.assert_equal(notify_filter(coord, content), False, "A notification without an NTS header was not filtered.")
+
+    content = b"NOTIFY * HTTP/1.1\r\nHOST: 239.255.255.250:1900\r\nNTS: ssdp:alive\r\n\r\n"
+    testplus.assert_equal(notify_filter(coord, content), False, "A notification without a USN header was not filtered.")
+
+    return
+
+
+def test_ssdp_filtered_notifications_are_not_queued():
+
+    coord = FakeCoordinator()
+
+    for content in [create_notify(KNOWN_USN_DEV + "::upnp:rootdevice"), create_notify(UNKNOWN_USN_DEV + "::upnp:rootdevice"),
+                    create_notify(KNOWN_USN_DEV + "::urn:schemas-upnp-org:service:AVTransport:1")]:
+        coord._queue_ssdp_datagram(content, ("192.168.1.10", 1900)) # pylint: disable=protected-access
+
+    testplus.assert_equal(coord._ssdp_notify_filtered, 2, "The filtered notifications were not counted.") # pylint: disable=protected-access
+
+    work_queue = coord._work_queue # pylint: disable=protected-access
+    testplus.assert_equal(work_queue.depth, 1, "The notification of the registered device was not the only one queued.")
+
+    packet = work_queue.dequeue(timeout=1)
+    addr, notify_msg = packet.wkargs
+    testplus.assert_equal(addr, ("192.168.1.10", 1900), "The address of the notification was not queued.")
+    testplus.assert_equal(notify_msg.get("USN"), KNOWN_USN_DEV + "::upnp:rootdevice", "The parsed notification was not queued.")
+
+    return
@@ -0,0 +1,167 @@
+
+from typing import Generator, Tuple
+
+import pickle
+import threading
+import uuid
+
+from contextlib import contextmanager
+
+import rpyc
+
+from mojo import testplus
+
+from mojo.interop.protocols.tasker.taskernode import TaskerNode
+from mojo.interop.protocols.tasker.tasking import TaskingSpec
+from mojo.interop.protocols.tasker.taskingresultpromise import TaskingNotification, as_completed
+
+from mojo.tests.interop.casey.protocols.rpycservice import start_rpyc_service
+
+
+PROTOCOL_CONFIG = {
+    "allow_public_attrs": True,
+    "allow_pickle": True
+}
+
+
+class SingleTaskerService(rpyc.Service):
+    """
+        A tasker service from before batches were added, it starts one tasking per call and pushes the completion
+        of each tasking to the caller.
+    """
+
+    single_calls = 0
+    batch_calls = 0
+
+    def exposed_supports_notifications(self) -> bool:
+        return True
+
+    def exposed_execute_tasking(self, *, session_id, worker, module_name, tasking_name, aspects, notify_callback=None, **kwargs):
+
+        type(self).single_calls += 1
+
+        tasking_id = str(uuid.uuid4())
+
+        notify = rpyc.async_(notify_callback)
+        threading.Timer(0.05, notify, args=(TaskingNotification.COMPLETED, tasking_id, pickle.dumps({"kwparams": kwargs}))).start()
+
+        taskref_info = {"module_name": module_name, "tasking_id": tasking_id, "task_name": tasking_name, "log_dir": "/tmp"}
+
+        return taskref_info
+
+
+class BatchTaskerService(SingleTaskerService):
+    """
+        A tasker service that starts a batch of taskings in one call, it pushes the completion of each tasking
+        before the call returns.
+    """
+
+    fail_batches = False
+
+    def exposed_supports_batches(self) -> bool:
+        return True
+
+    def exposed_execute_taskings(self, *, session_id, specs, aspects, notify_callback=None):
+
+        this_type = type(self)
+
+        this_type.batch_calls += 1
+
+        if this_type.fail_batches:
+            raise ValueError("The batch was refused by the service.")
+
+        notify = rpyc.async_(notify_callback)
+
+        taskrefs = []
+        for spec in pickle.loads(specs):
+            tasking_id = str(uuid.uuid4())
+            notify(TaskingNotification.COMPLETED, tasking_id, pickle.dumps({"kwparams": spec["kwparams"]}))
+
+            taskrefs.append({"module_name": spec["module_name"], "tasking_id": tasking_id,
+                             "task_name": spec["tasking_name"], "log_dir": "/tmp"})
+
+        return pickle.dumps(taskrefs)
+
+
+@contextmanager
+def start_tasker_service(service_type: type) -> Generator[Tuple[str, int], None, None]:
+    """
+        Runs a local tasker service with its call counts reset and yields its address.
+    """
+    service_type.single_calls = 0
+    service_type.batch_calls = 0
+
+    with start_rpyc_service(service_type, PROTOCOL_CONFIG) as address:
+        yield address
+
+    return
+
+
+def create_specs(count: int):
+    specs = [TaskingSpec("module", "Tasking", kwparams={"index": idx}) for idx in range(count)]
+    return specs
+
+
+def test_batch_submitted_in_one_call():
+
+    with start_tasker_service(BatchTaskerService) as (ipaddr, port):
+        node = TaskerNode(ipaddr, port)
+
+        promises = node.execute_taskings(specs=create_specs(5))
+
+        testplus.assert_equal(BatchTaskerService.batch_calls, 1, "The batch should be submitted in one call.")
+        testplus.assert_equal(BatchTaskerService.single_calls, 0, "The taskings of the batch were started one at a time.")
+
+        completed = list(as_completed(promises, timeout=10, interval=30))
+        testplus.assert_equal(len(completed), 5, "The completions pushed before the batch call returned were lost.")
+
+        indexes = [prom.get_result()["kwparams"]["index"] for prom in promises]
+        testplus.assert_equal(indexes, [0, 1, 2, 3, 4], "The promises are not in the order of the specs.")
+
+        node.close()
+
+    return
+
+
+def test_batch_falls_back_to_single_taskings():
+
+    with start_tasker_service(SingleTaskerService) as (ipaddr, port):
+        node = TaskerNode(ipaddr, port)
+
+        promises = node.execute_taskings(specs=create_specs(3))
+
+        testplus.assert_equal(SingleTaskerService.single_calls, 3, "The taskings were not started one at a time.")
+
+        completed = list(as_completed(promises, timeout=10, interval=30))
+        testplus.assert_equal(len(completed), 3, "Not all of the taskings completed.")
+
+        indexes = [prom.get_result()["kwparams"]["index"] for prom in promises]
+        testplus.assert_equal(indexes, [0, 1, 2], "The promises are not in the order of the specs.")
+
+        node.close()
+
+    return
+
+
+def test_batch_error_is_not_retried_as_single_taskings():
+
+    with start_tasker_service(BatchTaskerService) as (ipaddr, port):
+        BatchTaskerService.fail_batches = True
+
+        try:
+            node = TaskerNode(ipaddr, port)
+
+            refused = False
+            try:
+                node.execute_taskings(specs=create_specs(3))
+            except ValueError:
+                refused = True
+
+            testplus.assert_equal(refused, True, "The error raised by the service was not passed to the caller.")
+            testplus.assert_equal(BatchTaskerService.single_calls, 0, "The taskings of a refused batch were started.")
+
+            node.close()
+        finally:
+            BatchTaskerService.fail_batches = False
+
+    return
@@ -0,0 +1,185 @@
+
+import threading
+import time
+
+import rpyc
+
+from mojo import testplus
+
+from mojo.interop.protocols.tasker.taskerconnectionpool import TaskerConnectionPool
+
+from mojo.tests.interop.casey.protocols.rpycservice import start_rpyc_service
+
+
+PROTOCOL_CONFIG = {
+    "sync_request_timeout": 10
+}
+
+
+class EchoService(rpyc.Service):
+
+    def exposed_echo(self, value):
+        return value
+
+
+def test_connection_pool_reuses_connections():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG)
+
+        for idx in range(10):
+            with pool.connection() as client:
+                testplus.assert_equal(client.root.echo(idx), idx, "The service did not answer over the pooled connection.")
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["connects"], 1, "Sequential calls should share one connection.")
+        testplus.assert_equal(stats["open"], 1, "The pool should have one open connection.")
+        testplus.assert_equal(stats["idle"], 1, "The connection should be idle once it is checked in.")
+
+        pool.close()
+
+    return
+
+
+def test_connection_pool_waits_at_max_connections():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG, max_connections=2)
+
+        answers = []
+
+        def waiting_caller():
+            with pool.connection() as client:
+                answers.append(client.root.echo("waited"))
+            return
+
+        with pool.connection() as first:
+            with pool.connection() as second:
+                testplus.assert_equal(first is second, False, "Two threads of work should not share a connection.")
+
+                wthread = threading.Thread(target=waiting_caller, daemon=True)
+                wthread.start()
+
+                time.sleep(0.5)
+                testplus.assert_equal(wthread.is_alive(), True, "The third checkout should wait for a connection.")
+                testplus.assert_equal(pool.statistics()["waits"], 1, "The wait for a connection was not counted.")
+
+        wthread.join(10)
+        testplus.assert_equal(answers, ["waited"], "The waiting caller did not get a connection that was checked in.")
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["connects"], 2, "The pool opened more connections than its maximum.")
+
+        pool.close()
+
+    return
+
+
+def test_connection_pool_health_checks_idle_connections():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        # Every idle connection is pinged before it is handed out
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG, health_check_interval=0)
+
+        with pool.connection() as client:
+            client.root.echo(1)
+
+        with pool.connection() as client:
+            testplus.assert_equal(client.root.echo(2), 2, "A healthy connection should be reused.")
+
+        testplus.assert_equal(pool.statistics()["reconnects"], 0, "A healthy connection was replaced.")
+
+        # Close the idle connection behind the back of the pool
+        client.close()
+
+        with pool.connection() as client:
+            testplus.assert_equal(client.root.echo(3), 3, "The closed connection was not replaced.")
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["reconnects"], 1, "The closed connection should be counted as a reconnect.")
+        testplus.assert_equal(stats["open"], 1, "The closed connection should not be counted as open.")
+
+        pool.close()
+
+    return
+
+
+def test_connection_pool_drops_timed_out_connection():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG)
+
+        timed_out = None
+
+        try:
+            with pool.connection() as client:
+                timed_out = client
+                raise TimeoutError("Simulated request timeout.")
+        except TimeoutError:
+            pass
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["dropped"], 1, "The timed out connection should be dropped.")
+        testplus.assert_equal(stats["open"], 0, "The timed out connection should not be counted as open.")
+        testplus.assert_equal(timed_out.closed, True, "The timed out connection should be closed.")
+
+        with pool.connection() as client:
+            testplus.assert_equal(client is timed_out, False, "The timed out connection was handed out again.")
+            testplus.assert_equal(client.root.echo(4), 4, "The replacement connection did not answer.")
+
+        pool.close()
+
+    return
+
+
+def test_connection_pool_keepalive():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        # Every idle connection is swept by the keepalive
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG, keepalive_interval=0)
+
+        with pool.connection() as client:
+            client.root.echo(1)
+
+        pool.keepalive()
+        testplus.assert_equal(pool.statistics()["idle"], 1, "A connection that answered its keepalive was dropped.")
+
+        client.close()
+
+        pool.keepalive()
+        stats = pool.statistics()
+        testplus.assert_equal(stats["idle"], 0, "A connection that did not answer its keepalive was kept.")
+        testplus.assert_equal(stats["dropped"], 1, "The connection that did not answer its keepalive was not dropped.")
+
+        pool.close()
+
+    return
+
+
+def test_connection_pool_close():
+
+    with start_rpyc_service(EchoService, PROTOCOL_CONFIG) as (ipaddr, port):
+        pool = TaskerConnectionPool(ipaddr, port, PROTOCOL_CONFIG)
+
+        with pool.connection() as busy_client:
+            # Check in a second connection so the pool has an idle connection when it is closed
+            with pool.connection() as idle_client:
+                idle_client.root.echo(1)
+
+            pool.close()
+            testplus.assert_equal(idle_client.closed, True, "The idle connections were not closed.")
+            testplus.assert_equal(busy_client.closed, False, "A connection that is checked out was closed.")
+
+        testplus.assert_equal(busy_client.closed, True, "A connection checked in after the close was not closed.")
+        testplus.assert_equal(pool.statistics()["open"], 0, "The pool still has open connections after the close.")
+
+        refused = False
+        try:
+            with pool.connection() as client:
+                client.root.echo(3)
+        except ConnectionError:
+            refused = True
+
+        testplus.assert_equal(refused, True, "A closed pool should refuse to hand out connections.")
+
+    return
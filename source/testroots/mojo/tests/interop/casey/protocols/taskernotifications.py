@@ -0,0 +1,262 @@
+
+from typing import Optional
+
+import pickle
+import threading
+import time
+import uuid
+
+import rpyc
+
+from mojo import testplus
+
+from mojo.interop.protocols.tasker.taskernode import TaskerNode
+from mojo.interop.protocols.tasker.taskingevent import TaskingEvent
+from mojo.interop.protocols.tasker.taskingresultpromise import (
+    TaskingNotification,
+    TaskingNotificationReceiver,
+    TaskingNotificationRouter,
+    TaskingResultPromise,
+    as_completed,
+    wait_any
+)
+
+from mojo.tests.interop.casey.protocols.rpycservice import start_rpyc_service
+
+
+PROTOCOL_CONFIG = {
+    "allow_public_attrs": True,
+    "allow_pickle": True
+}
+
+
+class FakeConnection:
+    """
+        Stands in for the connection a tasking was started on, the notifications of the tasking are
+        trusted while the connection is open.
+    """
+
+    def __init__(self):
+        self.closed = False
+        return
+
+
+class FakeNode:
+    """
+        Stands in for the :class:`TaskerNode` a promise asks about its tasking when the state of the tasking
+        was not pushed.  The calls to the node are counted.
+    """
+
+    def __init__(self):
+        self.completed = set()
+        self.calls = 0
+        return
+
+    def get_tasking_events(self, *, tasking_id: str):
+        self.calls += 1
+        return []
+
+    def get_tasking_progress(self, *, tasking_id: str):
+        self.calls += 1
+        return None
+
+    def get_tasking_result(self, *, tasking_id: str):
+        self.calls += 1
+        return {"result": tasking_id}
+
+    def has_completed_and_result_ready(self, *, tasking_id: str) -> bool:
+        self.calls += 1
+        return tasking_id in self.completed
+
+
+def create_pushed_promise(node: FakeNode, tasking_id: str, connection: Optional[FakeConnection] = None) -> TaskingResultPromise:
+    """
+        Creates a promise for a tasking whose service pushes its notifications over the connection.
+    """
+    if connection is None:
+        connection = FakeConnection()
+
+    receiver = TaskingNotificationReceiver()
+    receiver.attach(connection)
+
+    promise = TaskingResultPromise(None, None, "module", tasking_id, "Tasking", "/tmp", "session", node, receiver=receiver)
+
+    return promise
+
+
+def push(promise: TaskingResultPromise, kind: str, data):
+    promise.receiver.notify(kind, promise.tasking_id, pickle.dumps(data))
+    return
+
+
+def test_notifications_answer_status_locally():
+
+    node = FakeNode()
+    promise = create_pushed_promise(node, "tasking-1")
+
+    push(promise, TaskingNotification.PROGRESS, {"position": 1})
+    push(promise, TaskingNotification.EVENT, {"tasking-id": "tasking-1", "event-name": "ready", "payload": None})
+
+    testplus.assert_equal(promise.get_progress(), {"position": 1}, "The pushed progress was not reported.")
+    testplus.assert_equal([ev.event_name for ev in promise.get_events()], ["ready"], "The pushed events were not reported.")
+    testplus.assert_equal(promise.is_task_complete(verify_interval=60), False, "The tasking is not complete yet.")
+
+    push(promise, TaskingNotification.COMPLETED, {"result": "done"})
+
+    testplus.assert_equal(promise.is_task_complete(verify_interval=60), True, "The pushed completion was not reported.")
+    testplus.assert_equal(promise.get_result(), {"result": "done"}, "The pushed result was not reported.")
+
+    testplus.assert_equal(node.calls, 0, "The promise should not call the service while the state is pushed.")
+
+    return
+
+
+def test_notifications_lost_completion_is_found_by_polling():
+
+    node = FakeNode()
+    promise = create_pushed_promise(node, "tasking-1")
+
+    # The tasking completes but the completion notification never arrives
+    threading.Timer(0.3, node.completed.add, args=("tasking-1",)).start()
+
+    start = time.monotonic()
+    promise.wait(timeout=10, interval=0.2)
+    elapsed = time.monotonic() - start
+
+    testplus.assert_equal(elapsed < 2, True, f"A lost completion should only delay the wait by an interval, waited {elapsed}s.")
+    testplus.assert_equal(node.calls > 0, True, "The completion was not checked with the service.")
+
+    return
+
+
+def test_notifications_connection_lost_falls_back_to_polling():
+
+    node = FakeNode()
+    connection = FakeConnection()
+    promise = create_pushed_promise(node, "tasking-1", connection=connection)
+
+    push(promise, TaskingNotification.EVENT, {"tasking-id": "tasking-1", "event-name": "ready", "payload": None})
+
+    # Once the connection of the tasking is closed the pushed state is no longer trusted
+    connection.closed = True
+
+    node.completed.add("tasking-1")
+
+    testplus.assert_equal(promise.is_task_complete(verify_interval=60), True, "The completion was not requested from the service.")
+    testplus.assert_equal(promise.get_events(), [], "The events were not requested from the service.")
+    testplus.assert_equal(node.calls, 2, "The promise did not fall back to the service.")
+
+    return
+
+
+def test_notifications_as_completed_wakes_on_push():
+
+    node = FakeNode()
+    first = create_pushed_promise(node, "tasking-1")
+    second = create_pushed_promise(node, "tasking-2")
+
+    threading.Timer(0.2, push, args=(second, TaskingNotification.COMPLETED, {"result": 2})).start()
+    threading.Timer(0.4, push, args=(first, TaskingNotification.COMPLETED, {"result": 1})).start()
+
+    start = time.monotonic()
+    completed = [prom.tasking_id for prom in as_completed([first, second], timeout=10, interval=30)]
+    elapsed = time.monotonic() - start
+
+    testplus.assert_equal(completed, ["tasking-2", "tasking-1"], "The taskings were not yielded in the order they completed.")
+    testplus.assert_equal(elapsed < 5, True, f"The pushed completions did not wake the wait, waited {elapsed}s.")
+
+    return
+
+
+def test_notifications_wait_any():
+
+    node = FakeNode()
+    first = create_pushed_promise(node, "tasking-1")
+    second = create_pushed_promise(node, "tasking-2")
+
+    threading.Timer(0.2, push, args=(second, TaskingNotification.COMPLETED, {"result": 2})).start()
+
+    done, pending = wait_any([first, second], timeout=10, interval=30)
+
+    testplus.assert_equal(done, [second], "The completed tasking was not reported as done.")
+    testplus.assert_equal(pending, [first], "The running tasking was not reported as pending.")
+
+    return
+
+
+def test_notifications_router_holds_early_notifications():
+
+    router = TaskingNotificationRouter()
+
+    # The service can push before the call that started the batch returns the tasking ids
+    router.notify(TaskingNotification.EVENT, "tasking-1", pickle.dumps({"tasking-id": "tasking-1", "event-name": "early", "payload": None}))
+    router.notify(TaskingNotification.COMPLETED, "tasking-1", pickle.dumps({"result": 1}))
+
+    receiver = TaskingNotificationReceiver()
+    router.add_receiver("tasking-1", receiver)
+
+    testplus.assert_equal([ev.event_name for ev in receiver.events], ["early"], "The held event was not delivered.")
+    testplus.assert_equal(receiver.completed, True, "The held completion was not delivered.")
+    testplus.assert_equal(receiver.result, {"result": 1}, "The held result was not delivered.")
+
+    return
+
+
+class PushingTaskerService(rpyc.Service):
+    """
+        A tasker service that completes every tasking after a short delay and pushes the completion to the caller.
+    """
+
+    status_requests = 0
+
+    def exposed_supports_notifications(self) -> bool:
+        return True
+
+    def exposed_execute_tasking(self, *, session_id, worker, module_name, tasking_name, aspects, notify_callback=None, delay=0.1, **kwargs):
+
+        tasking_id = str(uuid.uuid4())
+        notify = rpyc.async_(notify_callback)
+
+        def complete_tasking():
+            time.sleep(delay)
+            event = TaskingEvent(tasking_id, "finishing", None)
+            notify(TaskingNotification.EVENT, tasking_id, pickle.dumps(event.as_dict()))
+            notify(TaskingNotification.COMPLETED, tasking_id, pickle.dumps({"result": tasking_id}))
+            return
+
+        cthread = threading.Thread(target=complete_tasking, daemon=True)
+        cthread.start()
+
+        taskref_info = {"module_name": module_name, "tasking_id": tasking_id, "task_name": tasking_name, "log_dir": "/tmp"}
+
+        return taskref_info
+
+    def exposed_has_completed_and_result_ready(self, *, session_id, tasking_id) -> bool:
+        PushingTaskerService.status_requests += 1
+        return False
+
+
+def test_notifications_pushed_by_service():
+
+    with start_rpyc_service(PushingTaskerService, PROTOCOL_CONFIG) as (ipaddr, port):
+        node = TaskerNode(ipaddr, port)
+
+        PushingTaskerService.status_requests = 0
+
+        promises = [node.execute_tasking(module_name="module", tasking_name="Tasking", delay=0.05 * idx) for idx in range(5)]
+
+        start = time.monotonic()
+        completed = list(as_completed(promises, timeout=10, interval=30))
+        elapsed = time.monotonic() - start
+
+        testplus.assert_equal(len(completed), 5, "Not all of the taskings completed.")
+        testplus.assert_equal(elapsed < 5, True, f"The pushed completions did not wake the wait, waited {elapsed}s.")
+        testplus.assert_equal(PushingTaskerService.status_requests, 0, "The completion was polled instead of pushed.")
+
+        for prom in promises:
+            testplus.assert_equal(prom.get_result(), {"result": prom.tasking_id}, "The pushed result does not match the tasking.")
+            testplus.assert_equal([ev.event_name for ev in prom.get_events()], ["finishing"], "The pushed event was not received.")
+
+        node.close()
+
+    return
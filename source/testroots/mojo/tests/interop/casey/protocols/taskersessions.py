@@ -0,0 +1,169 @@
+
+from typing import List, Optional
+
+import pickle
+import tempfile
+
+from mojo import testplus
+
+from mojo.interop.protocols.tasker.taskeraspects import TaskerAspects
+from mojo.interop.protocols.tasker.taskerexceptions import TaskingLimitError
+from mojo.interop.protocols.tasker.taskerservice import TaskerService
+from mojo.interop.protocols.tasker.taskersession import TaskerSession
+
+
+TASKING_MODULE = "mojo.interop.protocols.tasker.examples.helloworldtasking"
+TASKING_NAME = "HelloWorldTasking"
+
+# The taskings keep running for longer than the checks of a test take
+TASKING_KWPARAMS = {"message": "Hello World", "iterations": 10}
+
+TASKING_ASPECTS = TaskerAspects(inactivity_timeout=60)
+
+
+def create_tasker_service() -> TaskerService:
+
+    TaskerService.logging_directory = tempfile.mkdtemp(prefix="tasker-logs-")
+
+    service = TaskerService()
+
+    return service
+
+
+def open_session(service: TaskerService, wref: str, max_taskings: int) -> TaskerSession:
+
+    session_id = service.exposed_session_open(worker="127.0.0.1", wref=wref, output_directory=tempfile.mkdtemp(prefix="tasker-output-"),
+                                              host_pool_size=1, max_taskings=max_taskings)
+
+    session = TaskerService.active_sessions[session_id]
+
+    return session
+
+
+def execute_tasking(service: TaskerService, session: TaskerSession) -> dict:
+
+    taskref_info = service.exposed_execute_tasking(session_id=session.session_id, module_name=TASKING_MODULE,
+                                                   tasking_name=TASKING_NAME, aspects=pickle.dumps(TASKING_ASPECTS.as_dict()),
+                                                   **TASKING_KWPARAMS)
+
+    return taskref_info
+
+
+def execute_taskings(service: TaskerService, session: TaskerSession, specs: List[dict]) -> List[dict]:
+
+    taskrefs_str = service.exposed_execute_taskings(session_id=session.session_id, specs=pickle.dumps(specs),
+                                                    aspects=pickle.dumps(TASKING_ASPECTS.as_dict()))
+
+    taskref_info_list = pickle.loads(taskrefs_str)
+
+    return taskref_info_list
+
+
+def create_spec(tasking_name: Optional[str] = None) -> dict:
+
+    if tasking_name is None:
+        tasking_name = TASKING_NAME
+
+    spec = {"module_name": TASKING_MODULE, "tasking_name": tasking_name, "parent_id": None, "kwparams": TASKING_KWPARAMS}
+
+    return spec
+
+
+def test_sessions_limits_are_per_session():
+
+    service = create_tasker_service()
+
+    first = open_session(service, "first", max_taskings=1)
+    second = open_session(service, "second", max_taskings=1)
+
+    try:
+        execute_tasking(service, first)
+
+        refused = False
+        try:
+            execute_tasking(service, first)
+        except TaskingLimitError:
+            refused = True
+
+        testplus.assert_equal(refused, True, "A session at its maximum number of taskings started another tasking.")
+        testplus.assert_equal(first.active_count, 1, "The refused tasking kept its tasking slot.")
+
+        # The limit of one session does not hold up the other sessions
+        execute_tasking(service, second)
+        testplus.assert_equal(second.active_count, 1, "The other session could not start a tasking.")
+    finally:
+        service.exposed_session_close_all()
+
+    return
+
+
+def test_sessions_batch_is_all_or_nothing():
+
+    service = create_tasker_service()
+
+    session = open_session(service, "batch", max_taskings=3)
+
+    try:
+        execute_tasking(service, session)
+
+        refused = False
+        try:
+            execute_taskings(service, session, [create_spec() for _ in range(3)])
+        except TaskingLimitError:
+            refused = True
+
+        testplus.assert_equal(refused, True, "A batch that does not fit in the session was started.")
+        testplus.assert_equal(session.active_count, 1, "The refused batch kept some of its tasking slots.")
+        testplus.assert_equal(len(session.taskings), 1, "Part of the refused batch was started.")
+
+        taskref_info_list = execute_taskings(service, session, [create_spec() for _ in range(2)])
+
+        testplus.assert_equal(len(taskref_info_list), 2, "The batch that fits in the session was not started.")
+        testplus.assert_equal(session.active_count, 3, "The taskings of the batch did not take their tasking slots.")
+    finally:
+        service.exposed_session_close_all()
+
+    return
+
+
+def test_sessions_batch_with_unknown_tasking_starts_nothing():
+
+    service = create_tasker_service()
+
+    session = open_session(service, "unknown", max_taskings=3)
+
+    try:
+        refused = False
+        try:
+            execute_taskings(service, session, [create_spec(), create_spec("NoSuchTasking")])
+        except ValueError:
+            refused = True
+
+        testplus.assert_equal(refused, True, "A batch with an unknown tasking was accepted.")
+        testplus.assert_equal(session.active_count, 0, "The refused batch kept some of its tasking slots.")
+        testplus.assert_equal(len(session.taskings), 0, "Part of the refused batch was started.")
+    finally:
+        service.exposed_session_close_all()
+
+    return
+
+
+def test_sessions_close_leaves_other_sessions_open():
+
+    service = create_tasker_service()
+
+    first = open_session(service, "first", max_taskings=None)
+    second = open_session(service, "second", max_taskings=None)
+
+    try:
+        service.exposed_session_close(session_id=first.session_id)
+
+        testplus.assert_equal(list(TaskerService.active_sessions.keys()), [second.session_id],
+                              "Closing a session changed the other sessions.")
+
+        execute_tasking(service, second)
+        testplus.assert_equal(second.active_count, 1, "The remaining session could not start a tasking.")
+    finally:
+        service.exposed_session_close_all()
+
+    return
@@ -0,0 +1,223 @@
+
+import os
+import time
+
+import psutil
+
+from mojo import testplus
+
+from mojo.interop.protocols.tasker.taskinghostpool import TaskingHostPool, TaskingHostProcess
+
+
+HOST_START_TIMEOUT = 60
+
+# Modules that are imported into a host process to grow its memory
+GROWTH_MODULES = [
+    "asyncio", "concurrent.futures", "decimal", "email.mime.multipart", "http.server", "logging.handlers",
+    "sqlite3", "tarfile", "unittest", "xml.dom.minidom", "zipfile"
+]
+
+GROWTH_THRESHOLD = 2 * 1024 * 1024
+
+# A CPU index that no machine has, restricting a host process to it fails
+INVALID_CPU = 65535
+
+
+def wait_for_idle_hosts(pool: TaskingHostPool, count: int, timeout: float = HOST_START_TIMEOUT):
+    """
+        Waits for the pool to have the specified number of warm hosts that are idle.
+    """
+    end_time = time.monotonic() + timeout
+
+    idle = pool.statistics()["idle"]
+    while idle < count and time.monotonic() < end_time:
+        time.sleep(0.1)
+        idle = pool.statistics()["idle"]
+
+    testplus.assert_equal(idle, count, "The warm host processes of the pool did not start.")
+
+    return
+
+
+def test_host_pool_reuses_warm_hosts():
+
+    pool = TaskingHostPool(pool_size=1, recycle_taskings=None, recycle_memory_growth=None)
+    pool.start()
+
+    try:
+        wait_for_idle_hosts(pool, 1)
+
+        pids = []
+        for _ in range(3):
+            host = pool.checkout()
+            pids.append(host.pid)
+            pool.checkin(host)
+
+        testplus.assert_equal(len(set(pids)), 1, "The taskings should have been run in the same warm host.")
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["started"], 1, "The pool started more host processes than its size.")
+        testplus.assert_equal(stats["reused"], 3, "The warm host was not reused.")
+        testplus.assert_equal(stats["overflow"], 0, "A tasking did not get a warm host.")
+    finally:
+        pool.shutdown()
+
+    return
+
+
+def test_host_pool_recycles_after_tasking_count():
+
+    pool = TaskingHostPool(pool_size=1, recycle_taskings=2, recycle_memory_growth=None)
+    pool.start()
+
+    try:
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        first_pid = host.pid
+        pool.checkin(host)
+
+        host = pool.checkout()
+        testplus.assert_equal(host.pid, first_pid, "The host was recycled before it ran the recycle count.")
+        pool.checkin(host)
+
+        testplus.assert_equal(pool.statistics()["recycled"], 1, "The host was not recycled after the recycle count.")
+
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        testplus.assert_equal(host.pid != first_pid, True, "The recycled host process was reused.")
+        pool.checkin(host)
+    finally:
+        pool.shutdown()
+
+    return
+
+
+def test_host_pool_recycles_on_memory_growth():
+
+    pool = TaskingHostPool(pool_size=1, recycle_taskings=None, recycle_memory_growth=GROWTH_THRESHOLD)
+    pool.start()
+
+    try:
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        first_pid = host.pid
+        pool.checkin(host)
+
+        testplus.assert_equal(pool.statistics()["recycled"], 0, "A host whose memory did not grow was recycled.")
+
+        host = pool.checkout()
+        testplus.assert_equal(host.pid, first_pid, "The warm host was not reused.")
+
+        # Leave modules behind in the host process like a tasking that grows its memory
+        host.manager.TaskingHost().preload_modules(GROWTH_MODULES)
+        pool.checkin(host)
+
+        testplus.assert_equal(pool.statistics()["recycled"], 1, "The host was not recycled after its memory grew.")
+
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        testplus.assert_equal(host.pid != first_pid, True, "The recycled host process was reused.")
+        pool.checkin(host)
+    finally:
+        pool.shutdown()
+
+    return
+
+
+def test_host_pool_recycles_failed_host():
+
+    pool = TaskingHostPool(pool_size=1, recycle_taskings=None, recycle_memory_growth=None)
+    pool.start()
+
+    try:
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        first_pid = host.pid
+
+        # The tasking run in the host did not complete cleanly
+        pool.checkin(host, reusable=False)
+
+        testplus.assert_equal(pool.statistics()["recycled"], 1, "The host of a failed tasking was not recycled.")
+
+        wait_for_idle_hosts(pool, 1)
+
+        host = pool.checkout()
+        testplus.assert_equal(host.pid != first_pid, True, "The host of a failed tasking was reused.")
+        pool.checkin(host)
+    finally:
+        pool.shutdown()
+
+    return
+
+
+def test_host_pool_overflow_hosts_are_not_kept():
+
+    pool = TaskingHostPool(pool_size=1, recycle_taskings=None, recycle_memory_growth=None)
+    pool.start()
+
+    try:
+        wait_for_idle_hosts(pool, 1)
+
+        warm_host = pool.checkout()
+        overflow_host = pool.checkout()
+
+        testplus.assert_equal(overflow_host.pid != warm_host.pid, True, "A busy host was handed out twice.")
+        testplus.assert_equal(pool.statistics()["overflow"], 1, "The host started for a busy pool was not counted.")
+
+        pool.checkin(warm_host)
+        pool.checkin(overflow_host)
+
+        stats = pool.statistics()
+        testplus.assert_equal(stats["idle"], 1, "The pool kept more idle hosts than its size.")
+        testplus.assert_equal(stats["busy"], 0, "The checked in hosts are still counted as busy.")
+    finally:
+        pool.shutdown()
+
+    return
+
+
+def test_host_pool_shutdown():
+
+    pool = TaskingHostPool(pool_size=1)
+    pool.start()
+
+    wait_for_idle_hosts(pool, 1)
+
+    pool.shutdown()
+
+    testplus.assert_equal(pool.statistics()["idle"], 0, "The idle hosts were not shut down.")
+
+    refused = False
+    try:
+        pool.checkout()
+    except RuntimeError:
+        refused = True
+
+    testplus.assert_equal(refused, True, "A pool that is shut down should refuse to hand out hosts.")
+
+    return
+
+
+def test_host_process_failed_start_shuts_down_manager():
+
+    # The platform cannot restrict a process to a set of CPUs so the start cannot fail
+    if not hasattr(os, "sched_setaffinity"):
+        return
+
+    host = TaskingHostProcess()
+
+    refused = False
+    try:
+        host.start([], cpu_affinity=[INVALID_CPU])
+    except OSError:
+        refused = True
+
+    testplus.assert_equal(refused, True, "Restricting the host process to a CPU that does not exist did not fail.")
+    testplus.assert_equal(psutil.pid_exists(host.pid), False, "The manager process of the failed host was left running.")
+
+    return
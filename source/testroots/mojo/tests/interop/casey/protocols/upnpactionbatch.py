@@ -0,0 +1,91 @@
+
+from typing import Optional
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.upnpactionbatch import UpnpActionBatch
+
+
+class FakeServiceProxy:
+    """
+        Stands in for a service proxy, the calls made on a blocked proxy do not return until the proxy
+        is released.
+    """
+
+    def __init__(self, host: str, blocked: bool = False, error: Optional[Exception] = None):
+        self.host = host
+        self.error = error
+        self.released = threading.Event()
+        if not blocked:
+            self.released.set()
+        return
+
+    def call_action(self, action_name, arguments=None, auth=None, headers=None, aspects=None):
+        self.released.wait()
+        if self.error is not None:
+            raise self.error
+        return {"host": self.host, "action": action_name}
+
+
+def test_action_batch_results_in_order():
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        batch = UpnpActionBatch(executor)
+
+        for idx in range(4):
+            batch.add(FakeServiceProxy("host-%d" % idx), "GetVolume")
+
+        calls = batch.execute(timeout=10)
+
+        testplus.assert_equal([call.succeeded for call in calls], [True] * 4, "Not all of the calls succeeded.")
+        testplus.assert_equal([res["host"] for res in batch.results()], ["host-0", "host-1", "host-2", "host-3"],
+                              "The results are not in the order the calls were added.")
+
+    return
+
+
+def test_action_batch_error_is_per_call():
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        batch = UpnpActionBatch(executor)
+
+        good_call = batch.add(FakeServiceProxy("good"), "GetVolume")
+        bad_call = batch.add(FakeServiceProxy("bad", error=ConnectionError("unreachable")), "GetVolume")
+
+        batch.execute(timeout=10)
+
+        testplus.assert_equal(good_call.succeeded, True, "The error of one call failed the other call.")
+        testplus.assert_equal(isinstance(bad_call.error, ConnectionError), True, "The error of the call was not kept.")
+        testplus.assert_equal(batch.errors, [bad_call], "The failed call was not reported as an error.")
+
+    return
+
+
+def test_action_batch_timed_out_call_is_not_overwritten():
+
+    proxy = FakeServiceProxy("slow", blocked=True)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        batch = UpnpActionBatch(executor)
+        call = batch.add(proxy, "GetVolume")
+
+        batch.execute(timeout=0.1)
+
+        testplus.assert_equal(isinstance(call.error, TimeoutError), True, "The call that did not finish was not timed out.")
+
+        # Let the call finish after the batch has returned it
+        proxy.released.set()
+    finally:
+        executor.shutdown(wait=True)
+
+    testplus.assert_equal(isinstance(call.error, TimeoutError), True, "The late finish replaced the timeout of the call.")
+    testplus.assert_equal(call.result, None, "The late finish set the result of a timed out call.")
+    testplus.assert_equal(call.elapsed, None, "The late finish set the elapsed time of a timed out call.")
+    testplus.assert_equal(call.succeeded, False, "A timed out call reported success.")
+
+    return
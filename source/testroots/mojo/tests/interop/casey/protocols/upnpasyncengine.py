@@ -0,0 +1,124 @@
+
+import asyncio
+import gc
+import weakref
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.upnpasyncengine import UpnpAsyncEngine, UpnpSsdpMonitorProtocol
+from mojo.interop.protocols.upnp.upnpworkqueue import UpnpWorkQueue
+
+
+EVENT_BODY = b'<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"><e:property><Mute>1</Mute></e:property></e:propertyset>'
+
+MALFORMED_BODY = b'<e:propertyset xmlns:e="urn:schemas-upnp-org:event-1-0"><e:property><Mute>1</Volume></e:property></e:propertyset>'
+
+
+class FakeCoordinator:
+    """
+        Stands in for the :class:`UpnpCoordinator` the engine hands its traffic to.
+    """
+
+    def __init__(self):
+        self._work_queue = UpnpWorkQueue()
+        self.datagrams = []
+        return
+
+    def _dispatch_subscription_callback(self, claddr, req_headers, req_body, property_nodes=None):
+        return
+
+    def _queue_ssdp_datagram(self, request: bytes, addr: tuple):
+        self.datagrams.append((request, addr))
+        return
+
+
+def create_notify_request(body: bytes) -> bytes:
+    request = b"NOTIFY /notify HTTP/1.1\r\nSID: uuid:device-1\r\nCONTENT-LENGTH: %d\r\n\r\n%s" % (len(body), body)
+    return request
+
+
+def send_callback(engine: UpnpAsyncEngine, request: bytes) -> bytes:
+    """
+        Serves the GENA callback handler of the engine on a local port, sends the request to it and
+        returns the response.
+    """
+
+    async def exchange():
+        server = await asyncio.start_server(engine._handle_gena_connection, host="127.0.0.1", port=0) # pylint: disable=protected-access
+        _, port = server.sockets[0].getsockname()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+
+        response = await reader.read()
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+        return response
+
+    response = asyncio.run(exchange())
+
+    return response
+
+
+def test_async_engine_callback_is_queued():
+
+    coord = FakeCoordinator()
+    engine = UpnpAsyncEngine(coord)
+
+    response = send_callback(engine, create_notify_request(EVENT_BODY))
+
+    testplus.assert_equal(response.startswith(b"HTTP/1.1 200 OK"), True, "The callback was not answered with 200 OK.")
+
+    packet = coord._work_queue.dequeue(timeout=1) # pylint: disable=protected-access
+    testplus.assert_equal(packet is not None, True, "The callback was not queued for a worker.")
+
+    _, req_headers, _, property_nodes = packet.wkargs
+    testplus.assert_equal(req_headers["SID"], "uuid:device-1", "The headers of the callback were not queued.")
+    testplus.assert_equal(len(property_nodes), 1, "The parsed properties of the callback were not queued.")
+
+    return
+
+
+def test_async_engine_malformed_callback_is_rejected():
+
+    coord = FakeCoordinator()
+    engine = UpnpAsyncEngine(coord)
+
+    response = send_callback(engine, create_notify_request(MALFORMED_BODY))
+
+    testplus.assert_equal(response.startswith(b"HTTP/1.1 400 Bad Request"), True, "The malformed callback was not answered with 400.")
+    testplus.assert_equal(coord._work_queue.depth, 0, "The malformed callback was queued for a worker.") # pylint: disable=protected-access
+
+    return
+
+
+def test_async_engine_ssdp_datagrams_are_handed_to_coordinator():
+
+    coord = FakeCoordinator()
+    protocol = UpnpSsdpMonitorProtocol(weakref.ref(coord))
+
+    protocol.datagram_received(b"NOTIFY * HTTP/1.1\r\n\r\n", ("10.0.0.2", 1900))
+
+    testplus.assert_equal(coord.datagrams, [(b"NOTIFY * HTTP/1.1\r\n\r\n", ("10.0.0.2", 1900))], "The datagram was not handed to the coordinator.")
+
+    # A datagram that arrives after the coordinator is gone is dropped
+    del coord
+    gc.collect()
+
+    protocol.datagram_received(b"NOTIFY * HTTP/1.1\r\n\r\n", ("10.0.0.2", 1900))
+
+    return
+
+
+def test_async_engine_not_running_until_started():
+
+    engine = UpnpAsyncEngine(FakeCoordinator())
+
+    testplus.assert_equal(engine.running, False, "An engine that was not started reported it was running.")
+    testplus.assert_equal(engine.loop, None, "An engine that was not started has an event loop.")
+
+    return
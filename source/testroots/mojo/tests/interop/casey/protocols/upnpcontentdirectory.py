@@ -0,0 +1,173 @@
+
+from typing import Optional
+
+import itertools
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.services.upnpcontentdirectoryserviceproxy import UpnpContentDirectoryServiceProxy
+
+
+DIDL_HEADER = (
+    '<DIDL-Lite xmlns="urn:schemas-upnp-org:metadata-1-0/DIDL-Lite/" xmlns:dc="http://purl.org/dc/elements/1.1/"'
+    ' xmlns:upnp="urn:schemas-upnp-org:metadata-1-0/upnp/">'
+)
+
+DIDL_FOOTER = '</DIDL-Lite>'
+
+DIDL_ITEM = (
+    '<item id="A:TRACKS/%d" parentID="A:TRACKS" restricted="true">'
+    '<dc:title>Track %d</dc:title><upnp:class>object.item</upnp:class></item>'
+)
+
+
+class FakeContentDirectory(UpnpContentDirectoryServiceProxy):
+    """
+        Stands in for a ContentDirectory service with a container of tracks.  The device returns at most
+        `max_returned` objects a page and only reports the total when `reports_total` is set.
+    """
+
+    def __init__(self, track_count: int, max_returned: Optional[int] = None, reports_total: bool = True):
+        super().__init__()
+        self.track_count = track_count
+        self.max_returned = max_returned
+        self.reports_total = reports_total
+        self.calls = []
+        return
+
+    def action_Browse(self, ObjectID, BrowseFlag, Filter, StartingIndex, RequestedCount, SortCriteria, aspects=None):
+        # pylint: disable=invalid-name,unused-argument
+        self.calls.append(("Browse", ObjectID, StartingIndex, RequestedCount))
+        return self._page(StartingIndex, RequestedCount)
+
+    def action_Search(self, ContainerID, SearchCriteria, Filter, StartingIndex, RequestedCount, SortCriteria, aspects=None):
+        # pylint: disable=invalid-name,unused-argument
+        self.calls.append(("Search", ContainerID, StartingIndex, RequestedCount))
+        return self._page(StartingIndex, RequestedCount)
+
+    def _page(self, index: int, count: int):
+        if self.max_returned is not None:
+            count = min(count, self.max_returned)
+
+        track_ids = range(index, min(index + count, self.track_count))
+
+        result = DIDL_HEADER + "".join(DIDL_ITEM % (tidx, tidx) for tidx in track_ids) + DIDL_FOOTER
+        total_matches = self.track_count if self.reports_total else 0
+
+        return result, len(track_ids), total_matches, 1
+
+
+def object_ids(objects) -> list:
+    oids = [obj.oid for obj in objects]
+    return oids
+
+
+def test_browse_objects_walks_all_pages():
+
+    cdir = FakeContentDirectory(25)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", page_size=10))
+
+    testplus.assert_equal(oids, ["A:TRACKS/%d" % tidx for tidx in range(25)], "The objects of all of the pages were not returned in order.")
+    testplus.assert_equal(cdir.calls, [("Browse", "A:TRACKS", 0, 10), ("Browse", "A:TRACKS", 10, 10), ("Browse", "A:TRACKS", 20, 10)],
+                          "The pages were not requested one after the other.")
+
+    return
+
+
+def test_browse_objects_pages_are_fetched_as_needed():
+
+    cdir = FakeContentDirectory(25)
+
+    objects = cdir.browse_objects("A:TRACKS", page_size=10)
+
+    first = list(itertools.islice(objects, 10))
+    testplus.assert_equal(len(first), 10, "The objects of the first page were not returned.")
+    testplus.assert_equal(len(cdir.calls), 1, "A page was requested before its objects were needed.")
+
+    next(objects)
+    testplus.assert_equal(len(cdir.calls), 2, "The second page was not requested when its objects were needed.")
+
+    objects.close()
+
+    return
+
+
+def test_browse_objects_limit_and_starting_index():
+
+    cdir = FakeContentDirectory(25)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", starting_index=5, page_size=10, limit=12))
+
+    testplus.assert_equal(oids, ["A:TRACKS/%d" % tidx for tidx in range(5, 17)], "The limited objects were not returned.")
+    testplus.assert_equal(cdir.calls, [("Browse", "A:TRACKS", 5, 10), ("Browse", "A:TRACKS", 15, 2)],
+                          "The last page did not request only the remaining objects.")
+
+    return
+
+
+def test_browse_objects_short_pages_with_total():
+
+    # The device returns fewer objects than requested, the walk continues until the total is reached
+    cdir = FakeContentDirectory(10, max_returned=4)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", page_size=10))
+
+    testplus.assert_equal(len(oids), 10, "The walk stopped on a short page before the total was reached.")
+    testplus.assert_equal([call[2] for call in cdir.calls], [0, 4, 8], "The pages did not start after the objects returned.")
+
+    return
+
+
+def test_browse_objects_without_total():
+
+    cdir = FakeContentDirectory(15, reports_total=False)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", page_size=10))
+
+    testplus.assert_equal(len(oids), 15, "The objects of a device that does not report a total were not all returned.")
+    testplus.assert_equal(len(cdir.calls), 2, "The walk did not stop on the first short page.")
+
+    # A device that returns exactly a page of objects is asked for one more page
+    cdir = FakeContentDirectory(10, reports_total=False)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", page_size=10))
+
+    testplus.assert_equal(len(oids), 10, "The objects of a full page were not all returned.")
+    testplus.assert_equal(len(cdir.calls), 2, "The walk did not stop on the empty page.")
+
+    return
+
+
+def test_browse_objects_empty_counts():
+
+    class EmptyCountsContentDirectory(FakeContentDirectory):
+        """
+            Stands in for a device that sends empty NumberReturned and TotalMatches values for an empty container.
+        """
+
+        def _page(self, index: int, count: int):
+            # pylint: disable=unused-argument
+            return DIDL_HEADER + DIDL_FOOTER, "", "", ""
+
+    cdir = EmptyCountsContentDirectory(0)
+
+    oids = object_ids(cdir.browse_objects("A:TRACKS", page_size=10))
+
+    testplus.assert_equal(oids, [], "Objects were returned for an empty container.")
+    testplus.assert_equal(len(cdir.calls), 1, "The walk did not stop when no objects were returned.")
+
+    return
+
+
+def test_search_objects_walks_all_pages():
+
+    cdir = FakeContentDirectory(12)
+
+    oids = object_ids(cdir.search_objects("A:TRACKS", 'upnp:class derivedfrom "object.item"', page_size=5))
+
+    testplus.assert_equal(oids, ["A:TRACKS/%d" % tidx for tidx in range(12)], "The objects of all of the search pages were not returned.")
+    testplus.assert_equal(cdir.calls, [("Search", "A:TRACKS", 0, 5), ("Search", "A:TRACKS", 5, 5), ("Search", "A:TRACKS", 10, 5)],
+                          "The search pages were not requested one after the other.")
+
+    return
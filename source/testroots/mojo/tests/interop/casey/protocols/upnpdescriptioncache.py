@@ -0,0 +1,254 @@
+
+from typing import Optional
+
+import contextlib
+import os
+import tempfile
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp import upnpdescriptioncache
+from mojo.interop.protocols.upnp.upnpdescriptioncache import UpnpDescriptionCache
+
+
+DEVICE_URL = "http://192.168.1.10:1400/xml/device_description.xml"
+
+DEVICE_UDN = "uuid:RINCON_000E58000001"
+
+DESCRIPTION_V1 = b'<?xml version="1.0"?><root xmlns="urn:schemas-upnp-org:device-1-0"><configId>1</configId></root>'
+
+DESCRIPTION_V2 = b'<?xml version="1.0"?><root xmlns="urn:schemas-upnp-org:device-1-0"><configId>2</configId></root>'
+
+
+class FakeResponse:
+    """
+        Stands in for the :class:`requests.Response` of a description request.
+    """
+
+    def __init__(self, status_code: int, content: bytes = b"", headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+        return
+
+
+class FakeDevice:
+    """
+        Stands in for the HTTP server of a device, the device answers the conditional requests that
+        match the ETag of its description with a 304.
+    """
+
+    def __init__(self, content: bytes, etag: str):
+        self.content = content
+        self.etag = etag
+        self.requests = []
+        return
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, **kwargs):
+        # pylint: disable=unused-argument
+        headers = headers if headers is not None else {}
+        self.requests.append(headers)
+
+        if headers.get("If-None-Match") == self.etag:
+            resp = FakeResponse(304)
+        else:
+            resp = FakeResponse(200, self.content, {"ETag": self.etag})
+
+        return resp
+
+
+@contextlib.contextmanager
+def cache_serving(device: FakeDevice, cache_dir: Optional[str] = None):
+    """
+        Points the description cache at a temporary directory and the requests of the cache at a fake device.
+    """
+    cache = UpnpDescriptionCache()
+
+    orig_enabled = cache.enabled
+    orig_cache_dir = cache.cache_dir
+    orig_request = upnpdescriptioncache.upnp_http_request
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache.configure(enabled=True, cache_dir=cache_dir if cache_dir is not None else tmp_dir)
+        upnpdescriptioncache.upnp_http_request = device.request
+        try:
+            yield cache
+        finally:
+            upnpdescriptioncache.upnp_http_request = orig_request
+            cache.configure(enabled=orig_enabled, cache_dir=orig_cache_dir)
+
+    return
+
+
+def stats_delta(cache: UpnpDescriptionCache, before: dict) -> dict:
+    after = cache.statistics()
+    delta = {key: after[key] - before[key] for key in after}
+    return delta
+
+
+def test_description_cache_miss_then_token_hit():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with cache_serving(device) as cache:
+        before = cache.statistics()
+
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The description was not downloaded.")
+        testplus.assert_equal(cache.is_current(DEVICE_URL), False, "A downloaded description was reported as current.")
+
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The cached description was not returned.")
+        testplus.assert_equal(len(device.requests), 1, "A request was made for a description with a matching token.")
+        testplus.assert_equal(cache.is_current(DEVICE_URL), True, "The cached description was not reported as current.")
+
+        testplus.assert_equal(stats_delta(cache, before), {"hits": 1, "revalidated": 0, "misses": 1},
+                              "The hit and the miss were not counted.")
+
+    return
+
+
+def test_description_cache_new_token_revalidates_with_etag():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with cache_serving(device) as cache:
+        before = cache.statistics()
+
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, bootid="10")
+
+        # The device rebooted, the document is validated with the ETag
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, bootid="11")
+
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The revalidated description was not returned.")
+        testplus.assert_equal(device.requests[-1], {"If-None-Match": '"v1"'}, "The request was not conditional on the ETag.")
+        testplus.assert_equal(cache.is_current(DEVICE_URL), True, "The revalidated description was not reported as current.")
+
+        # The token of the revalidated entry is updated so the next fetch is a hit
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, bootid="11")
+
+        testplus.assert_equal(len(device.requests), 2, "A request was made after the entry was revalidated.")
+        testplus.assert_equal(stats_delta(cache, before), {"hits": 1, "revalidated": 1, "misses": 1},
+                              "The revalidation was not counted.")
+
+    return
+
+
+def test_description_cache_changed_document_is_downloaded():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with cache_serving(device) as cache:
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+        device.content = DESCRIPTION_V2
+        device.etag = '"v2"'
+
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="2")
+
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V2), "The changed description was not downloaded.")
+        testplus.assert_equal(cache.is_current(DEVICE_URL), False, "The changed description was reported as current.")
+
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="2")
+        testplus.assert_equal(content, DESCRIPTION_V2, "The changed description was not cached.")
+        testplus.assert_equal(len(device.requests), 2, "A request was made for the changed description with a matching token.")
+
+    return
+
+
+def test_description_cache_invalidate_host():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with cache_serving(device) as cache:
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+        cache.invalidate_host("192.168.1.10:1400")
+
+        testplus.assert_equal(cache.is_current(DEVICE_URL), False, "The description was current after its host was invalidated.")
+
+        # Without a token from the device the document must be validated with the device
+        status_code, content = cache.fetch(DEVICE_URL)
+
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The revalidated description was not returned.")
+        testplus.assert_equal(len(device.requests), 2, "The description of the invalidated host was not validated with the device.")
+        testplus.assert_equal(device.requests[-1], {"If-None-Match": '"v1"'}, "The request was not conditional on the ETag.")
+
+    return
+
+
+def test_description_cache_entries_persist():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with cache_serving(device, cache_dir=cache_dir) as cache:
+            cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+        # A new configuration drops the loaded entries, so the entry is loaded from disk
+        with cache_serving(device, cache_dir=cache_dir) as cache:
+            status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+            testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The persisted description was not returned.")
+            testplus.assert_equal(len(device.requests), 1, "A request was made for a persisted description with a matching token.")
+
+        # Only the entry and the content addressed blob are left, the temporary files were replaced
+        cache_files = []
+        for dirpath, _, filenames in os.walk(cache_dir):
+            cache_files.extend(os.path.relpath(os.path.join(dirpath, fname), cache_dir) for fname in filenames)
+
+        testplus.assert_equal(len(cache_files), 2, "The cache directory has files other than the entry and the blob.")
+        testplus.assert_equal([fname for fname in cache_files if fname.endswith(".tmp")], [], "A temporary file was left behind.")
+
+    return
+
+
+def test_description_cache_missing_blob_is_downloaded():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with cache_serving(device, cache_dir=cache_dir) as cache:
+            cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+            blob_dir = os.path.join(cache_dir, "blobs")
+            for dirpath, _, filenames in os.walk(blob_dir):
+                for fname in filenames:
+                    os.remove(os.path.join(dirpath, fname))
+
+            status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="2")
+
+            testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The description with a missing blob was not downloaded.")
+            testplus.assert_equal(device.requests[-1], {}, "The description with a missing blob was requested conditionally.")
+
+    return
+
+
+def test_description_cache_unwritable_directory():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with tempfile.NamedTemporaryFile() as not_a_dir:
+        with cache_serving(device, cache_dir=os.path.join(not_a_dir.name, "descriptions")) as cache:
+            status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+            testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "A cache that cannot be written failed the fetch.")
+
+    return
+
+
+def test_description_cache_disabled():
+
+    device = FakeDevice(DESCRIPTION_V1, '"v1"')
+
+    with cache_serving(device) as cache:
+        cache.configure(enabled=False)
+
+        cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+        status_code, content = cache.fetch(DEVICE_URL, udn=DEVICE_UDN, configid="1")
+
+        testplus.assert_equal((status_code, content), (200, DESCRIPTION_V1), "The disabled cache did not return the description.")
+        testplus.assert_equal(device.requests, [{}, {}], "The disabled cache did not request the description every time.")
+
+    return
@@ -0,0 +1,128 @@
+
+from typing import Optional
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.upnpdeviceregistry import UpnpDeviceRegistry
+
+
+class FakeRootDevice:
+    """
+        Stands in for a :class:`UpnpRootDevice` with the identifiers the registry indexes.
+    """
+
+    def __init__(self, usn_dev: str, mac: Optional[str], ipaddr: Optional[str]):
+        self.USN_DEV = usn_dev
+        self.USN = usn_dev + "::upnp:rootdevice"
+        self.MACAddress = mac
+        self.IPAddress = ipaddr
+        return
+
+
+def create_registry(*devices: FakeRootDevice) -> UpnpDeviceRegistry:
+    registry = UpnpDeviceRegistry()
+    for device in devices:
+        registry.register("http://%s:1400/xml/device_description.xml" % device.IPAddress, device)
+    return registry
+
+
+def test_device_registry_exact_lookups():
+
+    kitchen = FakeRootDevice("uuid:RINCON_000E58000001", "00:0e:58:00:00:01", "192.168.1.10")
+    office = FakeRootDevice("uuid:RINCON_000E58000002", "00:0e:58:00:00:02", "192.168.1.11")
+
+    registry = create_registry(kitchen, office)
+
+    testplus.assert_equal(len(registry), 2, "Not all of the devices were registered.")
+    testplus.assert_equal(registry.find_by_ip("192.168.1.11"), office, "The device was not found by its IP address.")
+    testplus.assert_equal(registry.find_by_mac("00:0e:58:00:00:01"), kitchen, "The device was not found by its MAC address.")
+    testplus.assert_equal(registry.find_list_by_usn([office.USN, "uuid:unknown::upnp:rootdevice", kitchen.USN]), [office, kitchen],
+                          "The devices were not found by their USN(s).")
+    testplus.assert_equal(registry.find_by_ip("192.168.1.99"), None, "A device was found for an unknown IP address.")
+    testplus.assert_equal(registry.usn_list(), [kitchen.USN, office.USN], "The USN(s) are not in the order the devices were registered.")
+
+    return
+
+
+def test_device_registry_substring_lookups():
+
+    first = FakeRootDevice("uuid:RINCON_000E58000001", None, "192.168.1.10")
+    second = FakeRootDevice("uuid:RINCON_000E58000002", None, "192.168.1.11")
+
+    registry = create_registry(first, second)
+
+    testplus.assert_equal(registry.find_by_substring(second.USN), second, "The device was not found by its full USN.")
+    testplus.assert_equal(registry.find_by_substring(second.USN_DEV), second, "The device was not found by its device identifier.")
+    testplus.assert_equal(registry.find_by_substring("58000002"), second, "The device was not found by part of its USN.")
+    testplus.assert_equal(registry.find_by_substring("RINCON_000E58"), first, "The first registered device did not win a shared substring.")
+    testplus.assert_equal(registry.find_by_substring("NOT_A_DEVICE"), None, "A device was found for text that is in no USN.")
+
+    return
+
+
+def test_device_registry_update_moves_changed_keys():
+
+    device = FakeRootDevice("uuid:RINCON_000E58000001", "00:0e:58:00:00:01", "192.168.1.10")
+
+    registry = create_registry(device)
+
+    device.IPAddress = "192.168.1.20"
+    registry.update(device)
+
+    testplus.assert_equal(registry.find_by_ip("192.168.1.20"), device, "The device was not found by its new IP address.")
+    testplus.assert_equal(registry.find_by_ip("192.168.1.10"), None, "The device was still found by its old IP address.")
+
+    return
+
+
+def test_device_registry_ip_address_is_reused():
+
+    old_device = FakeRootDevice("uuid:RINCON_000E58000001", None, "192.168.1.10")
+    new_device = FakeRootDevice("uuid:RINCON_000E58000002", None, "192.168.1.11")
+
+    registry = create_registry(old_device, new_device)
+
+    # The address of the device that went away is handed out to the other device
+    new_device.IPAddress = "192.168.1.10"
+    registry.update(new_device)
+
+    testplus.assert_equal(registry.find_by_ip("192.168.1.10"), new_device, "The device most recently given the address does not own it.")
+
+    return
+
+
+def test_device_registry_deactivate():
+
+    device = FakeRootDevice("uuid:RINCON_000E58000001", "00:0e:58:00:00:01", "192.168.1.10")
+
+    registry = create_registry(device)
+
+    registry.deactivate(device)
+
+    testplus.assert_equal(registry.find_by_ip("192.168.1.10"), None, "The deactivated device was still found by its IP address.")
+    testplus.assert_equal(registry.find_by_mac("00:0e:58:00:00:01"), device, "The deactivated device was not found by its MAC address.")
+    testplus.assert_equal(registry.find_by_substring(device.USN_DEV), device, "The deactivated device was not found by its identifier.")
+
+    # The device comes back
+    registry.update(device)
+
+    testplus.assert_equal(registry.find_by_ip("192.168.1.10"), device, "The re-activated device was not found by its IP address.")
+
+    return
+
+
+def test_device_registry_register_same_location_reindexes():
+
+    device = FakeRootDevice("uuid:RINCON_000E58000001", None, "192.168.1.10")
+
+    registry = create_registry(device)
+
+    device.USN_DEV = "uuid:RINCON_000E58000009"
+    device.USN = device.USN_DEV + "::upnp:rootdevice"
+    registry.register("http://192.168.1.10:1400/xml/device_description.xml", device)
+
+    testplus.assert_equal(len(registry), 1, "Registering the same location twice added a second device.")
+    testplus.assert_equal(registry.find_by_substring("58000009"), device, "The device was not found by its new USN.")
+    testplus.assert_equal(registry.find_by_substring("58000001"), None, "The device was still found by its old USN.")
+
+    return
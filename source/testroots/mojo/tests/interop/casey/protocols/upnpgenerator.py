@@ -0,0 +1,124 @@
+
+import os
+import tempfile
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.generator.upnpgenerator import generate_service_proxies
+
+
+SAMPLE_SERVICE_TYPE = "urn:schemas-upnp-org:service:Sample:1"
+
+SAMPLE_SCPD = """<?xml version="1.0" encoding="utf-8"?>
+<scpd xmlns="urn:schemas-upnp-org:service-1-0">
+    <specVersion>
+        <major>1</major>
+        <minor>0</minor>
+    </specVersion>
+    <actionList>
+        <action>
+            <name>GetVolume</name>
+            <argumentList>
+                <argument>
+                    <name>InstanceID</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>A_ARG_TYPE_InstanceID</relatedStateVariable>
+                </argument>
+                <argument>
+                    <name>CurrentVolume</name>
+                    <direction>out</direction>
+                    <relatedStateVariable>Volume</relatedStateVariable>
+                </argument>
+            </argumentList>
+        </action>
+        <action>
+            <name>SetVolume</name>
+            <argumentList>
+                <argument>
+                    <name>InstanceID</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>A_ARG_TYPE_InstanceID</relatedStateVariable>
+                </argument>
+                <argument>
+                    <name>DesiredVolume</name>
+                    <direction>in</direction>
+                    <relatedStateVariable>Volume</relatedStateVariable>
+                </argument>
+            </argumentList>
+        </action>
+    </actionList>
+    <serviceStateTable>
+        <stateVariable sendEvents="no">
+            <name>A_ARG_TYPE_InstanceID</name>
+            <dataType>ui4</dataType>
+        </stateVariable>
+        <stateVariable sendEvents="yes">
+            <name>Volume</name>
+            <dataType>ui2</dataType>
+            <allowedValueRange>
+                <minimum>0</minimum>
+                <maximum>100</maximum>
+                <step>1</step>
+            </allowedValueRange>
+        </stateVariable>
+    </serviceStateTable>
+</scpd>
+"""
+
+
+def generate_sample_proxy(typed: bool) -> str:
+    """
+        Generates the service proxy for the sample service description and returns the content of the generated module.
+    """
+    working_dir = tempfile.mkdtemp(prefix="upnp-generator-")
+
+    desc_dir = os.path.join(working_dir, "descriptions")
+    proxy_dir = os.path.join(working_dir, "services")
+
+    manufacturer_dir = os.path.join(desc_dir, "UPnP")
+    os.makedirs(manufacturer_dir)
+
+    with open(os.path.join(manufacturer_dir, SAMPLE_SERVICE_TYPE + ".xml"), 'w') as xf:
+        xf.write(SAMPLE_SCPD)
+
+    generate_service_proxies(desc_dir, proxy_dir, typed=typed)
+
+    proxy_file = os.path.join(proxy_dir, "UPnP", "sample1serviceproxy.py")
+    testplus.assert_equal(os.path.exists(proxy_file), True, f"The service proxy module '{proxy_file}' was not generated.")
+
+    content = None
+    with open(proxy_file, 'r') as pf:
+        content = pf.read()
+
+    # The generated module must be valid python
+    compile(content, proxy_file, "exec")
+
+    return content
+
+
+def test_upnp_generator_untyped_proxy():
+
+    content = generate_sample_proxy(typed=False)
+
+    testplus.assert_equal("class Sample1ServiceProxy(" in content, True, "The proxy class was not generated.")
+    testplus.assert_equal("def action_GetVolume(self, InstanceID" in content, True, "The GetVolume action was not generated.")
+    testplus.assert_equal("def action_SetVolume(self, InstanceID, DesiredVolume" in content, True, "The SetVolume action was not generated.")
+    testplus.assert_equal("SERVICE_ACTION_IN_ARGS" in content, False, "The untyped proxy should not declare its in arguments.")
+    testplus.assert_equal('"GetVolume": (("CurrentVolume", "ui2"),),' in content, True,
+                          "The out arguments of GetVolume were not declared with their data types.")
+    testplus.assert_equal('"SetVolume": (' in content, False, "An action without out arguments was declared in the out argument table.")
+
+    return
+
+
+def test_upnp_generator_typed_proxy():
+
+    content = generate_sample_proxy(typed=True)
+
+    testplus.assert_equal("class Sample1ServiceProxy(" in content, True, "The proxy class was not generated.")
+    testplus.assert_equal("SERVICE_ACTION_IN_ARGS" in content, True, "The typed proxy should declare its in arguments.")
+    testplus.assert_equal("def action_GetVolume(" in content, True, "The GetVolume action was not generated.")
+    testplus.assert_equal("def action_SetVolume(" in content, True, "The SetVolume action was not generated.")
+    testplus.assert_equal("class Sample1GetVolumeResult(NamedTuple)" in content, True, "The GetVolume result type was not generated.")
+
+    return
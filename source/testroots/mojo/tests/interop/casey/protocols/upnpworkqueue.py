@@ -0,0 +1,157 @@
+
+import threading
+import time
+
+from mojo import testplus
+
+from mojo.interop.protocols.upnp.upnpworkqueue import UpnpWorkQueue
+
+
+def record(name: str):
+    return name
+
+
+def dequeue_names(queue: UpnpWorkQueue, count: int) -> list:
+    """
+        Dequeues the specified number of packets and returns the names they were queued with.
+    """
+    names = []
+    for _ in range(count):
+        packet = queue.dequeue(timeout=1)
+        names.append(packet.execute() if packet is not None else None)
+    return names
+
+
+def test_work_queue_unordered_packets_are_fifo():
+
+    queue = UpnpWorkQueue()
+
+    for name in ["first", "second", "third"]:
+        queue.enqueue(record, (name,))
+
+    testplus.assert_equal(dequeue_names(queue, 3), ["first", "second", "third"], "The packets were not dequeued in the order they were queued.")
+    testplus.assert_equal(queue.depth, 0, "The dequeued packets are still counted in the depth.")
+
+    return
+
+
+def test_work_queue_keyed_packets_are_held_until_complete():
+
+    queue = UpnpWorkQueue()
+
+    queue.enqueue(record, ("a1",), order_key="device-a")
+    queue.enqueue(record, ("a2",), order_key="device-a")
+    queue.enqueue(record, ("b1",), order_key="device-b")
+
+    first = queue.dequeue(timeout=1)
+    second = queue.dequeue(timeout=1)
+
+    # The packets of different devices are in flight at the same time
+    testplus.assert_equal([first.execute(), second.execute()], ["a1", "b1"], "The packets of a second device were held up.")
+
+    testplus.assert_equal(queue.dequeue(timeout=0.1), None, "A packet was released while the packet ahead of it was in flight.")
+
+    queue.complete(first)
+
+    third = queue.dequeue(timeout=1)
+    testplus.assert_equal(third.execute(), "a2", "The held packet was not released when the packet ahead of it completed.")
+
+    queue.complete(second)
+    queue.complete(third)
+
+    stats = queue.statistics()
+    testplus.assert_equal(stats["ordered_keys"], 0, "The order keys were not released once their packets completed.")
+    testplus.assert_equal(stats["completed"], 3, "The completed packets were not counted.")
+
+    return
+
+
+def test_work_queue_drops_when_full():
+
+    queue = UpnpWorkQueue(max_depth=2)
+
+    results = [queue.enqueue(record, (str(idx),)) for idx in range(3)]
+
+    testplus.assert_equal(results, [True, True, False], "The packet queued on a full queue was not dropped.")
+    testplus.assert_equal(queue.statistics()["dropped"], 1, "The dropped packet was not counted.")
+
+    return
+
+
+def test_work_queue_blocking_enqueue_waits_for_space():
+
+    queue = UpnpWorkQueue(max_depth=1)
+    queue.enqueue(record, ("first",))
+
+    results = []
+
+    def blocked_producer():
+        results.append(queue.enqueue(record, ("second",), block=True, timeout=10))
+        return
+
+    pthread = threading.Thread(target=blocked_producer, daemon=True)
+    pthread.start()
+
+    time.sleep(0.2)
+    testplus.assert_equal(pthread.is_alive(), True, "The producer did not wait for space in a full queue.")
+
+    testplus.assert_equal(dequeue_names(queue, 1), ["first"], "The first packet was not dequeued.")
+
+    pthread.join(10)
+    testplus.assert_equal(results, [True], "The waiting producer did not queue its packet once there was space.")
+    testplus.assert_equal(dequeue_names(queue, 1), ["second"], "The packet of the waiting producer was lost.")
+    testplus.assert_equal(queue.statistics()["blocked"], 1, "The blocked producer was not counted.")
+
+    return
+
+
+def test_work_queue_shutdown():
+
+    queue = UpnpWorkQueue(max_depth=1)
+    queue.enqueue(record, ("pending",), order_key="device-a")
+
+    waiting = []
+
+    def waiting_producer():
+        waiting.append(queue.enqueue(record, ("blocked",), block=True))
+        return
+
+    pthread = threading.Thread(target=waiting_producer, daemon=True)
+    pthread.start()
+    time.sleep(0.1)
+
+    queue.shutdown()
+
+    pthread.join(10)
+    testplus.assert_equal(waiting, [False], "The shutdown did not wake the producer waiting for space.")
+
+    testplus.assert_equal(queue.dequeue(timeout=1), None, "A packet was dequeued from a queue that was shut down.")
+    testplus.assert_equal(queue.depth, 0, "The pending packets were not discarded by the shutdown.")
+    testplus.assert_equal(queue.enqueue(record, ("late",)), False, "A queue that was shut down accepted a packet.")
+
+    return
+
+
+def test_work_queue_shutdown_wakes_workers():
+
+    queue = UpnpWorkQueue()
+
+    packets = []
+
+    def worker():
+        packets.append(queue.dequeue())
+        return
+
+    wthreads = [threading.Thread(target=worker, daemon=True) for _ in range(3)]
+    for wthread in wthreads:
+        wthread.start()
+
+    time.sleep(0.1)
+    queue.shutdown()
+
+    for wthread in wthreads:
+        wthread.join(10)
+
+    testplus.assert_equal(packets, [None, None, None], "The shutdown did not wake all of the waiting workers.")
+
+    return